@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark — Playwright profile extraction round-trips.
+
+Compares the single PROFILE_JS page.evaluate (scrapers/dom_extract.py)
+with the stepwise per-selector extractors PlaywrightGoogleMapsScraper
+used before (query_selector + inner_text / get_attribute per fallback).
+Every awaited Playwright call on the page or on an element handle is
+counted as one CDP round-trip.
+
+The page is leadparser/debug_response.html with its <script> tags
+removed and the usual profile anchors spliced in after <body>, loaded
+with page.set_content() so no network is involved.
+
+Requires Playwright + Chromium:
+  pip install playwright && playwright install chromium
+
+Usage (from the repo root):
+  python benchmarks/bench_dom_extract.py
+  python benchmarks/bench_dom_extract.py --rounds 100
+"""
+
+import argparse
+import asyncio
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "leadparser"))
+
+from scrapers.dom_extract import PROFILE_JS, normalize_profile  # noqa: E402
+from scrapers.playwright_scraper import PlaywrightGoogleMapsScraper  # noqa: E402
+
+FIXTURE = ROOT / "leadparser" / "debug_response.html"
+
+_PROFILE_ANCHORS = (
+    '<h1 class="DUwDvf">Joe\'s Plumbing</h1>'
+    '<div class="F7nice"><span aria-hidden="true">4.6</span></div>'
+    '<button aria-label="128 reviews">128 reviews</button>'
+    '<button class="DkEaL">Plumber</button>'
+    '<button data-item-id="address"><div class="fontBodyMedium">123 Main St, Dallas, TX 75201</div></button>'
+    '<a data-item-id="authority" href="https://joesplumbing.com">site</a>'
+    '<button data-item-id="phone:tel:+12145550123" aria-label="Phone: (214) 555-0123">call</button>'
+    '<div aria-label="Open ⋅ Closes 6 PM; Show open hours for the week"></div>'
+)
+
+_SCRIPT_RE = re.compile(r"<script\b.*?</script>", re.S | re.I)
+
+
+# ── Round-trip counting proxy ─────────────────────────────────────────────────
+
+class _Counting:
+    """Wraps a Page / ElementHandle; counts every awaited Playwright call."""
+
+    def __init__(self, target, counter: list):
+        self._target  = target
+        self._counter = counter
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not asyncio.iscoroutinefunction(attr):
+            return attr
+
+        async def call(*args, **kwargs):
+            self._counter[0] += 1
+            return _wrap(await attr(*args, **kwargs), self._counter)
+        return call
+
+
+def _wrap(result, counter):
+    if isinstance(result, list):
+        return [_wrap(r, counter) for r in result]
+    if hasattr(result, "get_attribute"):   # ElementHandle
+        return _Counting(result, counter)
+    return result
+
+
+# ── Runner ────────────────────────────────────────────────────────────────────
+
+async def _measure(fn, page, rounds):
+    counter = [0]
+    proxy   = _Counting(page, counter)
+    fields  = await fn(proxy)                 # warm-up + sanity result
+    counter[0] = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await fn(proxy)
+    ms = (time.perf_counter() - start) / rounds * 1000
+    return fields, counter[0] / rounds, ms
+
+
+async def _run(rounds: int) -> None:
+    try:
+        from playwright.async_api import async_playwright
+    except ImportError:
+        raise SystemExit("playwright is not installed — pip install playwright")
+
+    html    = _SCRIPT_RE.sub("", FIXTURE.read_text(encoding="utf-8"))
+    body_at = html.index(">", html.index("<body")) + 1
+    profile = html[:body_at] + _PROFILE_ANCHORS + html[body_at:]
+
+    scraper = PlaywrightGoogleMapsScraper({"scraping": {}}, rate_limiter=None)
+
+    async def batch(page):
+        return normalize_profile(await page.evaluate(PROFILE_JS))
+
+    async with async_playwright() as pw:
+        browser = await pw.chromium.launch(headless=True)
+        page    = await browser.new_page()
+        await page.set_content(profile)
+
+        old_fields, old_trips, old_ms = await _measure(
+            scraper._extract_fields_stepwise, page, rounds
+        )
+        new_fields, new_trips, new_ms = await _measure(batch, page, rounds)
+        await browser.close()
+
+    for key, value in old_fields.items():
+        assert new_fields[key] == value, (key, new_fields[key], value)
+
+    print(f"{'extractor':<22}{'round-trips':>13}{'ms/profile':>12}")
+    print(f"{'stepwise (before)':<22}{old_trips:>13.0f}{old_ms:>12.2f}")
+    print(f"{'PROFILE_JS (after)':<22}{new_trips:>13.0f}{new_ms:>12.2f}")
+    print(f"{'':<22}{old_trips / new_trips:>12.0f}x{old_ms / new_ms:>11.1f}x")
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    p.add_argument("--rounds", type=int, default=50)
+    args = p.parse_args()
+
+    if not FIXTURE.exists():
+        raise SystemExit(f"Fixture not found: {FIXTURE}")
+    asyncio.run(_run(args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark — XHR profile-page field extraction.
+
+Compares scrapers/html_extract.py (single precompiled anchor pass) with
+the legacy per-field parsers that XHRGoogleMapsScraper used to run, each
+of which re-scanned the full page with inline re.findall / re.search.
+
+Inputs are the saved leadparser/debug_response.html page (~220 KB, no
+phone anchors — exercises every fallback) and a "profile" variant of the
+same page with the usual profile anchors spliced in after <body>.
+
+Usage (from the repo root):
+  python benchmarks/bench_html_extract.py
+  python benchmarks/bench_html_extract.py --rounds 500
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "leadparser"))
+
+from scrapers.html_extract import parse_business_html  # noqa: E402
+
+FIXTURE = ROOT / "leadparser" / "debug_response.html"
+
+_PROFILE_ANCHORS = (
+    '<h1 class="DUwDvf">Joe\'s Plumbing</h1>'
+    '<span aria-label="4.6 stars"></span>'
+    '<button aria-label="128 reviews"></button>'
+    '<button data-item-id="address" aria-label="Address: 123 Main St, Dallas, TX 75201">'
+    '<a data-item-id="authority" href="https://joesplumbing.com">site</a>'
+    '<button data-item-id="phone:tel:+12145550123" aria-label="Phone: (214) 555-0123">'
+    '<div aria-label="Open ⋅ Closes 6 PM; Show open hours for the week"></div>'
+)
+
+
+# ── Legacy reference (pre-html_extract XHRGoogleMapsScraper parsers) ──────────
+
+_LEGACY_PHONE_RE = re.compile(r"\(?\d{3}\)?[\s.\-]?\d{3}[\s.\-]?\d{4}")
+
+
+def _legacy_phone(html):
+    for raw in re.findall(r'href="tel:([^"]+)"', html):
+        phone = raw.strip().replace("%20", " ")
+        if _LEGACY_PHONE_RE.search(phone) or re.search(r"\+?\d{7,}", phone):
+            return phone
+    for raw in re.findall(r'data-item-id="phone:tel:([^"]+)"', html):
+        if raw.strip():
+            return raw.strip()
+    for raw in re.findall(r'aria-label="Phone:\s*([^"]+)"', html):
+        if _LEGACY_PHONE_RE.search(raw):
+            return raw.strip()
+    phones = _LEGACY_PHONE_RE.findall(html)
+    return phones[0] if phones else ""
+
+
+def _legacy_name(html):
+    og = re.search(r'<meta property="og:title"\s+content="([^"]+)"', html)
+    if og:
+        name = re.split(r"\s*[·\-]\s*Google Maps", og.group(1).strip())[0].strip()
+        if name:
+            return name
+    title_m = re.search(r"<title>([^<]+)</title>", html)
+    if title_m:
+        name = re.split(r"\s*[·\-]\s*Google Maps", title_m.group(1).strip())[0].strip()
+        if name and name.lower() != "google maps":
+            return name
+    h1_m = re.search(r"<h1[^>]*>([^<]+)</h1>", html)
+    return h1_m.group(1).strip() if h1_m else ""
+
+
+def _legacy_rating_reviews(html):
+    rating, reviews = "", 0
+    r_m = re.search(r'"(\d+\.?\d*)\s+stars?"', html)
+    if r_m:
+        rating = r_m.group(1)
+    rev_m = re.search(r'"([\d,]+)\s+reviews?"', html)
+    if rev_m:
+        reviews = int(rev_m.group(1).replace(",", ""))
+    if not rating:
+        pair = re.search(r"(\d+\.?\d+)\s*\(([\d,]+)\)", html)
+        if pair:
+            rating = pair.group(1)
+            reviews = int(pair.group(2).replace(",", ""))
+    return rating, reviews
+
+
+def _legacy_parse(html, url, niche):
+    phone = _legacy_phone(html)
+    if not phone:
+        return None
+    name = _legacy_name(html)
+    if not name:
+        return None
+    rating, review_count = _legacy_rating_reviews(html)
+    addr = re.search(r'data-item-id="address"[^>]*aria-label="Address:\s*([^"]+)"', html)
+    if not addr:
+        addr = re.search(r'"streetAddress"\s*:\s*"([^"]+)"', html)
+    hours = re.search(r'aria-label="([^"]*(?:Open|Closed)[^"]*hours[^"]*)"', html, re.I)
+    web = re.search(r'data-item-id="authority"[^>]*href="([^"]+)"', html)
+    if not web:
+        og_url = re.search(r'<meta property="og:url"\s+content="([^"]+)"', html)
+        web = og_url if og_url and "google.com" not in og_url.group(1) else None
+    cat = re.search(r'"category"\s*:\s*"([^"]+)"', html)
+    return {
+        "name": name, "phone": phone, "rating": rating, "review_count": review_count,
+        "address": addr.group(1).strip() if addr else "",
+        "hours": hours.group(1).split(";")[0].strip() if hours else "",
+        "website": web.group(1).strip() if web else "",
+        "category": cat.group(1).strip() if cat else "",
+    }
+
+
+# ── Runner ────────────────────────────────────────────────────────────────────
+
+def _time(fn, html, rounds):
+    fn(html, "https://www.google.com/maps/place/x", "plumbers")   # warm-up
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(html, "https://www.google.com/maps/place/x", "plumbers")
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    p.add_argument("--rounds", type=int, default=200)
+    args = p.parse_args()
+
+    if not FIXTURE.exists():
+        raise SystemExit(f"Fixture not found: {FIXTURE}")
+
+    search_page = FIXTURE.read_text(encoding="utf-8")
+    body_at     = search_page.index(">", search_page.index("<body")) + 1
+    profile     = search_page[:body_at] + _PROFILE_ANCHORS + search_page[body_at:]
+
+    # Sanity check: both implementations agree on the spliced profile
+    legacy_lead = _legacy_parse(profile, "u", "n")
+    engine_lead = parse_business_html(profile, "u", "n")
+    for key, value in legacy_lead.items():
+        assert engine_lead[key] == value, (key, engine_lead[key], value)
+
+    print(f"{'fixture':<22}{'size':>9}{'legacy ms':>12}{'engine ms':>12}{'speedup':>10}")
+    for label, html in (("debug_response.html", search_page), ("profile (spliced)", profile)):
+        legacy = _time(_legacy_parse, html, args.rounds)
+        engine = _time(parse_business_html, html, args.rounds)
+        print(
+            f"{label:<22}{len(html) // 1024:>7} KB"
+            f"{legacy:>12.3f}{engine:>12.3f}{legacy / engine:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
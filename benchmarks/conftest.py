@@ -0,0 +1,223 @@
+"""
+conftest.py — options and the `bench` fixture for the benchmark suite.
+
+Benchmarks are skipped unless --bench is given:
+
+    python -m pytest benchmarks --bench                  # 1k + 100k
+    python -m pytest benchmarks --bench --bench-sizes 1k,100k,1m
+    python -m pytest benchmarks --bench --bench-save     # new baseline
+
+Each benchmark runs its target for a few rounds and keeps the fastest
+(min) and median wall time.  With a baseline file present, a benchmark
+fails when its min is more than --bench-threshold (default 25 %) slower
+than the stored min.  --bench-save writes the run into the baseline
+instead of comparing.
+
+benchmarks/baseline.json is committed together with the machine it was
+recorded on.  Timings only compare on similar hardware: when the current
+machine differs, the summary says so — re-record with --bench-save
+before trusting a regression.
+
+The suite reuses tests/python/conftest.py for the leadparser/ sys.path
+entry and the sample_config fixture, and puts tests/python/ on sys.path
+so synthetic.py can build pages with the unit tests' helpers.
+"""
+
+import importlib.util
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+BENCH_DIR        = Path(__file__).parent
+TESTS_CONFTEST   = BENCH_DIR.parent / "tests" / "python" / "conftest.py"
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+SIZES            = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+MAX_ROUNDS   = 5
+MIN_SECONDS  = 1.0     # stop adding rounds once this much time is spent
+
+
+# ── Shared test setup ─────────────────────────────────────────────────────────
+
+_spec   = importlib.util.spec_from_file_location("_leadparser_tests_conftest", TESTS_CONFTEST)
+_shared = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_shared)       # puts leadparser/ on sys.path
+sys.path.insert(0, str(TESTS_CONFTEST.parent))
+
+sample_config = _shared.sample_config
+
+
+# ── Options ───────────────────────────────────────────────────────────────────
+
+def pytest_addoption(parser):
+    group = parser.getgroup("bench", "lead pipeline benchmarks")
+    group.addoption("--bench", action="store_true",
+                    help="run the benchmarks (skipped otherwise)")
+    group.addoption("--bench-sizes", default="1k,100k",
+                    help="comma-separated input sizes: " + ", ".join(SIZES))
+    group.addoption("--bench-baseline", default=str(DEFAULT_BASELINE),
+                    help="baseline JSON to compare against / save to")
+    group.addoption("--bench-threshold", type=float, default=0.25,
+                    help="allowed slowdown over the baseline min (0.25 = 25 %%)")
+    group.addoption("--bench-save", action="store_true",
+                    help="store this run as the baseline instead of comparing")
+
+
+# Options from a non-root conftest exist only when this directory is on the
+# command line; a bare `pytest` run sees the defaults and skips everything.
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--bench", False):
+        return
+    skip = pytest.mark.skip(reason="benchmarks run only with --bench")
+    for item in items:
+        if BENCH_DIR in Path(str(item.fspath)).parents:
+            item.add_marker(skip)
+
+
+def pytest_generate_tests(metafunc):
+    if "size" not in metafunc.fixturenames:
+        return
+    names = [s.strip().lower() for s in metafunc.config.getoption("--bench-sizes", "1k").split(",")]
+    unknown = [s for s in names if s not in SIZES]
+    if unknown:
+        raise pytest.UsageError(f"unknown --bench-sizes {unknown}; choose from {list(SIZES)}")
+    metafunc.parametrize("size", [SIZES[s] for s in names], ids=names)
+
+
+# ── Results and baseline ──────────────────────────────────────────────────────
+
+class BenchSession:
+    """Collects results for one pytest run and holds the loaded baseline."""
+
+    def __init__(self, config):
+        self.path      = Path(config.getoption("--bench-baseline"))
+        self.threshold = config.getoption("--bench-threshold")
+        self.save      = config.getoption("--bench-save")
+        self.results: dict[str, dict] = {}
+        self.baseline: dict[str, dict] = {}
+        self.machine: dict = {}
+        if self.path.exists():
+            data          = json.loads(self.path.read_text())
+            self.baseline = data.get("benchmarks", {})
+            self.machine  = data.get("machine", {})
+
+    def same_machine(self) -> bool:
+        """True when the baseline was recorded on hardware like this one."""
+        here = _machine()
+        return all(self.machine.get(k) == here[k] for k in ("machine", "cpu"))
+
+    def check(self, name: str, result: dict) -> None:
+        """Record *result*; fail the test if it regressed past the threshold."""
+        self.results[name] = result
+        base = self.baseline.get(name)
+        if self.save or not base:
+            return
+        ratio = result["min"] / base["min"]
+        result["vs_baseline"] = round(ratio, 3)
+        if ratio > 1 + self.threshold:
+            pytest.fail(
+                f"{name}: {result['min'] * 1000:.1f} ms vs baseline "
+                f"{base['min'] * 1000:.1f} ms ({ratio:.2f}x, limit {1 + self.threshold:.2f}x)",
+                pytrace=False,
+            )
+
+    def write(self) -> None:
+        merged = {**self.baseline, **self.results}
+        self.path.write_text(json.dumps({
+            "machine":    _machine(),
+            "saved_at":   datetime.now().isoformat(timespec="seconds"),
+            "benchmarks": dict(sorted(merged.items())),
+        }, indent=2) + "\n")
+
+
+def _machine() -> dict:
+    return {
+        "python":   sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine":  platform.machine(),
+        "cpu":      platform.processor() or "unknown",
+    }
+
+
+def pytest_configure(config):
+    if config.getoption("--bench", False):
+        config._bench = BenchSession(config)
+
+
+def pytest_sessionfinish(session):
+    bench = getattr(session.config, "_bench", None)
+    if bench is not None and bench.save and bench.results:
+        bench.write()
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    bench = getattr(config, "_bench", None)
+    if bench is None or not bench.results:
+        return
+    tr = terminalreporter
+    tr.section("benchmarks")
+    tr.write_line(f"{'benchmark':<58} {'n':>9} {'min ms':>10} {'median ms':>10} {'vs base':>8}")
+    for name, r in sorted(bench.results.items()):
+        ratio = f"{r['vs_baseline']:.2f}x" if "vs_baseline" in r else "-"
+        tr.write_line(
+            f"{name:<58} {r['n']:>9} {r['min'] * 1000:>10.1f} {r['median'] * 1000:>10.1f} {ratio:>8}"
+        )
+    if bench.save:
+        tr.write_line(f"baseline saved to {bench.path}")
+    elif bench.baseline and not bench.same_machine():
+        m = bench.machine
+        tr.write_line(
+            f"note: baseline recorded on {m.get('machine', '?')} / {m.get('cpu', '?')} "
+            f"({m.get('platform', '?')}); re-record with --bench-save before "
+            f"trusting the comparison on this machine"
+        )
+
+
+# ── bench fixture ─────────────────────────────────────────────────────────────
+
+class Bench:
+    """
+    Times one benchmark target.  Mirrors the pytest-benchmark call style:
+
+        result = bench(func, *args)                      # same input every round
+        bench.pedantic(func, setup=make_args)            # fresh (args, kwargs) per round
+    """
+
+    def __init__(self, session: BenchSession, name: str, size: int):
+        self.session = session
+        self.name    = name
+        self.size    = size
+
+    def __call__(self, func, *args, **kwargs):
+        return self.pedantic(func, args=args, kwargs=kwargs)
+
+    def pedantic(self, func, args=(), kwargs=None, setup=None):
+        times, result, spent = [], None, 0.0
+        while len(times) < MAX_ROUNDS and (spent < MIN_SECONDS or not times):
+            call_args, call_kwargs = setup() if setup else (args, kwargs or {})
+            start  = time.perf_counter()
+            result = func(*call_args, **call_kwargs)
+            took   = time.perf_counter() - start
+            times.append(took)
+            spent += took
+        self.session.check(self.name, {
+            "n":      self.size,
+            "rounds": len(times),
+            "min":    min(times),
+            "median": statistics.median(times),
+        })
+        return result
+
+
+@pytest.fixture
+def bench(request):
+    name = request.node.nodeid.split("benchmarks/", 1)[-1]
+    size = request.node.callspec.params.get("size", 0) if hasattr(request.node, "callspec") else 0
+    return Bench(request.config._bench, name, size)
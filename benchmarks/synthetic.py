@@ -0,0 +1,146 @@
+"""
+Synthetic inputs for the benchmarks: raw scraper dicts, canonical leads,
+XHR profile pages and APP_INITIALIZATION_STATE search pages.
+
+Deterministic (seeded) so every run and every machine times the same
+input.  Cached per size: generating 1M leads costs more than most
+benchmarks.
+"""
+
+import random
+from functools import lru_cache
+
+NICHES  = ["plumbers", "electricians", "hvac", "roofers", "restaurants", "dentists", "salons"]
+CITIES  = [("Dallas", "TX", "75201", "214"), ("Austin", "TX", "78701", "512"),
+           ("Calgary", "AB", "T2P 1J9", "403"), ("Denver", "CO", "80202", "303"),
+           ("Tampa", "FL", "33602", "813")]
+STREETS = ["Main St", "Oak Ave", "Elm St", "Macleod Trail SE", "Commerce St", "5th Ave"]
+WORDS   = ["Ace", "Bolt", "Crux", "Delta", "Eagle", "Prime", "Metro", "Summit", "Joe's", "Apex"]
+
+
+def _rng(size: int, salt: str) -> random.Random:
+    return random.Random(f"{salt}-{size}")
+
+
+@lru_cache(maxsize=None)
+def raw_leads(size: int) -> tuple[dict, ...]:
+    """Raw scraper dicts, shaped like GoogleMapsScraper output."""
+    rng, leads = _rng(size, "raw"), []
+    for i in range(size):
+        niche                 = rng.choice(NICHES)
+        city, st, zip_, area  = rng.choice(CITIES)
+        has_site              = rng.random() < 0.4
+        name                  = f"{rng.choice(WORDS)} {niche.title()} {i}"
+        leads.append({
+            "source":          "Google Maps",
+            "niche":           niche,
+            "name":            name,
+            "phone":           f"({area}) {rng.randint(200, 999)}-{i % 10000:04d}" if rng.random() < 0.95 else "",
+            "secondary_phone": "",
+            "address":         f"{rng.randint(1, 9999)} {rng.choice(STREETS)}, {city}, {st} {zip_}",
+            "city":            city,
+            "state":           st,
+            "zip":             zip_,
+            "hours":           "Mon-Fri 8am-6pm",
+            "review_count":    rng.choice([0, 1, 3, 8, 24, 75, 210]),
+            "rating":          f"{rng.uniform(2.5, 5.0):.1f}" if rng.random() < 0.9 else "",
+            "website":         f"https://{name.split()[0].lower().strip(chr(39))}{i}.com" if has_site else "",
+            "facebook":        "",
+            "instagram":       "",
+            "gmb_link":        f"https://www.google.com/maps/place/?cid={10**12 + i}",
+            "category":        niche.rstrip("s").title(),
+            "notes":           "",
+            "email":           "",
+        })
+    return tuple(leads)
+
+
+@lru_cache(maxsize=None)
+def canonical_leads(size: int) -> tuple[dict, ...]:
+    """build_lead()-shaped dicts (what filters, exporters and the CSV see)."""
+    rng, leads = _rng(size, "lead"), []
+    for raw in raw_leads(size):
+        leads.append({
+            "niche":            raw["niche"],
+            "name":             raw["name"],
+            "phone":            raw["phone"] or "NOT FOUND",
+            "secondary_phone":  "",
+            "address":          raw["address"].split(",")[0],
+            "city":             raw["city"],
+            "state":            raw["state"],
+            "zip_code":         raw["zip"],
+            "hours":            raw["hours"],
+            "review_count":     raw["review_count"],
+            "rating":           raw["rating"],
+            "gmb_link":         raw["gmb_link"],
+            "website":          raw["website"],
+            "facebook":         "",
+            "instagram":        "",
+            "data_source":      "Google Maps",
+            "date_added":       "2026-01-15",
+            "lead_score":       rng.randint(0, 25),
+            "pitch_notes":      f"Hi {raw['name']}, I help {raw['niche']} in {raw['city']} get more clients.",
+            "additional_notes": "",
+            "call_status":      "",
+            "follow_up_date":   "",
+        })
+    return tuple(leads)
+
+
+# ── Pages ─────────────────────────────────────────────────────────────────────
+
+_PROFILE = (
+    "<!DOCTYPE html><html><head>"
+    '<meta property="og:title" content="{name} · Google Maps">'
+    "<script>{filler}</script></head><body>"
+    '<h1 class="DUwDvf">{name}</h1>'
+    '<span aria-label="{rating} stars"></span>'
+    '<button aria-label="{reviews} reviews"></button>'
+    '<button data-item-id="address" class="x" aria-label="Address: {address}">'
+    '<a data-item-id="authority" href="{website}">site</a>'
+    '<button data-item-id="phone:tel:+1{digits}" aria-label="Phone: {phone}">'
+    '<div aria-label="Open ⋅ Closes 6 PM; Show open hours for the week"></div>'
+    '<script>{{"category": "{category}"}}</script>'
+    "</body></html>"
+)
+# Real profile pages carry tens of KB of inline JS around the fields.
+_FILLER = "var _x=[" + ",".join(str(n) for n in range(5_000)) + "];"
+
+# Distinct pages generated per size; larger sizes cycle through them so 1M
+# pages do not need gigabytes of memory.  Parse time is the same either way.
+DISTINCT_PAGES = 1_000
+
+
+@lru_cache(maxsize=None)
+def profile_pages(size: int) -> tuple[tuple[str, str], ...]:
+    """(html, url) for *size* XHR /maps/place/ responses."""
+    pages = []
+    for raw in raw_leads(min(size, DISTINCT_PAGES)):
+        phone = raw["phone"] or "(214) 555-0000"
+        pages.append((_PROFILE.format(
+            name=raw["name"], rating=raw["rating"] or "4.0", reviews=raw["review_count"],
+            address=raw["address"], website=raw["website"] or "https://example.com",
+            digits="".join(c for c in phone if c.isdigit()), phone=phone,
+            category=raw["category"], filler=_FILLER,
+        ), raw["gmb_link"]))
+    return tuple(pages[i % len(pages)] for i in range(size))
+
+
+PLACES_PER_PAGE = 20
+
+
+@lru_cache(maxsize=None)
+def search_pages(size: int) -> tuple[str, ...]:
+    """Search pages holding *size* places in APP_INITIALIZATION_STATE, 20 per page."""
+    from unit.test_app_state import _page, _place
+
+    places = [
+        _place(raw["name"], f"0x{i:x}:0x{i * 7:x}", phone=raw["phone"] or None,
+               rating=float(raw["rating"]) if raw["rating"] else None,
+               reviews=raw["review_count"], place_id=f"ChIJ{i}")
+        for i, raw in enumerate(raw_leads(min(size, DISTINCT_PAGES * PLACES_PER_PAGE)))
+    ]
+    pages = [
+        _page(*places[i:i + PLACES_PER_PAGE]) for i in range(0, len(places), PLACES_PER_PAGE)
+    ]
+    return tuple(pages[i % len(pages)] for i in range(-(-size // PLACES_PER_PAGE)))
@@ -0,0 +1,70 @@
+"""
+Benchmarks for storage and export.
+
+Covers:
+  - SQLiteHandler.bulk_insert() into a fresh database each round
+  - SupabaseHandler._prepare_row() (client creation patched out)
+  - export_csv() writing the dated + latest CSV pair
+  - dashboard.load_leads() reading and sorting the latest CSV
+"""
+
+import itertools
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import dashboard
+from benchmarks.synthetic import canonical_leads
+from exporters.sqlite_handler import SQLiteHandler
+from main import export_csv
+
+
+def test_sqlite_bulk_insert(bench, size, tmp_path):
+    leads    = canonical_leads(size)
+    rounds   = itertools.count()
+    handlers = []
+
+    def fresh_db():
+        db = SQLiteHandler({"database": {"path": str(tmp_path / f"leads-{next(rounds)}.db")}})
+        db.open()
+        handlers.append(db)
+        return (db, leads), {}
+
+    try:
+        stats = bench.pedantic(lambda db, rows: db.bulk_insert(rows), setup=fresh_db)
+    finally:
+        for db in handlers:
+            db.close()
+    assert stats["new"] + stats["duplicates"] == size and stats["errors"] == 0
+
+
+def test_supabase_prepare_row(bench, size, monkeypatch):
+    monkeypatch.setenv("SUPABASE_URL", "https://fake.supabase.co")
+    monkeypatch.setenv("SUPABASE_KEY", "fake-service-role-key")
+    with patch("exporters.supabase_handler.create_client", return_value=MagicMock()):
+        from exporters.supabase_handler import SupabaseHandler
+        handler = SupabaseHandler()
+    leads = canonical_leads(size)
+
+    rows = bench(lambda: [handler._prepare_row(lead) for lead in leads])
+    assert len(rows) == size
+
+
+def test_export_csv(bench, size, tmp_path):
+    leads = canonical_leads(size)
+    path  = bench(export_csv, leads, str(tmp_path))
+    assert (tmp_path / "leads_latest.csv").exists() and path.endswith(".csv")
+
+
+@pytest.fixture
+def latest_csv(size, tmp_path, monkeypatch):
+    export_csv(canonical_leads(size), str(tmp_path))
+    monkeypatch.setattr(dashboard, "_csv_path", str(tmp_path / "leads_latest.csv"))
+
+
+def test_dashboard_load_leads(bench, size, latest_csv):
+    def cold():             # parse every round, not the (path, mtime) cache
+        dashboard._cache["key"] = None
+        return (), {}
+    leads = bench.pedantic(dashboard.load_leads, setup=cold)
+    assert 0 < len(leads) <= size
@@ -0,0 +1,36 @@
+"""
+Benchmarks for main.py's per-lead processing.
+
+Covers:
+  - build_lead() over raw scraper dicts (parse, validate, score, pitch)
+  - apply_filters() over canonical leads
+"""
+
+from benchmarks.synthetic import canonical_leads, raw_leads
+from main import apply_filters, build_lead
+from utils.address_parser import AddressParser
+from utils.lead_scorer import LeadScorer
+from utils.phone_validator import PhoneValidator
+from utils.pitch_engine import PitchEngine
+
+
+def test_build_lead(bench, size, sample_config):
+    raws    = raw_leads(size)
+    helpers = (LeadScorer(sample_config), PitchEngine(sample_config),
+               PhoneValidator(), AddressParser())
+
+    def run():
+        return [build_lead(raw, raw["niche"], sample_config, *helpers) for raw in raws]
+
+    leads = bench(run)
+    assert sum(lead is not None for lead in leads) > size * 0.9
+
+
+def test_apply_filters(bench, size, sample_config):
+    leads = list(canonical_leads(size))
+    sample_config["filters"].update(
+        min_reviews=1, max_rating=4.8, exclude_with_website=True,
+        require_phone=True, min_lead_score=5,
+    )
+    kept = bench(apply_filters, leads, sample_config)
+    assert 0 < len(kept) < size
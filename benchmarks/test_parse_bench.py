@@ -0,0 +1,30 @@
+"""
+Benchmarks for the scrape-side parsers.
+
+Covers:
+  - parse_business_html() over XHR /maps/place/ profile pages
+  - parse_place_records() over APP_INITIALIZATION_STATE search pages
+"""
+
+from benchmarks.synthetic import profile_pages, search_pages
+from scrapers.app_state import parse_place_records
+from scrapers.html_extract import parse_business_html
+
+
+def test_parse_profile_html(bench, size):
+    pages = profile_pages(size)
+
+    def run():
+        return [parse_business_html(html, url, "plumbers") for html, url in pages]
+
+    leads = bench(run)
+    assert len(leads) == size and all(leads)
+
+
+def test_decode_app_state(bench, size):
+    pages = search_pages(size)
+
+    def run():
+        return sum(len(parse_place_records(html)) for html in pages)
+
+    assert bench(run) == size
@@ -15,7 +15,6 @@ For remote access, use ngrok: ngrok http 5001
 import argparse
 import json
 import logging
-import sqlite3
 import sys
 import threading
 import time
@@ -25,12 +24,13 @@ from pathlib import Path
 from typing import Optional
 
 import yaml
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
 from flask_cors import CORS
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-from exporters.sqlite_handler import SQLiteHandler
+from exporters.sqlite_handler import LeadPage, SQLiteHandler, dashboard_stats
+from utils.sqlite_conn import read_pool
 from utils.lead_scorer import LeadScorer
 from scrapers.google_maps import GoogleMapsScraper
 
@@ -74,34 +74,21 @@ def get_status():
 
 @app.route('/api/leads')
 def get_leads():
-    """Get all qualified leads (no website + has phone)."""
-    filter_type = request.args.get("filter", "all")
+    """Qualified leads (no website + has phone): a keyset page with cursor / limit, else all; args in LeadPage."""
+    try:
+        page = LeadPage(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     
     if not DB_PATH.exists():
-        return jsonify([])
-    
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    
-    query = """
-        SELECT * FROM leads 
-        WHERE (website IS NULL OR website = '') 
-        AND (phone IS NOT NULL AND phone != '')
-    """
-    
-    if filter_type == "hot":
-        query += " AND lead_score >= 18"
-    elif filter_type == "warm":
-        query += " AND lead_score >= 12 AND lead_score < 18"
-    elif filter_type == "medium":
-        query += " AND lead_score >= 7 AND lead_score < 12"
+        return jsonify({"leads": [], "next_cursor": None} if page.paged else [])
     
-    query += " ORDER BY lead_score DESC, date_added DESC"
-    
-    rows = conn.execute(query).fetchall()
-    conn.close()
-    
-    return jsonify([dict(row) for row in rows])
+    return Response(stream_with_context(_stream_page(page)), mimetype="application/json")
+
+
+def _stream_page(page: LeadPage):
+    with read_pool(DB_PATH).connection() as conn:
+        yield from page.iter_json(conn)
 
 
 @app.route('/api/stats')
@@ -109,35 +96,18 @@ def get_stats():
     if not DB_PATH.exists():
         return jsonify({"total": 0, "hot": 0, "warm": 0, "new_this_session": 0})
     
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    
-    total = conn.execute("""
-        SELECT COUNT(*) FROM leads 
-        WHERE (website IS NULL OR website = '') 
-        AND (phone IS NOT NULL AND phone != '')
-    """).fetchone()[0]
-    
-    hot = conn.execute("""
-        SELECT COUNT(*) FROM leads 
-        WHERE (website IS NULL OR website = '') 
-        AND (phone IS NOT NULL AND phone != '')
-        AND lead_score >= 18
-    """).fetchone()[0]
-    
-    warm = conn.execute("""
-        SELECT COUNT(*) FROM leads 
-        WHERE (website IS NULL OR website = '') 
-        AND (phone IS NOT NULL AND phone != '')
-        AND lead_score >= 12 AND lead_score < 18
-    """).fetchone()[0]
-    
     today = datetime.now().strftime("%Y-%m-%d")
-    new_today = conn.execute("SELECT COUNT(*) FROM leads WHERE date_added = ?", (today,)).fetchone()[0]
-    
-    conn.close()
+    with read_pool(DB_PATH).connection() as conn:
+        stats = dashboard_stats(conn, today)
     
-    return jsonify({"total": total, "hot": hot, "warm": warm, "new_this_session": new_today})
+    # ETag on the trigger-maintained version: unchanged polls get a 304
+    version  = stats.pop("version")
+    response = jsonify(stats)
+    response.cache_control.no_cache = True
+    if version is not None:
+        response.set_etag(f"{version}-{today}")
+        response = response.make_conditional(request)
+    return response
 
 
 @app.route('/api/scrape', methods=['POST'])
@@ -330,13 +300,11 @@ def export_csv():
     if not DB_PATH.exists():
         return "No data", 404
     
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    rows = conn.execute("""
-        SELECT * FROM leads WHERE (website IS NULL OR website = '') 
-        AND (phone IS NOT NULL AND phone != '') ORDER BY lead_score DESC
-    """).fetchall()
-    conn.close()
+    with read_pool(DB_PATH).connection() as conn:
+        rows = conn.execute("""
+            SELECT * FROM leads WHERE (website IS NULL OR website = '') 
+            AND (phone IS NOT NULL AND phone != '') ORDER BY lead_score DESC
+        """).fetchall()
     
     output = io.StringIO()
     writer = csv.DictWriter(output, fieldnames=["name", "phone", "niche", "city", "state", "rating", "review_count", "lead_score", "gmb_link"])
@@ -355,6 +323,12 @@ def main():
     
     Path("data").mkdir(exist_ok=True)
     
+    # Migrate an existing leads.db (dashboard indexes) and log a warning if
+    # a dashboard query would still scan the table
+    if DB_PATH.exists():
+        with SQLiteHandler({"database": {"path": str(DB_PATH)}}):
+            pass
+    
     print(f"""
 ============================================================
          LeadParser API Server (Local Backend)
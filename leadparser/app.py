@@ -19,7 +19,6 @@ import argparse
 import json
 import logging
 import os
-import sqlite3
 import sys
 import threading
 import time
@@ -29,12 +28,13 @@ from pathlib import Path
 from typing import Optional
 
 import yaml
-from flask import Flask, render_template_string, jsonify, request
+from flask import Flask, Response, render_template_string, jsonify, request, stream_with_context
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from exporters.sqlite_handler import SQLiteHandler
+from exporters.sqlite_handler import LeadPage, SQLiteHandler, dashboard_stats
+from utils.sqlite_conn import read_pool
 from utils.lead_scorer import LeadScorer
 
 app = Flask(__name__)
@@ -548,6 +548,7 @@ MAIN_TEMPLATE = """
                     </tr>
                 </tbody>
             </table>
+            <button class="btn btn-secondary" id="loadMoreBtn" onclick="loadLeads(true)" style="display: none; margin: 15px auto;">Load more</button>
         </div>
     </div>
     
@@ -559,6 +560,7 @@ MAIN_TEMPLATE = """
     <script>
         let currentFilter = 'all';
         let leadsData = [];
+        let nextCursor = null;
         
         // Load leads on page load
         loadLeads();
@@ -631,9 +633,13 @@ MAIN_TEMPLATE = """
             }
         }
         
-        async function loadLeads() {
-            const response = await fetch('/api/leads?filter=' + currentFilter);
-            leadsData = await response.json();
+        async function loadLeads(more = false) {
+            let url = '/api/leads?limit=100&filter=' + currentFilter;
+            if (more && nextCursor) url += '&cursor=' + encodeURIComponent(nextCursor);
+            const response = await fetch(url);
+            const page = await response.json();
+            leadsData = more ? leadsData.concat(page.leads) : page.leads;
+            nextCursor = page.next_cursor;
             renderLeads();
         }
         
@@ -648,6 +654,7 @@ MAIN_TEMPLATE = """
         
         function renderLeads() {
             const tbody = document.getElementById('leadsTableBody');
+            document.getElementById('loadMoreBtn').style.display = nextCursor ? 'block' : 'none';
             
             if (leadsData.length === 0) {
                 tbody.innerHTML = `
@@ -1172,78 +1179,35 @@ def start_scrape():
 
 @app.route("/api/leads")
 def get_leads():
-    """Get leads with filtering."""
-    filter_type = request.args.get("filter", "all")
-    
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    
-    query = """
-        SELECT * FROM leads 
-        WHERE (website IS NULL OR website = '') 
-        AND (phone IS NOT NULL AND phone != '')
-    """
-    params = []
-    
-    if filter_type == "hot":
-        query += " AND lead_score >= 18"
-    elif filter_type == "warm":
-        query += " AND lead_score >= 12 AND lead_score < 18"
-    elif filter_type == "medium":
-        query += " AND lead_score >= 7 AND lead_score < 12"
-    
-    query += " ORDER BY lead_score DESC, date_added DESC"
-    
-    rows = conn.execute(query, params).fetchall()
-    conn.close()
-    
-    leads = [dict(row) for row in rows]
-    return jsonify(leads)
+    """A keyset page of qualified leads with cursor / limit, else all of them (see LeadPage)."""
+    try:
+        page = LeadPage(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return Response(stream_with_context(_stream_page(page)), mimetype="application/json")
+
+
+def _stream_page(page: LeadPage):
+    """JSON chunks straight off the cursor; the pooled connection is held only while streaming."""
+    with read_pool(DB_PATH).connection() as conn:
+        yield from page.iter_json(conn)
 
 
 @app.route("/api/stats")
 def get_stats():
-    """Get dashboard statistics."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    
-    # Total qualified leads (no website, has phone)
-    total = conn.execute("""
-        SELECT COUNT(*) FROM leads 
-        WHERE (website IS NULL OR website = '') 
-        AND (phone IS NOT NULL AND phone != '')
-    """).fetchone()[0]
-    
-    # Hot leads (score >= 18)
-    hot = conn.execute("""
-        SELECT COUNT(*) FROM leads 
-        WHERE (website IS NULL OR website = '') 
-        AND (phone IS NOT NULL AND phone != '')
-        AND lead_score >= 18
-    """).fetchone()[0]
-    
-    # Warm leads (12-17)
-    warm = conn.execute("""
-        SELECT COUNT(*) FROM leads 
-        WHERE (website IS NULL OR website = '') 
-        AND (phone IS NOT NULL AND phone != '')
-        AND lead_score >= 12 AND lead_score < 18
-    """).fetchone()[0]
-    
-    # New leads today
+    """Get dashboard statistics (qualified total, hot 18+, warm 12-17, new today)."""
     today = datetime.now().strftime("%Y-%m-%d")
-    new_today = conn.execute("""
-        SELECT COUNT(*) FROM leads WHERE date_added = ?
-    """, (today,)).fetchone()[0]
-    
-    conn.close()
+    with read_pool(DB_PATH).connection() as conn:
+        stats = dashboard_stats(conn, today)
     
-    return jsonify({
-        "total": total,
-        "hot": hot,
-        "warm": warm,
-        "new_this_session": new_today
-    })
+    # ETag on the trigger-maintained version: unchanged polls get a 304
+    version  = stats.pop("version")
+    response = jsonify(stats)
+    response.cache_control.no_cache = True
+    if version is not None:
+        response.set_etag(f"{version}-{today}")
+        response = response.make_conditional(request)
+    return response
 
 
 @app.route("/api/config", methods=["GET", "POST"])
@@ -1274,17 +1238,13 @@ def export_csv():
     import csv
     import io
     
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    
-    rows = conn.execute("""
-        SELECT * FROM leads 
-        WHERE (website IS NULL OR website = '') 
-        AND (phone IS NOT NULL AND phone != '')
-        ORDER BY lead_score DESC
-    """).fetchall()
-    
-    conn.close()
+    with read_pool(DB_PATH).connection() as conn:
+        rows = conn.execute("""
+            SELECT * FROM leads 
+            WHERE (website IS NULL OR website = '') 
+            AND (phone IS NOT NULL AND phone != '')
+            ORDER BY lead_score DESC
+        """).fetchall()
     
     output = io.StringIO()
     writer = csv.DictWriter(output, fieldnames=[
@@ -1321,17 +1281,13 @@ def export_csv():
 @app.route("/api/export/json")
 def export_json():
     """Export leads to JSON."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    
-    rows = conn.execute("""
-        SELECT * FROM leads 
-        WHERE (website IS NULL OR website = '') 
-        AND (phone IS NOT NULL AND phone != '')
-        ORDER BY lead_score DESC
-    """).fetchall()
-    
-    conn.close()
+    with read_pool(DB_PATH).connection() as conn:
+        rows = conn.execute("""
+            SELECT * FROM leads 
+            WHERE (website IS NULL OR website = '') 
+            AND (phone IS NOT NULL AND phone != '')
+            ORDER BY lead_score DESC
+        """).fetchall()
     
     leads = [dict(row) for row in rows]
     
@@ -1634,6 +1590,12 @@ def main():
     Path("data").mkdir(exist_ok=True)
     Path("logs").mkdir(exist_ok=True)
     
+    # Migrate an existing leads.db (dashboard indexes) and log a warning if
+    # a dashboard query would still scan the table
+    if DB_PATH.exists():
+        with SQLiteHandler({"database": {"path": str(DB_PATH)}}):
+            pass
+    
     # Open browser if requested
     if args.open:
         threading.Timer(1.5, lambda: webbrowser.open(f"http://localhost:{args.port}")).start()
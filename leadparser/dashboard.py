@@ -3,7 +3,7 @@
 LeadParser Dashboard — Localhost web viewer for scraped leads.
 =============================================================
 Shows ONLY businesses WITHOUT a website (highest-need prospects).
-Reads data/leads_latest.csv on every page load — always up to date.
+Re-reads data/leads_latest.csv whenever it changes — always up to date.
 
 Usage:
   python dashboard.py                          # default http://localhost:5000
@@ -31,6 +31,10 @@ app = Flask(__name__)
 # Set by CLI args at startup
 _csv_path: str = "data/leads_latest.csv"
 
+# Parsed CSV, keyed on (path, mtime, size) so page loads and the JSON
+# endpoints only re-parse after main.py has written a new file
+_cache: dict = {"key": None, "leads": []}
+
 # ── Score helpers ────────────────────────────────────────────────────────
 
 def _score(lead: dict) -> int:
@@ -56,11 +60,15 @@ def _tier(score: int) -> tuple[str, str]:
 def load_leads() -> list[dict]:
     """
     Load the CSV and return only rows that have NO website.
-    Sorted by Lead Score descending.
+    Sorted by Lead Score descending.  Cached until the file changes.
     """
     path = Path(_csv_path)
     if not path.exists():
         return []
+    stat = path.stat()
+    key  = (str(path), stat.st_mtime_ns, stat.st_size)
+    if _cache["key"] == key:
+        return _cache["leads"]
 
     leads = []
     with open(path, newline="", encoding="utf-8") as fh:
@@ -71,6 +79,7 @@ def load_leads() -> list[dict]:
                 leads.append(row)
 
     leads.sort(key=_score, reverse=True)
+    _cache["key"], _cache["leads"] = key, leads
     return leads
 
 
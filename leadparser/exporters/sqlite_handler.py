@@ -16,13 +16,17 @@ leads       -- one row per unique business
 sessions    -- one row per scraping run with summary stats
 """
 
+import base64
 import hashlib
 import json
 import logging
 import sqlite3
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Mapping, Optional
+
+from utils.metrics import metrics
+from utils.sqlite_conn import connect
 
 logger = logging.getLogger(__name__)
 
@@ -69,10 +73,33 @@ CREATE TABLE IF NOT EXISTS sessions (
     new_leads       INTEGER DEFAULT 0,
     duplicates      INTEGER DEFAULT 0,
     errors          INTEGER DEFAULT 0,
-    config_snapshot TEXT
+    config_snapshot TEXT,
+    metrics         TEXT    DEFAULT ''   -- utils.metrics summary (JSON)
 );
 """
 
+_INSERT_LEAD = """
+INSERT INTO leads (
+    dedup_key, niche, name, phone, secondary_phone,
+    address, city, state, zip_code, hours,
+    review_count, rating, gmb_link, website,
+    facebook, instagram, data_source, date_added,
+    lead_score, pitch_notes, additional_notes,
+    call_status, follow_up_date, raw_json
+) VALUES (
+    :dedup_key, :niche, :name, :phone, :secondary_phone,
+    :address, :city, :state, :zip_code, :hours,
+    :review_count, :rating, :gmb_link, :website,
+    :facebook, :instagram, :data_source, :date_added,
+    :lead_score, :pitch_notes, :additional_notes,
+    :call_status, :follow_up_date, :raw_json
+)"""
+
+# Bulk path: a duplicate dedup_key is skipped (not an exception), so a
+# whole batch goes through one executemany; new rows = its rowcount (which,
+# unlike total_changes, leaves out the lead_stats trigger writes).
+_INSERT_LEAD_IGNORE = _INSERT_LEAD + " ON CONFLICT(dedup_key) DO NOTHING"
+
 _CREATE_INDEXES = [
     "CREATE INDEX IF NOT EXISTS idx_leads_niche   ON leads (niche);",
     "CREATE INDEX IF NOT EXISTS idx_leads_city    ON leads (city);",
@@ -80,6 +107,315 @@ _CREATE_INDEXES = [
     "CREATE INDEX IF NOT EXISTS idx_leads_exported ON leads (exported);",
 ]
 
+# The dashboards' "qualified lead" filter (no website, has phone).  SQLite
+# only uses a partial index when the query repeats these exact terms, so
+# app.py / api_server.py must keep spelling the filter this way.
+QUALIFIED_WHERE = (
+    "(website IS NULL OR website = '') AND (phone IS NOT NULL AND phone != '')"
+)
+
+# -- Migrations -------------------------------------------------------
+# PRAGMA user_version counts the migrations applied to a file.  Append
+# new steps at the end; never edit or reorder one that has shipped.
+
+
+def _m1_sessions_metrics(cur: sqlite3.Cursor) -> None:
+    # Databases created before the metrics column existed
+    columns = {row[1] for row in cur.execute("PRAGMA table_info(sessions)")}
+    if "metrics" not in columns:
+        cur.execute("ALTER TABLE sessions ADD COLUMN metrics TEXT DEFAULT ''")
+
+
+def _m2_qualified_indexes(cur: sqlite3.Cursor) -> None:
+    # Qualified set in dashboard order: the lead list walks it without a
+    # sort, and id after the sort keys lets keyset pages (ORDER BY
+    # lead_score, date_added, id) come straight off it too.  website /
+    # phone ride along because SQLite only treats an index as covering when
+    # it holds the filter's columns -- with them the COUNT(*) stats never
+    # touch the table.
+    cur.execute(f"""
+        CREATE INDEX IF NOT EXISTS idx_leads_qualified
+        ON leads (lead_score DESC, date_added DESC, id DESC, website, phone)
+        WHERE {QUALIFIED_WHERE}
+    """)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_leads_date_added ON leads (date_added)")
+    cur.execute("ANALYZE leads")
+
+
+# One-query fallback for files that predate the lead_stats table
+_STATS_AGGREGATE = f"""
+SELECT COUNT(*)                                                AS total,
+       COUNT(*) FILTER (WHERE lead_score >= 18)                AS hot,
+       COUNT(*) FILTER (WHERE lead_score >= 12 AND lead_score < 18) AS warm
+FROM leads WHERE {QUALIFIED_WHERE}
+"""
+
+
+def _stats_delta(row: str, sign: str) -> str:
+    """SET clause adding (+) or removing (-) lead *row* (NEW / OLD) from lead_stats."""
+    qualified = QUALIFIED_WHERE.replace("website", f"{row}.website").replace("phone", f"{row}.phone")
+    score     = f"{row}.lead_score"
+    return f"""
+            total = total {sign} (CASE WHEN {qualified} THEN 1 ELSE 0 END),
+            hot   = hot   {sign} (CASE WHEN {qualified} AND {score} >= 18 THEN 1 ELSE 0 END),
+            warm  = warm  {sign} (CASE WHEN {qualified} AND {score} >= 12 AND {score} < 18
+                                  THEN 1 ELSE 0 END)"""
+
+
+def _daily_delta(row: str, sign: str) -> str:
+    return f"""
+        INSERT INTO lead_daily (day, added) VALUES ({row}.date_added, {sign}1)
+        ON CONFLICT(day) DO UPDATE SET added = added {sign} 1;"""
+
+
+def _m3_lead_stats(cur: sqlite3.Cursor) -> None:
+    # Dashboard counters kept current by triggers (the local twin of the
+    # Supabase lead_stats view): /api/stats reads one row instead of
+    # counting, and `version` moves on every change for ETags.
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS lead_stats (
+            id      INTEGER PRIMARY KEY CHECK (id = 1),
+            total   INTEGER NOT NULL DEFAULT 0,
+            hot     INTEGER NOT NULL DEFAULT 0,
+            warm    INTEGER NOT NULL DEFAULT 0,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS lead_daily (
+            day   TEXT PRIMARY KEY,
+            added INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    """)
+    total, hot, warm = cur.execute(_STATS_AGGREGATE).fetchone()
+    cur.execute("INSERT OR REPLACE INTO lead_stats (id, total, hot, warm) VALUES (1, ?, ?, ?)",
+                (total, hot, warm))
+    cur.execute("DELETE FROM lead_daily")
+    cur.execute("INSERT INTO lead_daily (day, added) "
+                "SELECT date_added, COUNT(*) FROM leads GROUP BY date_added")
+
+    cur.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_leads_stats_insert AFTER INSERT ON leads
+        BEGIN
+            UPDATE lead_stats SET {_stats_delta("NEW", "+")},
+                version = version + 1
+            WHERE id = 1;{_daily_delta("NEW", "+")}
+        END
+    """)
+    cur.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_leads_stats_delete AFTER DELETE ON leads
+        BEGIN
+            UPDATE lead_stats SET {_stats_delta("OLD", "-")},
+                version = version + 1
+            WHERE id = 1;{_daily_delta("OLD", "-")}
+        END
+    """)
+    # Only the columns the counters depend on; exported / call_status
+    # updates leave the stats (and their ETag) alone.
+    cur.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_leads_stats_update
+        AFTER UPDATE OF website, phone, lead_score, date_added ON leads
+        BEGIN
+            UPDATE lead_stats SET {_stats_delta("OLD", "-")},
+                version = version + 1
+            WHERE id = 1;
+            UPDATE lead_stats SET {_stats_delta("NEW", "+")}
+            WHERE id = 1;{_daily_delta("OLD", "-")}{_daily_delta("NEW", "+")}
+        END
+    """)
+
+
+_MIGRATIONS = [
+    _m1_sessions_metrics,       # 1
+    _m2_qualified_indexes,      # 2
+    _m3_lead_stats,             # 3
+]
+
+# -- Dashboard reads --------------------------------------------------
+
+
+def dashboard_stats(conn: sqlite3.Connection, today: str) -> dict:
+    """
+    Dashboard counters: qualified total / hot / warm and leads added on
+    *today*, plus `version` (bumped by every change, for ETags).  Reads the
+    trigger-maintained lead_stats row; a file that has not been migrated
+    yet falls back to one aggregate query and version None.
+    """
+    try:
+        row     = conn.execute("SELECT total, hot, warm, version FROM lead_stats WHERE id = 1").fetchone()
+        day     = conn.execute("SELECT added FROM lead_daily WHERE day = ?", (today,)).fetchone()
+        added   = day[0] if day else 0
+        version = row[3]
+    except sqlite3.OperationalError:        # no lead_stats table
+        row     = conn.execute(_STATS_AGGREGATE).fetchone()
+        added   = conn.execute("SELECT COUNT(*) FROM leads WHERE date_added = ?", (today,)).fetchone()[0]
+        version = None
+    return {"total": row[0], "hot": row[1], "warm": row[2],
+            "new_this_session": added, "version": version}
+
+
+# Every leads column in table order: what SELECT * (unpaged /api/leads) returns
+LEAD_COLUMNS = (
+    "id", "dedup_key", "niche", "name", "phone", "secondary_phone", "address", "city",
+    "state", "zip_code", "hours", "review_count", "rating", "gmb_link",
+    "website", "facebook", "instagram", "data_source", "date_added",
+    "lead_score", "pitch_notes", "additional_notes", "call_status",
+    "follow_up_date", "exported", "raw_json",
+)
+
+# /api/leads columns when no fields= is given (no raw_json / pitch_notes)
+LEAD_LIST_FIELDS = (
+    "id", "name", "phone", "niche", "address", "city", "state", "rating",
+    "review_count", "gmb_link", "lead_score", "date_added", "call_status",
+)
+
+_SCORE_TIERS = {"hot": (18, None), "warm": (12, 17), "medium": (7, 11)}
+
+
+class LeadPage:
+    """
+    One keyset page of qualified leads for /api/leads.
+
+    Rows come in dashboard order (lead_score DESC, date_added DESC, id DESC)
+    and the cursor is the last row's (lead_score, date_added, id), so page
+    N costs the same as page 1 and rows inserted meanwhile never shift a
+    page.  Built from request args:
+
+      cursor     opaque next_cursor from the previous page
+      limit      rows per page (default 100, at most 1000)
+      fields     comma-separated projection (default LEAD_LIST_FIELDS)
+      filter     hot / warm / medium / all (score tiers)
+      min_score, max_score, niche, city, status, q (name / phone / address)
+
+    Paging is opt-in: without cursor or limit the request gets the original
+    /api/leads contract — a bare JSON array of every matching lead with all
+    columns (fields= still narrows it).  Bad arguments raise ValueError.
+    """
+
+    DEFAULT_LIMIT = 100
+    MAX_LIMIT     = 1000
+
+    def __init__(self, args: Mapping[str, str]):
+        self.paged = "cursor" in args or "limit" in args
+        self.limit: Optional[int] = None
+        if self.paged:
+            self.limit = self._int(args, "limit", self.DEFAULT_LIMIT)
+            if not 1 <= self.limit <= self.MAX_LIMIT:
+                raise ValueError(f"limit must be between 1 and {self.MAX_LIMIT}")
+        self.fields = self._fields(
+            args.get("fields", ""), LEAD_LIST_FIELDS if self.paged else LEAD_COLUMNS
+        )
+        self.where  = [QUALIFIED_WHERE]
+        self.params: list = []
+
+        tier = args.get("filter", "all")
+        if tier != "all" and tier not in _SCORE_TIERS:
+            raise ValueError(f"unknown filter '{tier}'")
+        low, high = _SCORE_TIERS.get(tier, (None, None))
+        low  = self._int(args, "min_score", low)
+        high = self._int(args, "max_score", high)
+        if low is not None:
+            self._add("lead_score >= ?", low)
+        if high is not None:
+            self._add("lead_score <= ?", high)
+        if args.get("niche"):
+            self._add("niche = ?", args["niche"])
+        if args.get("city"):
+            self._add("city = ?", args["city"])
+        if "status" in args:
+            status = args["status"]
+            self._add("call_status = ?", "" if status == "new" else status)
+        if args.get("q"):
+            like = "%" + args["q"].replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            self.where.append("(name LIKE ? ESCAPE '\\' OR phone LIKE ? ESCAPE '\\' "
+                              "OR address LIKE ? ESCAPE '\\')")
+            self.params += [like, like, like]
+        if args.get("cursor"):
+            self._add("(lead_score, date_added, id) < (?, ?, ?)", *self._decode(args["cursor"]))
+
+    @property
+    def sql(self) -> str:
+        columns = dict.fromkeys(self.fields + ("lead_score", "date_added", "id"))
+        return (f"SELECT {', '.join(columns)} FROM leads WHERE {' AND '.join(self.where)} "
+                "ORDER BY lead_score DESC, date_added DESC, id DESC LIMIT ?")
+
+    def rows(self, conn: sqlite3.Connection) -> Iterator[dict]:
+        """Yield up to *limit* projected rows; next_cursor is set afterwards."""
+        self.next_cursor = None
+        # LIMIT -1 is SQLite for "no limit" (unpaged requests)
+        cur = conn.execute(self.sql, (*self.params, -1 if self.limit is None else self.limit + 1))
+        last = None
+        for n, row in enumerate(cur):
+            if n == self.limit:     # one extra row = there is a next page
+                self.next_cursor = self._encode(last)
+                break
+            last = row
+            yield {f: row[f] for f in self.fields}
+
+    def iter_json(self, conn: sqlite3.Connection) -> Iterator[str]:
+        """The page as JSON text chunks, one per row, so memory stays flat."""
+        yield '{"leads": [' if self.paged else "["
+        for n, lead in enumerate(self.rows(conn)):
+            yield ("," if n else "") + json.dumps(lead, ensure_ascii=False)
+        yield f'], "next_cursor": {json.dumps(self.next_cursor)}}}' if self.paged else "]"
+
+    # -- helpers
+
+    def _add(self, clause: str, *params) -> None:
+        self.where.append(clause)
+        self.params.extend(params)
+
+    @staticmethod
+    def _int(args: Mapping[str, str], name: str, default):
+        if args.get(name) in (None, ""):
+            return default
+        try:
+            return int(args[name])
+        except ValueError:
+            raise ValueError(f"{name} must be an integer") from None
+
+    @staticmethod
+    def _fields(spec: str, default: tuple) -> tuple:
+        if not spec:
+            return default
+        fields  = tuple(dict.fromkeys(f.strip() for f in spec.split(",") if f.strip()))
+        unknown = [f for f in fields if f not in LEAD_COLUMNS]
+        if unknown or not fields:
+            raise ValueError(f"unknown fields {unknown}; choose from {', '.join(LEAD_COLUMNS)}")
+        return fields
+
+    @staticmethod
+    def _encode(row: sqlite3.Row) -> str:
+        key = json.dumps([row["lead_score"], row["date_added"], row["id"]], separators=(",", ":"))
+        return base64.urlsafe_b64encode(key.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def _decode(cursor: str) -> list:
+        try:
+            key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+            score, day, lead_id = key
+            return [int(score), str(day), int(lead_id)]
+        except (ValueError, TypeError):
+            raise ValueError("invalid cursor") from None
+
+
+# Dashboard query shapes and the index each one must use (checked on open)
+_PLAN_CHECKS = {
+    "lead_list": (
+        LeadPage({"filter": "warm", "cursor": LeadPage._encode(
+            {"lead_score": 15, "date_added": "2000-01-01", "id": 1})}).sql,
+        (12, 17, 15, "2000-01-01", 1, 101), "idx_leads_qualified",
+    ),
+    "qualified_count": (
+        f"SELECT COUNT(*) FROM leads WHERE {QUALIFIED_WHERE} AND lead_score >= 18",
+        (), "idx_leads_qualified",
+    ),
+    "new_today": (
+        "SELECT COUNT(*) FROM leads WHERE date_added = ?",
+        ("2000-01-01",), "idx_leads_date_added",
+    ),
+}
+
 
 class SQLiteHandler:
     """
@@ -90,8 +426,9 @@ class SQLiteHandler:
     def __init__(self, config: dict):
         db_path = Path(config["database"]["path"])
         db_path.parent.mkdir(parents=True, exist_ok=True)
-        self.db_path    = str(db_path)
-        self.dedup_key  = config["database"].get("dedup_key", "name_city")
+        self.db_path      = str(db_path)
+        self.dedup_key    = config["database"].get("dedup_key", "name_city")
+        self.commit_every = int(config["database"].get("commit_every", 10_000))
         self._conn: Optional[sqlite3.Connection] = None
         self._session_id: Optional[int] = None
 
@@ -105,10 +442,9 @@ class SQLiteHandler:
         self.close()
 
     def open(self):
-        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        self._conn.row_factory = sqlite3.Row
-        self._conn.execute("PRAGMA journal_mode=WAL;")
+        self._conn = connect(self.db_path)     # WAL + tuned PRAGMA profile
         self._create_schema()
+        self.check_query_plans()
         logger.info(f"Database opened: {self.db_path}")
 
     def close(self):
@@ -126,6 +462,40 @@ class SQLiteHandler:
         for idx_sql in _CREATE_INDEXES:
             cur.execute(idx_sql)
         self._conn.commit()
+        self._migrate()
+
+    @property
+    def schema_version(self) -> int:
+        return self._conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def _migrate(self):
+        """Apply pending _MIGRATIONS, each in its own transaction."""
+        for version in range(self.schema_version + 1, len(_MIGRATIONS) + 1):
+            step = _MIGRATIONS[version - 1]
+            self._conn.execute("BEGIN")
+            try:
+                step(self._conn.cursor())
+                self._conn.execute(f"PRAGMA user_version = {version}")
+                self._conn.commit()
+            except sqlite3.Error:
+                self._conn.rollback()
+                raise
+            logger.info(f"Database migrated to v{version} ({step.__name__})")
+
+    def query_plan(self, sql: str, params: tuple = ()) -> list[str]:
+        """EXPLAIN QUERY PLAN detail lines for *sql*."""
+        return [row[3] for row in self._conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+    def check_query_plans(self) -> dict[str, bool]:
+        """Confirm each dashboard query shape uses its index; warn if not."""
+        results = {}
+        for name, (sql, params, index) in _PLAN_CHECKS.items():
+            plan = self.query_plan(sql, params)
+            results[name] = (any(index in line for line in plan)
+                             and not any("TEMP B-TREE" in line for line in plan))
+            if not results[name]:
+                logger.warning(f"Query '{name}' does not use {index} (or needs a sort): {' / '.join(plan)}")
+        return results
 
     # -- Session tracking ----------------------------------------------
 
@@ -156,7 +526,8 @@ class SQLiteHandler:
                    total_scraped  = ?,
                    new_leads      = ?,
                    duplicates     = ?,
-                   errors         = ?
+                   errors         = ?,
+                   metrics        = ?
                WHERE id = ?""",
             (
                 datetime.now().isoformat(),
@@ -164,6 +535,7 @@ class SQLiteHandler:
                 stats.get("new",        0),
                 stats.get("duplicates", 0),
                 stats.get("errors",     0),
+                json.dumps(stats.get("metrics") or {}),
                 self._session_id,
             ),
         )
@@ -177,77 +549,93 @@ class SQLiteHandler:
 
         Returns (True, dedup_key) if inserted, (False, dedup_key) if duplicate.
         """
-        key = self._make_dedup_key(lead)
-
+        row = self._lead_row(lead)
         try:
-            self._conn.execute(
-                """INSERT INTO leads (
-                       dedup_key, niche, name, phone, secondary_phone,
-                       address, city, state, zip_code, hours,
-                       review_count, rating, gmb_link, website,
-                       facebook, instagram, data_source, date_added,
-                       lead_score, pitch_notes, additional_notes,
-                       call_status, follow_up_date, raw_json
-                   ) VALUES (
-                       :dedup_key, :niche, :name, :phone, :secondary_phone,
-                       :address, :city, :state, :zip_code, :hours,
-                       :review_count, :rating, :gmb_link, :website,
-                       :facebook, :instagram, :data_source, :date_added,
-                       :lead_score, :pitch_notes, :additional_notes,
-                       :call_status, :follow_up_date, :raw_json
-                   )""",
-                {
-                    "dedup_key":       key,
-                    "niche":           lead.get("niche",            ""),
-                    "name":            lead.get("name",             ""),
-                    "phone":           lead.get("phone",            ""),
-                    "secondary_phone": lead.get("secondary_phone",  ""),
-                    "address":         lead.get("address",          ""),
-                    "city":            lead.get("city",             ""),
-                    "state":           lead.get("state",            ""),
-                    "zip_code":        lead.get("zip_code",         ""),
-                    "hours":           lead.get("hours",            ""),
-                    "review_count":    lead.get("review_count",     0),
-                    "rating":          str(lead.get("rating",       "")),
-                    "gmb_link":        lead.get("gmb_link",         ""),
-                    "website":         lead.get("website",          ""),
-                    "facebook":        lead.get("facebook",         ""),
-                    "instagram":       lead.get("instagram",        ""),
-                    "data_source":     lead.get("data_source",      "Google Maps"),
-                    "date_added":      lead.get("date_added",       datetime.now().strftime("%Y-%m-%d")),
-                    "lead_score":      lead.get("lead_score",       0),
-                    "pitch_notes":     lead.get("pitch_notes",      ""),
-                    "additional_notes":lead.get("additional_notes", ""),
-                    "call_status":     "",
-                    "follow_up_date":  "",
-                    "raw_json":        json.dumps(lead),
-                },
-            )
+            self._conn.execute(_INSERT_LEAD, row)
             self._conn.commit()
-            return (True, key)
+            return (True, row["dedup_key"])
 
         except sqlite3.IntegrityError:
             # Duplicate -- unique constraint on dedup_key
-            return (False, key)
+            return (False, row["dedup_key"])
 
-    def bulk_insert(self, leads: list[dict]) -> dict:
+    def bulk_insert(self, leads: list[dict], commit_every: Optional[int] = None) -> dict:
         """
         Insert multiple leads.  Returns stats dict with counts.
+
+        Each group of *commit_every* leads (database.commit_every, default
+        10 000) is one transaction and one executemany; duplicates are
+        skipped by ON CONFLICT(dedup_key) DO NOTHING and counted from
+        the rowcount, so there is one commit per group instead of one
+        fsync per lead.  A group that fails as a whole (e.g. a NOT NULL
+        violation) is rolled back and retried row by row so one bad lead
+        only costs itself.
         """
         stats = {"new": 0, "duplicates": 0, "errors": 0}
-        for lead in leads:
-            try:
-                inserted, _ = self.insert_lead(lead)
-                if inserted:
-                    stats["new"] += 1
-                else:
-                    stats["duplicates"] += 1
-            except Exception as exc:
-                logger.error(f"DB insert error for '{lead.get('name', '?')}': {exc}")
-                stats["errors"] += 1
+        step  = max(1, commit_every or self.commit_every)
+        with metrics.timer("exporter_seconds", exporter="sqlite", op="bulk_insert"):
+            for start in range(0, len(leads), step):
+                rows = []
+                for lead in leads[start:start + step]:
+                    try:
+                        rows.append(self._lead_row(lead))
+                    except Exception as exc:
+                        logger.error(f"DB insert error for '{lead.get('name', '?')}': {exc}")
+                        stats["errors"] += 1
+                if rows:
+                    self._insert_rows(rows, stats)
+        for result, key in (("new", "new"), ("duplicate", "duplicates"), ("error", "errors")):
+            metrics.inc("exporter_rows_total", stats[key], exporter="sqlite", result=result)
         return stats
 
-    # -- Queries -------------------------------------------------------
+    def _insert_rows(self, rows: list[dict], stats: dict) -> None:
+        """One transaction for *rows*; falls back to per-row inserts on failure."""
+        failed = 0
+        try:
+            with self._conn:
+                new = self._conn.executemany(_INSERT_LEAD_IGNORE, rows).rowcount
+        except sqlite3.Error as exc:
+            logger.warning(f"Bulk insert of {len(rows)} leads failed ({exc}) -- retrying row by row")
+            new = 0
+            with self._conn:
+                for row in rows:
+                    try:
+                        new += self._conn.execute(_INSERT_LEAD_IGNORE, row).rowcount
+                    except sqlite3.Error as row_exc:
+                        logger.error(f"DB insert error for '{row['name'] or '?'}': {row_exc}")
+                        failed += 1
+        stats["new"]        += new
+        stats["duplicates"] += len(rows) - new - failed
+        stats["errors"]     += failed
+
+    def _lead_row(self, lead: dict) -> dict:
+        """Named parameters for _INSERT_LEAD from a canonical lead dict."""
+        return {
+            "dedup_key":       self._make_dedup_key(lead),
+            "niche":           lead.get("niche",            ""),
+            "name":            lead.get("name",             ""),
+            "phone":           lead.get("phone",            ""),
+            "secondary_phone": lead.get("secondary_phone",  ""),
+            "address":         lead.get("address",          ""),
+            "city":            lead.get("city",             ""),
+            "state":           lead.get("state",            ""),
+            "zip_code":        lead.get("zip_code",         ""),
+            "hours":           lead.get("hours",            ""),
+            "review_count":    lead.get("review_count",     0),
+            "rating":          str(lead.get("rating",       "")),
+            "gmb_link":        lead.get("gmb_link",         ""),
+            "website":         lead.get("website",          ""),
+            "facebook":        lead.get("facebook",         ""),
+            "instagram":       lead.get("instagram",        ""),
+            "data_source":     lead.get("data_source",      "Google Maps"),
+            "date_added":      lead.get("date_added",       datetime.now().strftime("%Y-%m-%d")),
+            "lead_score":      lead.get("lead_score",       0),
+            "pitch_notes":     lead.get("pitch_notes",      ""),
+            "additional_notes":lead.get("additional_notes", ""),
+            "call_status":     "",
+            "follow_up_date":  "",
+            "raw_json":        json.dumps(lead),
+        }
 
     def get_all_leads(self, min_score: int = 0) -> list[dict]:
         """Return all leads with score >= *min_score*, sorted by niche then score."""
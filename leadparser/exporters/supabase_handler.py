@@ -19,6 +19,8 @@ from typing import Optional
 
 from supabase import create_client, Client
 
+from utils.metrics import metrics
+
 logger = logging.getLogger("leadparser.supabase")
 
 
@@ -84,7 +86,20 @@ class SupabaseHandler:
         return session_id
 
     def end_session(self, stats: dict):
-        logger.info(f"Session complete | stats: {stats}")
+        """Log the run; store its metrics summary on the scraper_jobs row, if queued."""
+        summary = {k: v for k, v in stats.items() if k != "metrics"}
+        logger.info(f"Session complete | stats: {summary}")
+        job_id = stats.get("job_id")
+        if not job_id or not stats.get("metrics"):
+            return
+        try:
+            (self.client.table("scraper_jobs")
+                 .update({"metrics": stats["metrics"]})
+                 .eq("id", job_id)
+                 .execute())
+        except Exception as exc:
+            # Column missing until supabase/add_job_metrics.sql has been run
+            logger.warning(f"Could not store job metrics: {exc}")
 
     # ── Core insert ────────────────────────────────────────────────────────
 
@@ -109,8 +124,17 @@ class SupabaseHandler:
                 stats["errors"] += 1
 
         if not rows:
+            metrics.inc("exporter_rows_total", stats["errors"], exporter="supabase", result="error")
             return stats
 
+        with metrics.timer("exporter_seconds", exporter="supabase", op="bulk_insert"):
+            self._upsert_rows(rows, stats)
+        for result, key in (("new", "new"), ("duplicate", "duplicates"), ("error", "errors")):
+            metrics.inc("exporter_rows_total", stats[key], exporter="supabase", result=result)
+        return stats
+
+    def _upsert_rows(self, rows: list[dict], stats: dict) -> None:
+        """Upsert prepared rows, folding per-chunk results into *stats*."""
         # Batch upsert in chunks of 100
         CHUNK = 100
         for i in range(0, len(rows), CHUNK):
@@ -133,8 +157,6 @@ class SupabaseHandler:
                 logger.error(f"Bulk insert chunk failed: {exc}")
                 stats["errors"] += len(chunk)
 
-        return stats
-
     # ── Compatibility shims (used in main.py export paths) ─────────────────
 
     def get_all_leads(self, min_score: int = 0) -> list[dict]:
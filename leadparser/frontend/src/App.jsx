@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { API_BASE_URL } from './config';
 
 // Styles
@@ -211,6 +211,8 @@ const styles = {
 function App() {
   const [activeTab, setActiveTab] = useState('dashboard');
   const [leads, setLeads] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const pagedRef = useRef(false);   // "Load more" used: polling leaves the list alone
   const [stats, setStats] = useState({ total: 0, hot: 0, warm: 0, new_this_session: 0 });
   const [filter, setFilter] = useState('all');
   const [loading, setLoading] = useState(false);
@@ -230,20 +232,27 @@ function App() {
     message: 'Ready'
   });
 
+  // Fetch one page of leads (the first, or the one after `cursor`)
+  const fetchLeads = async (cursor = null) => {
+    const params = new URLSearchParams({ filter, limit: '100' });
+    if (cursor) params.set('cursor', cursor);
+    const res = await fetch(`${API_BASE_URL}/api/leads?${params}`);
+    if (!res.ok) throw new Error('Failed to fetch leads');
+    const page = await res.json();
+    setLeads(prev => cursor ? [...prev, ...page.leads] : page.leads);
+    setNextCursor(page.next_cursor);
+  };
+
   // Fetch leads and stats
   const fetchData = async () => {
     try {
-      const [leadsRes, statsRes] = await Promise.all([
-        fetch(`${API_BASE_URL}/api/leads?filter=${filter}`),
+      const [, statsRes] = await Promise.all([
+        pagedRef.current ? null : fetchLeads(),
         fetch(`${API_BASE_URL}/api/stats`)
       ]);
       
-      if (!leadsRes.ok) throw new Error('Failed to fetch leads');
-      
-      const leadsData = await leadsRes.json();
       const statsData = await statsRes.json();
       
-      setLeads(leadsData);
       setStats(statsData);
       setError(null);
     } catch (err) {
@@ -251,6 +260,15 @@ function App() {
     }
   };
 
+  const loadMore = async () => {
+    pagedRef.current = true;
+    try {
+      await fetchLeads(nextCursor);
+    } catch (err) {
+      setError('Cannot connect to API server. Make sure `python api_server.py` is running on your PC.');
+    }
+  };
+
   // Check scraping status
   const checkStatus = async () => {
     try {
@@ -268,6 +286,7 @@ function App() {
   };
 
   useEffect(() => {
+    pagedRef.current = false;
     fetchData();
     const interval = setInterval(fetchData, 5000);
     return () => clearInterval(interval);
@@ -439,6 +458,11 @@ function App() {
             })}
           </tbody>
         </table>
+        {nextCursor && (
+          <button style={{...styles.filterBtn, display: 'block', margin: '16px auto 0'}} onClick={loadMore}>
+            Load more
+          </button>
+        )}
       </div>
     </>
   );
@@ -24,6 +24,9 @@ Full usage
   python main.py --no-csv                       # Skip local CSV export
   python main.py --dry-run                      # Scrape but don't write to DB
   python main.py --serve                        # Launch dashboard after run
+  python main.py --record fixtures/dallas       # Save every HTTP response
+  python main.py --replay fixtures/dallas       # Re-run offline from a recording
+  python main.py --metrics-file data/run.prom   # Prometheus-format run metrics
 """
 
 import argparse
@@ -35,6 +38,7 @@ import os
 import random
 import sys
 import time
+from contextlib import aclosing
 from datetime import datetime
 from pathlib import Path
 from typing import Callable
@@ -47,8 +51,11 @@ from colorama import init as colorama_init, Fore, Style
 # GoogleMapsScraper (Selenium) kept as legacy fallback; default is Playwright.
 # Parser selection is driven by config["scraping"]["parser"] at runtime.
 from scrapers.google_maps       import GoogleMapsScraper
+from scrapers.streaming         import is_async_scraper, iter_scraper, scraper_session
 from exporters.supabase_handler import SupabaseHandler
-from utils.rate_limiter         import RateLimiter
+from utils.rate_limiter         import DEFAULT_RATE_LIMITS, RateLimiter
+from utils.http_fixtures        import open_fixtures
+from utils.metrics              import metrics
 from utils.proxy_manager        import ProxyManager
 from utils.phone_validator      import PhoneValidator
 from utils.address_parser       import AddressParser
@@ -291,8 +298,8 @@ def build_lead(
     return lead
 
 
-def apply_filters(leads: list[dict], config: dict) -> list[dict]:
-    """Apply config.yaml filter criteria. Returns passing leads."""
+def passes_filters(lead: dict, config: dict) -> bool:
+    """True if *lead* meets the config.yaml filter criteria."""
     f = config.get("filters", {})
     min_reviews      = f.get("min_reviews",          0)
     max_reviews      = f.get("max_reviews",          9999)
@@ -303,28 +310,318 @@ def apply_filters(leads: list[dict], config: dict) -> list[dict]:
     require_phone    = f.get("require_phone",        False)
     min_score        = f.get("min_lead_score",       0)
 
-    filtered = []
-    for lead in leads:
-        reviews = int(lead.get("review_count", 0) or 0)
+    reviews = int(lead.get("review_count", 0) or 0)
+    try:
+        rating = float(lead.get("rating", 0.0) or 0.0)
+    except (TypeError, ValueError):
+        rating = 0.0
+    score = int(lead.get("lead_score", 0) or 0)
+    phone = (lead.get("phone") or "").strip()
+
+    if reviews < min_reviews:                                return False
+    if reviews > max_reviews:                                return False
+    if rating and rating < min_rating:                       return False
+    if rating and rating > max_rating:                       return False
+    if exclude_with_web and lead.get("website"):              return False
+    if require_website  and not lead.get("website"):          return False
+    if require_phone and (not phone or phone == "NOT FOUND"): return False
+    if score < min_score:                                    return False
+    return True
+
+
+def apply_filters(leads: list[dict], config: dict) -> list[dict]:
+    """Apply config.yaml filter criteria. Returns passing leads."""
+    return [lead for lead in leads if passes_filters(lead, config)]
+
+
+class LeadStream:
+    """
+    Streaming build → filter → batch chain for one pipeline run.
+
+    Raw scraped dicts go in one at a time via add(); each is deduplicated
+    by GMB link, built with build_lead() and checked with passes_filters().
+    Passing leads are buffered and handed out by take_batch() in groups of
+    *batch_size* for upsert.  Once *target* leads have passed, full is
+    True and the caller stops the scrape.
+    """
+
+    def __init__(
+        self,
+        config:     dict,
+        target:     "int | None",
+        batch_size: int,
+        scorer:     LeadScorer,
+        pitcher:    PitchEngine,
+        validator:  PhoneValidator,
+        parser:     AddressParser,
+    ):
+        self.config     = config
+        self.target     = target
+        self.batch_size = max(1, batch_size)
+        self._builders  = (scorer, pitcher, validator, parser)
+        self.logger     = logging.getLogger("leadparser.main")
+        self.seen_gmb:  set[str]   = set()
+        self._buffer:   list[dict] = []
+        self.raw_total  = 0   # unique leads built (pre-filter)
+        self.passed     = 0   # leads that passed filters
+        self.errors     = 0
+
+    @property
+    def full(self) -> bool:
+        return bool(self.target) and self.passed >= self.target
+
+    def add(self, raw: dict, niche: str, location: dict) -> bool:
+        """Build + filter one raw lead. Returns True if it was accepted."""
+        if self.full:
+            return False
+        gmb = (raw.get("gmb_link") or "").strip()
+        if gmb in self.seen_gmb:
+            metrics.inc("leads_total", stage="duplicate")
+            return False   # already processed in an earlier pass
+        self.seen_gmb.add(gmb)
+        metrics.inc("leads_total", stage="raw")
         try:
-            rating = float(lead.get("rating", 0.0) or 0.0)
-        except (TypeError, ValueError):
-            rating = 0.0
-        score = int(lead.get("lead_score", 0) or 0)
-        phone = (lead.get("phone") or "").strip()
+            with metrics.timer("build_lead_seconds"):
+                lead = build_lead(raw, niche, self.config, *self._builders)
+        except Exception as exc:
+            self.logger.warning(f"Lead build failed: {exc}", exc_info=True)
+            metrics.inc("leads_total", stage="build_error")
+            self.errors += 1
+            return False
+        if not lead:
+            metrics.inc("leads_total", stage="no_phone")
+            return False
+
+        # Tag with location for tracking
+        lead["_source_city"] = location["city"]
+        self.raw_total += 1
+        with metrics.timer("filter_seconds"):
+            passed = passes_filters(lead, self.config)
+        metrics.inc("leads_total", stage="passed" if passed else "filtered")
+        if not passed:
+            return False
+        self._buffer.append(lead)
+        self.passed += 1
+        return True
+
+    def take_batch(self, force: bool = False) -> list[dict]:
+        """Return the buffered leads once batch_size is reached (or always, if *force*)."""
+        if self._buffer and (force or len(self._buffer) >= self.batch_size):
+            batch, self._buffer = self._buffer, []
+            return batch
+        return []
+
+
+def _upsert_batch(db, batch: list[dict], run_stats: dict, logger: logging.Logger) -> None:
+    """Upsert one batch of filtered leads and fold the result into run_stats."""
+    if not batch:
+        return
+    try:
+        insert_stats            = db.bulk_insert(batch)
+        run_stats["new"]        += insert_stats["new"]
+        run_stats["duplicates"] += insert_stats["duplicates"]
+        run_stats["errors"]     += insert_stats["errors"]
+        logger.debug(
+            f"Upserted batch of {len(batch)}: {insert_stats['new']} new, "
+            f"{insert_stats['duplicates']} dupes, {insert_stats['errors']} errors"
+        )
+    except Exception as exc:
+        logger.error(f"Supabase insert failed: {exc}", exc_info=True)
+        run_stats["errors"] += 1
+
+
+async def _stream_combination(
+    scraper,
+    niche:       str,
+    location:    dict,
+    stream:      LeadStream,
+    flush:       Callable,
+    cap:         "int | None",
+    on_progress: Callable,
+    max_results: "int | None" = None,
+) -> tuple[int, int]:
+    """
+    Drain one niche+location scrape through *stream*.
+
+    Full batches go to the async *flush* callable (which upserts in a
+    worker thread) so the scrape keeps running meanwhile.  Stops (closing
+    the scraper's iterator, which cancels its in-flight fetches) once the
+    run target is met or this combination has contributed *cap* filtered
+    leads.
+
+    Returns (raw leads scraped, leads accepted).
+    """
+    scraped = accepted = 0
+    async with aclosing(
+        iter_scraper(scraper, niche, location, on_progress, max_results)
+    ) as leads:
+        async for raw in leads:
+            scraped += 1
+            if stream.add(raw, niche, location):
+                accepted += 1
+            batch = stream.take_batch()
+            if batch:
+                await flush(batch)
+            if stream.full or (cap and accepted >= cap):
+                break
+    return scraped, accepted
+
+
+MAX_PASSES = 3  # up to 3 passes; each doubles the raw-results ceiling
+
+
+async def _scrape_session(
+    scraper,
+    niches:                 list[str],
+    locations:              list[dict],
+    stream:                 LeadStream,
+    db,
+    run_stats:              dict,
+    config:                 dict,
+    target_count:           "int | None",
+    per_combination_target: "int | None",
+    logger:                 logging.Logger,
+) -> None:
+    """
+    Phase 1 on a single event loop.
+
+    The scraper's session runtime (one pooled HTTP client or one Chromium)
+    is opened once and reused by every niche×city combination and every
+    retry pass.  Within a pass, combinations run concurrently — up to
+    scraping.combination_concurrency at a time — and share the scraper's
+    own fetch budget.  Once the run target is met, the combinations still
+    in flight are cancelled.
+    """
+    combos   = [(location, niche) for location in locations for niche in niches]
+    total    = len(combos)
+    parallel = config["scraping"].get("combination_concurrency", 3)
+    if not is_async_scraper(scraper):
+        parallel = 1   # legacy Selenium: one driver, one combination at a time
+    slots       = asyncio.Semaphore(max(1, parallel))
+    upsert_lock = asyncio.Lock()
+    base_raw    = config["scraping"].get("max_results_per_niche", 100)
+    remainder   = (target_count - per_combination_target * total) if per_combination_target else 0
+
+    upserts: set[asyncio.Task] = set()
+
+    async def upsert(batch: list[dict]) -> None:
+        async with upsert_lock:
+            await asyncio.to_thread(_upsert_batch, db, batch, run_stats, logger)
+
+    async def flush(batch: list[dict]) -> None:
+        # Shielded: a batch already taken from the stream must still be
+        # saved when its combination is cancelled at the target.
+        if batch:
+            task = asyncio.create_task(upsert(batch))
+            upserts.add(task)
+            task.add_done_callback(upserts.discard)
+            await asyncio.shield(task)
+
+    async def run_combination(idx: int, location: dict, niche: str, pass_num: int) -> None:
+        async with slots:
+            if stream.full:
+                return
+
+            # Calculate per-combination target if distributing
+            current_target = None
+            ceiling        = base_raw
+            if per_combination_target:
+                # First 'remainder' combinations get +1
+                current_target = per_combination_target + (1 if idx <= remainder else 0)
+                # Adjust raw ceiling for this combination
+                ceiling = max(20, min(current_target * 10, 500))
+            if pass_num > 0:
+                # Increase raw ceiling 2× per retry pass
+                ceiling = min(ceiling * 2 ** pass_num, 2000)
+
+            print(
+                f"  [{idx}/{total}] "
+                f"{Fore.CYAN}{niche}{Style.RESET_ALL} "
+                f"in {location['city']}, {location['state']}"
+                + (f" (target: ~{current_target})" if current_target else "")
+            )
+
+            # Per-listing progress
+            _progress_pct = 10 + int((idx / total) * 60)
+
+            def _listing_progress(current: int, total: int, _pct=_progress_pct) -> None:
+                update_job_progress(_pct)
+
+            # First pass spreads the target across combinations;
+            # retry passes let any combination fill the shortfall.
+            cap = current_target if pass_num == 0 else None
+            try:
+                scraped, accepted = await _stream_combination(
+                    scraper, niche, location, stream, flush,
+                    cap, _listing_progress, max_results=ceiling,
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.error(f"Scraping failed for '{niche}' in {location['city']}: {exc}", exc_info=True)
+                run_stats["errors"] += 1
+                return
+            finally:
+                await flush(stream.take_batch(force=True))
+
+            logger.info(
+                f"  -> {scraped} raw scraped, "
+                f"{accepted} new leads passed filters for '{niche}' in {location['city']}; "
+                f"running total: {stream.passed}"
+                + (f"/{target_count}" if target_count else "")
+            )
+
+    async with scraper_session(scraper):
+        for pass_num in range(MAX_PASSES):
+            if pass_num > 0:
+                logger.info(
+                    f"  Retry pass {pass_num + 1}/{MAX_PASSES}: "
+                    f"doubling raw ceilings to collect more matches"
+                )
+                print(
+                    f"\n{Fore.YELLOW}  Retry pass {pass_num + 1}: "
+                    f"collecting up to {2 ** pass_num}× more raw results...{Style.RESET_ALL}"
+                )
 
-        if reviews < min_reviews:                                continue
-        if reviews > max_reviews:                                continue
-        if rating and rating < min_rating:                       continue
-        if rating and rating > max_rating:                       continue
-        if exclude_with_web and lead.get("website"):              continue
-        if require_website  and not lead.get("website"):          continue
-        if require_phone and (not phone or phone == "NOT FOUND"): continue
-        if score < min_score:                                    continue
+            tasks = [
+                asyncio.create_task(run_combination(idx, location, niche, pass_num))
+                for idx, (location, niche) in enumerate(combos, 1)
+            ]
+            # Target met → cancel the combinations still scraping
+            for finished in asyncio.as_completed(tasks):
+                await finished
+                if stream.full:
+                    for t in tasks:
+                        t.cancel()
+                    break
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await asyncio.gather(*upserts)
 
-        filtered.append(lead)
+            # ── Check after each full pass whether target is met ──
+            have = stream.passed
+            need = target_count or 0
 
-    return filtered
+            if need and have < need:
+                logger.info(
+                    f"  Pass {pass_num + 1} result: {have}/{need} leads pass filters"
+                )
+                if pass_num < MAX_PASSES - 1:
+                    continue   # do another pass with higher ceiling
+                logger.warning(
+                    f"Exhausted {MAX_PASSES} passes — "
+                    f"{have}/{need} filtered leads available."
+                )
+                print(
+                    f"{Fore.YELLOW}Note:{Style.RESET_ALL} "
+                    f"Only {Fore.GREEN}{have}{Style.RESET_ALL}/{need} leads "
+                    f"available after {MAX_PASSES} passes — "
+                    f"Google Maps may be exhausted for these niches/cities."
+                )
+            else:
+                # Target met (or no target) — stop early
+                if need:
+                    logger.info(f"  Target reached: {have}/{need} leads pass filters")
+                break
 
 
 def print_banner():
@@ -353,6 +650,13 @@ CSV_KEYS = [
 
 
 def export_csv(leads: list[dict], output_dir: str = "data") -> str:
+    with metrics.timer("exporter_seconds", exporter="csv", op="export"):
+        path = _write_csv(leads, output_dir)
+    metrics.inc("exporter_rows_total", len(leads), exporter="csv", result="written")
+    return path
+
+
+def _write_csv(leads: list[dict], output_dir: str) -> str:
     Path(output_dir).mkdir(parents=True, exist_ok=True)
     timestamp   = datetime.now().strftime("%Y%m%d_%H%M%S")
     dated_path  = Path(output_dir) / f"leads_{timestamp}.csv"
@@ -394,13 +698,18 @@ def print_stats(stats: dict, dashboard_url: str = None, csv_path: str = None):
 def run_pipeline(config: dict, args: argparse.Namespace, logger: logging.Logger):
     """
     Full lead-generation pipeline:
-      1. Scrape Google Maps (over-collect to guarantee target count)
-      2. Supplement missing phones from Yelp / Yellow Pages / BBB
-      3. Score + filter leads
-      4. Trim to --limit target (guarantees N filtered leads)
-      5. Upsert into Supabase
-      6. Optional CSV export
+      1. Scrape Google Maps, streaming each raw lead as it is parsed
+      2. Build + score + filter every lead the moment it arrives
+      3. Upsert passing leads into Supabase in batches while scraping runs
+      4. Stop the scrape as soon as --limit filtered leads exist
+         (retry passes with a higher raw ceiling if the target is missed)
+      5. Optional CSV export
+
+    Phase timings and scraper / exporter counters go to utils.metrics;
+    the summary is stored with the session record (and written as
+    Prometheus text to metrics.prometheus_file, if set).
     """
+    metrics.reset()
     rate_limiter = RateLimiter(config)
     proxy_mgr    = ProxyManager(config)
     validator    = PhoneValidator()
@@ -410,7 +719,8 @@ def run_pipeline(config: dict, args: argparse.Namespace, logger: logging.Logger)
 
     # Always refresh proxy pool — proxies are now always enabled by default.
     # ProxyManager.refresh() is a no-op when enabled=False (legacy config support).
-    proxy_mgr.refresh()
+    with metrics.timer("phase_seconds", phase="proxy_refresh"):
+        proxy_mgr.refresh()
 
     # Support comma-separated niches from CLI (e.g. --niche "plumbers,electricians")
     if args.niche:
@@ -463,6 +773,7 @@ def run_pipeline(config: dict, args: argparse.Namespace, logger: logging.Logger)
         "combinations": total_combinations,
         "raw_total": 0, "total": 0,
         "new": 0, "duplicates": 0, "errors": 0,
+        "job_id": getattr(args, "job_id", None),
     }
 
     update_job_progress(5)
@@ -493,185 +804,65 @@ def run_pipeline(config: dict, args: argparse.Namespace, logger: logging.Logger)
         if hasattr(scraper, "__enter__"):
             scraper.__enter__()
 
-        # seen_gmb: dedup across retry passes so we never count a lead twice
-        seen_gmb: set[str] = set()
-        raw_bucket: list[dict] = []   # all unique pre-filter leads accumulated so far
-        all_leads: list[dict] = []
-
-        MAX_PASSES = 3  # up to 3 passes; each doubles the raw-results ceiling
+        # One stream for the whole run: dedups across retry passes (seen_gmb),
+        # filters on arrival and batches passing leads for upsert.
+        stream = LeadStream(
+            config, target_count,
+            config["scraping"].get("upsert_batch_size", 50),
+            scorer, pitcher, validator, addr_parser,
+        )
 
         try:
-            combination_idx = 0
-            for pass_num in range(MAX_PASSES):
-                if pass_num > 0:
-                    # Increase raw ceiling 2× for the retry
-                    new_raw = min(
-                        config["scraping"]["max_results_per_niche"] * 2, 2000
-                    )
-                    config["scraping"]["max_results_per_niche"] = new_raw
-                    logger.info(
-                        f"  Retry pass {pass_num + 1}/{MAX_PASSES}: "
-                        f"raising raw ceiling to {new_raw} to collect more matches"
-                    )
-                    print(
-                        f"\n{Fore.YELLOW}  Retry pass {pass_num + 1}: "
-                        f"collecting up to {new_raw} raw results...{Style.RESET_ALL}"
-                    )
-
-                # Iterate over all niche + location combinations
-                for loc_i, location in enumerate(locations):
-                    for niche_i, niche in enumerate(niches):
-                        combination_idx += 1
-                        
-                        # Calculate per-combination target if distributing
-                        current_target = None
-                        if per_combination_target:
-                            # First 'remainder' combinations get +1
-                            extra = 1 if combination_idx <= (target_count - per_combination_target * total_combinations) else 0
-                            current_target = per_combination_target + extra
-                            # Adjust raw ceiling for this combination
-                            config["scraping"]["max_results_per_niche"] = max(20, min(current_target * 10, 500))
-                        
-                        print(
-                            f"  [{combination_idx}/{total_combinations}] "
-                            f"{Fore.CYAN}{niche}{Style.RESET_ALL} "
-                            f"in {location['city']}, {location['state']}"
-                            + (f" (target: ~{current_target})" if current_target else "")
-                        )
-
-                        # Per-listing progress
-                        _progress_pct = 10 + int((combination_idx / total_combinations) * 60)
-
-                        def _listing_progress(current: int, total: int,
-                                              _pct=_progress_pct) -> None:
-                            update_job_progress(_pct)
-
-                        try:
-                            raw_leads = scraper.scrape_niche(
-                                niche, location, on_progress=_listing_progress
-                            )
-                        except Exception as exc:
-                            logger.error(f"Scraping failed for '{niche}' in {location['city']}: {exc}", exc_info=True)
-                            run_stats["errors"] += 1
-                            continue
-
-                        new_this_pass = 0
-                        for raw in raw_leads:
-                            gmb = (raw.get("gmb_link") or "").strip()
-                            if gmb in seen_gmb:
-                                continue   # already processed in an earlier pass
-                            seen_gmb.add(gmb)
-                            try:
-                                lead = build_lead(
-                                    raw, niche, config,
-                                    scorer, pitcher, validator, addr_parser
-                                )
-                                if lead:
-                                    # Tag with location for tracking
-                                    lead['_source_city'] = location['city']
-                                    raw_bucket.append(lead)
-                                    run_stats["raw_total"] += 1
-                                    new_this_pass += 1
-                            except Exception as exc:
-                                logger.warning(f"Lead build failed: {exc}", exc_info=True)
-                                run_stats["errors"] += 1
-
-                        logger.info(
-                            f"  -> {len(raw_leads)} raw scraped, "
-                            f"{new_this_pass} new unique leads for '{niche}' in {location['city']}; "
-                            f"running total: {run_stats['raw_total']}"
-                        )
-
-                # ── Check after each full pass whether target is met ──
-                filtered_so_far = apply_filters(raw_bucket, config)
-                have  = len(filtered_so_far)
-                need  = target_count or 0
-
-                if need and have < need:
-                    logger.info(
-                        f"  Pass {pass_num + 1} result: {have}/{need} leads pass filters"
-                    )
-                    if pass_num < MAX_PASSES - 1:
-                        continue   # do another pass with higher ceiling
-                    else:
-                        logger.warning(
-                            f"Exhausted {MAX_PASSES} passes — "
-                            f"{have}/{need} filtered leads available."
-                        )
-                        print(
-                            f"{Fore.YELLOW}Note:{Style.RESET_ALL} "
-                            f"Only {Fore.GREEN}{have}{Style.RESET_ALL}/{need} leads "
-                            f"available after {MAX_PASSES} passes — "
-                            f"Google Maps may be exhausted for these niches/cities."
-                        )
-                else:
-                    # Target met (or no target) — stop early
-                    if need:
-                        logger.info(f"  Target reached: {have}/{need} leads pass filters")
-                    break
-
-            # Collapse to final filtered set
-            all_leads = apply_filters(raw_bucket, config)
-
+            with metrics.timer("phase_seconds", phase="scrape"):
+                asyncio.run(_scrape_session(
+                    scraper, niches, locations, stream, db, run_stats,
+                    config, target_count, per_combination_target, logger,
+                ))
         finally:
+            _upsert_batch(db, stream.take_batch(force=True), run_stats, logger)
             if hasattr(scraper, "__exit__"):
                 scraper.__exit__(None, None, None)
 
-        # ── Phase 3: Filter ────────────────────────────────────────────
-        update_job_progress(75)
-        before_filter = run_stats["raw_total"]
-        logger.info(f"Filters applied: {before_filter} raw -> {len(all_leads)} passed")
-        print(
-            f"\n{Fore.YELLOW}Phase 3: Filtering...{Style.RESET_ALL} "
-            f"{before_filter} raw -> {Fore.GREEN}{len(all_leads)}{Style.RESET_ALL} passed"
-        )
+        run_stats["raw_total"] = stream.raw_total
+        run_stats["total"]     = stream.passed
+        run_stats["errors"]   += stream.errors
 
-        # ── Phase 4: Trim to target count ─────────────────────────────
+        # ── Summary: filter + upsert happened while scraping ──────────
         update_job_progress(85)
-        if target_count:
-            if len(all_leads) > target_count:
-                all_leads = all_leads[:target_count]
-                logger.info(f"Trimmed to target: {target_count} leads")
-                print(
-                    f"{Fore.YELLOW}Trimming to target:{Style.RESET_ALL} "
-                    f"keeping {Fore.GREEN}{target_count}{Style.RESET_ALL}"
-                )
-
-        run_stats["total"] = len(all_leads)
-
-        # ── Phase 5: Upsert into Supabase ─────────────────────────────
-        print(f"\n{Fore.YELLOW}Saving to Supabase...{Style.RESET_ALL}")
-        update_job_progress(88)
-        try:
-            insert_stats            = db.bulk_insert(all_leads)
-            run_stats["new"]        = insert_stats["new"]
-            run_stats["duplicates"] = insert_stats["duplicates"]
-            run_stats["errors"]    += insert_stats["errors"]
-            logger.info(
-                f"Supabase insert: {insert_stats['new']} new, "
-                f"{insert_stats['duplicates']} dupes, "
-                f"{insert_stats['errors']} errors"
-            )
-        except Exception as exc:
-            logger.error(f"Supabase insert failed: {exc}", exc_info=True)
-            run_stats["errors"] += 1
+        logger.info(
+            f"Filters applied: {stream.raw_total} raw -> {stream.passed} passed; "
+            f"Supabase: {run_stats['new']} new, {run_stats['duplicates']} dupes"
+        )
+        print(
+            f"\n{Fore.YELLOW}Filtered + saved while scraping:{Style.RESET_ALL} "
+            f"{stream.raw_total} raw -> {Fore.GREEN}{stream.passed}{Style.RESET_ALL} passed, "
+            f"{run_stats['new']} new in Supabase"
+        )
 
         # ── Phase 6: Optional CSV export ──────────────────────────────
         update_job_progress(95)
         if not args.no_csv:
             try:
-                min_score_val = config["filters"].get("min_lead_score", 0)
-                all_db_leads  = db.get_all_leads(min_score=min_score_val)
-                csv_path      = export_csv(all_db_leads)
+                with metrics.timer("phase_seconds", phase="csv_export"):
+                    min_score_val = config["filters"].get("min_lead_score", 0)
+                    all_db_leads  = db.get_all_leads(min_score=min_score_val)
+                    csv_path      = export_csv(all_db_leads)
                 run_stats["csv_path"] = csv_path
                 print(f"\n{Fore.GREEN}CSV saved: {csv_path}{Style.RESET_ALL}")
                 logger.info(f"CSV export: {len(all_db_leads)} leads -> {csv_path}")
             except Exception as exc:
                 logger.error(f"CSV export failed: {exc}", exc_info=True)
 
+        run_stats["metrics"] = metrics.summary()
         db.end_session(run_stats)
     update_job_progress(100)
 
+    _log_metrics(config, logger)
+
+    fixtures = open_fixtures(config)
+    if fixtures.enabled:
+        logger.info(f"HTTP fixtures: {fixtures.summary()}")
+
     supabase_url   = os.environ.get("SUPABASE_URL", "")
     dashboard_hint = (
         supabase_url.replace("supabase.co", "supabase.com/dashboard")
@@ -680,6 +871,36 @@ def run_pipeline(config: dict, args: argparse.Namespace, logger: logging.Logger)
     return run_stats, dashboard_hint
 
 
+def _log_metrics(config: dict, logger: logging.Logger) -> None:
+    """Log where the run spent its time; write the Prometheus file, if configured."""
+    spent = {
+        phase: metrics.histogram("phase_seconds", phase=phase)
+        for phase in ("proxy_refresh", "scrape", "csv_export")
+    }
+    spent["build_lead"] = metrics.histogram("build_lead_seconds")
+    spent["filter"]     = metrics.histogram("filter_seconds")
+    spent["upsert"]     = metrics.histogram("exporter_seconds", exporter="supabase", op="bulk_insert")
+    logger.info("Timings: " + ", ".join(
+        f"{name} {h['sum']:.2f}s" for name, h in spent.items() if h
+    ))
+    limits = {
+        limiter: metrics.gauge("adaptive_limit", limiter=limiter)
+        for limiter in ("xhr", "maps_rpc")
+    }
+    if any(v is not None for v in limits.values()):
+        logger.info("Adaptive concurrency limits: " + ", ".join(
+            f"{name} {v:g}" for name, v in limits.items() if v is not None
+        ))
+
+    path = (config.get("metrics") or {}).get("prometheus_file")
+    if path:
+        try:
+            metrics.write_prometheus(path)
+            logger.info(f"Metrics written to {path}")
+        except OSError as exc:
+            logger.warning(f"Could not write metrics to {path}: {exc}")
+
+
 def run_export_only(config: dict, logger: logging.Logger):
     logger.info("Export-only mode: reading all leads from Supabase")
     try:
@@ -749,6 +970,17 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--export-only", action="store_true")
     parser.add_argument("--no-csv",      action="store_true")
     parser.add_argument("--dry-run",     action="store_true")
+    parser.add_argument("--no-cache",    action="store_true", dest="no_cache",
+        help="Ignore the on-disk response cache and fetch every page again")
+    fixtures = parser.add_mutually_exclusive_group()
+    fixtures.add_argument("--record", default=None, metavar="DIR",
+        help="Save every HTTP response (and Playwright HAR archives) to DIR")
+    fixtures.add_argument("--replay", default=None, metavar="DIR",
+        help="Serve responses recorded with --record from DIR; no network access")
+    parser.add_argument("--replay-latency", type=float, default=0, dest="replay_latency",
+        metavar="MS", help="Simulated network latency per replayed response (ms)")
+    parser.add_argument("--metrics-file", default=None, dest="metrics_file", metavar="PATH",
+        help="Write run metrics to PATH in Prometheus text format")
     parser.add_argument("--serve",       action="store_true")
     parser.add_argument("--port",        type=int, default=5000)
     return parser.parse_args()
@@ -803,6 +1035,35 @@ def _apply_cli_overrides(config: dict, args: argparse.Namespace):
         config["scraping"]["concurrent_xhr"] = args.concurrent_xhr
         print(f"  {Fore.CYAN}Concurrent XHR workers:{Style.RESET_ALL} {args.concurrent_xhr}")
 
+    if args.no_cache:
+        config.setdefault("cache", {})["enabled"] = False
+        print(f"  {Fore.CYAN}Response cache:{Style.RESET_ALL} off")
+
+    if args.metrics_file:
+        config.setdefault("metrics", {})["prometheus_file"] = args.metrics_file
+        print(f"  {Fore.CYAN}Metrics file:{Style.RESET_ALL} {args.metrics_file}")
+
+    if args.record or args.replay:
+        mode = "record" if args.record else "replay"
+        config["fixtures"] = {
+            "mode":       mode,
+            "dir":        args.record or args.replay,
+            "latency_ms": args.replay_latency,
+        }
+        # Every request has to reach the recorder / replayer
+        config.setdefault("cache", {})["enabled"] = False
+        if mode == "replay":
+            # Nothing leaves the machine: no proxies, no politeness delays
+            config.setdefault("proxies", {})["enabled"] = False
+            config["scraping"]["delay_min"] = config["scraping"]["delay_max"] = 0
+            config["scraping"]["rate_limits"] = {
+                name: {"rate": 1000.0, "burst": 1000} for name in DEFAULT_RATE_LIMITS
+            }
+        print(
+            f"  {Fore.CYAN}{mode.capitalize()}:{Style.RESET_ALL} {args.record or args.replay}"
+            + (f" (+{args.replay_latency:g} ms per response)" if args.replay and args.replay_latency else "")
+        )
+
     # Apply per-job filter overrides from CLI (worker.py passes these)
     filters = config.setdefault("filters", {})
     if args.min_reviews is not None:
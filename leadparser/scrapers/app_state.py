@@ -0,0 +1,268 @@
+"""
+Structured decoder for Google Maps' window.APP_INITIALIZATION_STATE.
+
+Search and profile pages embed their data as one large JS array literal:
+
+    window.APP_INITIALIZATION_STATE=[[...],[...],...];window.APP_FLAGS=...
+
+Most of the useful payload sits inside that array as *strings* that are
+themselves JSON, prefixed with Google's XSSI guard:
+
+    ")]}'\\n[\"plumbers near 51.04,-114.07\",null,...,[[null,[<place>]],...]]"
+
+Design
+──────
+  1. Locate the blob: find the marker, then let json.JSONDecoder.raw_decode
+     consume exactly one value starting at the opening "[".  raw_decode
+     tracks bracket depth and string escapes in C, so the end of the array
+     is found in the same pass that parses it — no non-greedy regex and no
+     second scan over the page.
+  2. Walk the decoded tree once with an explicit stack.  Strings that
+     start with the ")]}'" guard are decoded in place and walked too.
+  3. Any list shaped like a place record (hex data id at [10], name at
+     [11]) is turned into a PlaceRecord by reading fixed positions, so
+     every field comes from the same record — phones can never drift
+     onto the wrong business.
+
+Known place-record positions (all optional; Google shifts them rarely):
+    [2]          address lines          [4][7]   rating
+    [4][8]       review count           [7][0]   website
+    [9][2:4]     lat, lng               [10]     data id  "0x…:0x…"
+    [11]         name                   [13]     categories
+    [18]         "Name, full address"   [39]     full address
+    [78]         place id  "ChIJ…"      [178][0][0]  display phone
+"""
+
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Optional
+from urllib.parse import quote_plus, unquote_plus
+
+logger = logging.getLogger(__name__)
+
+_MARK        = "APP_INITIALIZATION_STATE"
+_XSSI_PREFIX = ")]}'"
+_DECODER     = json.JSONDecoder()
+
+# /maps/place/<name>[/data=…!1s<data id>…] inside a profile href
+_PLACE_NAME_RE = re.compile(r"/maps/place/([^/?#]+)")
+_DATA_ID_RE    = re.compile(r"!1s(0x[0-9a-fA-F]+:0x[0-9a-fA-F]+)")
+
+
+# ── Record type ───────────────────────────────────────────────────────────────
+
+@dataclass(slots=True)
+class PlaceRecord:
+    """One business as read from a place-record array."""
+
+    name:         str
+    data_id:      str           = ""
+    place_id:     str           = ""
+    phone:        str           = ""
+    rating:       str           = ""
+    review_count: int           = 0
+    lat:          Optional[float] = None
+    lng:          Optional[float] = None
+    website:      str           = ""
+    address:      str           = ""
+    categories:   list[str]     = field(default_factory=list)
+
+    @property
+    def url(self) -> str:
+        """Canonical /maps/place/ profile URL for this record."""
+        return place_url(self.name, self.data_id)
+
+    def to_lead(self, niche: str = "", source: str = "Google Maps") -> dict:
+        """Raw lead dict in the shape run_pipeline's build_lead() expects."""
+        return {
+            "source":          source,
+            "gmb_link":        self.url,
+            "niche":           niche,
+            "name":            self.name,
+            "phone":           self.phone,
+            "secondary_phone": "",
+            "address":         self.address,
+            "hours":           "",
+            "review_count":    self.review_count,
+            "rating":          self.rating,
+            "website":         self.website,
+            "category":        self.categories[0] if self.categories else "",
+            "place_id":        self.place_id or self.data_id,
+            "lat":             self.lat,
+            "lng":             self.lng,
+        }
+
+
+def place_url(name: str, data_id: str = "") -> str:
+    """Canonical /maps/place/ profile URL: the name, plus the data id when known."""
+    base = f"https://www.google.com/maps/place/{quote_plus(name)}"
+    if data_id:
+        return f"{base}/data=!4m2!3m1!1s{data_id}"
+    return base
+
+
+def canonical_place_url(href: str) -> str:
+    """
+    Rewrite a scraped /maps/place/ href into place_url() form.
+
+    Hrefs carry Google's own name encoding and a long data= tail; records
+    decoded from APP_INITIALIZATION_STATE give place_url().  Rewriting
+    hrefs the same way makes one place one string, whichever path found
+    it.  Hrefs that are not place links come back unchanged.
+    """
+    name = _PLACE_NAME_RE.search(href)
+    if not name:
+        return href
+    data_id = _DATA_ID_RE.search(href)
+    return place_url(unquote_plus(name.group(1)), data_id.group(1) if data_id else "")
+
+
+# ── Blob location ─────────────────────────────────────────────────────────────
+
+def locate_app_state(html: str) -> Optional[Any]:
+    """
+    Find and decode the APP_INITIALIZATION_STATE array in *html*.
+
+    Returns the decoded Python value, or None if the marker is missing or
+    the literal is not valid JSON.
+    """
+    at = html.find(_MARK)
+    if at == -1:
+        return None
+    start = html.find("[", at + len(_MARK))
+    if start == -1:
+        return None
+    try:
+        value, _end = _DECODER.raw_decode(html, start)
+    except ValueError as exc:
+        logger.debug(f"APP_INITIALIZATION_STATE decode failed: {exc}")
+        return None
+    return value
+
+
+def _decode_guarded(text: str) -> Optional[Any]:
+    """Decode a ")]}'"-prefixed JSON payload string, or None."""
+    nl = text.find("\n")
+    if nl == -1:
+        return None
+    try:
+        return json.loads(text[nl + 1:])
+    except ValueError:
+        return None
+
+
+# ── Record walk ───────────────────────────────────────────────────────────────
+
+def _at(node: Any, *path: int) -> Any:
+    """Safe nested index: _at(x, 4, 7) is x[4][7] or None."""
+    for i in path:
+        if not isinstance(node, list) or i >= len(node):
+            return None
+        node = node[i]
+    return node
+
+
+def _is_place(node: list) -> bool:
+    if len(node) <= 11:
+        return False
+    data_id, name = node[10], node[11]
+    return (
+        isinstance(name, str) and bool(name)
+        and isinstance(data_id, str) and data_id.startswith("0x") and ":" in data_id
+    )
+
+
+def _read_place(node: list) -> PlaceRecord:
+    rating  = _at(node, 4, 7)
+    reviews = _at(node, 4, 8)
+    lat     = _at(node, 9, 2)
+    lng     = _at(node, 9, 3)
+    phone   = _at(node, 178, 0, 0)
+    website = _at(node, 7, 0)
+    place_id = _at(node, 78)
+
+    address = _at(node, 39)
+    if not isinstance(address, str):
+        lines   = _at(node, 2)
+        address = ", ".join(l for l in lines if isinstance(l, str)) if isinstance(lines, list) else ""
+
+    cats = _at(node, 13)
+    categories = [c for c in cats if isinstance(c, str)] if isinstance(cats, list) else []
+
+    return PlaceRecord(
+        name         = node[11].strip(),
+        data_id      = node[10],
+        place_id     = place_id if isinstance(place_id, str) else "",
+        phone        = phone.strip() if isinstance(phone, str) else "",
+        rating       = str(rating) if isinstance(rating, (int, float)) else "",
+        review_count = reviews if isinstance(reviews, int) else 0,
+        lat          = float(lat) if isinstance(lat, (int, float)) else None,
+        lng          = float(lng) if isinstance(lng, (int, float)) else None,
+        website      = website if isinstance(website, str) else "",
+        address      = address.strip(),
+        categories   = categories,
+    )
+
+
+def iter_place_records(state: Any):
+    """
+    Yield a PlaceRecord for every place-shaped array reachable from *state*.
+
+    Walks the tree once (explicit stack, so deep nesting is safe), decoding
+    XSSI-guarded string payloads as it meets them.  Place records are not
+    descended into — nested "people also search for" entries belong to a
+    different business.  Duplicates (same data id) are yielded once.
+    """
+    seen:  set[str]  = set()
+    stack: list[Any] = [state]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            if _is_place(node):
+                if node[10] not in seen:
+                    seen.add(node[10])
+                    yield _read_place(node)
+                continue
+            # Reverse so records come out in document order
+            stack.extend(reversed(node))
+        elif isinstance(node, str) and node.startswith(_XSSI_PREFIX):
+            inner = _decode_guarded(node)
+            if inner is not None:
+                stack.append(inner)
+        elif isinstance(node, dict):
+            stack.extend(reversed(list(node.values())))
+
+
+def parse_place_records(html: str) -> list[PlaceRecord]:
+    """Decode APP_INITIALIZATION_STATE in *html* and return its place records."""
+    state = locate_app_state(html)
+    if state is None:
+        return []
+    return list(iter_place_records(state))
+
+
+def parse_place_payload(body: str) -> list[PlaceRecord]:
+    """
+    Place records from any Maps response body.
+
+    Handles the three shapes the browser receives: a page embedding
+    APP_INITIALIZATION_STATE, a bare ")]}'"-guarded XHR payload
+    (/maps/preview/place), and the {"c":0,"d":")]}'\\n[...]"}/*""*/
+    envelope of /search?tbm=map — raw_decode stops at the end of the
+    envelope and the walk decodes the guarded "d" string.
+    """
+    text = body.lstrip()
+    if text.startswith(_XSSI_PREFIX):
+        state = _decode_guarded(text)
+    elif text.startswith(("[", "{")):
+        try:
+            state, _end = _DECODER.raw_decode(text)
+        except ValueError:
+            state = None
+    else:
+        state = locate_app_state(body)
+    if state is None:
+        return []
+    return list(iter_place_records(state))
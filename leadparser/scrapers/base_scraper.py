@@ -245,7 +245,7 @@ class BaseScraper(ABC):
         anyway: Chrome has usually loaded the visible business-card content
         well before the 30 s deadline, so extraction can still succeed.
         """
-        self.rate_limiter.wait()
+        self.rate_limiter.wait(host=url)
         try:
             self.driver.get(url)
             return True
@@ -0,0 +1,324 @@
+"""
+Browser pool — one Chromium per process, warm contexts shared by Phase A
+and Phase B across every niche×city combination.
+
+Why
+───
+Launching Chromium costs 1–3 s and ~150 MB RSS.  Before the pool each
+scrape launched its own browser and every Phase B chunk built a fresh
+context.  Now a job launches Chromium once; contexts are handed out,
+returned, and reused (cookies and all) until the recycle policy retires
+them.
+
+Lifecycle
+─────────
+    pool = BrowserPool(config, proxy_manager)
+    await pool.start()                        # launch + pre-warm contexts
+    async with pool.context() as lease:       # borrow a warm context
+        page = await pool.new_page(lease)
+        await page.goto(url); lease["pages"] += 1
+        ...
+        lease["healthy"] = False              # caller saw it misbehave
+    await pool.close()
+
+A lease is a plain dict:
+    ctx          the Playwright BrowserContext
+    fingerprint  the new_context() kwargs it was built with (UA, viewport,
+                 timezone, locale, headers) — fixed for the context's life
+    proxied      built for proxied use (pool bucket it returns to)
+    gen          browser launch it belongs to
+    born         time.monotonic() at creation
+    pages        page loads so far — callers bump it per navigation
+    healthy      False → closed on release instead of returned
+
+Recycle policy
+──────────────
+On release (and again on acquire, for contexts that aged while idle) a
+context is closed instead of reused when it is unhealthy, has served
+scraping.context_max_pages page loads, is older than
+scraping.context_max_age seconds, or belongs to a browser that has
+since been relaunched.  Long-running holders check pool.expired(lease)
+between pages and swap in a fresh lease.  At most scraping.pool_contexts
+idle contexts per proxy mode are kept warm; extras are closed.
+
+Health checks
+─────────────
+acquire() checks browser.is_connected(); a crashed Chromium is
+relaunched once (under a lock) and every context from the dead browser
+is dropped.  The pool never blocks on a size cap — contexts are created
+on demand, so a caller holding several leases cannot deadlock.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from utils.http_fixtures import open_fixtures
+
+logger = logging.getLogger(__name__)
+
+# ── User-agent pool (20+ real desktop strings) ───────────────────────────────
+USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36 Edg/124.0.0.0",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36 Edg/123.0.0.0",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_4_1) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.4.1 Safari/605.1.15",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 13_6_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.5 Safari/605.1.15",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:125.0) Gecko/20100101 Firefox/125.0",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:124.0) Gecko/20100101 Firefox/124.0",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 14.4; rv:125.0) Gecko/20100101 Firefox/125.0",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36 OPR/110.0.0.0",
+    "Mozilla/5.0 (Windows NT 10.0; WOW64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 12_7_4) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
+]
+
+TIMEZONES = [
+    "America/New_York", "America/Chicago", "America/Denver",
+    "America/Los_Angeles", "America/Phoenix", "America/Detroit",
+    "America/Toronto", "America/Vancouver", "America/Edmonton",
+    "America/Calgary", "America/Montreal", "America/Boston",
+    "America/Atlanta", "America/Dallas", "America/Houston",
+    "America/Miami", "America/Denver", "America/Seattle",
+    # Note: America/Seattle is mapped to America/Los_Angeles in _get_timezone()
+]
+
+# Valid IANA timezone IDs (Seattle uses Los Angeles)
+_IANA_TIMEZONE_MAP = {
+    "America/Seattle": "America/Los_Angeles",
+}
+
+_LAUNCH_ARGS = ["--no-sandbox", "--disable-dev-shm-usage", "--disable-gpu"]
+
+
+def _get_timezone() -> str:
+    """Return a valid IANA timezone ID."""
+    tz = random.choice(TIMEZONES)
+    # Map invalid/legacy IDs to valid IANA IDs
+    return _IANA_TIMEZONE_MAP.get(tz, tz)
+
+
+def make_fingerprint() -> dict:
+    """
+    Build randomised browser.new_context() kwargs for one context.
+
+    UA, viewport, timezone and locale stay fixed for the context's life,
+    so every page it opens presents the same identity.
+    """
+    return {
+        "user_agent": random.choice(USER_AGENTS),
+        "viewport": {
+            "width":  random.randint(1280, 1920),
+            "height": random.randint(720,  1080),
+        },
+        "locale":             "en-US",
+        "timezone_id":        _get_timezone(),
+        "extra_http_headers": {"Referer": "https://www.google.com/"},
+    }
+
+
+class BrowserPool:
+    """One Chromium and a pool of reusable, fingerprinted browser contexts."""
+
+    def __init__(self, config: dict, proxy_manager=None):
+        scraping           = config["scraping"]
+        self.config        = config
+        self.proxy_manager = proxy_manager
+        self.headless      = scraping.get("headless", True)
+        self.warm          = scraping.get("pool_contexts", scraping.get("workers", 4))
+        self.max_pages     = scraping.get("context_max_pages", 50)
+        self.max_age       = scraping.get("context_max_age", 300)
+        self.fixtures      = open_fixtures(config)   # --record HAR / --replay
+
+        self._pw       = None
+        self._browser  = None
+        self._gen      = 0          # bumped on every (re)launch
+        self._idle: dict[bool, list[dict]] = {True: [], False: []}
+        self._lock     = asyncio.Lock()
+        self.stats     = {
+            "launches": 0, "created": 0, "reused": 0, "recycled": 0,
+        }
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+
+    async def start(self) -> None:
+        """Launch Chromium and pre-warm scraping.pool_contexts contexts."""
+        async with self._lock:
+            if self._browser is not None:
+                return
+            await self._relaunch()
+        use_proxy = self._proxy_available()
+        leases = await asyncio.gather(*(
+            self._create(use_proxy) for _ in range(self.warm)
+        ))
+        self._idle[use_proxy].extend(leases)
+
+    async def close(self) -> None:
+        """Close every context, the browser and Playwright."""
+        for leases in self._idle.values():
+            for lease in leases:
+                await self._dispose(lease)
+            leases.clear()
+        browser, pw = self._browser, self._pw
+        self._browser = self._pw = None
+        try:
+            if browser is not None:
+                await browser.close()
+        finally:
+            if pw is not None:
+                await pw.stop()
+        logger.info(
+            "Browser pool closed — %(launches)d launch(es), %(created)d contexts "
+            "created, %(reused)d reused, %(recycled)d recycled", self.stats,
+        )
+
+    async def _launch_browser(self):
+        """Start Playwright and Chromium; returns (playwright, browser)."""
+        from playwright.async_api import async_playwright
+
+        pw = await async_playwright().start()
+        try:
+            # Proxy is applied per-context, not at browser level, so a dead
+            # proxy only kills one context and we can fall back to direct.
+            browser = await pw.chromium.launch(headless=self.headless, args=_LAUNCH_ARGS)
+        except Exception:
+            await pw.stop()
+            raise
+        return pw, browser
+
+    async def _relaunch(self) -> None:
+        """(Re)launch Chromium; contexts of the old browser become stale."""
+        old_browser, old_pw = self._browser, self._pw
+        self._browser = None
+        for leases in self._idle.values():
+            leases.clear()   # they died with the old browser
+        if old_browser is not None:
+            try:
+                await old_browser.close()
+            except Exception:
+                pass
+            try:
+                await old_pw.stop()
+            except Exception:
+                pass
+        self._pw, self._browser = await self._launch_browser()
+        self._gen += 1
+        self.stats["launches"] += 1
+
+    async def _ensure_browser(self) -> None:
+        """Health check: relaunch Chromium if it crashed or disconnected."""
+        if self._browser is not None and self._browser.is_connected():
+            return
+        async with self._lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._browser is not None:
+                    logger.warning("Browser pool: Chromium disconnected — relaunching")
+                await self._relaunch()
+
+    # ── Leases ────────────────────────────────────────────────────────────────
+
+    @asynccontextmanager
+    async def context(self, use_proxy: bool = True) -> AsyncIterator[dict]:
+        """Borrow a context for the block; it returns to the pool afterwards."""
+        lease = await self.acquire(use_proxy)
+        try:
+            yield lease
+        finally:
+            await self.release(lease)
+
+    async def acquire(self, use_proxy: bool = True) -> dict:
+        """Return a warm context lease, creating one if none is idle."""
+        await self._ensure_browser()
+        use_proxy = use_proxy and self._proxy_available()
+        idle = self._idle[use_proxy]
+        while idle:
+            lease = idle.pop()
+            if self.expired(lease):
+                await self._retire(lease)
+                continue
+            self.stats["reused"] += 1
+            return lease
+        return await self._create(use_proxy)
+
+    async def release(self, lease: dict) -> None:
+        """Return *lease* to the pool, or close it if it is due for recycling."""
+        idle = self._idle[lease["proxied"]]
+        if self.expired(lease) or len(idle) >= self.warm:
+            await self._retire(lease)
+            return
+        # Leave no pages behind; the context keeps its cookies.
+        for page in list(lease["ctx"].pages):
+            try:
+                await page.close()
+            except Exception:
+                lease["healthy"] = False
+        if lease["healthy"]:
+            idle.append(lease)
+        else:
+            await self._retire(lease)
+
+    async def new_page(self, lease: dict):
+        """Open a page on the leased context; a failure marks it unhealthy."""
+        try:
+            return await lease["ctx"].new_page()
+        except Exception:
+            lease["healthy"] = False
+            raise
+
+    def expired(self, lease: dict) -> bool:
+        """True once *lease* is due for recycling (see module docstring)."""
+        return (
+            not lease["healthy"]
+            or lease["gen"] != self._gen
+            or lease["pages"] >= self.max_pages
+            or time.monotonic() - lease["born"] >= self.max_age
+        )
+
+    # ── Internals ─────────────────────────────────────────────────────────────
+
+    def _proxy_available(self) -> bool:
+        return self.proxy_manager is not None
+
+    async def _create(self, use_proxy: bool) -> dict:
+        fingerprint = make_fingerprint()
+        ctx_kwargs  = dict(fingerprint)
+        if use_proxy and self.proxy_manager:
+            proxy_dict = self.proxy_manager.get_proxy()
+            if proxy_dict:
+                proxy_host = proxy_dict.get("http", "").replace("http://", "")
+                ctx_kwargs["proxy"] = {"server": f"http://{proxy_host}"}
+        ctx_kwargs.update(self.fixtures.context_kwargs())
+        ctx = await self._browser.new_context(**ctx_kwargs)
+        await self.fixtures.install_context(ctx)
+        self.stats["created"] += 1
+        return {
+            "ctx":         ctx,
+            "fingerprint": fingerprint,
+            "proxied":     use_proxy,
+            "gen":         self._gen,
+            "born":        time.monotonic(),
+            "pages":       0,
+            "healthy":     True,
+        }
+
+    async def _retire(self, lease: dict) -> None:
+        self.stats["recycled"] += 1
+        await self._dispose(lease)
+
+    @staticmethod
+    async def _dispose(lease: dict) -> None:
+        try:
+            await lease["ctx"].close()
+        except Exception:
+            pass
@@ -0,0 +1,178 @@
+"""
+Single-round-trip profile extraction for the Playwright scrapers.
+
+PlaywrightGoogleMapsScraper used to read a business profile with one
+awaited CDP call per selector attempt — query_selector, then inner_text
+or get_attribute, for every fallback of every field: 20–40 round-trips
+per profile.  PROFILE_JS runs the same selector fallbacks, in the same
+order, inside the page and returns every candidate in one JSON object:
+
+    raw  = await page.evaluate(PROFILE_JS)
+    lead = normalize_profile(raw)
+
+The JS only collects raw strings (candidate lists where a field has
+several fallbacks); normalize_profile() applies the same cleanup and
+regexes the per-field Python extractors used, so the two paths agree
+field for field.  The old stepwise extractors remain in
+playwright_scraper.py as the fallback if evaluate() fails.
+"""
+
+import re
+from urllib.parse import unquote
+
+PROFILE_JS = r"""
+() => {
+    const xp = (path) => document.evaluate(
+        path, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+    ).singleNodeValue;
+    const text = (el) => el ? (el.innerText || '').trim() : '';
+    const attr = (el, name) => el ? (el.getAttribute(name) || '') : '';
+    const firstText = (...sels) => {
+        for (const sel of sels) {
+            const t = text(document.querySelector(sel));
+            if (t) return t;
+        }
+        return '';
+    };
+
+    // ── Phone: candidates in fallback order ──────────────────────────────
+    const phones = [];
+    for (const p of ['//button[starts-with(@data-item-id,"phone:")]',
+                     '//a[starts-with(@data-item-id,"phone:")]']) {
+        const el = xp(p);
+        if (el) phones.push(attr(el, 'data-item-id').replace('phone:', '').replace('tel:', ''));
+    }
+    for (const p of ['//button[starts-with(@aria-label,"Phone:")]',
+                     '//div[starts-with(@aria-label,"Phone:")]',
+                     '//a[starts-with(@aria-label,"Phone:")]']) {
+        const el = xp(p);
+        if (el) phones.push(attr(el, 'aria-label').replace('Phone:', ''));
+    }
+    for (const link of document.querySelectorAll('a[href^="tel:"]')) {
+        phones.push(link.href.replace('tel:', ''));
+    }
+    for (const btn of document.querySelectorAll('[data-item-id*="phone:"]')) {
+        const m = (btn.getAttribute('data-item-id') || '').match(/tel:([\d\+\-\(\)\s]+)/);
+        if (m) phones.push(m[1]);
+    }
+    if (!phones.some((p) => p.trim().length >= 10)) {
+        const m = document.documentElement.outerHTML.match(/href="tel:([^"]+)"/);
+        if (m) phones.push(m[1]);
+    }
+
+    // ── Address ──────────────────────────────────────────────────────────
+    let address = '';
+    for (const p of ['//button[@data-item-id="address"]',
+                     '//div[@data-item-id="address"]']) {
+        const el = xp(p);
+        if (!el) continue;
+        address = text(el.querySelector('div.fontBodyMedium')) || text(el);
+        if (address) break;
+    }
+    if (!address) {
+        for (const p of ['//button[starts-with(@aria-label,"Address:")]',
+                         '//div[starts-with(@aria-label,"Address:")]']) {
+            const el = xp(p);
+            if (!el) continue;
+            address = attr(el, 'aria-label').replace('Address:', '').trim();
+            if (address) break;
+        }
+    }
+
+    // ── Rating / reviews / website: first element per XPath ──────────────
+    const ratings = [];
+    for (const p of ['//span[@aria-label[contains(.,"star")]]',
+                     '//div[@class="F7nice"]//span[@aria-hidden="true"]']) {
+        const el = xp(p);
+        if (el) ratings.push(text(el) || attr(el, 'aria-label'));
+    }
+    const reviews = [];
+    for (const p of ['//button[contains(@aria-label,"review")]',
+                     '//span[contains(@aria-label,"review")]']) {
+        const el = xp(p);
+        if (el) reviews.push(attr(el, 'aria-label') || text(el));
+    }
+    const websites = [];
+    for (const p of ['//a[@data-item-id="authority"]',
+                     '//a[contains(@aria-label,"Website")]',
+                     '//a[contains(@aria-label,"website")]']) {
+        const el = xp(p);
+        if (el) websites.push(attr(el, 'href'));
+    }
+
+    return {
+        name:        firstText('h1.DUwDvf', 'h1'),
+        phones:      phones,
+        address:     address,
+        hours_label: attr(xp('//button[contains(@aria-label,"hours")]'
+                           + '|//div[contains(@aria-label,"hours")]'), 'aria-label'),
+        hours_text:  firstText('div.MkV9', 'span[jstcache*="hour"]', 'div.t39EBf'),
+        ratings:     ratings,
+        reviews:     reviews,
+        websites:    websites,
+        category:    firstText('button.DkEaL', 'button[jsaction*="category"]', 'span.DkEaL'),
+    };
+}
+"""
+
+_RATING_RE  = re.compile(r"(\d+\.?\d*)")
+_REVIEWS_RE = re.compile(r"([\d,]+)\s+reviews?", re.I)
+_URL_ARG_RE = re.compile(r"url=([^&]+)")
+
+
+def normalize_profile(raw: dict) -> dict:
+    """
+    Turn PROFILE_JS output into the profile fields
+    (name, phone, address, hours, review_count, rating, website, category).
+    """
+    return {
+        "name":         (raw.get("name") or "").strip(),
+        "phone":        _phone(raw.get("phones") or []),
+        "address":      (raw.get("address") or "").strip(),
+        "hours":        _hours(raw.get("hours_label") or "", raw.get("hours_text") or ""),
+        "review_count": _review_count(raw.get("reviews") or []),
+        "rating":       _rating(raw.get("ratings") or []),
+        "website":      _website(raw.get("websites") or []),
+        "category":     (raw.get("category") or "").strip(),
+    }
+
+
+def _phone(candidates: list[str]) -> str:
+    for cand in candidates:
+        phone = (cand or "").strip()
+        if len(phone) >= 10:
+            return phone
+    return ""
+
+
+def _hours(label: str, fallback_text: str) -> str:
+    if len(label) > 20:
+        return label.split(";")[0].strip()
+    return fallback_text.strip()
+
+
+def _rating(texts: list[str]) -> str:
+    for txt in texts:
+        match = _RATING_RE.search(txt or "")
+        if match:
+            return match.group(1)
+    return ""
+
+
+def _review_count(labels: list[str]) -> int:
+    for label in labels:
+        match = _REVIEWS_RE.search(label or "")
+        if match:
+            return int(match.group(1).replace(",", ""))
+    return 0
+
+
+def _website(hrefs: list[str]) -> str:
+    for href in hrefs:
+        if not href:
+            continue
+        if "google.com/url" not in href:
+            return href
+        match = _URL_ARG_RE.search(href)
+        return unquote(match.group(1)) if match else href
+    return ""
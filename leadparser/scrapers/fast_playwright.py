@@ -5,11 +5,16 @@ Optimized Playwright Scraper - Maximum speed without sacrificing reliability
 import asyncio
 import logging
 import random
-from typing import Callable, Optional
+from contextlib import aclosing, asynccontextmanager
+from typing import AsyncIterator, Callable, Optional
 from urllib.parse import quote_plus
 
 from playwright.async_api import async_playwright
 
+from scrapers import resource_blocking
+from scrapers.feed_scroll import collect_feed
+from scrapers.streaming import collect, merge_workers
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,6 +27,7 @@ class FastPlaywrightScraper:
     - Aggressive timeouts (faster failures)
     - Parallel extraction with semaphore
     - Skip non-essential waits
+    - Block tiles, images, fonts and telemetry (resource_blocking.py)
     """
     
     def __init__(self, config: dict, rate_limiter, proxy_manager=None):
@@ -30,23 +36,74 @@ class FastPlaywrightScraper:
         self.proxy_manager = proxy_manager
         self.logger = logging.getLogger(self.__class__.__name__)
         self._n_workers = config["scraping"].get("workers", 4)
+        self._session = None   # {"pw", "browser", "sem"} while a session is open
+        self._block_rules = resource_blocking.load_rules(config)
+        self.resource_stats = resource_blocking.new_stats()   # whole job
         
     def scrape_niche(self, niche: str, location: dict, on_progress: Callable = None) -> list[dict]:
         """Scrape niche with optimized Playwright."""
-        return asyncio.run(self._scrape_async(niche, location, on_progress))
+        return asyncio.run(collect(self.scrape_niche_iter(niche, location, on_progress)))
     
-    async def _scrape_async(
+    async def scrape_niche_iter(
         self,
         niche: str,
         location: dict,
-        on_progress: Optional[Callable],
-    ) -> list[dict]:
-        """Fast async scraping."""
-        from scrapers.google_maps import NICHE_EXPANSIONS
-        
+        on_progress: Optional[Callable] = None,
+        max_results: Optional[int] = None,
+    ) -> AsyncIterator[dict]:
+        """Fast async scraping; yields each lead as its profile is extracted."""
+        async with self._session_scope() as session:
+            browser = session["browser"]
+            
+            # Phase A: Collect URLs quickly
+            all_urls = await self._collect_urls_fast(
+                browser, niche, location, max_results
+            )
+            
+            if not all_urls:
+                return
+            
+            # Phase B: Parallel extraction
+            async with aclosing(self._extract_parallel(
+                browser, all_urls, niche, on_progress, session["sem"]
+            )) as leads:
+                async for lead in leads:
+                    yield lead
+    
+    # ── Session runtime (one browser + budget shared by every combination) ──
+    
+    async def open_session(self) -> None:
+        """Launch the session browser; scrapes reuse it until close_session()."""
+        if self._session is None:
+            self._session = await self._launch()
+    
+    async def close_session(self) -> None:
+        """Close the session browser, if one is open."""
+        if self._session is not None:
+            session, self._session = self._session, None
+            await self._shutdown(session)
+            if self._block_rules["enabled"]:
+                self.logger.info(
+                    f"Resource blocking: {resource_blocking.summary(self.resource_stats)}"
+                )
+    
+    @asynccontextmanager
+    async def _session_scope(self):
+        """Yield the open session, or a throwaway one for a standalone scrape."""
+        if self._session is not None:
+            yield self._session
+            return
+        session = await self._launch()
+        try:
+            yield session
+        finally:
+            await self._shutdown(session)
+    
+    async def _launch(self) -> dict:
         headless = self.config["scraping"].get("headless", True)
         
-        async with async_playwright() as pw:
+        pw = await async_playwright().start()
+        try:
             # Launch single browser
             browser = await pw.chromium.launch(
                 headless=headless,
@@ -58,36 +115,30 @@ class FastPlaywrightScraper:
                     "--disable-features=IsolateOrigins,site-per-process",
                 ]
             )
-            
-            try:
-                # Phase A: Collect URLs quickly
-                all_urls = await self._collect_urls_fast(
-                    browser, niche, location
-                )
-                
-                if not all_urls:
-                    return []
-                
-                # Phase B: Parallel extraction
-                leads = await self._extract_parallel(
-                    browser, all_urls, niche, on_progress
-                )
-                
-                return leads
-                
-            finally:
-                await browser.close()
+        except Exception:
+            await pw.stop()
+            raise
+        return {"pw": pw, "browser": browser, "sem": asyncio.Semaphore(self._n_workers)}
+    
+    @staticmethod
+    async def _shutdown(session: dict) -> None:
+        try:
+            await session["browser"].close()
+        finally:
+            await session["pw"].stop()
     
     async def _collect_urls_fast(
         self,
         browser,
         niche: str,
         location: dict,
+        max_results: Optional[int] = None,
     ) -> list[str]:
         """Fast URL collection with minimal overhead."""
         from scrapers.google_maps import NICHE_EXPANSIONS
         
-        max_results = self.config["scraping"].get("max_results_per_niche", 60)
+        if max_results is None:
+            max_results = self.config["scraping"].get("max_results_per_niche", 60)
         city_state = f"{location['city']}, {location['state']}"
         expansions = NICHE_EXPANSIONS.get(niche.lower().strip(), [])
         search_terms = [niche] + expansions[:5]  # Limit expansion terms
@@ -100,6 +151,9 @@ class FastPlaywrightScraper:
             viewport={"width": 1280, "height": 720},
             user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
         )
+        await resource_blocking.install(
+            context, "search", self._block_rules, self.resource_stats
+        )
         
         page = await context.new_page()
         
@@ -132,31 +186,11 @@ class FastPlaywrightScraper:
         return all_urls[:max_results]
     
     async def _scroll_and_collect_fast(self, page, max_collect: int, seen: set) -> list[str]:
-        """Fast scroll and collect."""
-        urls = []
-        
-        for _ in range(10):  # Max 10 scrolls
-            # Extract links
-            links = await page.query_selector_all("a[href*='/maps/place/']")
-            
-            for link in links:
-                try:
-                    href = await link.get_attribute("href")
-                    if href and "/maps/place/" in href and href not in seen:
-                        seen.add(href)
-                        urls.append(href)
-                        if len(urls) >= max_collect:
-                            return urls
-                except:
-                    continue
-            
-            # Quick scroll
-            await page.evaluate("""() => {
-                const feed = document.querySelector('div[role="feed"]');
-                if (feed) feed.scrollBy(0, 800);
-            }""")
-            await asyncio.sleep(0.5)  # Short pause
-        
+        """Fast scroll and collect (event-driven, see feed_scroll.py)."""
+        urls, _ = await collect_feed(
+            page, max_collect, seen, max_steps=10, quiet_ms=300, max_wait_ms=2_000
+        )
+        seen.update(urls)
         return urls
     
     async def _extract_parallel(
@@ -165,14 +199,20 @@ class FastPlaywrightScraper:
         urls: list[str],
         niche: str,
         on_progress: Optional[Callable],
-    ) -> list[dict]:
-        """Extract business data in parallel."""
-        sem = asyncio.Semaphore(self._n_workers)
+        sem: asyncio.Semaphore,
+    ) -> AsyncIterator[dict]:
+        """
+        Extract business data in parallel, yielding leads as they complete.
+        *sem* is the session-wide extraction budget.
+        """
         progress = {"done": 0, "total": len(urls)}
+        out = asyncio.Queue()
         
-        async def extract_one(url: str) -> Optional[dict]:
+        async def extract_one(url: str) -> None:
             async with sem:
                 lead = await self._extract_business_fast(browser, url, niche)
+                if lead is not None:
+                    out.put_nowait(lead)
                 
                 progress["done"] += 1
                 if on_progress:
@@ -180,13 +220,10 @@ class FastPlaywrightScraper:
                         on_progress(progress["done"], progress["total"])
                     except:
                         pass
-                
-                return lead
         
-        tasks = [extract_one(url) for url in urls]
-        results = await asyncio.gather(*tasks)
-        
-        return [r for r in results if r is not None]
+        async with aclosing(merge_workers(out, [extract_one(url) for url in urls])) as leads:
+            async for lead in leads:
+                yield lead
     
     async def _extract_business_fast(
         self,
@@ -200,6 +237,9 @@ class FastPlaywrightScraper:
         )
         
         try:
+            await resource_blocking.install(
+                context, "profile", self._block_rules, self.resource_stats
+            )
             page = await context.new_page()
             
             # Fast navigation
@@ -0,0 +1,128 @@
+"""
+Event-driven results-feed scrolling for the Playwright scrapers.
+
+Phase A used to scroll the Maps results feed, sleep a fixed
+scroll_pause_time (+ jitter), scan every <p>/<span> in the document for
+the "end of the list" notice and then read each result link with its own
+get_attribute round-trip.  SCROLL_JS does one step of that in a single
+page.evaluate:
+
+  • a MutationObserver on the feed (installed once per document) notes
+    when result cards are added and when the end-of-list notice appears
+  • the step scrolls, then resolves as soon as new cards arrive, the feed
+    has been quiet for *quietMs*, or *maxWaitMs* passes
+  • hrefs not returned by an earlier step come back in the same call
+
+collect_feed() drives the steps from Python and stops on end-of-list,
+*max_collect* URLs, or three steps in a row that add nothing.
+"""
+
+import random
+
+SCROLL_JS = r"""
+async ({scroll, dy, quietMs, maxWaitMs}) => {
+    const feed = document.querySelector('div[role="feed"]');
+    if (!feed) return {hrefs: [], end: false, missing: true};
+
+    const isEnd = (t) => t.includes('end of the list') || t.includes('No more results');
+    let st = window.__lpFeed;
+    if (!st || st.feed !== feed) {
+        st = window.__lpFeed = {
+            feed, seen: new Set(), end: false, fresh: false,
+            last: performance.now(), wake: null,
+        };
+        for (const el of feed.querySelectorAll('p, span')) {
+            if (isEnd(el.textContent || '')) { st.end = true; break; }
+        }
+        new MutationObserver((mutations) => {
+            st.last = performance.now();
+            for (const m of mutations) {
+                for (const node of m.addedNodes) {
+                    if (node.nodeType !== 1) continue;
+                    if (node.matches('a.hfpxzc') || node.querySelector('a.hfpxzc')) {
+                        st.fresh = true;
+                    } else if (!st.end && isEnd(node.textContent || '')) {
+                        st.end = true;
+                    }
+                }
+            }
+            if (st.wake && (st.fresh || st.end)) st.wake();
+        }).observe(feed, {childList: true, subtree: true});
+    }
+
+    const take = () => {
+        const out = [];
+        for (const a of feed.querySelectorAll('a.hfpxzc')) {
+            const href = a.getAttribute('href') || '';
+            if (href.includes('/maps/place/') && !st.seen.has(href)) {
+                st.seen.add(href);
+                out.push(href);
+            }
+        }
+        return out;
+    };
+
+    const hrefs = take();
+    if (scroll && !st.end) {
+        st.fresh = false;
+        const start = performance.now();
+        st.last = start;
+        feed.scrollBy(0, dy);
+        await new Promise((resolve) => {
+            const timer = setInterval(() => {
+                const now = performance.now();
+                if (now - st.last >= quietMs || now - start >= maxWaitMs) done();
+            }, 50);
+            const done = () => { st.wake = null; clearInterval(timer); resolve(); };
+            st.wake = done;
+        });
+        hrefs.push(...take());
+    }
+    return {hrefs, end: st.end};
+}
+"""
+
+_IDLE_STEPS = 3   # steps in a row with no new cards before giving up
+
+
+async def collect_feed(
+    page,
+    max_collect: int,
+    exclude:     set,
+    max_steps:   int = 20,
+    quiet_ms:    int = 400,
+    max_wait_ms: int = 3_000,
+) -> tuple[list[str], bool]:
+    """
+    Scroll the results feed on *page* and collect new profile URLs.
+
+    Returns (urls, end_reached).  URLs in *exclude* are skipped; at most
+    *max_collect* are returned.
+    """
+    seen: set[str]  = set(exclude)
+    urls: list[str] = []
+    idle = 0
+    end  = False
+
+    for step in range(max_steps + 1):
+        res = await page.evaluate(SCROLL_JS, {
+            "scroll":    step > 0,
+            "dy":        random.randint(750, 1050),
+            "quietMs":   quiet_ms,
+            "maxWaitMs": max_wait_ms,
+        })
+        if not res or res.get("missing"):
+            break
+
+        before = len(urls)
+        for href in res.get("hrefs") or []:
+            if href not in seen:
+                seen.add(href)
+                urls.append(href)
+
+        idle = idle + 1 if len(urls) == before else 0
+        end  = bool(res.get("end"))
+        if end or idle >= _IDLE_STEPS or len(urls) >= max_collect:
+            break
+
+    return urls[:max_collect], end
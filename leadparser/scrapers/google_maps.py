@@ -549,7 +549,7 @@ class GoogleMapsScraper(BaseScraper):
                     on_progress(i, len(all_urls))
                 except Exception:
                     pass
-            self.rate_limiter.wait()
+            self.rate_limiter.wait(host="google.com")
 
         return leads
 
@@ -0,0 +1,389 @@
+"""
+HTML field extraction engine for Google Maps business profile pages.
+
+Used by the XHR parser (scrapers/xhr_scraper.py) to turn a raw profile
+page into a lead dict without a browser.
+
+Design
+──────
+The old per-field parsers each ran their own re.findall / re.search
+over the full 200 KB+ page — ten or more scans per profile, most of it
+spent crawling inline JavaScript and CSS.  This module instead:
+
+  1. Splits the page into regions in one pass (_split_regions):
+     markup, <script> bodies, and <style> bodies (dropped — never
+     contains a field).  A typical profile page is ~70% script, ~25%
+     style and only a few KB of actual markup.
+  2. Runs ONE precompiled alternation over the markup (_MARKUP_ANCHOR_RE)
+     recording every attribute anchor in document order:
+       • <meta property="og:*">        — og:title (name), og:url (website)
+       • <title> / <h1>                — name fallbacks
+       • href="tel:…"                  — phone
+       • data-item-id="…"              — phone:tel:, address, authority
+       • aria-label="…"                — Phone:, Address:, hours, stars
+  3. Runs ONE quote-led pattern over the script bodies
+     (_SCRIPT_ANCHOR_RE) for the JSON-side anchors:
+       • "4.8 stars" / "123 reviews"   — quoted rating / review strings
+       • "streetAddress" / "category"  — schema.org / JSON key-value pairs
+     and remembers the APP_INITIALIZATION_STATE blob's region.
+
+Field parsers then work only on those small slices.  The two broad
+fallbacks (bare phone pattern, compact "4.8(123)" rating) only run when
+no anchor produced a value, and only over markup / script text.
+
+Everything here is a pure module-level function so it can be shipped to
+a worker process by the XHR scraper's parse executor.
+"""
+
+import re
+from typing import Optional
+
+# ── Precompiled patterns ──────────────────────────────────────────────────────
+
+_BLOCK_OPEN_RE  = re.compile(r"<(script|style)\b[^>]*>", re.I)
+_BLOCK_CLOSE_RE = {
+    tag: re.compile(rf"</{tag}\s*>", re.I) for tag in ("script", "style")
+}
+
+_MARKUP_ANCHOR_RE = re.compile(
+    r'<meta\s(?P<meta>[^>]*)>'
+    r'|<title>(?P<title>[^<]+)</title>'
+    r'|<h1[^>]*>(?P<h1>[^<]+)</h1>'
+    r'|href="tel:(?P<tel>[^"]+)"'
+    r'|data-item-id="(?P<item>[^"]+)"'
+    r'|aria-label="(?P<aria>[^"]+)"'
+    r'|"(?P<quoted>[\d.,]+\s+(?:stars?|reviews?))"'
+)
+
+_SCRIPT_ANCHOR_RE = re.compile(
+    r'"(?:(?P<quoted>[\d.,]+\s+(?:stars?|reviews?))"'
+    r'|(?P<jkey>streetAddress|category)"\s*:\s*"(?P<jval>[^"]+)")'
+)
+
+_APP_STATE_MARK = "APP_INITIALIZATION_STATE"
+
+_META_PROP_RE    = re.compile(r'property="og:(title|url)"')
+_META_CONTENT_RE = re.compile(r'content="([^"]*)"')
+_TAG_ARIA_RE     = re.compile(r'aria-label="Address:\s*([^"]+)"')
+_TAG_HREF_RE     = re.compile(r'href="([^"]+)"')
+
+_PHONE_RE        = re.compile(r"\(?\d{3}\)?[\s.\-]?\d{3}[\s.\-]?\d{4}")
+_LONG_DIGITS_RE  = re.compile(r"\+?\d{7,}")
+_STARS_RE        = re.compile(r"(\d+\.?\d*)\s+stars?")
+_REVIEWS_RE      = re.compile(r"([\d,]+)\s+reviews?")
+_COMPACT_RATE_RE = re.compile(r"(\d+\.?\d+)\s*\(([\d,]+)\)")
+_HOURS_RE        = re.compile(r"(?:Open|Closed).*hours", re.I)
+_GMAPS_SUFFIX_RE = re.compile(r"\s*[·\-]\s*Google Maps")
+
+
+# ── Region split + anchor pass ────────────────────────────────────────────────
+
+def _split_regions(html: str) -> tuple[str, list[str]]:
+    """
+    Split *html* into (markup, script_bodies) in a single forward pass.
+
+    Script bodies are skipped over with one close-tag search so the
+    markup pattern never walks them; <style> bodies are discarded
+    entirely.  Tags match case-insensitively at both ends (<SCRIPT> …
+    </Script >), as browsers do.
+    """
+    markup:  list[str] = []
+    scripts: list[str] = []
+    pos = 0
+    while True:
+        m = _BLOCK_OPEN_RE.search(html, pos)
+        if not m:
+            markup.append(html[pos:])
+            break
+        markup.append(html[pos:m.start()])
+        tag   = m.group(1).lower()
+        close = _BLOCK_CLOSE_RE[tag].search(html, m.end())
+        end   = close.start() if close else len(html)
+        if tag == "script":
+            scripts.append(html[m.end():end])
+        pos = close.end() if close else len(html)
+    return "\n".join(markup), scripts
+
+
+def _scan_anchors(html: str) -> dict:
+    """
+    Walk the page once and bucket every anchor match by kind.
+
+    Each bucket is a list in document order (markup before scripts), so
+    the "first match wins" semantics of the old per-field regexes hold.
+    """
+    a: dict = {
+        "og_title": [], "og_url": [], "title": [], "h1": [],
+        "tel": [], "item_phone": [], "item_address": [], "item_authority": [],
+        "aria_phone": [], "aria_hours": [],
+        "stars": [], "reviews": [],
+        "streetAddress": [], "category": [],
+        "app_state": "",
+    }
+
+    markup, scripts = _split_regions(html)
+    a["markup"]  = markup
+    a["scripts"] = scripts
+
+    for m in _MARKUP_ANCHOR_RE.finditer(markup):
+        kind = m.lastgroup
+
+        if kind == "meta":
+            attrs = m.group("meta")
+            prop  = _META_PROP_RE.search(attrs)
+            if prop:
+                content = _META_CONTENT_RE.search(attrs)
+                if content:
+                    a["og_" + prop.group(1)].append(content.group(1))
+
+        elif kind == "title":
+            a["title"].append(m.group("title"))
+
+        elif kind == "h1":
+            a["h1"].append(m.group("h1"))
+
+        elif kind == "tel":
+            a["tel"].append(m.group("tel"))
+
+        elif kind == "item":
+            item = m.group("item")
+            if item.startswith("phone:tel:"):
+                a["item_phone"].append(item[10:])
+            elif item in ("address", "authority"):
+                # Slice only the remainder of this tag for the attribute lookups
+                end = markup.find(">", m.end())
+                a["item_" + item].append(markup[m.end(): end if end != -1 else None])
+
+        elif kind == "aria":
+            label = m.group("aria")
+            if label.startswith("Phone:"):
+                a["aria_phone"].append(label[6:])
+            if _HOURS_RE.search(label):
+                a["aria_hours"].append(label)
+            _bucket_quoted(a, label)
+
+        elif kind == "quoted":
+            _bucket_quoted(a, m.group("quoted"))
+
+    for body in scripts:
+        if not a["app_state"]:
+            at = body.find(_APP_STATE_MARK)
+            if at != -1:
+                a["app_state"] = body[at + len(_APP_STATE_MARK):]
+
+        for m in _SCRIPT_ANCHOR_RE.finditer(body):
+            if m.lastgroup == "quoted":
+                _bucket_quoted(a, m.group("quoted"))
+            else:
+                a[m.group("jkey")].append(m.group("jval"))
+
+    return a
+
+
+def _bucket_quoted(a: dict, text: str) -> None:
+    """File a quoted '4.8 stars' / '123 reviews' string into its bucket."""
+    stars = _STARS_RE.fullmatch(text)
+    if stars:
+        a["stars"].append(stars.group(1))
+        return
+    reviews = _REVIEWS_RE.fullmatch(text)
+    if reviews:
+        a["reviews"].append(reviews.group(1))
+
+
+# ── Field parsers (operate on anchor slices only) ─────────────────────────────
+
+def _pick_phone(a: dict) -> str:
+    # Strategy 1: tel: links (most reliable)
+    for raw in a["tel"]:
+        phone = raw.strip().replace("%20", " ")
+        if _PHONE_RE.search(phone) or _LONG_DIGITS_RE.search(phone):
+            return phone
+
+    # Strategy 2: data-item-id="phone:tel:..."
+    for raw in a["item_phone"]:
+        cleaned = raw.strip()
+        if cleaned:
+            return cleaned
+
+    # Strategy 3: aria-label="Phone: ..."
+    for raw in a["aria_phone"]:
+        if _PHONE_RE.search(raw):
+            return raw.strip()
+
+    # Strategy 4: broad phone-pattern scan — markup first, then script data
+    for region in (a["markup"], *a["scripts"]):
+        m = _PHONE_RE.search(region)
+        if m:
+            return m.group(0)
+    return ""
+
+
+def _clean_title(raw: str) -> str:
+    return _GMAPS_SUFFIX_RE.split(raw.strip())[0].strip()
+
+
+def _pick_name(a: dict) -> str:
+    # Open Graph title (most reliable — Google sets it to business name)
+    for raw in a["og_title"][:1]:
+        name = _clean_title(raw)
+        if name and name.lower() != "google maps":
+            return name
+
+    # <title> fallback
+    for raw in a["title"][:1]:
+        name = _clean_title(raw)
+        if name and name.lower() != "google maps":
+            return name
+
+    # h1 if rendered in static HTML
+    for raw in a["h1"][:1]:
+        return raw.strip()
+
+    return ""
+
+
+def _pick_rating_reviews(a: dict) -> tuple[str, int]:
+    rating  = a["stars"][0] if a["stars"] else ""
+    reviews = 0
+
+    if a["reviews"]:
+        try:
+            reviews = int(a["reviews"][0].replace(",", ""))
+        except ValueError:
+            pass
+
+    # Fallback: "4.8(123)" compact pattern — visible text lives in markup
+    if not rating:
+        pair = _COMPACT_RATE_RE.search(a["markup"])
+        if pair:
+            rating = pair.group(1)
+            try:
+                reviews = int(pair.group(2).replace(",", ""))
+            except ValueError:
+                pass
+
+    return rating, reviews
+
+
+def _pick_address(a: dict) -> str:
+    # aria-label attribute on the address button
+    for tail in a["item_address"]:
+        m = _TAG_ARIA_RE.search(tail)
+        if m:
+            return m.group(1).strip()
+
+    # schema.org streetAddress
+    for raw in a["streetAddress"][:1]:
+        return raw.strip()
+
+    return ""
+
+
+def _pick_hours(a: dict) -> str:
+    for label in a["aria_hours"][:1]:
+        if len(label) > 10:
+            return label.split(";")[0].strip()
+    return ""
+
+
+def _pick_website(a: dict) -> str:
+    # data-item-id="authority" href (the "Visit website" button)
+    for tail in a["item_authority"]:
+        m = _TAG_HREF_RE.search(tail)
+        if m:
+            return m.group(1).strip()
+
+    # OG URL — skip if it's a Google domain
+    for raw in a["og_url"][:1]:
+        if "google.com" not in raw:
+            return raw.strip()
+
+    return ""
+
+
+def _pick_category(a: dict) -> str:
+    for raw in a["category"][:1]:
+        return raw.strip()
+    return ""
+
+
+# ── Public API ────────────────────────────────────────────────────────────────
+
+def extract_fields(html: str) -> dict:
+    """
+    Extract every business field from a profile page in one anchor pass.
+
+    Returns a dict with name, phone, address, hours, rating, review_count,
+    website and category (empty strings / 0 when not found).
+    """
+    a = _scan_anchors(html)
+    rating, review_count = _pick_rating_reviews(a)
+    return {
+        "name":         _pick_name(a),
+        "phone":        _pick_phone(a),
+        "address":      _pick_address(a),
+        "hours":        _pick_hours(a),
+        "rating":       rating,
+        "review_count": review_count,
+        "website":      _pick_website(a),
+        "category":     _pick_category(a),
+    }
+
+
+def parse_business_html(html: str, url: str, niche: str) -> Optional[dict]:
+    """
+    Build a raw lead dict from Google Maps business page HTML.
+
+    Returns None if no phone or no name is found (insta-skip), matching
+    the gate the XHR scraper has always applied.
+    """
+    a = _scan_anchors(html)
+
+    # Phone is the gate — skip immediately if absent
+    phone = _pick_phone(a)
+    if not phone:
+        return None
+
+    name = _pick_name(a)
+    if not name:
+        return None
+
+    rating, review_count = _pick_rating_reviews(a)
+
+    return {
+        "source":          "Google Maps (XHR)",
+        "gmb_link":        url,
+        "niche":           niche,
+        "name":            name,
+        "phone":           phone,
+        "secondary_phone": "",
+        "address":         _pick_address(a),
+        "city":            "",
+        "state":           "",
+        "zip":             "",
+        "hours":           _pick_hours(a),
+        "review_count":    review_count,
+        "rating":          rating,
+        "website":         _pick_website(a),
+        "facebook":        "",
+        "instagram":       "",
+        "notes":           "",
+        "category":        _pick_category(a),
+    }
+
+
+def parse_business_bytes(
+    body:     bytes,
+    encoding: str,
+    url:      str,
+    niche:    str,
+) -> Optional[dict]:
+    """
+    Process-pool entry point: raw response bytes in, lead dict out.
+
+    Decoding happens in the worker too, so the event loop never touches
+    the full body.  Undecodable bytes are replaced rather than raised.
+    """
+    html = body.decode(encoding or "utf-8", errors="replace")
+    return parse_business_html(html, url, niche)
@@ -8,11 +8,19 @@ import json
 import logging
 import random
 import re
-from typing import Callable, Optional
+from contextlib import aclosing, asynccontextmanager
+from typing import AsyncIterator, Callable, Optional
 from urllib.parse import quote_plus
 
 import httpx
 
+from .app_state import parse_place_records
+from .streaming import collect, merge_workers
+from utils.adaptive_limiter import AdaptiveLimiter
+from utils.http_fixtures import open_fixtures
+from utils.metrics import metrics
+from utils.response_cache import open_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -41,6 +49,10 @@ CITY_COORDS = {
 }
 
 
+def _count(result: str) -> None:
+    metrics.inc("scraper_requests_total", scraper="maps_rpc", kind="grid", result=result)
+
+
 def generate_grid(city: str, state: str, radius_km: float = 10.0) -> list[dict]:
     """Generate search grid points for a city."""
     city_key = city.lower().strip()
@@ -87,19 +99,28 @@ class MapsRPCScraper:
         self.rate_limiter = rate_limiter
         self.proxy_manager = proxy_manager
         self.logger = logging.getLogger(self.__class__.__name__)
+        self.cache = open_cache(config)
+        self.fixtures = open_fixtures(config)
         self._concurrency = min(config["scraping"].get("xhr_concurrency", 50), 50)
+        self._session = None   # {"client", "limiter"} while a session is open
     
     def scrape_niche(self, niche: str, location: dict, on_progress: Callable = None) -> list[dict]:
         """Scrape leads using grid search."""
-        return asyncio.run(self._scrape_async(niche, location, on_progress))
+        return asyncio.run(collect(self.scrape_niche_iter(niche, location, on_progress)))
     
-    async def _scrape_async(
+    async def scrape_niche_iter(
         self,
         niche: str,
         location: dict,
-        on_progress: Optional[Callable],
-    ) -> list[dict]:
-        """Async grid-based scraping."""
+        on_progress: Optional[Callable] = None,
+        max_results: Optional[int] = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Async grid-based scraping; yields unique leads as each grid point returns.
+        
+        Uses the session client when open_session() has been called.  Stops
+        after *max_results* leads when given.
+        """
         city = location["city"]
         state = location.get("state", "")
         
@@ -112,86 +133,158 @@ class MapsRPCScraper:
         )
         
         # Fetch all grid points
-        async with httpx.AsyncClient(
-            timeout=httpx.Timeout(12.0, connect=5.0),
-            follow_redirects=True,
-            http2=True,
-            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
-        ) as client:
-            sem = asyncio.Semaphore(self._concurrency)
+        async with self._session_scope() as session:
+            client = session["client"]
+            limiter = session["limiter"]
+            out = asyncio.Queue()
             
             progress = {"done": 0, "total": len(grid_points)}
-            tasks = [
-                self._fetch_grid_point(client, niche, point, sem, progress, on_progress)
-                for point in grid_points
-            ]
             
-            results = await asyncio.gather(*tasks)
-        
-        # Deduplicate
-        all_leads = []
-        seen_ids = set()
-        
-        for point_leads in results:
-            for lead in point_leads:
-                # Create unique key
-                key = lead.get("place_id", "")
-                if not key:
-                    key = f"{lead.get('name', '')}_{lead.get('lat', '')}_{lead.get('lng', '')}"
-                
-                if key and key not in seen_ids:
-                    seen_ids.add(key)
-                    all_leads.append(lead)
+            async def fetch(point: dict) -> None:
+                out.put_nowait(
+                    await self._fetch_grid_point(client, niche, point, limiter, progress, on_progress)
+                )
+            
+            # Deduplicate as results arrive
+            seen_ids = set()
+            n_leads = 0
+            
+            async with aclosing(merge_workers(out, [fetch(p) for p in grid_points])) as results:
+                async for point_leads in results:
+                    for lead in point_leads:
+                        # Create unique key
+                        key = lead.get("place_id", "")
+                        if not key:
+                            key = f"{lead.get('name', '')}_{lead.get('lat', '')}_{lead.get('lng', '')}"
+                        
+                        if key and key not in seen_ids:
+                            seen_ids.add(key)
+                            n_leads += 1
+                            yield lead
+                            if max_results and n_leads >= max_results:
+                                break
+                    if max_results and n_leads >= max_results:
+                        break
         
         self.logger.info(
-            f"MapsRPC: {len(all_leads)} unique leads for '{niche}' in {city}"
+            f"MapsRPC: {n_leads} unique leads for '{niche}' in {city}"
         )
-        return all_leads
     
+    # ── Session runtime (one client + budget shared by every combination) ──
+    
+    async def open_session(self) -> None:
+        """Start the session client; scrapes reuse it until close_session()."""
+        if self._session is None:
+            self._session = self._new_session()
+    
+    async def close_session(self) -> None:
+        """Close the session client, if one is open."""
+        if self._session is not None:
+            session, self._session = self._session, None
+            await self._close_session(session)
+    
+    @asynccontextmanager
+    async def _session_scope(self):
+        """Yield the open session, or a throwaway one for a standalone scrape."""
+        if self._session is not None:
+            yield self._session
+            return
+        session = self._new_session()
+        try:
+            yield session
+        finally:
+            await self._close_session(session)
+    
+    async def _close_session(self, session: dict) -> None:
+        await session["client"].aclose()
+        self.logger.info(f"MapsRPC adaptive concurrency: {session['limiter'].summary()}")
+        if self.cache.enabled:
+            self.logger.info(f"MapsRPC response cache: {self.cache.summary()}")
+    
+    def _new_session(self) -> dict:
+        return {
+            "client": httpx.AsyncClient(
+                timeout=httpx.Timeout(12.0, connect=5.0),
+                follow_redirects=True,
+                http2=True,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+                **self.fixtures.httpx_kwargs(),
+            ),
+            # AIMD: shrinks on 429, grows back while requests stay healthy
+            "limiter": AdaptiveLimiter(self.config, self._concurrency, "maps_rpc"),
+        }
+    
+    async def _rate_token(self) -> None:
+        """Await a google.com token (shared across jobs under worker.py); replay skips it."""
+        if self.rate_limiter is not None and self.fixtures.mode != "replay":
+            await self.rate_limiter.acquire("google.com")
+
     async def _fetch_grid_point(
         self,
         client: httpx.AsyncClient,
         niche: str,
         point: dict,
-        sem: asyncio.Semaphore,
+        limiter: AdaptiveLimiter,
         progress: dict,
         on_progress: Optional[Callable],
     ) -> list[dict]:
-        """Fetch businesses from a single grid point."""
-        async with sem:
-            # Build search query with location bias
-            query = f"{niche} near {point['lat']:.6f},{point['lng']:.6f}"
-            url = f"https://www.google.com/maps/search/{quote_plus(query)}"
-            
-            headers = self._get_headers()
-            
-            for attempt in range(2):
-                try:
-                    resp = await client.get(url, headers=headers, follow_redirects=True)
-                    
-                    if resp.status_code == 200:
+        """
+        Fetch businesses from a single grid point (one rate token and one
+        limiter slot per attempt).
+        
+        Grid pages in the response cache are parsed without a request; only
+        pages that yielded leads are stored, so a CAPTCHA page never is.
+        """
+        # Build search query with location bias
+        query = f"{niche} near {point['lat']:.6f},{point['lng']:.6f}"
+        url = f"https://www.google.com/maps/search/{quote_plus(query)}"
+        
+        headers = self._get_headers()
+        cached = await self.cache.aget(url)
+        
+        for attempt in range(2):
+            if attempt:
+                metrics.inc("scraper_retries_total", scraper="maps_rpc")
+            try:
+                if cached is not None:
+                    resp = cached
+                    _count("cache_hit")
+                else:
+                    await self._rate_token()
+                    async with limiter.slot() as ticket:
+                        with metrics.timer("scraper_fetch_seconds", scraper="maps_rpc", kind="grid"):
+                            resp = await client.get(url, headers=headers, follow_redirects=True)
+                        if resp.status_code == 429:
+                            ticket["outcome"] = "blocked"
+                    _count({200: "ok", 429: "blocked"}.get(resp.status_code, "http_error"))
+                
+                if resp.status_code == 200:
+                    with metrics.timer("scraper_parse_seconds", scraper="maps_rpc"):
                         leads = self._parse_response(resp.text)
-                        
-                        progress["done"] += 1
-                        if on_progress:
-                            try:
-                                on_progress(progress["done"], progress["total"])
-                            except Exception:
-                                pass
-                        
-                        return leads
+                    if leads and resp is not cached:
+                        await self.cache.aput(url, resp.content, resp.encoding)
                     
-                    elif resp.status_code == 429:
-                        await asyncio.sleep(2 ** attempt)
-                        continue
-                        
-                except Exception as exc:
-                    if attempt < 1:
-                        await asyncio.sleep(1)
+                    progress["done"] += 1
+                    if on_progress:
+                        try:
+                            on_progress(progress["done"], progress["total"])
+                        except Exception:
+                            pass
+                    
+                    return leads
+                
+                elif resp.status_code == 429:
+                    await asyncio.sleep(2 ** attempt)
                     continue
-            
-            progress["done"] += 1
-            return []
+                    
+            except Exception as exc:
+                _count("network_error")
+                if attempt < 1:
+                    await asyncio.sleep(1)
+                continue
+        
+        progress["done"] += 1
+        return []
     
     def _get_headers(self) -> dict:
         """Get request headers."""
@@ -226,64 +319,16 @@ class MapsRPCScraper:
         return leads
     
     def _parse_app_state(self, html: str) -> list[dict]:
-        """Parse APP_INITIALIZATION_STATE for business data."""
+        """
+        Parse APP_INITIALIZATION_STATE for business data.
+
+        Decoded once by scrapers/app_state.py; every field of a lead is read
+        from the same place-record array, so phones stay with their business.
+        """
         leads = []
-        
-        # Find the state
-        patterns = [
-            r'window\.APP_INITIALIZATION_STATE\s*=\s*(\[.+?\]);</script>',
-            r'APP_INITIALIZATION_STATE\s*=\s*(\[.+?\]);',
-        ]
-        
-        json_str = None
-        for pattern in patterns:
-            match = re.search(pattern, html, re.DOTALL)
-            if match:
-                json_str = match.group(1)
-                break
-        
-        if not json_str:
-            return leads
-        
-        try:
-            # The state is a deeply nested array
-            # Look for strings that look like business names
-            # They're typically in double quotes within the array
-            
-            # Pattern 1: Look for ["Business Name", rating, ...]
-            biz_pattern1 = r'\[\s*"([^"]{3,60}[^"])"\s*,\s*([\d.]+|null)\s*,\s*"([^"]*)"'
-            matches1 = re.findall(biz_pattern1, json_str)
-            
-            for match in matches1:
-                name = match[0].strip()
-                # Filter out non-business strings
-                if self._is_valid_business_name(name):
-                    lead = {
-                        "name": name,
-                        "rating": match[1] if match[1] != 'null' else "",
-                        "source": "Google Maps",
-                        "gmb_link": "",
-                        "niche": "",
-                    }
-                    leads.append(lead)
-            
-            # Pattern 2: Look for data with place IDs
-            # Format often includes: 0xHEX:0xHEX which is a place ID
-            place_pattern = r'0x[0-9a-fA-F]+:0x[0-9a-fA-F]+'
-            place_ids = re.findall(place_pattern, json_str)
-            
-            # Pattern 3: Extract phone numbers
-            phone_pattern = r'"(\+?\d[\d\s\-\(\)]{8,20})"'
-            phones = re.findall(phone_pattern, json_str)
-            
-            # Try to associate phones with businesses
-            for i, lead in enumerate(leads):
-                if i < len(phones):
-                    lead["phone"] = phones[i]
-            
-        except Exception as exc:
-            self.logger.debug(f"APP_INITIALIZATION_STATE parse error: {exc}")
-        
+        for record in parse_place_records(html):
+            if self._is_valid_business_name(record.name):
+                leads.append(record.to_lead())
         return leads
     
     def _extract_business_patterns(self, html: str) -> list[dict]:
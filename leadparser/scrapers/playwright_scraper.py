@@ -5,7 +5,17 @@ Speed improvements over the Selenium version
 ─────────────────────────────────────────────
 • Playwright async API — no per-request ChromeDriver startup overhead
 • Phase B uses N_WORKERS (default 4) parallel browser contexts so 4
-  business profile pages are extracted simultaneously
+  business profile pages are extracted simultaneously; they pull from one
+  shared URL queue, so a slow or stuck profile never idles the others
+• Phase A fans the niche's search terms out over phase_a_workers
+  (default 3) contexts with one shared seen-set
+• Phase A scrolling is event-driven (scrapers/feed_scroll.py): each
+  scroll step returns as soon as new result cards render, not after a
+  fixed pause
+• Each profile is read with one page.evaluate (scrapers/dom_extract.py)
+  instead of dozens of per-selector CDP round-trips
+• One Chromium per job (scrapers/browser_pool.py): warm contexts are
+  reused by Phase A and Phase B across every niche×city combination
 • playwright-stealth patches all fingerprint leaks automatically
 • Leads with no phone are instantly skipped — no supplementary lookup
 
@@ -26,10 +36,11 @@ PlaywrightGoogleMapsScraper.scrape_niche(niche, location, on_progress)
 
 import asyncio
 import logging
-import random
 import re
 import time
-from typing import Callable, Optional
+from collections import deque
+from contextlib import aclosing, asynccontextmanager
+from typing import AsyncIterator, Callable, Optional
 from urllib.parse import quote_plus, unquote
 
 logger = logging.getLogger(__name__)
@@ -65,59 +76,38 @@ async def _apply_stealth(page) -> None:
         await _stealth_legacy(page)
 
 # Import NICHE_EXPANSIONS from the Selenium scraper — no duplication
+from . import resource_blocking
+from .app_state import PlaceRecord, parse_place_payload
+from .browser_pool import BrowserPool
+from .dom_extract import PROFILE_JS, normalize_profile
+from .feed_scroll import collect_feed
 from .google_maps import NICHE_EXPANSIONS
-
-# ── User-agent pool (20+ real desktop strings) ───────────────────────────────
-USER_AGENTS = [
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36 Edg/124.0.0.0",
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36 Edg/123.0.0.0",
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_4_1) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.4.1 Safari/605.1.15",
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 13_6_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.5 Safari/605.1.15",
-    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:125.0) Gecko/20100101 Firefox/125.0",
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:124.0) Gecko/20100101 Firefox/124.0",
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 14.4; rv:125.0) Gecko/20100101 Firefox/125.0",
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36 OPR/110.0.0.0",
-    "Mozilla/5.0 (Windows NT 10.0; WOW64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 12_7_4) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
-]
-
-TIMEZONES = [
-    "America/New_York", "America/Chicago", "America/Denver",
-    "America/Los_Angeles", "America/Phoenix", "America/Detroit",
-    "America/Toronto", "America/Vancouver", "America/Edmonton",
-    "America/Calgary", "America/Montreal", "America/Boston",
-    "America/Atlanta", "America/Dallas", "America/Houston",
-    "America/Miami", "America/Denver", "America/Seattle",
-    # Note: America/Seattle is mapped to America/Los_Angeles in _get_timezone()
-]
-
-# Valid IANA timezone IDs (Seattle uses Los Angeles)
-_IANA_TIMEZONE_MAP = {
-    "America/Seattle": "America/Los_Angeles",
-}
-
-
-def _get_timezone() -> str:
-    """Return a valid IANA timezone ID."""
-    tz = random.choice(TIMEZONES)
-    # Map invalid/legacy IDs to valid IANA IDs
-    return _IANA_TIMEZONE_MAP.get(tz, tz)
+from .streaming import collect, merge_workers
+from utils.metrics import metrics
 
 _BASE_URL = "https://www.google.com/maps/search/{query}"
 
 # Phone pattern for button-text fallback extraction
 _PHONE_RE = re.compile(r"\(?\d{3}\)?[\s.\-]\d{3}[\s.\-]\d{4}")
 
+# Maps responses that carry place records (network capture, Phase A):
+# the search page itself, /search?tbm=map scroll pages, place previews
+_CAPTURE_URL_RE = re.compile(r"/maps/search/|/search\?tbm=map|/maps/preview/place")
+# Data id inside a /maps/place/ href: ...!1s0x87c…:0x3b2…!...
+_DATA_ID_RE     = re.compile(r"!1s(0x[0-9a-fA-F]+:0x[0-9a-fA-F]+)")
+
+# Phase A: dead-proxy symptoms; this many in a row → direct connection
+_PROXY_ERRORS = (
+    "ERR_CONNECTION_RESET", "ERR_EMPTY_RESPONSE",
+    "ERR_TUNNEL_CONNECTION_FAILED", "ERR_PROXY_CONNECTION_FAILED",
+)
+_PROXY_RESET_LIMIT = 3
+
+# Phase B adaptive scheduling (see _new_schedule)
+_BLOCK_URL_MARKERS = ("google.com/sorry/",)
+_ADAPT_WINDOW      = 10     # page outcomes per resize decision
+_BLOCK_RATE_LIMIT  = 0.2    # >20% blocked in the window → drop a worker
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 
@@ -136,6 +126,11 @@ class PlaywrightGoogleMapsScraper:
         self.proxy_manager = proxy_manager
         self.logger        = logging.getLogger(self.__class__.__name__)
         self._n_workers    = config["scraping"].get("workers", 4)
+        self._n_phase_a    = config["scraping"].get("phase_a_workers", 3)
+        self._session: Optional[dict] = None   # {"pool", "sem"}
+        self._capture       = config["scraping"].get("network_capture", True)
+        self._block_rules   = resource_blocking.load_rules(config)
+        self.resource_stats = resource_blocking.new_stats()   # whole job
 
     # ── Public interface (sync — matches GoogleMapsScraper) ───────────────────
 
@@ -148,189 +143,276 @@ class PlaywrightGoogleMapsScraper:
         """
         Scrape Google Maps for *niche* in *location* and return all leads.
 
-        Sync wrapper around the async implementation; safe to call from
+        Sync wrapper around scrape_niche_iter(); safe to call from
         ordinary (non-async) code in main.py.
         """
-        return asyncio.run(self._scrape_async(niche, location, on_progress))
+        return asyncio.run(
+            collect(self.scrape_niche_iter(niche, location, on_progress))
+        )
 
     # ── Async core ────────────────────────────────────────────────────────────
 
-    async def _scrape_async(
+    async def scrape_niche_iter(
         self,
         niche:       str,
         location:    dict,
-        on_progress: Optional[Callable],
-    ) -> list[dict]:
-        from playwright.async_api import async_playwright
+        on_progress: Optional[Callable] = None,
+        max_results: Optional[int] = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Yield raw leads as each profile is extracted.
+
+        With scraping.network_capture on, Phase A also decodes the place
+        payloads the browser receives while scrolling; places whose record
+        already has a phone and a website are yielded straight away and
+        only the rest are opened in Phase B.
+
+        Runs on the session browser pool when open_session() has been
+        called, otherwise starts one for this call.  *max_results* overrides
+        scraping.max_results_per_niche for this call only.  Closing the
+        generator early cancels the Phase B workers and closes their
+        contexts (and the browser, if this call launched it).
+        """
+        async with self._session_scope() as session:
+            pool = session["pool"]
 
-        headless = self.config["scraping"].get("headless", True)
+            if max_results is None:
+                max_results = self.config["scraping"].get("max_results_per_niche", 60)
 
-        launch_kwargs: dict = {
-            "headless": headless,
-            # Proxy is applied per-context, not at browser level, so a dead
-            # proxy only kills one context and we can fall back to direct.
-            "args": ["--no-sandbox", "--disable-dev-shm-usage", "--disable-gpu"],
-        }
+            # ── Phase A: search terms fanned out over K contexts ──────────────
+            self.logger.info(f"Playwright Phase A: collecting URLs for '{niche}'")
+            captured = {} if self._capture else None
+            all_urls = await self._collect_all_urls(
+                pool, niche, location, max_results, captured
+            )
+            self.logger.info(f"  Phase A complete — {len(all_urls)} unique URLs")
 
-        async with async_playwright() as pw:
-            browser = await pw.chromium.launch(**launch_kwargs)
-            try:
-                # ── Phase A: one context, sequential scroll, collect URLs ──────
-                self.logger.info(f"Playwright Phase A: collecting URLs for '{niche}'")
-                all_urls = await self._collect_all_urls(browser, niche, location)
-                self.logger.info(f"  Phase A complete — {len(all_urls)} unique URLs")
+            ready, todo = _split_captured(all_urls, captured or {}, max_results, niche)
+            if captured is not None:
+                self.logger.info(
+                    f"  Network capture: {len(captured)} place records, "
+                    f"{len(ready)} complete — {len(todo)} profiles left for Phase B"
+                )
+            for lead in ready:
+                yield lead
+
+            if not todo:
+                return
+
+            # ── Phase B: N workers pull from one shared URL queue ─────────────
+            sched = _new_schedule(todo, self._n_workers, self.config)
+            self.logger.info(
+                f"Playwright Phase B: {len(todo)} profiles "
+                f"across up to {sched['max']} parallel worker(s)"
+            )
 
-                if not all_urls:
-                    return []
+            # Shared progress counter (updated by all workers)
+            progress = {"done": 0, "total": len(todo)}
 
-                # ── Phase B: N workers extract in parallel ────────────────────
-                n        = min(self._n_workers, len(all_urls))
-                chunks   = _split_chunks(all_urls, n)
+            out     = asyncio.Queue()
+            n_leads = 0
+            async with aclosing(merge_workers(out, [
+                self._phase_b_worker(
+                    wid, pool, sched, niche, on_progress, progress, out, session["sem"]
+                )
+                for wid in range(sched["max"])
+            ])) as leads:
+                async for lead in leads:
+                    n_leads += 1
+                    yield lead
+
+            self.logger.info(
+                f"  Phase B complete — {n_leads} leads with phones "
+                f"({sched['retried']} retried, {sched['dropped']} dropped, "
+                f"{sched['blocked']} blocked; final workers: {sched['target']})"
+            )
+
+    # ── Session runtime ───────────────────────────────────────────────────────
+    # run_pipeline opens one session per job (main.py runs one job per
+    # process): Chromium launches once and every niche×city combination and
+    # retry pass borrows warm contexts from the pool.  The session semaphore
+    # caps profile extractions in flight across all concurrent combinations
+    # at scraping.workers.
+
+    async def open_session(self) -> None:
+        """Start the session browser pool; scrapes reuse it until close_session()."""
+        if self._session is None:
+            self._session = await self._launch()
+
+    async def close_session(self) -> None:
+        """Close the session browser pool, if one is open."""
+        if self._session is not None:
+            session, self._session = self._session, None
+            await session["pool"].close()
+            if self._block_rules["enabled"]:
                 self.logger.info(
-                    f"Playwright Phase B: {len(all_urls)} profiles "
-                    f"across {n} parallel worker(s)"
+                    f"Resource blocking: {resource_blocking.summary(self.resource_stats)}"
                 )
 
-                # Shared progress counter (updated by all workers)
-                progress = {"done": 0, "total": len(all_urls)}
+    @asynccontextmanager
+    async def _session_scope(self):
+        """Yield the open session, or a throwaway one for a standalone scrape."""
+        if self._session is not None:
+            yield self._session
+            return
+        session = await self._launch()
+        try:
+            yield session
+        finally:
+            await session["pool"].close()
 
-                contexts = [await self._new_context(browser) for _ in chunks]
-                try:
-                    batch_results = await asyncio.gather(*[
-                        self._extract_chunk(ctx, chunk, niche, on_progress, progress)
-                        for ctx, chunk in zip(contexts, chunks)
-                    ])
-                finally:
-                    for ctx in contexts:
-                        try:
-                            await ctx.close()
-                        except Exception:
-                            pass
-
-                leads = [lead for batch in batch_results for lead in batch]
-                self.logger.info(f"  Phase B complete — {len(leads)} leads with phones")
-                return leads
-
-            finally:
-                await browser.close()
-
-    # ── Browser context factory ───────────────────────────────────────────────
-
-    async def _new_context(self, browser, use_proxy: bool = True):
-        """Create a new browser context with a unique randomised fingerprint.
-
-        Proxy is applied at context level (not browser level) so a dead proxy
-        only affects this context and the caller can fall back to direct.
+    async def _launch(self) -> dict:
+        pool = BrowserPool(self.config, self.proxy_manager)
+        try:
+            await pool.start()
+        except Exception:
+            await pool.close()
+            raise
+        return {"pool": pool, "sem": asyncio.Semaphore(self._n_workers)}
+
+    async def _block(self, page, phase: str) -> None:
+        """Abort the requests *phase* does not need (scrapers/resource_blocking.py).
+
+        Routed per page, not per context: pooled contexts serve both phases.
         """
-        ua  = random.choice(USER_AGENTS)
-        tz  = _get_timezone()
-        ctx_kwargs: dict = {
-            "user_agent":   ua,
-            "viewport": {
-                "width":  random.randint(1280, 1920),
-                "height": random.randint(720,  1080),
-            },
-            "locale":       "en-US",
-            "timezone_id":  tz,
-            "extra_http_headers": {"Referer": "https://www.google.com/"},
-        }
-        if use_proxy and self.proxy_manager:
-            proxy_dict = self.proxy_manager.get_proxy()
-            if proxy_dict:
-                proxy_host = proxy_dict.get("http", "").replace("http://", "")
-                ctx_kwargs["proxy"] = {"server": f"http://{proxy_host}"}
-        ctx = await browser.new_context(**ctx_kwargs)
-        return ctx
+        await resource_blocking.install(page, phase, self._block_rules, self.resource_stats)
 
     # ── Phase A: URL collection ───────────────────────────────────────────────
 
     async def _collect_all_urls(
         self,
-        browser,
-        niche:    str,
-        location: dict,
+        pool:        BrowserPool,
+        niche:       str,
+        location:    dict,
+        max_results: int,
+        captured:    Optional[dict] = None,
     ) -> list[str]:
-        """One context scrolls through all search terms and collects URLs."""
-        max_results  = self.config["scraping"].get("max_results_per_niche", 60)
+        """
+        Fan the search terms out over phase_a_workers contexts and collect URLs.
+
+        Workers pop terms from one shared deque and merge into one shared
+        seen-set; once *max_results* URLs are in, the workers still
+        scrolling are cancelled.  When *captured* is a dict, every place
+        record decoded from the pages' Maps responses is stored in it by
+        data id.
+        """
         city_state   = f"{location['city']}, {location['state']}"
         expansions   = NICHE_EXPANSIONS.get(niche.lower().strip(), [])
-        search_terms = [niche] + expansions
+        terms        = deque([niche] + expansions)
+        if max_results <= 0:
+            return []
+
+        found = {
+            "seen": set(),
+            "urls": [],
+            "max":  max_results,
+            "full": asyncio.Event(),
+        }
+
+        n     = max(1, min(self._n_phase_a, len(terms)))
+        tasks = [
+            asyncio.create_task(
+                self._phase_a_worker(wid, pool, terms, city_state, found, captured)
+            )
+            for wid in range(n)
+        ]
+        full = asyncio.create_task(found["full"].wait())
+        try:
+            running = set(tasks)
+            while running and not found["full"].is_set():
+                done, running = await asyncio.wait(
+                    running | {full}, return_when=asyncio.FIRST_COMPLETED
+                )
+                running.discard(full)
+                for task in done:
+                    if task is not full:
+                        task.result()   # surface unexpected worker errors
+        finally:
+            full.cancel()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(full, *tasks, return_exceptions=True)
 
-        global_seen: set[str] = set()
-        all_urls:    list[str] = []
+        return found["urls"]
 
+    async def _phase_a_worker(
+        self,
+        wid:        int,
+        pool:       BrowserPool,
+        terms:      deque,
+        city_state: str,
+        found:      dict,
+        captured:   Optional[dict],
+    ) -> None:
+        """Scroll search terms from *terms* in one context until none are left."""
         # Start with a proxied context; fall back to direct after repeated resets.
-        use_proxy   = True
-        ctx  = await self._new_context(browser, use_proxy=use_proxy)
-        page = await ctx.new_page()
-        await _apply_stealth(page)
-        consecutive_resets = 0
-        _RESET_THRESHOLD   = 3  # switch to direct connection after this many resets
+        use_proxy = True
+        lease     = None
+        page      = None
+        resets    = 0
+        pending: set = set()
 
         try:
-            for term in search_terms:
-                remaining = max_results - len(all_urls)
-                if remaining <= 0:
-                    break
+            while terms and not found["full"].is_set():
+                term = terms.popleft()
+                if lease is None:
+                    lease = await pool.acquire(use_proxy=use_proxy)
+                    page  = await pool.new_page(lease)
+                    await self._block(page, "search")
+                    await _apply_stealth(page)
+                    _capture_places(page, captured, pending)
 
                 query = f"{term} in {city_state}"
                 url   = _BASE_URL.format(query=quote_plus(query))
-                self.logger.info(f"  Searching: '{query}'")
+                self.logger.info(f"  [A{wid}] Searching: '{query}'")
 
                 try:
-                    await page.goto(url, wait_until="domcontentloaded", timeout=30_000)
-                    await page.wait_for_timeout(2_000)
-                    consecutive_resets = 0  # successful load resets the counter
+                    await self.rate_limiter.acquire("google.com")
+                    with metrics.timer("scraper_fetch_seconds", scraper="playwright", kind="search"):
+                        await page.goto(url, wait_until="domcontentloaded", timeout=30_000)
+                    lease["pages"] += 1
+                    resets = 0  # successful load resets the counter
+                    _count("search", "ok")
                 except Exception as exc:
-                    err_str = str(exc)
+                    _count("search", "network_error")
                     self.logger.warning(f"  Could not load '{term}': {exc}")
-
                     # Detect dead-proxy symptoms and fall back to direct connection
-                    if use_proxy and any(
-                        marker in err_str
-                        for marker in ("ERR_CONNECTION_RESET", "ERR_EMPTY_RESPONSE",
-                                       "ERR_TUNNEL_CONNECTION_FAILED",
-                                       "ERR_PROXY_CONNECTION_FAILED")
-                    ):
-                        consecutive_resets += 1
-                        if consecutive_resets >= _RESET_THRESHOLD:
+                    if use_proxy and any(m in str(exc) for m in _PROXY_ERRORS):
+                        resets += 1
+                        if resets >= _PROXY_RESET_LIMIT:
                             self.logger.warning(
-                                f"  {consecutive_resets} consecutive proxy failures — "
+                                f"  {resets} consecutive proxy failures — "
                                 "switching to direct connection"
                             )
-                            await ctx.close()
+                            stale, lease = lease, None
+                            stale["healthy"] = False
+                            await pool.release(stale)
                             use_proxy = False
-                            ctx  = await self._new_context(browser, use_proxy=False)
-                            page = await ctx.new_page()
-                            await _apply_stealth(page)
-                            consecutive_resets = 0
-                            # Retry the current term with the new context
-                            try:
-                                await page.goto(url, wait_until="domcontentloaded",
-                                                timeout=30_000)
-                                await page.wait_for_timeout(2_000)
-                            except Exception as exc2:
-                                self.logger.warning(
-                                    f"  Direct connection also failed for '{term}': {exc2}"
-                                )
-                                continue
-                    else:
-                        continue
+                            resets    = 0
+                            terms.appendleft(term)   # retry it on the direct context
+                    continue
 
-                new_urls = await self._scroll_and_collect(page, remaining, global_seen)
+                remaining = found["max"] - len(found["urls"])
+                new_urls  = await self._scroll_and_collect(page, remaining, found["seen"])
+                added     = 0
                 for u in new_urls:
-                    global_seen.add(u)
-                    all_urls.append(u)
+                    if u in found["seen"] or len(found["urls"]) >= found["max"]:
+                        continue
+                    found["seen"].add(u)
+                    found["urls"].append(u)
+                    added += 1
 
                 self.logger.info(
-                    f"  '{term}': +{len(new_urls)} (total: {len(all_urls)}/{max_results})"
+                    f"  '{term}': +{added} (total: {len(found['urls'])}/{found['max']})"
                 )
-                if len(all_urls) >= max_results:
-                    break
+                if len(found["urls"]) >= found["max"]:
+                    found["full"].set()
         finally:
-            await ctx.close()
-
-        return all_urls
+            # Let in-flight response decodes land before the page goes away
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            if lease is not None:
+                await pool.release(lease)
 
     async def _scroll_and_collect(
         self,
@@ -339,12 +421,7 @@ class PlaywrightGoogleMapsScraper:
         exclude:     set,
     ) -> list[str]:
         """Scroll the results sidebar and collect new business profile URLs."""
-        pause   = self.config["scraping"].get("scroll_pause_time", 1.0)
-        max_att = self.config["scraping"].get("max_scroll_attempts", 20)
-
-        seen  = set(exclude)
-        urls  = []
-        no_new = 0
+        cfg = self.config["scraping"]
 
         # Wait for the results feed to appear
         try:
@@ -353,90 +430,108 @@ class PlaywrightGoogleMapsScraper:
             self.logger.warning("  Results feed not found — possible CAPTCHA")
             return []
 
-        for _ in range(max_att):
-            links = await page.query_selector_all("a.hfpxzc")
-            prev  = len(urls)
-
-            for link in links:
-                try:
-                    href = await link.get_attribute("href") or ""
-                    if "/maps/place/" in href and href not in seen:
-                        seen.add(href)
-                        urls.append(href)
-                except Exception:
-                    continue
-
-            if len(urls) == prev:
-                no_new += 1
-            else:
-                no_new = 0
-
-            if no_new >= 3 or len(urls) >= max_collect:
-                break
-
-            # Check end-of-results marker
-            end_reached = await page.evaluate("""
-                () => {
-                    for (const el of document.querySelectorAll('p, span')) {
-                        const t = el.textContent;
-                        if (t.includes('end of the list') ||
-                            t.includes('No more results')) return true;
-                    }
-                    return false;
-                }
-            """)
-            if end_reached:
-                self.logger.info("  Reached end of results")
-                break
-
-            # Scroll the feed panel
-            await page.evaluate("""
-                () => {
-                    const feed = document.querySelector('div[role="feed"]');
-                    if (feed) feed.scrollBy(0, 900);
-                }
-            """)
-            await page.wait_for_timeout(
-                int((pause + random.uniform(0, 0.5)) * 1_000)
-            )
-
-        return urls[:max_collect]
+        urls, end_reached = await collect_feed(
+            page, max_collect, exclude,
+            max_steps   = cfg.get("max_scroll_attempts", 20),
+            quiet_ms    = cfg.get("scroll_quiet_ms", 400),
+            max_wait_ms = cfg.get("scroll_max_wait_ms", 3_000),
+        )
+        if end_reached:
+            self.logger.info("  Reached end of results")
+        return urls
 
     # ── Phase B: parallel extraction ──────────────────────────────────────────
 
-    async def _extract_chunk(
+    async def _phase_b_worker(
         self,
-        ctx,
-        urls:          list[str],
+        wid:           int,
+        pool:          BrowserPool,
+        sched:         dict,
         niche:         str,
         on_progress:   Optional[Callable],
         progress:      dict,
-    ) -> list[dict]:
-        """Extract business data from a list of URLs using one browser context."""
-        leads = []
-        page  = await ctx.new_page()
-        await _apply_stealth(page)
-
-        for url in urls:
-            try:
-                lead = await self._extract_business(page, url, niche)
-                if lead:
-                    leads.append(lead)
-            except Exception as exc:
-                self.logger.warning(f"  Skipping {url[:60]}: {exc}")
-
-            progress["done"] += 1
-            if on_progress:
+        out:           asyncio.Queue,
+        budget:        asyncio.Semaphore,
+    ) -> None:
+        """
+        Pull profile URLs from the shared schedule until every URL is done,
+        pushing each lead onto *out* as soon as it is parsed.
+
+        Worker *wid* only takes work while wid < sched["target"], so the
+        schedule can shed or add workers as latency and block rate move.
+        Each URL gets profile_timeout seconds; a timeout, error or block
+        re-queues it (up to profile_retries times) for any worker, and the
+        worker swaps in a fresh page — or, after a block, a fresh context.
+        A context that hits the pool's recycle policy is swapped too.  Each
+        page load first awaits a google.com token from the rate limiter,
+        then holds a slot of the session-wide *budget*.
+        """
+        lease = None
+        page  = None
+        try:
+            while True:
+                job = await _next_job(sched, wid)
+                if job is None:
+                    return
+                url, attempt = job
+
+                if lease is None or pool.expired(lease):
+                    if lease is not None:
+                        stale, lease = lease, None
+                        await pool.release(stale)
+                    lease = await pool.acquire()
+                    page  = None
+                if page is None:
+                    page = await pool.new_page(lease)
+                    await self._block(page, "profile")
+                    await _apply_stealth(page)
+
+                # Per-host token bucket — awaited, so other workers keep going
+                await self.rate_limiter.acquire("google.com")
+
+                lead, failed, blocked = None, False, False
+                t0 = time.monotonic()
                 try:
-                    on_progress(progress["done"], progress["total"])
-                except Exception:
-                    pass
-
-            # Respect the configured rate limit between business pages
-            self.rate_limiter.wait()
+                    async with budget:
+                        lead = await asyncio.wait_for(
+                            self._extract_business(page, url, niche),
+                            sched["timeout"],
+                        )
+                    lease["pages"] += 1
+                    blocked = _is_blocked_page(page)
+                except Exception as exc:   # includes asyncio.TimeoutError
+                    failed = True
+                    self.logger.debug(f"  Profile attempt {attempt + 1} failed {url[:60]}: {exc!r}")
+                    await _close_quietly(page)
+                    page = None
+                elapsed = time.monotonic() - t0
+                metrics.observe("scraper_fetch_seconds", elapsed, scraper="playwright", kind="profile")
+                _count("profile", "blocked" if blocked else "error" if failed else "ok")
+
+                if blocked:
+                    lease["healthy"] = False   # retire this fingerprint
+                    stale, lease, page = lease, None, None
+                    await pool.release(stale)
+
+                retry = failed or blocked
+                if await _settle(sched, url, attempt, elapsed, retry, blocked):
+                    metrics.inc("scraper_retries_total", scraper="playwright")
+                    continue
 
-        await page.close()
-        return leads
+                if lead and not blocked:
+                    out.put_nowait(lead)
+                elif retry:
+                    self.logger.warning(f"  Skipping {url[:60]} after {attempt + 1} attempt(s)")
+
+                progress["done"] += 1
+                if on_progress:
+                    try:
+                        on_progress(progress["done"], progress["total"])
+                    except Exception:
+                        pass
+        finally:
+            if lease is not None:
+                await pool.release(lease)
 
     async def _extract_business(
         self,
@@ -444,11 +539,14 @@ class PlaywrightGoogleMapsScraper:
         url:   str,
         niche: str,
     ) -> Optional[dict]:
-        """Navigate to a business profile URL and extract all data fields."""
-        try:
-            await page.goto(url, wait_until="domcontentloaded", timeout=30_000)
-        except Exception:
-            return None
+        """
+        Navigate to a business profile URL and extract all data fields.
+
+        A failed navigation raises, so the Phase B schedule re-queues the URL
+        under its retry budget; a loaded profile without a name or phone
+        returns None and counts as done.
+        """
+        await page.goto(url, wait_until="domcontentloaded", timeout=30_000)
 
         # Wait for the name heading — confirms the detail panel loaded
         try:
@@ -456,13 +554,19 @@ class PlaywrightGoogleMapsScraper:
         except Exception:
             return None
 
-        name = await self._pw_text(page, "h1.DUwDvf", "h1")
-        if not name:
+        # Every field in one page.evaluate (scrapers/dom_extract.py)
+        with metrics.timer("scraper_parse_seconds", scraper="playwright"):
+            try:
+                fields = normalize_profile(await page.evaluate(PROFILE_JS))
+            except Exception as exc:
+                self.logger.debug(f"  Batch extract failed ({exc}) — stepwise: {url[:60]}")
+                fields = await self._extract_fields_stepwise(page)
+
+        if not fields["name"]:
             return None
 
-        # Extract phone — insta-skip if not found (no supplementary lookup)
-        phone = await self._extract_phone_pw(page)
-        if not phone:
+        # Insta-skip if no phone (no supplementary lookup)
+        if not fields["phone"]:
             self.logger.debug(f"  No phone on profile — skipping: {url[:60]}")
             return None
 
@@ -470,24 +574,45 @@ class PlaywrightGoogleMapsScraper:
             "source":          "Google Maps",
             "gmb_link":        url,
             "niche":           niche,
-            "name":            name,
-            "phone":           phone,
+            "name":            fields["name"],
+            "phone":           fields["phone"],
             "secondary_phone": "",
-            "address":         await self._extract_address_pw(page),
+            "address":         fields["address"],
             "city":            "",
             "state":           "",
             "zip":             "",
-            "hours":           await self._extract_hours_pw(page),
-            "review_count":    await self._extract_review_count_pw(page),
-            "rating":          await self._extract_rating_pw(page),
-            "website":         await self._extract_website_pw(page),
+            "hours":           fields["hours"],
+            "review_count":    fields["review_count"],
+            "rating":          fields["rating"],
+            "website":         fields["website"],
             "facebook":        "",
             "instagram":       "",
             "notes":           "",
-            "category":        await self._extract_category_pw(page),
+            "category":        fields["category"],
         }
 
-    # ── Playwright field extractors ───────────────────────────────────────────
+    # ── Playwright field extractors (stepwise fallback) ───────────────────────
+    # One awaited CDP round-trip per selector attempt.  Only used when the
+    # single PROFILE_JS evaluate fails; kept field-for-field equivalent.
+
+    async def _extract_fields_stepwise(self, page) -> dict:
+        """Same fields as normalize_profile(), one selector at a time."""
+        name = await self._pw_text(page, "h1.DUwDvf", "h1")
+        if not name:
+            return {"name": "", "phone": ""}
+        phone = await self._extract_phone_pw(page)
+        if not phone:
+            return {"name": name, "phone": ""}
+        return {
+            "name":         name,
+            "phone":        phone,
+            "address":      await self._extract_address_pw(page),
+            "hours":        await self._extract_hours_pw(page),
+            "review_count": await self._extract_review_count_pw(page),
+            "rating":       await self._extract_rating_pw(page),
+            "website":      await self._extract_website_pw(page),
+            "category":     await self._extract_category_pw(page),
+        }
 
     async def _pw_text(self, page, *selectors: str) -> str:
         """Return inner text of first matching CSS selector, or ''."""
@@ -674,14 +799,180 @@ class PlaywrightGoogleMapsScraper:
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
-def _split_chunks(lst: list, n: int) -> list[list]:
-    """Split *lst* into *n* roughly equal sublists."""
-    if not lst or n <= 0:
-        return [lst]
-    k, rem = divmod(len(lst), n)
-    chunks, i = [], 0
-    for c in range(n):
-        size = k + (1 if c < rem else 0)
-        chunks.append(lst[i: i + size])
-        i += size
-    return [c for c in chunks if c]  # drop any empty slices
+def _capture_places(page, captured: Optional[dict], pending: set) -> None:
+    """
+    Decode Maps place payloads from *page*'s responses into *captured*
+    (data id → PlaceRecord).  In-flight decode tasks are tracked in
+    *pending* — await them before releasing the page.
+    """
+    if captured is None:
+        return
+
+    async def decode(response) -> None:
+        try:
+            body = await response.text()
+        except Exception:
+            return   # navigated away / body evicted
+        for rec in parse_place_payload(body):
+            prev = captured.get(rec.data_id)
+            # Keep the richer copy: a preview payload may add the phone
+            if prev is None or (not prev.phone and rec.phone):
+                captured[rec.data_id] = rec
+
+    def on_response(response) -> None:
+        if response.status != 200 or not _CAPTURE_URL_RE.search(response.url):
+            return
+        task = asyncio.ensure_future(decode(response))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+
+    page.on("response", on_response)
+
+
+def _split_captured(
+    urls:        list[str],
+    captured:    dict,
+    max_results: int,
+    niche:       str,
+) -> tuple[list[dict], list[str]]:
+    """
+    Split Phase A output into leads ready from captured records and the
+    profile URLs Phase B must still open.
+
+    A record is complete when it has both a phone and a website.  DOM
+    hrefs are matched to records by data id; captured places the scroll
+    never rendered are added (up to *max_results* places in total) via
+    their canonical /maps/place/ URL.
+    """
+    ready: list[dict] = []
+    todo:  list[str]  = []
+    used:  set[str]   = set()
+
+    def place(url: str, rec: Optional[PlaceRecord]) -> None:
+        if rec is not None and rec.phone and rec.website:
+            lead = rec.to_lead(niche)
+            lead["gmb_link"] = url
+            ready.append(lead)
+        else:
+            todo.append(url)
+
+    for url in urls:
+        m   = _DATA_ID_RE.search(url)
+        rec = captured.get(m.group(1)) if m else None
+        if rec is not None:
+            used.add(rec.data_id)
+        place(url, rec)
+
+    for data_id, rec in captured.items():
+        if len(ready) + len(todo) >= max_results:
+            break
+        if data_id not in used:
+            place(rec.url, rec)
+
+    return ready, todo
+
+
+def _count(kind: str, result: str) -> None:
+    metrics.inc("scraper_requests_total", scraper="playwright", kind=kind, result=result)
+
+
+def _is_blocked_page(page) -> bool:
+    """True if Google redirected the page to its /sorry/ CAPTCHA interstitial."""
+    try:
+        return any(m in (page.url or "") for m in _BLOCK_URL_MARKERS)
+    except Exception:
+        return False
+
+
+async def _close_quietly(page) -> None:
+    try:
+        await page.close()
+    except Exception:
+        pass
+
+
+# ── Phase B schedule ──────────────────────────────────────────────────────────
+# A shared FIFO of (url, attempt) that every Phase B worker pulls from, so a
+# slow profile or a context stuck on a timeout holds up one URL, not a whole
+# chunk.  sched["target"] is the number of workers allowed to take work; it
+# starts at scraping.workers and is adjusted from a sliding window of
+# outcomes: a high block rate or slow pages drop a worker, a clean fast
+# window adds one back (never above scraping.workers, which is also the
+# session extraction budget).
+
+def _new_schedule(urls: list[str], workers: int, config: dict) -> dict:
+    scraping = config["scraping"]
+    n        = max(1, min(workers, len(urls)))
+    queue: deque = deque((url, 0) for url in urls)
+    return {
+        "queue":     queue,
+        "pending":   len(urls),      # URLs not yet finished or dropped
+        "target":    n,
+        "max":       n,
+        "timeout":   scraping.get("profile_timeout", 25),
+        "retries":   scraping.get("profile_retries", 1),
+        "slow_secs": scraping.get("profile_slow_secs", 10),
+        "window":    deque(maxlen=_ADAPT_WINDOW),   # (seconds, blocked)
+        "cond":      asyncio.Condition(),
+        "retried":   0,
+        "dropped":   0,
+        "blocked":   0,
+    }
+
+
+async def _next_job(sched: dict, wid: int) -> Optional[tuple[str, int]]:
+    """Wait for a URL this worker may take; None once every URL is done."""
+    async with sched["cond"]:
+        await sched["cond"].wait_for(
+            lambda: sched["pending"] == 0
+            or (wid < sched["target"] and sched["queue"])
+        )
+        if sched["pending"] == 0:
+            return None
+        return sched["queue"].popleft()
+
+
+async def _settle(
+    sched:   dict,
+    url:     str,
+    attempt: int,
+    seconds: float,
+    retry:   bool,
+    blocked: bool,
+) -> bool:
+    """
+    Record one page outcome and wake the waiting workers.
+
+    A *retry* URL goes back to the end of the queue while it has retries
+    left (returns True); otherwise the URL is finished (returns False).
+    """
+    async with sched["cond"]:
+        requeued = retry and attempt < sched["retries"]
+        if requeued:
+            sched["queue"].append((url, attempt + 1))
+            sched["retried"] += 1
+        else:
+            sched["pending"] -= 1
+            sched["dropped"] += retry
+        _adapt(sched, seconds, blocked)
+        sched["cond"].notify_all()
+    return requeued
+
+
+def _adapt(sched: dict, seconds: float, blocked: bool) -> None:
+    """Feed one outcome into the window and resize the worker target."""
+    window = sched["window"]
+    window.append((seconds, blocked))
+    sched["blocked"] += blocked
+    if len(window) < _ADAPT_WINDOW // 2:
+        return
+
+    blocks   = sum(1 for _, b in window if b)
+    avg_secs = sum(t for t, _ in window) / len(window)
+    if blocks / len(window) > _BLOCK_RATE_LIMIT or avg_secs > sched["slow_secs"]:
+        if sched["target"] > 1:
+            sched["target"] -= 1
+            window.clear()
+    elif len(window) == _ADAPT_WINDOW and not blocks and sched["target"] < sched["max"]:
+        sched["target"] += 1
+        window.clear()
@@ -0,0 +1,135 @@
+"""
+Request interception for the Playwright scrapers.
+
+The scrapers only read text from the Maps side panel, yet a full page
+load pulls map tiles, photos, fonts and analytics beacons.  install()
+routes every request of a page (or context) through a filter that
+aborts anything the current phase does not need:
+
+    stats = new_stats()
+    rules = load_rules(config)
+    await install(page, "profile", rules, stats)
+
+A request is let through when its resource type is on the phase's
+allowlist and its URL matches none of the block patterns — or when it
+matches an allow pattern, which wins over both.  Phases:
+
+    search   Phase A results feed — needs its scripts, XHR and CSS so the
+             feed renders and scrolls
+    profile  Phase B business page — needs document, scripts and XHR only
+
+Blocked requests are counted per resource type together with an
+estimate of the bytes saved (aborted requests never report a size, so
+typical sizes per type are used).  Override the defaults in config.yaml:
+
+    scraping:
+      block_resources: true
+      resource_allow:          {search: [...], profile: [...]}
+      block_url_patterns:      [...]      # added to the defaults
+      allow_url_patterns:      [...]
+"""
+
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# Resource types each phase must load (Playwright request.resource_type)
+DEFAULT_ALLOW = {
+    "search":  ("document", "script", "xhr", "fetch", "stylesheet"),
+    "profile": ("document", "script", "xhr", "fetch"),
+}
+
+# Blocked whatever their resource type: tiles, imagery, telemetry
+DEFAULT_BLOCK_PATTERNS = (
+    r"/maps/vt[/?]",                # vector / raster map tiles
+    r"/kh/v=|khms\d*\.google",      # satellite tiles
+    r"streetviewpixels|/cbk\?",     # street view
+    r"googleusercontent\.com",      # business photos
+    r"gstatic\.com/.*\.(?:png|jpe?g|gif|webp|svg|woff2?)",
+    r"google-analytics\.com|googletagmanager\.com|doubleclick\.net",
+    r"/gen_204|/log\?|/csi\?",      # client-side telemetry beacons
+)
+
+# Rough transfer size per blocked request, for the "bytes saved" estimate
+_EST_BYTES = {
+    "image":      25_000,
+    "media":      200_000,
+    "font":       40_000,
+    "stylesheet": 20_000,
+    "script":     60_000,
+    "xhr":        5_000,
+    "fetch":      5_000,
+}
+_EST_BYTES_OTHER = 2_000
+
+
+def load_rules(config: dict) -> dict:
+    """Build the per-phase rule set from scraping.* config (or the defaults)."""
+    scraping = config["scraping"]
+    allow    = {**DEFAULT_ALLOW, **scraping.get("resource_allow", {})}
+    block    = list(DEFAULT_BLOCK_PATTERNS) + list(scraping.get("block_url_patterns", []))
+    keep     = list(scraping.get("allow_url_patterns", []))
+    return {
+        "enabled":  scraping.get("block_resources", True),
+        "allow":    {phase: frozenset(types) for phase, types in allow.items()},
+        "block_re": re.compile("|".join(f"(?:{p})" for p in block)) if block else None,
+        "keep_re":  re.compile("|".join(f"(?:{p})" for p in keep)) if keep else None,
+    }
+
+
+def new_stats() -> dict:
+    return {"blocked": 0, "allowed": 0, "est_bytes_saved": 0, "by_type": {}}
+
+
+def should_block(rules: dict, phase: str, resource_type: str, url: str) -> bool:
+    """True if *url* of *resource_type* is not needed during *phase*."""
+    if rules["keep_re"] is not None and rules["keep_re"].search(url):
+        return False
+    if resource_type not in rules["allow"].get(phase, ()):
+        return True
+    return rules["block_re"] is not None and bool(rules["block_re"].search(url))
+
+
+async def install(target, phase: str, rules: dict, stats: dict) -> None:
+    """
+    Route every request of *target* (a Page or BrowserContext) through the
+    *phase* filter, counting into *stats*.  A no-op when blocking is off.
+    """
+    if not rules["enabled"]:
+        return
+
+    async def handle(route) -> None:
+        request = route.request
+        rtype   = request.resource_type
+        try:
+            if should_block(rules, phase, rtype, request.url):
+                record_blocked(stats, rtype)
+                await route.abort()
+            else:
+                stats["allowed"] += 1
+                await route.fallback()   # context routes (HAR replay) or the network
+        except Exception:
+            pass   # page/context closed mid-request
+
+    await target.route("**/*", handle)
+
+
+def record_blocked(stats: dict, resource_type: str) -> None:
+    stats["blocked"] += 1
+    stats["est_bytes_saved"] += _EST_BYTES.get(resource_type, _EST_BYTES_OTHER)
+    stats["by_type"][resource_type] = stats["by_type"].get(resource_type, 0) + 1
+
+
+def summary(stats: dict) -> str:
+    """One-line human summary for the job log."""
+    total = stats["blocked"] + stats["allowed"]
+    pct   = (100 * stats["blocked"] / total) if total else 0
+    types = ", ".join(f"{t}={n}" for t, n in sorted(
+        stats["by_type"].items(), key=lambda kv: -kv[1]
+    ))
+    return (
+        f"{stats['blocked']}/{total} requests blocked ({pct:.0f}%), "
+        f"~{stats['est_bytes_saved'] / 1_048_576:.1f} MB saved"
+        + (f" [{types}]" if types else "")
+    )
@@ -0,0 +1,117 @@
+"""
+Streaming helpers shared by the async scrapers.
+
+Every async scraper exposes
+
+    async def scrape_niche_iter(niche, location, on_progress=None, max_results=None)
+
+an async generator that yields raw lead dicts as each profile completes.
+scrape_niche() is the sync, list-returning wrapper over it, and
+run_pipeline() consumes the iterator directly so it can build, filter
+and upsert leads while the scrape is still running — and stop the scrape
+the moment it has enough.
+
+scraper_session() keeps one client / browser open across every call made
+inside it, so a job pays the TLS handshakes or Chromium launch once
+rather than once per niche×city combination.
+
+merge_workers() is the plumbing: a scraper starts its extraction
+workers, each pushes leads onto one asyncio.Queue, and the generator
+yields from that queue.  Closing the generator early (break in the
+consumer + aclosing) cancels every worker still running.
+"""
+
+import asyncio
+from contextlib import aclosing, asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Coroutine, Optional
+
+_END = object()   # posted once every worker has finished
+
+
+async def merge_workers(
+    queue:   asyncio.Queue,
+    workers: list[Coroutine],
+) -> AsyncIterator[Any]:
+    """
+    Run *workers* as tasks and yield every item they put on *queue*.
+
+    Finishes once all workers return.  A worker exception stops the
+    stream and is re-raised to the consumer; the remaining workers are
+    cancelled.  Closing the generator early cancels every worker too.
+    """
+    tasks = [asyncio.create_task(w) for w in workers]
+    if not tasks:
+        return
+    done = asyncio.gather(*tasks)
+    done.add_done_callback(lambda _: queue.put_nowait(_END))
+    try:
+        while True:
+            item = await queue.get()
+            if item is _END:
+                break
+            yield item
+        await done
+    finally:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if done.done() and not done.cancelled():
+            done.exception()   # mark retrieved when closed before the re-raise
+
+
+async def collect(leads: AsyncIterator[dict]) -> list[dict]:
+    """Drain an async lead iterator into a list (the scrape_niche() wrapper)."""
+    return [lead async for lead in leads]
+
+
+def is_async_scraper(scraper) -> bool:
+    """True if *scraper* streams natively (and can share one event loop)."""
+    return hasattr(scraper, "scrape_niche_iter")
+
+
+async def iter_scraper(
+    scraper,
+    niche:       str,
+    location:    dict,
+    on_progress: Optional[Callable] = None,
+    max_results: Optional[int] = None,
+) -> AsyncIterator[dict]:
+    """
+    Yield raw leads from any scraper.
+
+    Uses scrape_niche_iter() when the scraper has one; otherwise (the
+    legacy Selenium GoogleMapsScraper) runs the blocking scrape_niche()
+    in a worker thread and yields its list once it returns.  The legacy
+    scraper only reads its ceiling from config, so *max_results* is
+    written there for it.
+    """
+    if is_async_scraper(scraper):
+        kwargs = {"max_results": max_results} if max_results is not None else {}
+        async with aclosing(scraper.scrape_niche_iter(
+            niche, location, on_progress, **kwargs
+        )) as leads:
+            async for lead in leads:
+                yield lead
+        return
+
+    if max_results is not None:
+        scraper.config["scraping"]["max_results_per_niche"] = max_results
+    leads = await asyncio.to_thread(scraper.scrape_niche, niche, location, on_progress)
+    for lead in leads:
+        yield lead
+
+
+@asynccontextmanager
+async def scraper_session(scraper):
+    """
+    Hold the scraper's session runtime (shared client / browser) open for
+    the duration of the block.  A no-op for scrapers without one.
+    """
+    if not hasattr(scraper, "open_session"):
+        yield scraper
+        return
+    await scraper.open_session()
+    try:
+        yield scraper
+    finally:
+        await scraper.close_session()
@@ -33,6 +33,8 @@ from urllib.parse import quote_plus
 
 from .yelp_scraper import YelpScraper
 from .yellow_pages import YellowPagesScraper
+from utils.http_fixtures import open_fixtures
+from utils.response_cache import open_cache
 
 logger = logging.getLogger(__name__)
 
@@ -62,6 +64,8 @@ class SupplementaryScraper:
         self.ss_config    = config.get("supplementary_scrapers", {})
         self.session      = requests.Session()
         self.session.headers.update(_HEADERS)
+        self.cache        = open_cache(config)
+        open_fixtures(config).install_session(self.session)
 
         # Lazy-initialised sub-scrapers
         self._yelp = None
@@ -164,8 +168,10 @@ class SupplementaryScraper:
             f"{quote_plus(city.replace(' ', '-'))}-{state.upper()}/"
         )
         try:
-            self.rate_limiter.wait()
-            resp = self.session.get(url, timeout=10)
+            resp = self.cache.fetch(
+                self.session, url, timeout=10,
+                wait=lambda: self.rate_limiter.wait(host=url),
+            )
             if resp.status_code != 200:
                 return ""
             soup = BeautifulSoup(resp.text, "lxml")
@@ -220,8 +226,10 @@ class SupplementaryScraper:
         url      = f"https://html.duckduckgo.com/html/?q={quote_plus(query)}"
 
         try:
-            time.sleep(random.uniform(2, 4))
-            resp = self.session.get(url, timeout=12)
+            resp = self.cache.fetch(
+                self.session, url, timeout=12,
+                wait=lambda: time.sleep(random.uniform(2, 4)),
+            )
             if resp.status_code != 200:
                 return profiles
 
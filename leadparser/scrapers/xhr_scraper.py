@@ -7,14 +7,20 @@ Pure async HTTP — no browser launched, no DOM rendering.
 
 Phase A  URL collection
   httpx.AsyncClient GETs Google Maps search pages and extracts
-  business profile links directly from server-side-rendered HTML.
-  NICHE_EXPANSIONS drives multi-term searches (identical to other parsers).
+  business profile links from the decoded APP_INITIALIZATION_STATE
+  place records (scrapers/app_state.py), falling back to href scans
+  of the server-side-rendered HTML.
+  NICHE_EXPANSIONS drives multi-term searches (identical to other parsers);
+  up to xhr_search_concurrency terms are in flight at once.
 
 Phase B  Parallel extraction
-  asyncio.Semaphore(xhr_concurrency) governs up to 50 simultaneous
-  httpx requests to individual business profile pages.  Data is
-  extracted by regex / lightweight HTML parsing of the embedded
-  APP_INITIALIZATION_STATE JSON blob and plain HTML attributes.
+  The phases are streamed: Phase A pushes each URL onto an asyncio.Queue
+  the moment its search page is parsed, and xhr_concurrency profile
+  workers drain that queue — profile fetches start while later search
+  terms are still in flight.  Data is
+  extracted by scrapers/html_extract.py — one precompiled anchor pass
+  over the page (og meta, data-item-id / aria-label attributes,
+  APP_INITIALIZATION_STATE) followed by per-field parsers on the slices.
 
 Anti-detection measures (Bright-Data-equivalent feature set)
 ──────────────────────────────────────────────────────────────
@@ -42,20 +48,44 @@ Limitations
 • Google server-renders ~10–20 results per search term in the initial
   HTML response (the rest require JavaScript/scrolling).  NICHE_EXPANSIONS
   multiplies the number of search terms so total URL yield is comparable.
-• With very high concurrency (>50) block risk increases; reduce
-  xhr_concurrency in config.yaml if you see frequent 429s.
+• With very high concurrency (>50) block risk increases.  Profile
+  fetches run under an AIMD limiter (utils/adaptive_limiter.py) that
+  halves the requests in flight on a 429 / block page and grows back
+  one at a time; xhr_concurrency is its ceiling.
+
+Parse executor
+──────────────
+scraping.parse_executor chooses where profile HTML is parsed:
+  "inline"  — on the event loop (default)
+  "thread"  — ThreadPoolExecutor; loop stays responsive, still GIL-bound
+  "process" — ProcessPoolExecutor with scraping.parse_workers processes
+              (0 = one per core).  Response bytes are shipped to the pool
+              and a lead dict comes back, so parsing uses every core and
+              socket reads never stall behind a regex.
+The pool lives until close() / __exit__ (main.py calls it after Phase 1).
 """
 
 import asyncio
 import logging
+import os
 import random
 import re
-from typing import Callable, Optional
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import aclosing, asynccontextmanager
+from typing import AsyncIterator, Callable, Optional
 from urllib.parse import quote_plus, unquote
 
 import httpx
 
+from .app_state import canonical_place_url, parse_place_records
 from .google_maps import NICHE_EXPANSIONS
+from .html_extract import parse_business_bytes, parse_business_html
+from .streaming import collect, merge_workers
+from utils.adaptive_limiter import AdaptiveLimiter
+from utils.http_fixtures import open_fixtures
+from utils.metrics import metrics
+from utils.response_cache import CachedResponse, open_cache
 
 logger = logging.getLogger(__name__)
 
@@ -108,13 +138,29 @@ _BLOCK_RE = re.compile(
 )
 
 # Regex patterns for data extraction
-_PHONE_RE    = re.compile(r"\(?\d{3}\)?[\s.\-]?\d{3}[\s.\-]?\d{4}")
 _GMB_URL_RE  = re.compile(r'href="(/maps/place/[^"]+)"')
 _SEARCH_URL  = "https://www.google.com/maps/search/{query}"
 
+# Only the first few KB are needed for block / CAPTCHA detection
+_BLOCK_SNIFF_BYTES = 3000
+
+_PARSE_EXECUTORS = ("inline", "thread", "process")
+
+
+def _is_blocked_body(resp: httpx.Response) -> bool:
+    """Sniff the head of *resp* for CAPTCHA text without decoding the full body."""
+    head = resp.content[:_BLOCK_SNIFF_BYTES].decode(
+        resp.encoding or "utf-8", errors="ignore"
+    )
+    return bool(_BLOCK_RE.search(head))
+
 
 # ── Fingerprint generator ─────────────────────────────────────────────────────
 
+def _count(kind: str, result: str) -> None:
+    metrics.inc("scraper_requests_total", scraper="xhr", kind=kind, result=result)
+
+
 def _make_fingerprint() -> dict:
     """
     Build a consistent browser fingerprint for one scraping session.
@@ -168,7 +214,38 @@ class XHRGoogleMapsScraper:
         self.rate_limiter  = rate_limiter
         self.proxy_manager = proxy_manager
         self.logger        = logging.getLogger(self.__class__.__name__)
+        self.cache         = open_cache(config)
+        self.fixtures      = open_fixtures(config)
         self._concurrency  = config["scraping"].get("xhr_concurrency", 50)
+        self._search_concurrency = max(
+            1, config["scraping"].get("xhr_search_concurrency", 4)
+        )
+
+        self._parse_mode = str(
+            config["scraping"].get("parse_executor", "inline")
+        ).lower()
+        if self._parse_mode not in _PARSE_EXECUTORS:
+            self.logger.warning(
+                f"Unknown parse_executor '{self._parse_mode}' — using inline"
+            )
+            self._parse_mode = "inline"
+        self._parse_workers = config["scraping"].get("parse_workers", 0) or os.cpu_count() or 1
+        self._parse_pool: Optional[Executor] = None
+        self._session:    Optional[dict]     = None
+
+    # ── Context manager (main.py calls __enter__/__exit__ around Phase 1) ─────
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the parse executor, if one was started."""
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=True, cancel_futures=True)
+            self._parse_pool = None
 
     # ── Public interface (sync — matches GoogleMapsScraper) ───────────────────
 
@@ -179,17 +256,104 @@ class XHRGoogleMapsScraper:
         on_progress: Callable = None,
     ) -> list[dict]:
         """Sync wrapper — matches GoogleMapsScraper.scrape_niche() interface."""
-        return asyncio.run(self._scrape_async(niche, location, on_progress))
+        return asyncio.run(
+            collect(self.scrape_niche_iter(niche, location, on_progress))
+        )
 
     # ── Async core ────────────────────────────────────────────────────────────
 
-    async def _scrape_async(
+    async def scrape_niche_iter(
         self,
         niche:       str,
         location:    dict,
-        on_progress: Optional[Callable],
-    ) -> list[dict]:
-        """Fast XHR scraping - uses direct connection by default for reliability."""
+        on_progress: Optional[Callable] = None,
+        max_results: Optional[int] = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Yield raw leads as each profile page is parsed.
+
+        Runs on the session client when open_session() has been called,
+        otherwise on a client scoped to this call.  *max_results*
+        overrides scraping.max_results_per_niche for this call only.
+        Closing the generator early cancels every in-flight search and
+        profile fetch.
+        """
+        if max_results is None:
+            max_results = self.config["scraping"].get("max_results_per_niche", 60)
+
+        async with self._session_scope() as session:
+            # ── Phase A → Phase B, streamed through a queue ──────────────────
+            # Search terms run concurrently (search_concurrency) and push
+            # profile URLs as soon as each page is parsed; profile workers
+            # (xhr_concurrency) start fetching the moment the first URL lands.
+            self.logger.info(
+                f"XHR: streaming '{niche}' "
+                f"(search={self._search_concurrency}, profiles={self._concurrency})"
+            )
+            urls:  asyncio.Queue = asyncio.Queue()
+            out:   asyncio.Queue = asyncio.Queue()
+            progress = {"done": 0, "total": 0}
+
+            async def phase_a() -> None:
+                try:
+                    n_urls = await self._produce_urls(
+                        session, niche, location, urls, progress, max_results
+                    )
+                    self.logger.info(f"  Phase A complete — {n_urls} unique URLs")
+                finally:
+                    for _ in range(self._concurrency):
+                        urls.put_nowait(None)
+
+            workers = [phase_a()] + [
+                self._profile_worker(session, urls, out, niche, progress, on_progress)
+                for _ in range(self._concurrency)
+            ]
+            n_leads = 0
+            async with aclosing(merge_workers(out, workers)) as leads:
+                async for lead in leads:
+                    n_leads += 1
+                    yield lead
+
+        self.logger.info(f"  Phase B complete — {n_leads} leads with phones")
+
+    # ── Session runtime ───────────────────────────────────────────────────────
+    # run_pipeline opens one session for the whole job: a single pooled
+    # HTTP/2 client (one set of TLS handshakes, one cookie jar), one search
+    # semaphore and one adaptive fetch limiter, so concurrent niche×city
+    # combinations share the xhr_search_concurrency / xhr_concurrency
+    # budget instead of each getting its own.
+
+    async def open_session(self) -> None:
+        """Start the session client; scrapes reuse it until close_session()."""
+        if self._session is None:
+            self._session = self._new_session()
+
+    async def close_session(self) -> None:
+        """Close the session client, if one is open."""
+        if self._session is not None:
+            session, self._session = self._session, None
+            await self._close_session(session)
+
+    @asynccontextmanager
+    async def _session_scope(self):
+        """Yield the open session, or a throwaway one for a standalone scrape."""
+        if self._session is not None:
+            yield self._session
+            return
+        session = self._new_session()
+        try:
+            yield session
+        finally:
+            await self._close_session(session)
+
+    async def _close_session(self, session: dict) -> None:
+        await session["client"].aclose()
+        self.logger.info(f"XHR adaptive concurrency: {session['limiter'].summary()}")
+        if self.cache.enabled:
+            self.logger.info(f"XHR response cache: {self.cache.summary()}")
+
+    def _new_session(self) -> dict:
+        """Build the client, shared fingerprint state and concurrency budget."""
         fingerprint = _make_fingerprint()
         
         # Use proxy only if explicitly enabled AND available
@@ -226,156 +390,179 @@ class XHRGoogleMapsScraper:
             except Exception:
                 # Default to new API
                 client_kwargs["proxy"] = proxy_map
-        
-        async with httpx.AsyncClient(**client_kwargs) as client:
-            # ── Phase A: URL collection ──────────────────────────────────────
-            self.logger.info(f"XHR Phase A: collecting URLs for '{niche}'")
-            
-            all_urls = await self._collect_all_urls(
-                client, niche, location, fingerprint
-            )
-            self.logger.info(f"  Phase A complete — {len(all_urls)} unique URLs")
 
-            if not all_urls:
-                return []
+        # --record / --replay: response hook or offline transport
+        client_kwargs.update(self.fixtures.httpx_kwargs())
 
-            # ── Phase B: parallel extraction ─────────────────────────────────
-            self.logger.info(
-                f"XHR Phase B: {len(all_urls)} profiles "
-                f"(concurrency={self._concurrency})"
-            )
-            sem      = asyncio.Semaphore(self._concurrency)
-            progress = {"done": 0, "total": len(all_urls)}
-            tasks    = [
-                self._fetch_business(
-                    client, url, niche, sem, fingerprint, progress, on_progress
-                )
-                for url in all_urls
-            ]
-            results = await asyncio.gather(*tasks)
+        return {
+            "client":     httpx.AsyncClient(**client_kwargs),
+            # fingerprint is shared by every worker, so one rotation moves
+            # the whole session to the new identity
+            "state":      {"fingerprint": fingerprint},
+            "search_sem": asyncio.Semaphore(self._search_concurrency),
+            "limiter":    AdaptiveLimiter(self.config, self._concurrency, "xhr"),
+        }
+
+    async def _rate_token(self) -> None:
+        """
+        Await a google.com token from the rate limiter before a request.
 
-        leads = [r for r in results if r is not None]
-        self.logger.info(f"  Phase B complete — {len(leads)} leads with phones")
-        return leads
+        Inside a worker-spawned job the bucket lives in the shared budget
+        server, so every job's XHR traffic draws from one rate.  Replayed
+        fixtures never leave the machine and skip the bucket.
+        """
+        if self.rate_limiter is not None and self.fixtures.mode != "replay":
+            await self.rate_limiter.acquire("google.com")
 
     # ── Phase A: URL collection ───────────────────────────────────────────────
 
-    async def _collect_all_urls(
+    async def _produce_urls(
         self,
-        client:      httpx.AsyncClient,
+        session:     dict,
         niche:       str,
         location:    dict,
-        fingerprint: dict,
-    ) -> list[str]:
+        queue:       asyncio.Queue,
+        progress:    dict,
+        max_results: int,
+    ) -> int:
         """
-        Fetch Google Maps search pages via HTTP and extract profile URLs
-        from the server-side-rendered HTML.  Each search term typically
-        yields ~10–20 URLs; NICHE_EXPANSIONS multiplies coverage.
+        Fetch Google Maps search pages concurrently and enqueue profile URLs
+        from the server-side-rendered HTML as each page arrives.  Each search
+        term typically yields ~10–20 URLs; NICHE_EXPANSIONS multiplies
+        coverage.  Returns the number of URLs enqueued.
         """
-        max_results  = self.config["scraping"].get("max_results_per_niche", 60)
         city_state   = f"{location['city']}, {location['state']}"
         expansions   = NICHE_EXPANSIONS.get(niche.lower().strip(), [])
         search_terms = [niche] + expansions
 
-        global_seen: set[str] = set()
-        all_urls:    list[str] = []
+        sem    = session["search_sem"]
+        search = {"seen": set(), "queued": 0}
+
+        async def run_term(term: str) -> None:
+            async with sem:
+                if search["queued"] >= max_results:
+                    return
+                new_urls = await self._search_term(
+                    session["client"], term, city_state, session["state"],
+                    session["limiter"],
+                )
+                for u in new_urls:
+                    if search["queued"] >= max_results:
+                        break
+                    if u in search["seen"]:
+                        continue
+                    search["seen"].add(u)
+                    search["queued"] += 1
+                    progress["total"] += 1
+                    queue.put_nowait(u)
 
-        for term in search_terms:
-            if len(all_urls) >= max_results:
-                break
+                self.logger.info(
+                    f"  '{term}': +{len(new_urls)} "
+                    f"(total: {search['queued']}/{max_results})"
+                )
+                # Short polite pause before this slot takes the next term
+                await asyncio.sleep(random.uniform(0.5, 1.5))
 
-            query = f"{term} in {city_state}"
-            url   = _SEARCH_URL.format(query=quote_plus(query))
-            self.logger.debug(f"  XHR search: '{query}'")
+        await asyncio.gather(*(run_term(t) for t in search_terms))
+        return search["queued"]
 
-            try:
+    async def _search_term(
+        self,
+        client:     httpx.AsyncClient,
+        term:       str,
+        city_state: str,
+        state:      dict,
+        limiter:    AdaptiveLimiter,
+    ) -> list[str]:
+        """
+        GET one search page and return the profile URLs it lists.
+
+        Search pages are not fetched under *limiter* (xhr_search_concurrency
+        caps them), but a block here still shrinks the profile fetch limit.
+        A page in the response cache is used without a request.
+        """
+        query = f"{term} in {city_state}"
+        url   = _SEARCH_URL.format(query=quote_plus(query))
+        self.logger.debug(f"  XHR search: '{query}'")
+
+        try:
+            cached = await self.cache.aget(url)
+            if cached is not None:
+                _count("search", "cache_hit")
+                return self._extract_urls_from_html(cached.text, set())
+
+            await self._rate_token()
+            epoch = limiter.epoch
+            with metrics.timer("scraper_fetch_seconds", scraper="xhr", kind="search"):
                 resp = await client.get(
                     url,
                     headers={
-                        **fingerprint["headers"],
+                        **state["fingerprint"]["headers"],
                         "Referer": "https://www.google.com/",
                         "sec-fetch-site": "none",
                     },
                 )
 
-                # Block / CAPTCHA detection
-                if resp.status_code == 429 or _BLOCK_RE.search(resp.text[:3000]):
-                    self.logger.warning(
-                        f"  Blocked on search for '{term}' — rotating identity"
-                    )
-                    fingerprint = _make_fingerprint()
-                    if self.proxy_manager and proxy_map:
-                        self.proxy_manager.mark_bad({"http": proxy_map["http://"]})
-                    await asyncio.sleep(random.uniform(5, 15))
-                    continue
-                
-                # Handle non-200 responses
-                if resp.status_code != 200:
-                    self.logger.warning(
-                        f"  HTTP {resp.status_code} for '{term}'"
-                    )
-                    continue
-
-                # Debug: log a snippet of the HTML
-                html_snippet = resp.text[:2000]
-                if '/maps/place/' in html_snippet:
-                    self.logger.debug(f"  HTML contains /maps/place/ links")
-                else:
-                    self.logger.debug(f"  HTML snippet (first 500 chars): {html_snippet[:500]}")
-
-                new_urls = self._extract_urls_from_html(resp.text, global_seen)
-                for u in new_urls:
-                    global_seen.add(u)
-                    all_urls.append(u)
+            # Block / CAPTCHA detection
+            if resp.status_code == 429 or _is_blocked_body(resp):
+                _count("search", "blocked")
+                limiter.report_block(epoch)
+                self.logger.warning(
+                    f"  Blocked on search for '{term}' — rotating identity"
+                )
+                state["fingerprint"] = _make_fingerprint()
+                if self.proxy_manager:
+                    old_proxy = self._get_proxy_url()
+                    if old_proxy:
+                        self.proxy_manager.mark_bad({"http": old_proxy})
+                await asyncio.sleep(random.uniform(5, 15))
+                return []
 
-                self.logger.info(
-                    f"  '{term}': +{len(new_urls)} "
-                    f"(total: {len(all_urls)}/{max_results})"
+            # Handle non-200 responses
+            if resp.status_code != 200:
+                _count("search", "http_error")
+                self.logger.warning(
+                    f"  HTTP {resp.status_code} for '{term}'"
                 )
+                return []
 
-            except (httpx.ConnectError, httpx.TimeoutException, httpx.ProxyError) as exc:
-                self.logger.warning(f"  Connection error for '{term}': {exc}")
-                # Don't let one failed term stop the whole scrape
-                continue
-            except Exception as exc:
-                self.logger.warning(f"  XHR search failed for '{term}': {exc}")
+            _count("search", "ok")
+            html = resp.text
+            if "/maps/place/" not in html[:2000]:
+                self.logger.debug(f"  HTML snippet (first 500 chars): {html[:500]}")
 
-            # Short polite pause between search requests
-            await asyncio.sleep(random.uniform(0.5, 1.5))
+            urls = self._extract_urls_from_html(html, set())
+            if urls:
+                await self.cache.aput(url, resp.content, resp.encoding)
+            return urls
 
-        return all_urls[:max_results]
+        except (httpx.ConnectError, httpx.TimeoutException, httpx.ProxyError) as exc:
+            # Don't let one failed term stop the whole scrape
+            _count("search", "network_error")
+            self.logger.warning(f"  Connection error for '{term}': {exc}")
+        except Exception as exc:
+            self.logger.warning(f"  XHR search failed for '{term}': {exc}")
+        return []
 
     def _extract_urls_from_html(self, html: str, exclude: set) -> list[str]:
         """
         Extract /maps/place/ profile URLs from Google Maps search HTML.
         Tries multiple methods: direct links, APP_INITIALIZATION_STATE JSON, etc.
+        Both methods return canonical place_url() strings.
         """
         unique: list[str] = []
         seen_here: set[str] = set()
         
-        # Method 1: Extract from APP_INITIALIZATION_STATE JSON
-        # This contains the actual place data as a JavaScript variable
+        # Method 1: place records decoded from APP_INITIALIZATION_STATE
         try:
-            # Find the APP_INITIALIZATION_STATE
-            match = re.search(r'window\.APP_INITIALIZATION_STATE\s*=\s*(\[.+?\]);</script>', html, re.DOTALL)
-            if not match:
-                match = re.search(r'APP_INITIALIZATION_STATE\s*=\s*(\[.+?\]);', html, re.DOTALL)
-            
-            if match:
-                json_str = match.group(1)
-                # Look for place IDs (ludocid) and fids in the JSON
-                # Format: "https://www.google.com/maps/place/.../data=!4m2!3m1!1s0x..."
-                place_urls = re.findall(r'(https://www\.google\.com/maps/place/[^"\\]+)', json_str)
-                for url in place_urls:
-                    # Clean up escaped characters
-                    url = url.replace('\\u003d', '=').replace('\\u0026', '&').replace('\\', '')
-                    # Strip data parameters
-                    clean = re.split(r"(?=/data=)", url)[0]
-                    if "/maps/place/" in clean and clean not in exclude and clean not in seen_here:
-                        seen_here.add(clean)
-                        unique.append(url)
-                
-                self.logger.debug(f"Extracted {len(unique)} URLs from APP_INITIALIZATION_STATE")
+            # Record URLs carry the data id, so same-named branches stay distinct
+            for record in parse_place_records(html):
+                url = record.url
+                if url not in exclude and url not in seen_here:
+                    seen_here.add(url)
+                    unique.append(url)
+
+            self.logger.debug(f"Extracted {len(unique)} URLs from APP_INITIALIZATION_STATE")
         except Exception as exc:
             self.logger.debug(f"APP_INITIALIZATION_STATE extraction failed: {exc}")
         
@@ -395,71 +582,101 @@ class XHRGoogleMapsScraper:
             for path in all_paths:
                 if "/maps/place/" not in path:
                     continue
-                if path.startswith('http'):
-                    full = path
-                else:
-                    full = f"https://www.google.com{path}"
-                clean = re.split(r"(?=/data=)", full)[0]
-                if clean not in exclude and clean not in seen_here:
-                    seen_here.add(clean)
-                    unique.append(full)
+                # Same string a decoded record gives, so `seen` / gmb_link
+                # dedup match a place found by either method
+                url = canonical_place_url(path)
+                if url not in exclude and url not in seen_here:
+                    seen_here.add(url)
+                    unique.append(url)
         
         return unique
 
     # ── Phase B: business extraction ──────────────────────────────────────────
 
-    async def _fetch_business(
+    async def _profile_worker(
         self,
-        client:      httpx.AsyncClient,
-        url:         str,
+        session:     dict,
+        urls:        asyncio.Queue,
+        out:         asyncio.Queue,
         niche:       str,
-        sem:         asyncio.Semaphore,
-        fingerprint: dict,
         progress:    dict,
         on_progress: Optional[Callable],
-    ) -> Optional[dict]:
-        """Fetch one business profile and parse it; respects the semaphore."""
-        async with sem:
-            result = await self._fetch_with_retry(client, url, niche, fingerprint)
+    ) -> None:
+        """
+        Pull profile URLs off *urls* until a None sentinel; push leads to *out*.
+        Each request holds a slot of the session-wide adaptive limiter.
+        """
+        while True:
+            url = await urls.get()
+            if url is None:
+                return
+            result = await self._fetch_with_retry(
+                session["client"], url, niche, session["state"], session["limiter"]
+            )
+            if result is not None:
+                out.put_nowait(result)
             progress["done"] += 1
             if on_progress:
                 try:
                     on_progress(progress["done"], progress["total"])
                 except Exception:
                     pass
-            return result
 
     async def _fetch_with_retry(
         self,
         client:      httpx.AsyncClient,
         url:         str,
         niche:       str,
-        fingerprint: dict,
+        state:       dict,
+        limiter:     AdaptiveLimiter,
         max_retries: int = 4,
     ) -> Optional[dict]:
         """
         GET a business page with retry + identity rotation on block.
         Back-off schedule: ~1s, ~2s, ~4s, ~8s between attempts.
+        state["fingerprint"] is shared by every worker, so one rotation
+        moves the whole session to the new identity.
+
+        Each attempt takes a google.com rate token, then holds a *limiter*
+        slot only for the GET itself; blocks and network errors are reported
+        to it, and back-off sleeps do not occupy a slot.  A page in the
+        response cache skips the network.
         """
+        cached = await self.cache.aget(url)
+        if cached is not None:
+            _count("profile", "cache_hit")
+            return await self._parse_response(cached, url, niche)
+
         for attempt in range(max_retries):
+            if attempt:
+                metrics.inc("scraper_retries_total", scraper="xhr")
             try:
-                resp = await client.get(
-                    url,
-                    headers={
-                        **fingerprint["headers"],
-                        "Referer":        "https://www.google.com/maps/",
-                        "sec-fetch-site": "same-origin",
-                    },
-                )
+                await self._rate_token()
+                async with limiter.slot() as ticket:
+                    with metrics.timer("scraper_fetch_seconds", scraper="xhr", kind="profile"):
+                        resp = await client.get(
+                            url,
+                            headers={
+                                **state["fingerprint"]["headers"],
+                                "Referer":        "https://www.google.com/maps/",
+                                "sec-fetch-site": "same-origin",
+                            },
+                        )
+                    blocked = resp.status_code == 429 or _is_blocked_body(resp)
+                    if blocked:
+                        ticket["outcome"] = "blocked"
+                    elif resp.status_code >= 500:
+                        ticket["outcome"] = "error"
 
                 # Block / CAPTCHA detection
-                if resp.status_code == 429 or _BLOCK_RE.search(resp.text[:3000]):
+                if blocked:
+                    _count("profile", "blocked")
                     backoff = (2 ** attempt) + random.uniform(0, 1)
                     self.logger.warning(
                         f"  Blocked (attempt {attempt+1}/{max_retries}) — "
                         f"rotating identity, waiting {backoff:.1f}s"
                     )
-                    fingerprint = _make_fingerprint()
+                    state["fingerprint"] = _make_fingerprint()
                     if self.proxy_manager:
                         # Mark current proxy bad so next rotation skips it
                         old_proxy = self._get_proxy_url()
@@ -471,14 +688,18 @@ class XHRGoogleMapsScraper:
                     continue
 
                 if resp.status_code != 200:
+                    _count("profile", "http_error")
                     self.logger.debug(
                         f"  HTTP {resp.status_code} for {url[:60]}"
                     )
                     return None
 
-                return self._parse_business_html(resp.text, url, niche)
+                _count("profile", "ok")
+                await self.cache.aput(url, resp.content, resp.encoding)
+                return await self._parse_response(resp, url, niche)
 
             except (httpx.TimeoutException, httpx.ConnectError) as exc:
+                _count("profile", "network_error")
                 backoff = (2 ** attempt) + random.uniform(0, 1)
                 self.logger.warning(
                     f"  Network error (attempt {attempt+1}): {exc} "
@@ -495,6 +716,56 @@ class XHRGoogleMapsScraper:
 
     # ── HTML parser ───────────────────────────────────────────────────────────
 
+    async def _parse_response(
+        self,
+        resp:  httpx.Response | CachedResponse,
+        url:   str,
+        niche: str,
+    ) -> Optional[dict]:
+        """Parse a profile response on the configured parse executor."""
+        with metrics.timer("scraper_parse_seconds", scraper="xhr"):
+            return await self._parse_on_executor(resp, url, niche)
+
+    async def _parse_on_executor(
+        self,
+        resp:  httpx.Response | CachedResponse,
+        url:   str,
+        niche: str,
+    ) -> Optional[dict]:
+        if self._parse_mode == "inline":
+            return self._parse_business_html(resp.text, url, niche)
+
+        loop = asyncio.get_running_loop()
+        pool = self._get_parse_pool()
+        try:
+            return await loop.run_in_executor(
+                pool, parse_business_bytes,
+                resp.content, resp.encoding or "utf-8", url, niche,
+            )
+        except BrokenProcessPool:
+            # A worker died (OOM / killed) — fall back to inline for the rest
+            if self._parse_pool is pool:
+                self.logger.warning("  Parse process pool broke — falling back to inline")
+                self._parse_pool = None
+                self._parse_mode = "inline"
+                pool.shutdown(wait=False, cancel_futures=True)
+            return self._parse_business_html(resp.text, url, niche)
+
+    def _get_parse_pool(self) -> Executor:
+        """Lazily start the thread / process pool for profile parsing."""
+        if self._parse_pool is None:
+            if self._parse_mode == "process":
+                self._parse_pool = ProcessPoolExecutor(max_workers=self._parse_workers)
+            else:
+                self._parse_pool = ThreadPoolExecutor(
+                    max_workers=self._parse_workers,
+                    thread_name_prefix="xhr-parse",
+                )
+            self.logger.info(
+                f"XHR parse executor: {self._parse_mode} × {self._parse_workers}"
+            )
+        return self._parse_pool
+
     def _parse_business_html(
         self,
         html:  str,
@@ -504,169 +775,14 @@ class XHRGoogleMapsScraper:
         """
         Extract all business fields from raw Google Maps business page HTML.
 
-        Strategy (in order):
-          1. Regex-parse embedded APP_INITIALIZATION_STATE JSON for structured data.
-          2. data-item-id / aria-label attribute patterns (reliable anchors).
-          3. Open Graph meta tags (og:title, og:description).
-          4. Broad regex patterns on raw HTML text.
+        Delegates to scrapers/html_extract.py, which finds every anchor
+        (og meta, data-item-id / aria-label attributes, tel: links,
+        APP_INITIALIZATION_STATE) in a single precompiled pass and runs the
+        per-field parsers on those slices only.
 
         Returns None if no phone is found (insta-skip).
         """
-        # Phone is the gate — skip immediately if absent
-        phone = self._parse_phone(html)
-        if not phone:
-            return None
-
-        name = self._parse_name(html)
-        if not name:
-            return None
-
-        rating, review_count = self._parse_rating_reviews(html)
-
-        return {
-            "source":          "Google Maps (XHR)",
-            "gmb_link":        url,
-            "niche":           niche,
-            "name":            name,
-            "phone":           phone,
-            "secondary_phone": "",
-            "address":         self._parse_address(html),
-            "city":            "",
-            "state":           "",
-            "zip":             "",
-            "hours":           self._parse_hours(html),
-            "review_count":    review_count,
-            "rating":          rating,
-            "website":         self._parse_website(html),
-            "facebook":        "",
-            "instagram":       "",
-            "notes":           "",
-            "category":        self._parse_category(html),
-        }
-
-    # ── Field parsers (regex / attribute extraction) ──────────────────────────
-
-    def _parse_phone(self, html: str) -> str:
-        # Strategy 1: tel: links (most reliable)
-        for raw in re.findall(r'href="tel:([^"]+)"', html):
-            phone = raw.strip().replace("%20", " ")
-            if _PHONE_RE.search(phone) or re.search(r"\+?\d{7,}", phone):
-                return phone
-
-        # Strategy 2: data-item-id="phone:tel:..."
-        for raw in re.findall(r'data-item-id="phone:tel:([^"]+)"', html):
-            cleaned = raw.strip()
-            if cleaned:
-                return cleaned
-
-        # Strategy 3: aria-label="Phone: ..."
-        for raw in re.findall(r'aria-label="Phone:\s*([^"]+)"', html):
-            if _PHONE_RE.search(raw):
-                return raw.strip()
-
-        # Strategy 4: broad phone-pattern scan
-        phones = _PHONE_RE.findall(html)
-        if phones:
-            return phones[0]
-
-        return ""
-
-    def _parse_name(self, html: str) -> str:
-        # Open Graph title (most reliable — Google sets it to business name)
-        og = re.search(r'<meta property="og:title"\s+content="([^"]+)"', html)
-        if og:
-            name = og.group(1).strip()
-            name = re.split(r"\s*[·\-]\s*Google Maps", name)[0].strip()
-            if name:
-                return name
-
-        # <title> fallback
-        title_m = re.search(r"<title>([^<]+)</title>", html)
-        if title_m:
-            name = title_m.group(1).strip()
-            name = re.split(r"\s*[·\-]\s*Google Maps", name)[0].strip()
-            if name and name.lower() != "google maps":
-                return name
-
-        # h1 if rendered in static HTML
-        h1_m = re.search(r"<h1[^>]*>([^<]+)</h1>", html)
-        if h1_m:
-            return h1_m.group(1).strip()
-
-        return ""
-
-    def _parse_rating_reviews(self, html: str) -> tuple[str, int]:
-        rating  = ""
-        reviews = 0
-
-        # "4.8 stars" pattern in aria-labels
-        r_m = re.search(r'"(\d+\.?\d*)\s+stars?"', html)
-        if r_m:
-            rating = r_m.group(1)
-
-        # "(123 reviews)" pattern
-        rev_m = re.search(r'"([\d,]+)\s+reviews?"', html)
-        if rev_m:
-            try:
-                reviews = int(rev_m.group(1).replace(",", ""))
-            except ValueError:
-                pass
-
-        # Fallback: "4.8(123)" compact pattern
-        if not rating:
-            pair = re.search(r"(\d+\.?\d+)\s*\(([\d,]+)\)", html)
-            if pair:
-                rating = pair.group(1)
-                try:
-                    reviews = int(pair.group(2).replace(",", ""))
-                except ValueError:
-                    pass
-
-        return rating, reviews
-
-    def _parse_address(self, html: str) -> str:
-        # aria-label attribute on the address button
-        m = re.search(
-            r'data-item-id="address"[^>]*aria-label="Address:\s*([^"]+)"', html
-        )
-        if m:
-            return m.group(1).strip()
-
-        # schema.org streetAddress
-        schema = re.search(r'"streetAddress"\s*:\s*"([^"]+)"', html)
-        if schema:
-            return schema.group(1).strip()
-
-        return ""
-
-    def _parse_hours(self, html: str) -> str:
-        h_m = re.search(
-            r'aria-label="([^"]*(?:Open|Closed)[^"]*hours[^"]*)"', html, re.I
-        )
-        if h_m and len(h_m.group(1)) > 10:
-            return h_m.group(1).split(";")[0].strip()
-        return ""
-
-    def _parse_website(self, html: str) -> str:
-        # data-item-id="authority" href (the "Visit website" button)
-        web_m = re.search(
-            r'data-item-id="authority"[^>]*href="([^"]+)"', html
-        )
-        if web_m:
-            return web_m.group(1).strip()
-
-        # OG URL — skip if it's a Google domain
-        og_url = re.search(r'<meta property="og:url"\s+content="([^"]+)"', html)
-        if og_url and "google.com" not in og_url.group(1):
-            return og_url.group(1).strip()
-
-        return ""
-
-    def _parse_category(self, html: str) -> str:
-        cat_m = re.search(r'"category"\s*:\s*"([^"]+)"', html)
-        if cat_m:
-            return cat_m.group(1).strip()
-        return ""
+        return parse_business_html(html, url, niche)
 
     # ── Proxy helper ──────────────────────────────────────────────────────────
 
@@ -13,6 +13,9 @@ import random
 import requests
 from bs4 import BeautifulSoup
 
+from utils.http_fixtures import open_fixtures
+from utils.response_cache import open_cache
+
 logger = logging.getLogger(__name__)
 
 _HEADERS = {
@@ -48,6 +51,8 @@ class YellowPagesScraper:
         self.rate_limiter = rate_limiter
         self.session      = requests.Session()
         self.session.headers.update(_HEADERS)
+        self.cache        = open_cache(config)
+        open_fixtures(config).install_session(self.session)
 
     # ── Public API ────────────────────────────────────────────────────
 
@@ -79,8 +84,10 @@ class YellowPagesScraper:
         )
 
         try:
-            self.rate_limiter.wait()
-            resp = self.session.get(url, timeout=12)
+            resp = self.cache.fetch(
+                self.session, url, timeout=12,
+                wait=lambda: self.rate_limiter.wait(host="yellowpages.com"),
+            )
             resp.raise_for_status()
         except Exception as exc:
             logger.debug(f"Yellow Pages request failed: {exc}")
@@ -126,8 +133,10 @@ class YellowPagesScraper:
         )
 
         try:
-            time.sleep(random.uniform(1.5, 3.0))
-            resp = self.session.get(url, timeout=12)
+            resp = self.cache.fetch(
+                self.session, url, timeout=12,
+                wait=lambda: time.sleep(random.uniform(1.5, 3.0)),
+            )
             resp.raise_for_status()
         except Exception as exc:
             logger.debug(f"White Pages request failed: {exc}")
@@ -167,8 +176,10 @@ class YellowPagesScraper:
         )
 
         try:
-            time.sleep(random.uniform(1.5, 3.0))
-            resp = self.session.get(url, timeout=12)
+            resp = self.cache.fetch(
+                self.session, url, timeout=12,
+                wait=lambda: time.sleep(random.uniform(1.5, 3.0)),
+            )
             resp.raise_for_status()
         except Exception as exc:
             logger.debug(f"BBB request failed: {exc}")
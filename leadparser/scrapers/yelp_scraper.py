@@ -18,6 +18,9 @@ import random
 import requests
 from bs4 import BeautifulSoup
 
+from utils.http_fixtures import open_fixtures
+from utils.response_cache import open_cache
+
 logger = logging.getLogger(__name__)
 
 # Realistic headers to avoid simple bot blocks
@@ -53,6 +56,8 @@ class YelpScraper:
         self.rate_limiter = rate_limiter
         self.session      = requests.Session()
         self.session.headers.update(_HEADERS)
+        self.cache        = open_cache(config)
+        open_fixtures(config).install_session(self.session)
 
     # ── Public API ────────────────────────────────────────────────────
 
@@ -70,8 +75,10 @@ class YelpScraper:
         )
 
         try:
-            self.rate_limiter.wait()
-            resp = self.session.get(search_url, timeout=12)
+            resp = self.cache.fetch(
+                self.session, search_url, timeout=12,
+                wait=lambda: self.rate_limiter.wait(host="yelp.com"),
+            )
             resp.raise_for_status()
         except Exception as exc:
             logger.warning(f"Yelp search request failed for '{business_name}': {exc}")
@@ -102,8 +109,10 @@ class YelpScraper:
         profiles = {"facebook": "", "instagram": ""}
 
         try:
-            self.rate_limiter.wait()
-            resp = self.session.get(search_url, timeout=12)
+            resp = self.cache.fetch(
+                self.session, search_url, timeout=12,
+                wait=lambda: self.rate_limiter.wait(host="yelp.com"),
+            )
             resp.raise_for_status()
         except Exception:
             return profiles
@@ -113,8 +122,7 @@ class YelpScraper:
             return profiles
 
         try:
-            time.sleep(random.uniform(*self.SESSION_PAUSE))
-            resp2 = self.session.get(detail_url, timeout=12)
+            resp2 = self.cache.fetch(self.session, detail_url, timeout=12, wait=self._pause)
             soup  = BeautifulSoup(resp2.text, "lxml")
 
             for a_tag in soup.find_all("a", href=True):
@@ -130,6 +138,9 @@ class YelpScraper:
 
     # ── Private helpers ───────────────────────────────────────────────
 
+    def _pause(self) -> None:
+        time.sleep(random.uniform(*self.SESSION_PAUSE))
+
     def _find_best_match_url(self, html: str, business_name: str) -> str:
         """
         Parse the Yelp search results page and return the URL of the
@@ -166,8 +177,7 @@ class YelpScraper:
     def _extract_phone_from_detail(self, url: str, business_name: str) -> str:
         """Fetch a Yelp business page and extract the phone number."""
         try:
-            time.sleep(random.uniform(*self.SESSION_PAUSE))
-            resp = self.session.get(url, timeout=12)
+            resp = self.cache.fetch(self.session, url, timeout=12, wait=self._pause)
             resp.raise_for_status()
         except Exception as exc:
             logger.warning(f"Yelp detail page fetch failed ({url}): {exc}")
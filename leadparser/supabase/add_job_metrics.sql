@@ -0,0 +1,8 @@
+-- Migration: add metrics column to scraper_jobs
+-- Run this in the Supabase SQL Editor.
+-- main.py stores each run's utils/metrics.py summary here when it finishes:
+--   {"counters": {"leads_total{stage=passed}": 48, ...},
+--    "timers":   {"phase_seconds{phase=scrape}": {"count": 1, "sum": 212.4, ...}, ...}}
+
+ALTER TABLE scraper_jobs
+  ADD COLUMN IF NOT EXISTS metrics JSONB;
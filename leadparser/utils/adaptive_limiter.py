@@ -0,0 +1,213 @@
+"""
+Adaptive Limiter — AIMD concurrency control for the async HTTP scrapers.
+
+xhr_concurrency used to be a fixed semaphore size: when Google started
+answering 429 / CAPTCHA pages the scrapers kept the same number of
+requests in flight until their retries ran out.  AdaptiveLimiter replaces
+that semaphore with a limit that moves:
+
+  • additive increase — after every `limit` completed requests, if that
+    window had ≤ 5% errors and its mean latency stayed under
+    scraping.adaptive_latency_target, the limit grows by one
+  • multiplicative decrease — a blocked request (429 or block page)
+    halves the limit, once per "epoch": requests that started before the
+    last decrease cannot trigger another one
+
+The limit starts at scraping.adaptive_start and stays between
+scraping.adaptive_min and the scraper's own ceiling (xhr_concurrency).
+With scraping.adaptive_concurrency: false it is pinned at the ceiling and
+behaves exactly like the old semaphore.
+
+Usage:
+    limiter = AdaptiveLimiter(config, ceiling=50, name="xhr")
+    async with limiter.slot() as ticket:
+        resp = await client.get(url)
+        if resp.status_code == 429:
+            ticket["outcome"] = "blocked"
+
+limiter.stats holds the current limit and counters for logging; the
+limit is also published as the adaptive_limit{limiter=<name>} gauge in
+utils/metrics.py, so it lands in the run summary and --metrics-file.
+
+Inside a job spawned by worker.py each slot also holds one of the
+worker's scraping.shared_concurrency slots (utils/shared_budget.py), so
+all jobs together never have more than that many requests in flight.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager, nullcontext
+from typing import AsyncIterator
+
+from utils.metrics import metrics
+from utils.shared_budget import get_client
+
+logger = logging.getLogger(__name__)
+
+_DECREASE_FACTOR = 0.5    # multiplicative decrease on a block
+_MAX_ERROR_RATE  = 0.05   # window error rate that still counts as healthy
+
+
+class AdaptiveLimiter:
+    """
+    Async concurrency limiter whose limit follows AIMD.
+
+    Slots are handed out in FIFO order.  Each slot yields a ticket dict;
+    the caller sets ticket["outcome"] to "blocked" or "error" when the
+    request went wrong (an exception escaping the block counts as
+    "error", cancellation is not counted at all).
+    """
+
+    def __init__(self, config: dict, ceiling: int, name: str = "fetch"):
+        cfg = config["scraping"]
+        self.name           = name
+        self.enabled        = bool(cfg.get("adaptive_concurrency", True))
+        self.max_limit      = max(1, int(ceiling))
+        self.min_limit      = max(1, min(int(cfg.get("adaptive_min", 2)), self.max_limit))
+        self.latency_target = float(cfg.get("adaptive_latency_target", 4.0))
+
+        start = int(cfg.get("adaptive_start", 10)) if self.enabled else self.max_limit
+        self.limit = min(max(start, self.min_limit), self.max_limit)
+        self.epoch = 0
+
+        self._shared    = get_client()
+        self._in_flight = 0
+        self._waiters: deque = deque()
+        self._window    = {"ok": 0, "errors": 0, "latency": 0.0}
+        self.stats      = {
+            "limit":     self.limit,
+            "peak":      0,          # most requests in flight at once
+            "ok":        0,
+            "errors":    0,
+            "blocked":   0,
+            "increases": 0,
+            "decreases": 0,
+        }
+        self._publish()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    # ── Slots ─────────────────────────────────────────────────────────
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[dict]:
+        """Hold one request slot; yields the ticket to record its outcome on."""
+        await self._acquire()
+        ticket = {"epoch": self.epoch, "start": time.monotonic(), "outcome": "ok"}
+        try:
+            async with self._shared.slot() if self._shared else nullcontext():
+                ticket["start"] = time.monotonic()   # latency excludes the shared queue
+                yield ticket
+        except asyncio.CancelledError:
+            ticket["outcome"] = None
+            raise
+        except Exception:
+            ticket["outcome"] = "error"
+            raise
+        finally:
+            self._in_flight -= 1
+            self._record(ticket, time.monotonic() - ticket["start"])
+            self._wake()
+
+    async def _acquire(self) -> None:
+        if self._in_flight < self.limit and not self._waiters:
+            self._take()
+            return
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # The slot was handed over just as we were cancelled
+                self._in_flight -= 1
+                self._wake()
+            raise
+
+    def _take(self) -> None:
+        self._in_flight += 1
+        self.stats["peak"] = max(self.stats["peak"], self._in_flight)
+
+    def _wake(self) -> None:
+        """Hand free slots to waiters, oldest first."""
+        while self._waiters and self._in_flight < self.limit:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                self._take()
+                fut.set_result(None)
+
+    # ── AIMD ──────────────────────────────────────────────────────────
+
+    def report_block(self, epoch: int) -> None:
+        """
+        Record a block seen by a request started in *epoch*.
+
+        Only blocks from the current epoch shrink the limit, so one burst
+        of 429s answered to the same wave of requests halves it once.
+        """
+        self.stats["blocked"] += 1
+        if not self.enabled or epoch != self.epoch:
+            return
+        old        = self.limit
+        self.limit = max(self.min_limit, int(self.limit * _DECREASE_FACTOR))
+        self.epoch += 1
+        self._reset_window()
+        self.stats["decreases"] += 1
+        self._publish()
+        logger.warning(f"Adaptive concurrency ({self.name}): blocked — limit {old} → {self.limit}")
+
+    def _record(self, ticket: dict, latency: float) -> None:
+        outcome = ticket["outcome"]
+        if outcome is None:
+            return
+        if outcome == "blocked":
+            self.report_block(ticket["epoch"])
+            return
+
+        window = self._window
+        if outcome == "error":
+            window["errors"]      += 1
+            self.stats["errors"]  += 1
+        else:
+            window["ok"]          += 1
+            window["latency"]     += latency
+            self.stats["ok"]      += 1
+
+        if window["ok"] + window["errors"] >= self.limit:
+            self._adjust()
+
+    def _adjust(self) -> None:
+        """Close the window: grow by one if it was healthy."""
+        window  = self._window
+        total   = window["ok"] + window["errors"]
+        latency = window["latency"] / window["ok"] if window["ok"] else 0.0
+        healthy = (
+            window["errors"] / total <= _MAX_ERROR_RATE
+            and latency <= self.latency_target
+        )
+        self._reset_window()
+        if self.enabled and healthy and self.limit < self.max_limit:
+            self.limit += 1
+            self.stats["increases"] += 1
+            self._publish()
+            logger.debug(f"Adaptive concurrency ({self.name}): limit → {self.limit}")
+            self._wake()
+
+    def _publish(self) -> None:
+        self.stats["limit"] = self.limit
+        metrics.set("adaptive_limit", self.limit, limiter=self.name)
+
+    def _reset_window(self) -> None:
+        self._window = {"ok": 0, "errors": 0, "latency": 0.0}
+
+    def summary(self) -> str:
+        s = self.stats
+        return (
+            f"limit {s['limit']} (range {self.min_limit}–{self.max_limit}, peak {s['peak']} "
+            f"in flight) — {s['ok']} ok, {s['errors']} errors, {s['blocked']} blocked; "
+            f"{s['increases']} increases, {s['decreases']} decreases"
+        )
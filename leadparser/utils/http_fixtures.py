@@ -0,0 +1,237 @@
+"""
+HTTP Fixtures — record live responses once, replay them offline.
+
+`main.py --record DIR` saves every response the scrapers receive;
+`main.py --replay DIR` serves them back without touching the network, so
+the whole run_pipeline can be benchmarked, profiled and regression-tested
+on a laptop with no connection:
+
+  httpx (XHR, MapsRPC)      record: response event hook
+                            replay: ReplayTransport in place of the network
+  requests (Yelp, Yellow    record: session response hook
+  Pages, 411, DuckDuckGo)   replay: ReplayAdapter mounted on the session
+  Playwright contexts       record: one HAR archive per context (har/*.zip)
+                            replay: context.route_from_har() over every
+                            archive; anything not in them is aborted
+
+Layout of DIR:
+    http/<key>.json   method, url, status, content-type / location
+    http/<key>.body   decoded response body
+    har/*.zip         Playwright HAR archives
+
+<key> is the SHA-256 of the method and the normalized URL (the same
+normalization as utils/response_cache.py), so tracking parameters and
+query order do not cause misses.  A miss during replay is answered with
+a 404 and counted.  Replayed HTTP responses wait latency_ms first
+(--replay-latency) to simulate the network; Playwright replay has no
+added latency.
+
+Usage:
+    fixtures = open_fixtures(config)             # off → every hook is a no-op
+    httpx.AsyncClient(**kwargs, **fixtures.httpx_kwargs())
+    fixtures.install_session(requests_session)
+    ctx = await browser.new_context(**kwargs, **fixtures.context_kwargs())
+    await fixtures.install_context(ctx)
+"""
+
+import asyncio
+import glob
+import hashlib
+import itertools
+import json
+import logging
+import os
+import time
+from typing import Optional
+
+import httpx
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from utils.response_cache import normalize_url
+
+logger = logging.getLogger(__name__)
+
+_KEPT_HEADERS = ("content-type", "location")
+
+
+def fixture_key(method: str, url: str) -> str:
+    return hashlib.sha256(f"{method.upper()} {normalize_url(url)}".encode()).hexdigest()
+
+
+class HttpFixtures:
+    """Recorder / replayer for one fixture directory; mode None = off."""
+
+    def __init__(self, config: dict):
+        cfg = config.get("fixtures") or {}
+        self.mode       = cfg.get("mode") if cfg.get("mode") in ("record", "replay") else None
+        self.dir        = cfg.get("dir", "fixtures")
+        self.latency    = max(0.0, float(cfg.get("latency_ms", 0))) / 1000
+        self.http_dir   = os.path.join(self.dir, "http")
+        self.har_dir    = os.path.join(self.dir, "har")
+        self.stats      = {"recorded": 0, "replayed": 0, "misses": 0}
+        self._har_ids   = itertools.count(1)
+        if self.mode == "record":
+            os.makedirs(self.http_dir, exist_ok=True)
+            os.makedirs(self.har_dir, exist_ok=True)
+        elif self.mode == "replay" and not os.path.isdir(self.http_dir):
+            logger.warning(f"Replay directory {self.dir} has no recorded HTTP responses")
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode is not None
+
+    # ── Store ─────────────────────────────────────────────────────────
+
+    def save(self, method: str, url: str, status: int, headers, body: bytes) -> None:
+        """Write one response; concurrent writers never leave a partial file."""
+        key  = fixture_key(method, url)
+        meta = {
+            "method":  method.upper(),
+            "url":     url,
+            "status":  status,
+            "headers": {h: headers[h] for h in _KEPT_HEADERS if h in headers},
+        }
+        base = os.path.join(self.http_dir, key)
+        for path, data in ((base + ".body", body), (base + ".json", json.dumps(meta).encode())):
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, path)
+        self.stats["recorded"] += 1
+
+    def load(self, method: str, url: str) -> Optional[tuple[int, dict, bytes]]:
+        """(status, headers, body) recorded for *url*, or None."""
+        base = os.path.join(self.http_dir, fixture_key(method, url))
+        try:
+            with open(base + ".json", encoding="utf-8") as fh:
+                meta = json.load(fh)
+            with open(base + ".body", "rb") as fh:
+                body = fh.read()
+        except (OSError, ValueError):
+            self.stats["misses"] += 1
+            logger.debug(f"Replay miss: {method} {url[:80]}")
+            return None
+        self.stats["replayed"] += 1
+        return meta["status"], meta["headers"], body
+
+    # ── httpx ─────────────────────────────────────────────────────────
+
+    def httpx_kwargs(self) -> dict:
+        """Extra httpx.AsyncClient kwargs: a response hook or the replay transport."""
+        if self.mode == "record":
+            return {"event_hooks": {"response": [self._record_httpx]}}
+        if self.mode == "replay":
+            return {"transport": ReplayTransport(self)}
+        return {}
+
+    async def _record_httpx(self, response) -> None:
+        await response.aread()
+        request = response.request
+        await asyncio.to_thread(
+            self.save, request.method, str(request.url),
+            response.status_code, response.headers, response.content,
+        )
+
+    # ── requests ──────────────────────────────────────────────────────
+
+    def install_session(self, session) -> None:
+        """Hook a requests.Session up for recording or replay."""
+        if self.mode == "record":
+            session.hooks["response"].append(self._record_requests)
+        elif self.mode == "replay":
+            adapter = ReplayAdapter(self)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+
+    def _record_requests(self, response, *args, **kwargs) -> None:
+        request = response.request
+        self.save(request.method, request.url, response.status_code,
+                  response.headers, response.content)
+
+    # ── Playwright ────────────────────────────────────────────────────
+
+    def context_kwargs(self) -> dict:
+        """Extra browser.new_context() kwargs: a HAR archive per context when recording."""
+        if self.mode != "record":
+            return {}
+        name = f"context-{os.getpid()}-{next(self._har_ids)}.zip"
+        return {"record_har_path": os.path.join(self.har_dir, name)}
+
+    async def install_context(self, ctx) -> None:
+        """Serve a new context from the recorded HAR archives (replay only)."""
+        if self.mode != "replay":
+            return
+        # Routes run newest-first: each archive falls back to the next,
+        # and whatever none of them recorded is aborted.
+        await ctx.route("**/*", _abort)
+        for har in sorted(glob.glob(os.path.join(self.har_dir, "*.zip"))):
+            await ctx.route_from_har(har, not_found="fallback")
+
+    def summary(self) -> str:
+        s = self.stats
+        if self.mode == "record":
+            return f"recorded {s['recorded']} HTTP responses to {self.dir}"
+        return f"replayed {s['replayed']} HTTP responses from {self.dir}, {s['misses']} misses"
+
+
+async def _abort(route) -> None:
+    await route.abort()
+
+
+# ── Replay back-ends ──────────────────────────────────────────────────
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """httpx transport that answers from the fixture directory."""
+
+    def __init__(self, fixtures: HttpFixtures):
+        self.fixtures = fixtures
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.fixtures.latency:
+            await asyncio.sleep(self.fixtures.latency)
+        found = self.fixtures.load(request.method, str(request.url))
+        if found is None:
+            return httpx.Response(404, request=request)
+        status, headers, body = found
+        return httpx.Response(status, headers=headers, content=body, request=request)
+
+
+class ReplayAdapter(BaseAdapter):
+    """requests transport adapter that answers from the fixture directory."""
+
+    def __init__(self, fixtures: HttpFixtures):
+        super().__init__()
+        self.fixtures = fixtures
+
+    def send(self, request, **kwargs) -> requests.Response:
+        if self.fixtures.latency:
+            time.sleep(self.fixtures.latency)
+        found = self.fixtures.load(request.method, request.url)
+        status, headers, body = found if found is not None else (404, {}, b"")
+        resp = requests.Response()
+        resp.status_code = status
+        resp.headers     = CaseInsensitiveDict(headers)
+        resp.encoding    = get_encoding_from_headers(resp.headers)
+        resp._content    = body
+        resp.url         = request.url
+        resp.request     = request
+        resp.reason      = "OK" if status == 200 else "Replay"
+        return resp
+
+    def close(self) -> None:
+        pass
+
+
+_fixtures: dict[tuple, HttpFixtures] = {}
+
+
+def open_fixtures(config: dict) -> HttpFixtures:
+    """The process-wide HttpFixtures for config's fixtures section."""
+    cfg = config.get("fixtures") or {}
+    key = (cfg.get("mode"), os.path.abspath(cfg.get("dir", "fixtures")), cfg.get("latency_ms", 0))
+    if key not in _fixtures:
+        _fixtures[key] = HttpFixtures(config)
+    return _fixtures[key]
@@ -0,0 +1,210 @@
+"""
+Metrics — per-run timers, counters and histograms.
+
+run_pipeline used to print phase banners and nothing else, so a slow job
+could not be pinned on URL collection, profile fetches, build_lead,
+filtering or the Supabase upsert.  Every stage now records into the
+process-wide `metrics` registry (gauges hold the latest value):
+
+  phase_seconds{phase}                    run_pipeline phases
+  build_lead_seconds / filter_seconds     per lead, inside LeadStream
+  leads_total{stage}                      raw / duplicate / built / passed …
+  scraper_fetch_seconds{scraper, kind}    one network fetch
+  scraper_parse_seconds{scraper}          one page parse
+  scraper_requests_total{scraper, kind, result}
+                                          ok / blocked / http_error /
+                                          network_error / cache_hit
+  scraper_retries_total{scraper}
+  exporter_seconds{exporter, op}          SQLite / Supabase / CSV writes
+  exporter_rows_total{exporter, result}   new / duplicate / error / written
+  adaptive_limit{limiter}                 gauge: current AIMD concurrency limit
+
+summary() is a JSON-able dict stored with the session record
+(sessions.metrics in SQLite, scraper_jobs.metrics in Supabase);
+to_prometheus() renders the Prometheus text exposition format for
+`main.py --metrics-file` or a node_exporter textfile collector.
+
+Usage:
+    from utils.metrics import metrics
+    metrics.inc("scraper_requests_total", scraper="xhr", kind="profile", result="ok")
+    with metrics.timer("phase_seconds", phase="scrape"):
+        ...
+    metrics.observe("scraper_parse_seconds", 0.004, scraper="xhr")
+    metrics.set("adaptive_limit", 12, limiter="xhr")
+"""
+
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+PREFIX = "leadparser_"
+
+# Histogram upper bounds in seconds (Prometheus-style, cumulative on export)
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, math.inf)
+
+_Key = tuple[str, tuple[tuple[str, str], ...]]
+
+
+def _key(name: str, labels: dict) -> _Key:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _label_str(labels: tuple, extra: str = "") -> str:
+    parts = [f'{k}="{v}"' for k, v in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _flat_name(key: _Key) -> str:
+    name, labels = key
+    if not labels:
+        return name
+    return name + "{" + ",".join(f"{k}={v}" for k, v in labels) + "}"
+
+
+class Metrics:
+    """Thread-safe registry of counters, gauges and histograms for one run."""
+
+    def __init__(self):
+        self._lock      = threading.Lock()
+        self._counters: dict[_Key, float] = {}
+        self._gauges:   dict[_Key, float] = {}
+        self._hists:    dict[_Key, dict]  = {}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._hists.clear()
+
+    # ── Recording ─────────────────────────────────────────────────────
+
+    def inc(self, name: str, n: float = 1, **labels) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + n
+
+    def set(self, name: str, value: float, **labels) -> None:
+        """Set gauge *name* to *value* (the last value set wins)."""
+        key = _key(name, labels)
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            h = self._hists.get(key)
+            if h is None:
+                h = self._hists[key] = {"count": 0, "sum": 0.0, "max": 0.0,
+                                        "buckets": [0] * len(BUCKETS)}
+            h["count"] += 1
+            h["sum"]   += value
+            h["max"]    = max(h["max"], value)
+            for i, bound in enumerate(BUCKETS):
+                if value <= bound:
+                    h["buckets"][i] += 1
+                    break
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Observe the wall time of the block (awaits included) into *name*."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    # ── Reading ───────────────────────────────────────────────────────
+
+    def counter(self, name: str, **labels) -> float:
+        return self._counters.get(_key(name, labels), 0)
+
+    def gauge(self, name: str, **labels) -> Optional[float]:
+        return self._gauges.get(_key(name, labels))
+
+    def histogram(self, name: str, **labels) -> Optional[dict]:
+        h = self._hists.get(_key(name, labels))
+        return dict(h, buckets=list(h["buckets"])) if h else None
+
+    def summary(self) -> dict:
+        """JSON-able snapshot: counters, gauges, plus count / sum / max / p50 / p95 per histogram."""
+        with self._lock:
+            counters = {_flat_name(k): v for k, v in sorted(self._counters.items())}
+            gauges   = {_flat_name(k): v for k, v in sorted(self._gauges.items())}
+            timers   = {
+                _flat_name(k): {
+                    "count": h["count"],
+                    "sum":   round(h["sum"], 4),
+                    "max":   round(h["max"], 4),
+                    "p50":   _quantile(h, 0.5),
+                    "p95":   _quantile(h, 0.95),
+                }
+                for k, h in sorted(self._hists.items())
+            }
+        return {"counters": counters, "gauges": gauges, "timers": timers}
+
+    def to_prometheus(self) -> str:
+        """The registry in Prometheus text exposition format (version 0.0.4)."""
+        lines: list[str] = []
+        with self._lock:
+            typed: set[str] = set()
+            for (name, labels), value in sorted(self._counters.items()):
+                full = PREFIX + name
+                if full not in typed:
+                    typed.add(full)
+                    lines.append(f"# TYPE {full} counter")
+                lines.append(f"{full}{_label_str(labels)} {_num(value)}")
+
+            for (name, labels), value in sorted(self._gauges.items()):
+                full = PREFIX + name
+                if full not in typed:
+                    typed.add(full)
+                    lines.append(f"# TYPE {full} gauge")
+                lines.append(f"{full}{_label_str(labels)} {_num(value)}")
+
+            for (name, labels), h in sorted(self._hists.items()):
+                full = PREFIX + name
+                if full not in typed:
+                    typed.add(full)
+                    lines.append(f"# TYPE {full} histogram")
+                cumulative = 0
+                for bound, n in zip(BUCKETS, h["buckets"]):
+                    cumulative += n
+                    le     = "+Inf" if bound == math.inf else _num(bound)
+                    bucket = _label_str(labels, f'le="{le}"')
+                    lines.append(f"{full}_bucket{bucket} {cumulative}")
+                lines.append(f"{full}_sum{_label_str(labels)} {_num(h['sum'])}")
+                lines.append(f"{full}_count{_label_str(labels)} {h['count']}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """Write to_prometheus() atomically (textfile collectors read it any time)."""
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            fh.write(self.to_prometheus())
+        os.replace(tmp, path)
+
+
+def _quantile(h: dict, q: float) -> float:
+    """Upper bucket bound holding the q-th observation (the max for the last bucket)."""
+    rank = q * h["count"]
+    seen = 0
+    for bound, n in zip(BUCKETS, h["buckets"]):
+        seen += n
+        if seen >= rank and n:
+            return round(min(bound, h["max"]), 4)
+    return round(h["max"], 4)
+
+
+def _num(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+metrics = Metrics()
@@ -3,12 +3,27 @@ Rate Limiter — enforces polite delays between scraping requests.
 
 Uses configurable min/max random delays to mimic human browsing
 behavior and avoid triggering anti-bot measures.
+
+AsyncRateLimiter adds per-host token buckets for code running on an
+event loop: `await limiter.acquire("google.com")` waits with
+asyncio.sleep, so parallel workers overlap their waits instead of
+serialising on time.sleep(), while the bucket still caps the request
+rate per host (plus one global bucket across all hosts).
+RateLimiter.acquire() / wait(host=...) expose the same buckets to the
+async and sync (Selenium / requests) paths.
+
+Inside a job spawned by worker.py the buckets live in the worker's
+budget server (utils/shared_budget.py) instead, so every job draws from
+one budget; the local buckets are the fallback if it is unreachable.
 """
 
+import asyncio
+import threading
 import time
 import random
 import logging
 from functools import wraps
+from urllib.parse import urlsplit
 
 logger = logging.getLogger(__name__)
 
@@ -24,16 +39,26 @@ class RateLimiter:
         self.delay_min: float = config["scraping"].get("delay_min", 2.5)
         self.delay_max: float = config["scraping"].get("delay_max", 6.0)
         self._last_request_time: float = 0.0
+        self.hosts = AsyncRateLimiter(config)
 
     # ── Core wait method ──────────────────────────────────────────────
 
-    def wait(self, override_min: float = None, override_max: float = None) -> None:
+    def wait(
+        self,
+        override_min: float = None,
+        override_max: float = None,
+        host:         str   = None,
+    ) -> None:
         """
         Sleep for a random duration between [min, max] seconds.
 
         Can be called with explicit bounds to override the defaults —
         useful for shorter pauses between sub-actions within a page.
+        With *host*, a token is first taken from that host's bucket
+        (blocking — sync callers only; coroutines use acquire()).
         """
+        if host:
+            self.hosts.acquire_sync(host)
         lo = override_min if override_min is not None else self.delay_min
         hi = override_max if override_max is not None else self.delay_max
         delay = random.uniform(lo, hi)
@@ -41,6 +66,10 @@ class RateLimiter:
         time.sleep(delay)
         self._last_request_time = time.time()
 
+    async def acquire(self, host: str) -> None:
+        """Await a token for *host* without blocking the event loop."""
+        await self.hosts.acquire(host)
+
     def wait_short(self) -> None:
         """Quick micro-pause (0.5–1.5 s) between in-page interactions."""
         self.wait(0.5, 1.5)
@@ -81,3 +110,109 @@ class RateLimiter:
         delay = base + jitter
         logger.info(f"Back-off delay: {delay:.1f}s (attempt {attempt})")
         time.sleep(delay)
+
+
+# ── Per-host token buckets ────────────────────────────────────────────
+
+# Used when scraping.rate_limits is absent or leaves a key out.
+# rate = sustained requests/second, burst = bucket capacity.
+DEFAULT_RATE_LIMITS = {
+    "global":          {"rate": 4.0, "burst": 8},
+    "google.com":      {"rate": 2.0, "burst": 4},
+    "yelp.com":        {"rate": 0.5, "burst": 2},
+    "yellowpages.com": {"rate": 0.5, "burst": 2},
+    "default":         {"rate": 1.0, "burst": 2},
+}
+
+
+class TokenBucket:
+    """
+    Classic token bucket; thread-safe so sync and async callers can share it.
+
+    reserve() always takes a token and returns how long the caller must
+    wait before using it (0 while the bucket has tokens left).  Tokens may
+    go negative, which queues later callers behind earlier ones in order.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate     = max(float(rate), 1e-6)
+        self.capacity = max(float(burst), 1.0)
+        self.tokens   = self.capacity
+        self._updated = time.monotonic()
+        self._lock    = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now           = time.monotonic()
+            self.tokens   = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self.tokens  -= 1.0
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class AsyncRateLimiter:
+    """
+    Per-host token buckets plus one global bucket.
+
+    Hosts are matched by domain suffix against scraping.rate_limits
+    ("www.google.com" and "maps.google.com" share "google.com"); unknown
+    hosts share the "default" bucket.  A request waits for whichever of
+    its host bucket and the global bucket frees up last.
+
+    With *remote* (the default) and a shared budget server configured,
+    tokens come from the server and the local buckets are only the
+    fallback.
+    """
+
+    def __init__(self, config: dict, remote: bool = True):
+        from utils.shared_budget import get_client
+
+        limits = {**DEFAULT_RATE_LIMITS, **(config["scraping"].get("rate_limits") or {})}
+        self.buckets = {
+            name: TokenBucket(spec.get("rate", 1.0), spec.get("burst", 1))
+            for name, spec in limits.items()
+        }
+        self.remote = get_client() if remote else None
+        self.stats  = {"acquired": 0, "waited": 0, "wait_seconds": 0.0}
+
+    def bucket_for(self, host: str) -> str:
+        """Map a host name or URL to its bucket name."""
+        if "/" in host:
+            host = urlsplit(host).hostname or host
+        host = host.lower().rstrip(".")
+        for name in self.buckets:
+            if name in ("global", "default"):
+                continue
+            if host == name or host.endswith("." + name):
+                return name
+        return "default"
+
+    def reserve(self, host: str) -> float:
+        """Take a token for *host* from the local buckets; returns the wait."""
+        return max(
+            self.buckets[self.bucket_for(host)].reserve(),
+            self.buckets["global"].reserve(),
+        )
+
+    def _count(self, delay: float) -> float:
+        self.stats["acquired"] += 1
+        if delay > 0:
+            self.stats["waited"]       += 1
+            self.stats["wait_seconds"] += delay
+        return delay
+
+    async def acquire(self, host: str) -> None:
+        """Wait (asyncio.sleep) until a request to *host* is allowed."""
+        delay = await self.remote.token(host) if self.remote else None
+        if delay is None:
+            delay = self.reserve(host)
+        if self._count(delay) > 0:
+            await asyncio.sleep(delay)
+
+    def acquire_sync(self, host: str) -> None:
+        """Sync shim for Selenium / requests code: same buckets, time.sleep."""
+        delay = self.remote.token_sync(host) if self.remote else None
+        if delay is None:
+            delay = self.reserve(host)
+        if self._count(delay) > 0:
+            time.sleep(delay)
@@ -0,0 +1,302 @@
+"""
+Response Cache — persistent on-disk cache of fetched pages.
+
+Retry passes in run_pipeline and repeated scheduled runs fetch the same
+/maps/place/ profiles and search pages again; seen_gmb only dedups inside
+one process.  ResponseCache keeps successful responses in a SQLite file
+(cache.path) so a re-run of a city/niche inside the TTL never touches
+the network:
+
+  • key     — SHA-256 of the normalized URL (lower-cased host, no
+              fragment, tracking parameters dropped, query sorted)
+  • TTL     — per URL class: "profile" (/maps/place/), "search"
+              (/maps/search/), "lookup" (Yelp / Yellow Pages / BBB /
+              White Pages / 411) and "default"; cache.ttl_hours, 0 = off
+  • bodies  — zlib-compressed
+  • size    — bounded by cache.max_mb; least recently used rows are
+              evicted first
+
+Only 200 responses the caller has already checked (not a block page) are
+stored.  The file is shared by every process (WAL mode), so parallel
+worker jobs reuse each other's pages.
+
+Usage:
+    cache = open_cache(config)                  # disabled → no-op instance
+    resp  = cache.get(url)                      # CachedResponse or None
+    cache.put(url, resp.content, resp.encoding)
+    resp  = cache.fetch(session, url, wait=..)  # requests.Session helper
+    hit   = await cache.aget(url)               # async callers (off-loop)
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Callable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_HOURS = {
+    "profile": 168,    # a week — phones / hours rarely change
+    "search":  24,
+    "lookup":  720,    # directory listings
+    "default": 24,
+}
+
+_LOOKUP_HOSTS  = ("yelp.com", "yellowpages.com", "whitepages.com", "bbb.org", "411.com")
+_DROP_PARAMS   = {"authuser", "rclk", "entry", "g_ep", "gclid", "fbclid", "ved", "ei"}
+_EVICT_TO      = 0.9    # evict down to this fraction of max_mb
+_RECOUNT_EVERY = 100    # puts between re-reading the file size (other processes write too)
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of *url* used for the cache key."""
+    parts = urlsplit(url.strip())
+    host  = (parts.hostname or "").lower()
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k not in _DROP_PARAMS and not k.startswith("utm_")
+    )
+    return urlunsplit((parts.scheme.lower(), host, parts.path or "/", urlencode(query), ""))
+
+
+def url_class(url: str) -> str:
+    """TTL class of *url*: profile, search, lookup or default."""
+    parts = urlsplit(url)
+    host  = (parts.hostname or "").lower()
+    if "/maps/place/" in parts.path:
+        return "profile"
+    if "/maps/search/" in parts.path:
+        return "search"
+    if any(host == h or host.endswith("." + h) for h in _LOOKUP_HOSTS):
+        return "lookup"
+    return "default"
+
+
+class CachedResponse:
+    """The parts of an httpx / requests response the scrapers read."""
+
+    status_code = 200
+    from_cache  = True
+
+    def __init__(self, url: str, content: bytes, encoding: Optional[str]):
+        self.url      = url
+        self.content  = content
+        self.encoding = encoding or "utf-8"
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors="replace")
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+class ResponseCache:
+    """
+    SQLite-backed response cache; thread-safe, shared across processes.
+
+    With cache.enabled false (or no cache section at all) every method is
+    a no-op and get() always misses, so callers never need to branch.
+    """
+
+    def __init__(self, config: dict):
+        cfg = config.get("cache") or {}
+        self.enabled   = bool(cfg.get("enabled", False))
+        self.path      = cfg.get("path", "data/http_cache.db")
+        self.max_bytes = int(float(cfg.get("max_mb", 512)) * 1024 * 1024)
+        self.ttl       = {
+            kind: float(hours) * 3600
+            for kind, hours in {**DEFAULT_TTL_HOURS, **(cfg.get("ttl_hours") or {})}.items()
+        }
+        self.stats     = {"hits": 0, "misses": 0, "stores": 0, "evicted": 0, "expired": 0}
+
+        self._lock  = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._bytes = 0
+        self._puts  = 0
+        if self.enabled:
+            try:
+                self._open()
+            except sqlite3.Error as exc:
+                logger.warning(f"Response cache disabled — cannot open {self.path}: {exc}")
+                self.enabled = False
+
+    # ── Storage ───────────────────────────────────────────────────────
+
+    def _open(self) -> None:
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key         TEXT PRIMARY KEY,
+                url         TEXT NOT NULL,
+                kind        TEXT NOT NULL,
+                encoding    TEXT,
+                body        BLOB NOT NULL,
+                size        INTEGER NOT NULL,
+                stored_at   REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)")
+        conn.commit()
+        self._conn = conn
+        with self._lock:
+            self._purge_expired()
+            self._recount()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        self.enabled = False
+
+    def _recount(self) -> None:
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        self._bytes = row[0]
+
+    def _purge_expired(self) -> None:
+        now = time.time()
+        for kind, ttl in self.ttl.items():
+            cur = self._conn.execute(
+                "DELETE FROM responses WHERE kind = ? AND stored_at < ?", (kind, now - ttl)
+            )
+            self.stats["expired"] += cur.rowcount
+        self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop least recently used rows until the file is under _EVICT_TO × max."""
+        target = self.max_bytes * _EVICT_TO
+        doomed = []
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ):
+            if self._bytes <= target:
+                break
+            doomed.append((key,))
+            self._bytes -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+        self._conn.commit()
+        self.stats["evicted"] += len(doomed)
+
+    # ── Public API ────────────────────────────────────────────────────
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """The cached response for *url*, or None (miss, expired or disabled)."""
+        if not self.enabled:
+            return None
+        kind = url_class(url)
+        ttl  = self.ttl.get(kind, self.ttl["default"])
+        key  = hashlib.sha256(normalize_url(url).encode()).hexdigest()
+        now  = time.time()
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT body, encoding, stored_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None or now - row[2] > ttl:
+                    self.stats["misses"] += 1
+                    return None
+                self._conn.execute(
+                    "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+                self._conn.commit()
+                self.stats["hits"] += 1
+            return CachedResponse(url, zlib.decompress(row[0]), row[1])
+        except (sqlite3.Error, zlib.error) as exc:
+            logger.debug(f"Response cache read failed for {url[:60]}: {exc}")
+            return None
+
+    def put(self, url: str, content: bytes, encoding: Optional[str] = None) -> None:
+        """Store a successful response body for *url*."""
+        if not self.enabled:
+            return
+        kind = url_class(url)
+        if self.ttl.get(kind, self.ttl["default"]) <= 0:
+            return
+        key  = hashlib.sha256(normalize_url(url).encode()).hexdigest()
+        body = zlib.compress(content, 6)
+        now  = time.time()
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses "
+                    "(key, url, kind, encoding, body, size, stored_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, url, kind, encoding, body, len(body), now, now),
+                )
+                self._conn.commit()
+                self.stats["stores"] += 1
+                self._bytes += len(body)
+                self._puts  += 1
+                if self._puts % _RECOUNT_EVERY == 0:
+                    self._recount()
+                if self._bytes > self.max_bytes:
+                    self._evict()
+        except sqlite3.Error as exc:
+            logger.debug(f"Response cache write failed for {url[:60]}: {exc}")
+
+    async def aget(self, url: str) -> Optional[CachedResponse]:
+        """get() off the event loop (decompression + SQLite I/O)."""
+        if not self.enabled:
+            return None
+        return await asyncio.to_thread(self.get, url)
+
+    async def aput(self, url: str, content: bytes, encoding: Optional[str] = None) -> None:
+        """put() off the event loop."""
+        if self.enabled:
+            await asyncio.to_thread(self.put, url, content, encoding)
+
+    def fetch(self, session, url: str, wait: Optional[Callable] = None, **kwargs):
+        """
+        GET *url* with a requests.Session through the cache.
+
+        A hit returns a CachedResponse without calling *wait* (the rate
+        limiter) or touching the network; a 200 miss is stored.
+        """
+        hit = self.get(url)
+        if hit is not None:
+            return hit
+        if wait is not None:
+            wait()
+        resp = session.get(url, **kwargs)
+        if resp.status_code == 200:
+            self.put(url, resp.content, resp.encoding)
+        return resp
+
+    def summary(self) -> str:
+        s = self.stats
+        return (
+            f"{s['hits']} hits, {s['misses']} misses, {s['stores']} stored, "
+            f"{s['evicted']} evicted, {self._bytes / 1e6:.1f} MB on disk"
+        )
+
+
+_caches: dict[str, ResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def open_cache(config: dict) -> ResponseCache:
+    """The process-wide ResponseCache for config's cache.path (one connection per file)."""
+    cfg = config.get("cache") or {}
+    if not cfg.get("enabled", False):
+        return ResponseCache(config)
+    path = os.path.abspath(cfg.get("path", "data/http_cache.db"))
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None or not cache.enabled:
+            cache = _caches[path] = ResponseCache(config)
+    return cache
@@ -0,0 +1,395 @@
+"""
+Shared Budget — one request budget for every scraper process on the machine.
+
+worker.py runs up to MAX_PARALLEL main.py subprocesses.  On their own,
+each one has its own token buckets and its own fetch limiter, so the
+combined rate to Google grows with the number of jobs — exactly when
+blocks start.  BudgetServer runs inside worker.py and owns the only copy
+of the budget; every subprocess finds it through the LEADPARSER_BUDGET
+environment variable and asks it before sending a request.
+
+Each client keeps one connection open and tags every request with an id
+that the answer echoes, so many coroutines can share it:
+
+  <id> TOKEN <host>\\n  →  "<id> <seconds>\\n"
+      Takes a token from the server's per-host bucket (scraping.rate_limits)
+      and returns how long the caller must wait before using it.
+  <id> SLOT\\n          →  "<id> OK\\n"
+      Sent once one of scraping.shared_concurrency request slots is free.
+  <id> RELEASE\\n       (no answer)
+      Gives one of this connection's slots back.  Slots still held when
+      the connection closes are released with it, so a crashed or killed
+      job can never leak one.
+
+The server listens on a Unix socket (TCP on 127.0.0.1 where AF_UNIX is
+unavailable) and serves from an asyncio loop on a daemon thread.
+
+BudgetClient fails open: if the server cannot be reached, the caller
+falls back to its own per-process limits and the client stops trying
+for a while.  get_client() returns None outside a worker-spawned job.
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+import socket
+import tempfile
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+logger = logging.getLogger(__name__)
+
+ENV_VAR = "LEADPARSER_BUDGET"
+
+_TIMEOUT     = 2.0    # seconds to connect / get a TOKEN answer
+_RETRY_AFTER = 30.0   # seconds to stay on local limits after a failure
+
+
+# ── Server ────────────────────────────────────────────────────────────
+
+class BudgetServer:
+    """Token / slot server shared by every main.py a worker spawns."""
+
+    def __init__(self, config: dict, path: Optional[str] = None, use_unix: bool = True):
+        from utils.rate_limiter import AsyncRateLimiter
+
+        self.buckets     = AsyncRateLimiter(config, remote=False)
+        self.concurrency = max(1, int(config["scraping"].get("shared_concurrency", 50)))
+        self.path        = path or os.path.join(
+            tempfile.gettempdir(), f"leadparser-budget-{os.getpid()}.sock"
+        )
+        self.use_unix    = use_unix and hasattr(socket, "AF_UNIX")
+        self.address: Optional[str] = None
+        self.stats       = {
+            "connections": 0, "tokens": 0, "slots": 0, "in_flight": 0, "peak": 0,
+        }
+
+        self._loop:   Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread]          = None
+        self._error:  Optional[BaseException]             = None
+
+    def start(self) -> str:
+        """Start serving on a daemon thread; returns the LEADPARSER_BUDGET address."""
+        ready = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(ready,), name="budget-server", daemon=True
+        )
+        self._thread.start()
+        ready.wait(10)
+        if self._error is not None:
+            raise self._error
+        if self.address is None:
+            raise RuntimeError("budget server did not start")
+        return self.address
+
+    def stop(self) -> None:
+        if self._loop is not None and self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join(5)
+        if self.address and self.address.startswith("unix:"):
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+    def _run(self, ready: threading.Event) -> None:
+        loop = self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        server = None
+        try:
+            server = loop.run_until_complete(self._listen())
+        except BaseException as exc:
+            self._error = exc
+        ready.set()
+        if server is None:
+            loop.close()
+            return
+        try:
+            loop.run_forever()
+        finally:
+            server.close()
+            for task in asyncio.all_tasks(loop):
+                task.cancel()
+            loop.run_until_complete(asyncio.sleep(0))
+            loop.close()
+
+    async def _listen(self):
+        self._slots = asyncio.Semaphore(self.concurrency)
+        if self.use_unix:
+            try:
+                if os.path.exists(self.path):
+                    os.unlink(self.path)
+                server = await asyncio.start_unix_server(self._handle, path=self.path)
+                self.address = f"unix:{self.path}"
+                return server
+            except OSError as exc:
+                logger.warning(f"Budget server: Unix socket failed ({exc}) — using TCP")
+        server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port   = server.sockets[0].getsockname()[1]
+        self.address = f"tcp:127.0.0.1:{port}"
+        return server
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one client connection until it closes."""
+        self.stats["connections"] += 1
+        conn = {"held": 0, "waiting": set()}
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                rid, _, rest = line.decode("ascii", "replace").strip().partition(" ")
+                cmd, _, arg  = rest.partition(" ")
+                if cmd == "TOKEN":
+                    delay = self.buckets.reserve(arg or "default")
+                    self.stats["tokens"] += 1
+                    writer.write(f"{rid} {delay:.4f}\n".encode())
+                elif cmd == "SLOT":
+                    task = asyncio.ensure_future(self._grant_slot(conn, rid, writer))
+                    conn["waiting"].add(task)
+                    task.add_done_callback(conn["waiting"].discard)
+                elif cmd == "RELEASE":
+                    if conn["held"]:
+                        self._release(conn)
+                else:
+                    writer.write(f"{rid} ERR\n".encode())
+                await writer.drain()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            for task in list(conn["waiting"]):
+                task.cancel()
+            while conn["held"]:
+                self._release(conn)
+            writer.close()
+
+    async def _grant_slot(self, conn: dict, rid: str, writer: asyncio.StreamWriter) -> None:
+        await self._slots.acquire()
+        conn["held"]            += 1
+        self.stats["slots"]     += 1
+        self.stats["in_flight"] += 1
+        self.stats["peak"] = max(self.stats["peak"], self.stats["in_flight"])
+        try:
+            writer.write(f"{rid} OK\n".encode())
+        except (ConnectionError, OSError, RuntimeError):
+            pass   # the handler's cleanup releases the slot
+
+    def _release(self, conn: dict) -> None:
+        conn["held"]            -= 1
+        self.stats["in_flight"] -= 1
+        self._slots.release()
+
+
+# ── Client ────────────────────────────────────────────────────────────
+
+class BudgetClient:
+    """
+    Talks to a BudgetServer; every method fails open (returns None / no slot).
+
+    Coroutines share one connection per event loop, and sync callers share
+    one blocking socket, instead of connecting for every request.
+    """
+
+    def __init__(self, address: str):
+        self.address = address
+        kind, _, rest = address.partition(":")
+        self.kind = kind
+        if kind == "tcp":
+            host, _, port = rest.rpartition(":")
+            self._tcp = (host, int(port))
+        elif kind == "unix":
+            self._path = rest
+        else:
+            raise ValueError(f"Unknown budget address: {address!r}")
+        self._down_until = 0.0
+        self._ids        = itertools.count(1)
+
+        self._conn: Optional[dict] = None          # async connection, see _connection()
+        self._sock: Optional[socket.socket] = None
+        self._sock_file = None
+        self._sock_lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _failed(self, exc: BaseException) -> None:
+        if self.available:
+            logger.warning(
+                f"Shared budget unreachable ({exc!r}) — using per-process limits "
+                f"for {_RETRY_AFTER:.0f}s"
+            )
+        self._down_until = time.monotonic() + _RETRY_AFTER
+
+    # ── Async connection ──────────────────────────────────────────────
+
+    async def _connection(self) -> dict:
+        """This loop's open connection, connecting on first use."""
+        loop = asyncio.get_running_loop()
+        conn = self._conn
+        if conn is not None and conn["loop"] is loop and not conn["closed"]:
+            return conn
+        if conn is None or conn["loop"] is not loop:
+            if conn is not None and not conn["closed"]:
+                try:
+                    conn["writer"].close()   # left behind by an earlier event loop
+                except RuntimeError:
+                    pass
+            conn = self._conn = {"loop": loop, "lock": asyncio.Lock(), "closed": True}
+        async with conn["lock"]:
+            if conn["closed"]:
+                if self.kind == "unix":
+                    opening = asyncio.open_unix_connection(self._path)
+                else:
+                    opening = asyncio.open_connection(*self._tcp)
+                reader, writer = await asyncio.wait_for(opening, _TIMEOUT)
+                conn.update(
+                    reader=reader, writer=writer, closed=False,
+                    pending={}, abandoned=set(),
+                )
+                conn["task"] = loop.create_task(self._read_replies(conn))
+        return conn
+
+    async def _read_replies(self, conn: dict) -> None:
+        """Route each answer to the request that is waiting for it."""
+        error: BaseException = ConnectionError("budget server closed the connection")
+        try:
+            while True:
+                line = await conn["reader"].readline()
+                if not line:
+                    break
+                rid, _, value = line.decode("ascii", "replace").strip().partition(" ")
+                fut = conn["pending"].pop(rid, None)
+                if fut is not None and not fut.done():
+                    fut.set_result(value)
+                elif rid in conn["abandoned"]:
+                    # The slot arrived after its caller gave up — hand it back
+                    conn["abandoned"].discard(rid)
+                    conn["writer"].write(f"{rid} RELEASE\n".encode())
+        except (ConnectionError, OSError) as exc:
+            error = exc
+        finally:
+            conn["closed"] = True
+            conn["writer"].close()
+            for fut in conn["pending"].values():
+                if not fut.done():
+                    fut.set_exception(error)
+            conn["pending"].clear()
+
+    async def _send(self, conn: dict, command: str) -> tuple[str, asyncio.Future]:
+        rid = str(next(self._ids))
+        fut = conn["loop"].create_future()
+        conn["pending"][rid] = fut
+        conn["writer"].write(f"{rid} {command}\n".encode())
+        await conn["writer"].drain()
+        return rid, fut
+
+    async def token(self, host: str) -> Optional[float]:
+        """Seconds to wait before a request to *host*; None if the server is down."""
+        if not self.available:
+            return None
+        try:
+            conn   = await self._connection()
+            _, fut = await self._send(conn, f"TOKEN {host}")
+            return float(await asyncio.wait_for(fut, _TIMEOUT))
+        except (OSError, ValueError, asyncio.TimeoutError) as exc:
+            self._failed(exc)
+            return None
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[bool]:
+        """
+        Hold one shared request slot for the duration of the block.
+
+        Yields True when a slot is held, False when the server is down
+        (the caller proceeds on its local limits only).
+        """
+        conn = rid = None
+        if self.available:
+            try:
+                conn     = await self._connection()
+                rid, fut = await self._send(conn, "SLOT")
+                try:
+                    if await fut != "OK":
+                        raise ConnectionError("budget server refused the slot")
+                except asyncio.CancelledError:
+                    conn["pending"].pop(rid, None)
+                    conn["abandoned"].add(rid)
+                    raise
+            except (OSError, asyncio.TimeoutError) as exc:
+                self._failed(exc)
+                conn = None
+        try:
+            yield conn is not None
+        finally:
+            if conn is not None and not conn["closed"]:
+                conn["writer"].write(f"{rid} RELEASE\n".encode())
+
+    # ── Sync connection ───────────────────────────────────────────────
+
+    def token_sync(self, host: str) -> Optional[float]:
+        """Blocking token() for sync callers."""
+        if not self.available:
+            return None
+        with self._sock_lock:
+            try:
+                if self._sock is None:
+                    if self.kind == "unix":
+                        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                        sock.settimeout(_TIMEOUT)
+                        sock.connect(self._path)
+                    else:
+                        sock = socket.create_connection(self._tcp, timeout=_TIMEOUT)
+                    self._sock, self._sock_file = sock, sock.makefile("rb")
+                rid = str(next(self._ids))
+                self._sock.sendall(f"{rid} TOKEN {host}\n".encode())
+                got, _, value = self._sock_file.readline().decode("ascii").strip().partition(" ")
+                if got != rid:
+                    raise ConnectionError(f"budget server answered {got!r} to request {rid}")
+                return float(value)
+            except (OSError, ValueError) as exc:
+                self._close_sync()
+                self._failed(exc)
+                return None
+
+    def close(self) -> None:
+        """Close both connections; the next request reconnects."""
+        with self._sock_lock:
+            self._close_sync()
+        conn, self._conn = self._conn, None
+        if conn is not None and not conn["closed"]:
+            try:
+                conn["writer"].close()
+            except RuntimeError:
+                pass
+
+    def _close_sync(self) -> None:
+        for closable in (self._sock_file, self._sock):
+            if closable is not None:
+                try:
+                    closable.close()
+                except OSError:
+                    pass
+        self._sock = self._sock_file = None
+
+
+_client: Optional[BudgetClient] = None
+
+
+def get_client() -> Optional[BudgetClient]:
+    """The process's BudgetClient, or None when LEADPARSER_BUDGET is unset."""
+    global _client
+    address = os.environ.get(ENV_VAR, "").strip()
+    if not address:
+        return None
+    if _client is None or _client.address != address:
+        try:
+            _client = BudgetClient(address)
+        except ValueError as exc:
+            logger.warning(str(exc))
+            return None
+    return _client
@@ -0,0 +1,119 @@
+"""
+SQLite connections — one tuned PRAGMA profile for every leads.db user.
+
+The dashboards (app.py, api_server.py) used to open a fresh
+sqlite3.connect() per request with default settings, paying the connect
+and schema-parse cost every time; SQLiteHandler only turned on WAL.  This
+module gives both sides the same profile:
+
+  journal_mode  WAL      readers never block the writer (writer sets it)
+  synchronous   NORMAL   fsync at checkpoints, not every commit (safe in WAL)
+  temp_store    MEMORY   sorts / temp b-trees stay off disk
+  cache_size    64 MB    page cache per connection
+  mmap_size     256 MB   reads served from the OS page cache
+  busy_timeout  5 s      wait for the writer instead of "database is locked"
+
+Writers (the scraper's SQLiteHandler) get one read-write connection each
+via connect().  Readers borrow from a ReadPool: read-only
+(mode=ro, query_only) connections that stay open and warm between
+requests.  The pool is a shared LIFO rather than thread-local because
+Flask's threaded server starts a new thread per request, which would
+throw a thread-local connection away after every request.
+
+Usage:
+    conn = connect("data/leads.db")                      # writer
+    with read_pool("data/leads.db").connection() as conn:  # dashboards
+        rows = conn.execute("SELECT ...").fetchall()
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Union
+
+PRAGMAS = {
+    "synchronous":  "NORMAL",
+    "temp_store":   "MEMORY",
+    "cache_size":   -64_000,        # negative = KiB
+    "mmap_size":    256 * 1024 * 1024,
+    "busy_timeout": 5_000,          # ms
+}
+
+POOL_SIZE = 8    # idle read connections kept per database
+
+
+def apply_profile(conn: sqlite3.Connection, readonly: bool = False) -> None:
+    """Apply PRAGMAS to *conn*; writers also switch the file to WAL."""
+    if not readonly:
+        conn.execute("PRAGMA journal_mode=WAL")
+    for name, value in PRAGMAS.items():
+        conn.execute(f"PRAGMA {name}={value}")
+    if readonly:
+        conn.execute("PRAGMA query_only=ON")
+
+
+def connect(path: Union[str, Path], readonly: bool = False) -> sqlite3.Connection:
+    """A tuned connection with sqlite3.Row rows, usable from any thread."""
+    if readonly:
+        uri  = Path(os.path.abspath(path)).as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    else:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(path), check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    apply_profile(conn, readonly)
+    return conn
+
+
+class ReadPool:
+    """Idle read-only connections to one database, reused across requests."""
+
+    def __init__(self, path: Union[str, Path], size: int = POOL_SIZE):
+        self.path  = str(path)
+        self.size  = size
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self.stats = {"opened": 0, "reused": 0}
+
+    @contextmanager
+    def connection(self):
+        """Borrow a read-only connection (opened on demand) for one request."""
+        try:
+            conn = self._idle.get_nowait()
+            self.stats["reused"] += 1
+        except queue.Empty:
+            conn = connect(self.path, readonly=True)
+            self.stats["opened"] += 1
+        try:
+            yield conn
+        except BaseException:
+            conn.close()    # possibly mid-statement — do not hand it out again
+            raise
+        else:
+            if self._idle.qsize() < self.size:
+                self._idle.put(conn)
+            else:
+                conn.close()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+_pools: dict[str, ReadPool] = {}
+_pools_lock = threading.Lock()
+
+
+def read_pool(path: Union[str, Path]) -> ReadPool:
+    """The process-wide ReadPool for *path*."""
+    key = os.path.abspath(path)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ReadPool(key)
+    return pool
@@ -8,6 +8,9 @@ jobs from the Scraper tab.
 
 Supports running up to MAX_PARALLEL jobs simultaneously — each job
 runs main.py in its own subprocess so scrapes don't block each other.
+The jobs share one request budget (per-host rates from
+scraping.rate_limits, scraping.shared_concurrency requests in flight),
+served from this process by utils/shared_budget.py.
 
 Setup
 -----
@@ -28,9 +31,12 @@ from datetime import datetime, timezone
 from pathlib import Path
 from threading import Thread
 
+import yaml
 from dotenv import load_dotenv
 from supabase import create_client, Client
 
+from utils.shared_budget import ENV_VAR as BUDGET_ENV, BudgetServer
+
 # ── Setup ──────────────────────────────────────────────────────────────────
 load_dotenv()
 
@@ -62,6 +68,7 @@ HEARTBEAT_INTERVAL = 10   # seconds between heartbeat updates
 MAX_PARALLEL       = 4    # max concurrent scrape jobs (increase if your machine allows)
 MAX_XHR_WORKERS    = 4    # max XHR workers per job when running solo
 MAIN_PY            = Path(__file__).parent / 'main.py'
+CONFIG_YAML        = Path(__file__).parent / 'config.yaml'
 
 
 def calculate_resource_allocation(active_jobs: int, total_slots: int = MAX_PARALLEL) -> dict:
@@ -299,9 +306,34 @@ def process_job(job: dict, resource_allocation: dict = None) -> None:
 
 # ── Main loop ──────────────────────────────────────────────────────────────
 
+def start_budget_server() -> BudgetServer | None:
+    """
+    Serve the shared request budget and export its address so every
+    main.py we spawn (Popen inherits os.environ) draws from it.
+    Returns None — jobs keep their per-process limits — if it fails.
+    """
+    try:
+        with open(CONFIG_YAML, encoding='utf-8') as fh:
+            config = yaml.safe_load(fh) or {}
+        config.setdefault('scraping', {})
+        server  = BudgetServer(config)
+        address = server.start()
+    except Exception as exc:
+        log.warning(f'Shared request budget unavailable ({exc}) — jobs use per-process limits')
+        return None
+    os.environ[BUDGET_ENV] = address
+    log.info(
+        f'Shared request budget on {address} — '
+        f'{server.concurrency} requests in flight across all jobs'
+    )
+    return server
+
+
 def main() -> None:
     global _stop
 
+    budget = start_budget_server()
+
     # Start heartbeat thread
     hb = Thread(target=heartbeat_loop, daemon=True)
     hb.start()
@@ -362,6 +394,10 @@ def main() -> None:
         log.info('Worker stopping — waiting for active jobs to finish…')
         executor.shutdown(wait=True)
         log.info('Worker stopped. Site will show "Engine Offline" shortly.')
+    finally:
+        if budget is not None:
+            os.environ.pop(BUDGET_ENV, None)
+            budget.stop()
 
 
 if __name__ == '__main__':
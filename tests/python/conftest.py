@@ -91,6 +91,29 @@ def sample_raw_lead():
     }
 
 
+@pytest.fixture
+def make_lead():
+    """Factory for canonical leads as stored in SQLite: make_lead(i, **overrides)."""
+    def make(i: int, **overrides) -> dict:
+        return {
+            "niche": "plumbers", "name": f"Biz {i}", "phone": f"(214) 555-{i:04d}",
+            "city": "Dallas", "state": "TX", "review_count": 3, "rating": "4.2",
+            "date_added": "2026-01-15", "lead_score": 9, **overrides,
+        }
+    return make
+
+
+@pytest.fixture
+def db(tmp_path):
+    """An open, empty SQLiteHandler on a temporary leads.db."""
+    from exporters.sqlite_handler import SQLiteHandler
+
+    handler = SQLiteHandler({"database": {"path": str(tmp_path / "leads.db")}})
+    handler.open()
+    yield handler
+    handler.close()
+
+
 @pytest.fixture
 def sample_raw_lead_no_phone():
     """Raw lead missing a phone number."""
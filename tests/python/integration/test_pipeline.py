@@ -0,0 +1,202 @@
+"""
+Integration tests for main.py's streaming build → filter → upsert chain.
+
+A fake async scraper yields raw leads; a fake handler records each
+bulk_insert batch.  No network, no Supabase.
+
+Tests cover:
+  - LeadStream dedups by GMB link, builds, filters and batches
+  - _stream_combination stops the scrape once the target is met
+  - Per-combination caps and batch upserts while scraping
+  - _scrape_session opens the scraper session once, runs combinations
+    concurrently and cancels the rest once the target is met
+"""
+
+import asyncio
+
+import pytest
+
+import main
+from main import LeadStream, _scrape_session, _stream_combination
+from utils.address_parser import AddressParser
+from utils.lead_scorer import LeadScorer
+from utils.phone_validator import PhoneValidator
+from utils.pitch_engine import PitchEngine
+
+LOCATION = {"city": "Dallas", "state": "TX"}
+
+
+def _raw(i: int, reviews: int = 3) -> dict:
+    return {
+        "name":         f"Biz {i}",
+        "phone":        f"(214) 555-{i:04d}",
+        "address":      "123 Main St, Dallas, TX 75201",
+        "review_count": reviews,
+        "rating":       "4.2",
+        "gmb_link":     f"https://www.google.com/maps/place/biz-{i}",
+        "source":       "Google Maps",
+    }
+
+
+class FakeScraper:
+    """Yields raw leads; records pulls, closes, sessions and peak concurrency."""
+
+    def __init__(self, leads: list[dict], delay: float = 0):
+        self.leads    = leads
+        self.delay    = delay
+        self.pulled   = 0
+        self.closed   = False
+        self.sessions = 0
+        self.active   = 0
+        self.peak     = 0
+
+    async def open_session(self):
+        self.sessions += 1
+
+    async def close_session(self):
+        pass
+
+    async def scrape_niche_iter(self, niche, location, on_progress=None, max_results=None):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            for raw in self.leads:
+                self.pulled += 1
+                await asyncio.sleep(self.delay)
+                yield {**raw, "gmb_link": f"{raw['gmb_link']}/{niche}/{location['city']}"}
+        finally:
+            self.active -= 1
+            self.closed = True
+
+
+class FakeDB:
+    def __init__(self):
+        self.batches: list[list[dict]] = []
+
+    def bulk_insert(self, leads):
+        self.batches.append(list(leads))
+        return {"new": len(leads), "duplicates": 0, "errors": 0}
+
+
+@pytest.fixture
+def stream_factory(sample_config):
+    def make(target=None, batch_size=2):
+        return LeadStream(
+            sample_config, target, batch_size,
+            LeadScorer(sample_config), PitchEngine(sample_config),
+            PhoneValidator(), AddressParser(),
+        )
+    return make
+
+
+def _stats() -> dict:
+    return {"new": 0, "duplicates": 0, "errors": 0}
+
+
+def _drain(scraper, stream, db, stats, cap=None):
+    logger = main.logging.getLogger("test")
+
+    async def flush(batch):
+        main._upsert_batch(db, batch, stats, logger)
+
+    return asyncio.run(_stream_combination(
+        scraper, "plumbers", LOCATION, stream, flush, cap, lambda *_: None,
+    ))
+
+
+def _session(scraper, stream, config, niches, cities, target=None):
+    db, stats = FakeDB(), _stats()
+    per_combo = max(1, target // (len(niches) * len(cities))) if target else None
+    asyncio.run(_scrape_session(
+        scraper, niches, [{"city": c, "state": "TX"} for c in cities],
+        stream, db, stats, config, target, per_combo,
+        main.logging.getLogger("test"),
+    ))
+    return db, stats
+
+
+# ── LeadStream ────────────────────────────────────────────────────────────────
+
+class TestLeadStream:
+    def test_dedups_by_gmb_link(self, stream_factory):
+        stream = stream_factory()
+        assert stream.add(_raw(1), "plumbers", LOCATION)
+        assert not stream.add(_raw(1), "plumbers", LOCATION)
+        assert stream.passed == 1
+
+    def test_filters_on_arrival(self, stream_factory, sample_config):
+        sample_config["filters"]["max_reviews"] = 10
+        stream = stream_factory()
+        assert not stream.add(_raw(1, reviews=500), "plumbers", LOCATION)
+        assert stream.raw_total == 1
+        assert stream.passed == 0
+
+    def test_batches(self, stream_factory):
+        stream = stream_factory(batch_size=2)
+        stream.add(_raw(1), "plumbers", LOCATION)
+        assert stream.take_batch() == []
+        stream.add(_raw(2), "plumbers", LOCATION)
+        assert [l["name"] for l in stream.take_batch()] == ["Biz 1", "Biz 2"]
+        stream.add(_raw(3), "plumbers", LOCATION)
+        assert len(stream.take_batch(force=True)) == 1
+
+    def test_lead_tagged_with_city(self, stream_factory):
+        stream = stream_factory()
+        stream.add(_raw(1), "plumbers", LOCATION)
+        assert stream.take_batch(force=True)[0]["_source_city"] == "Dallas"
+
+
+# ── _stream_combination ───────────────────────────────────────────────────────
+
+class TestStreamCombination:
+    def test_stops_at_target(self, stream_factory):
+        scraper = FakeScraper([_raw(i) for i in range(50)])
+        stream  = stream_factory(target=5)
+        scraped, accepted = _drain(scraper, stream, FakeDB(), _stats())
+        assert accepted == 5
+        assert scraper.pulled == 5
+        assert scraper.closed
+        assert stream.full
+
+    def test_stops_at_cap(self, stream_factory):
+        scraper = FakeScraper([_raw(i) for i in range(50)])
+        stream  = stream_factory(target=20)
+        _, accepted = _drain(scraper, stream, FakeDB(), _stats(), cap=3)
+        assert accepted == 3
+        assert not stream.full
+
+    def test_upserts_batches_while_scraping(self, stream_factory):
+        scraper = FakeScraper([_raw(i) for i in range(5)])
+        stream  = stream_factory(batch_size=2)
+        db, stats = FakeDB(), _stats()
+        _drain(scraper, stream, db, stats)
+        assert [len(b) for b in db.batches] == [2, 2]
+        assert stats["new"] == 4
+        # Remainder is left for the caller's forced flush
+        assert len(stream.take_batch(force=True)) == 1
+
+
+# ── _scrape_session ───────────────────────────────────────────────────────────
+
+class TestScrapeSession:
+    def test_session_opened_once_for_all_combinations(self, stream_factory, sample_config):
+        scraper = FakeScraper([_raw(i) for i in range(3)])
+        _session(scraper, stream_factory(), sample_config,
+                 ["plumbers", "roofers"], ["Dallas", "Austin"])
+        assert scraper.sessions == 1
+
+    def test_combinations_run_concurrently(self, stream_factory, sample_config):
+        sample_config["scraping"]["combination_concurrency"] = 3
+        scraper = FakeScraper([_raw(i) for i in range(5)], delay=0.001)
+        _session(scraper, stream_factory(), sample_config,
+                 ["plumbers", "roofers", "hvac", "electricians"], ["Dallas"])
+        assert scraper.peak == 3
+
+    def test_stops_at_target_across_combinations(self, stream_factory, sample_config):
+        scraper = FakeScraper([_raw(i) for i in range(40)], delay=0.001)
+        stream  = stream_factory(target=6)
+        db, _   = _session(scraper, stream, sample_config,
+                           ["plumbers", "roofers"], ["Dallas", "Austin"], target=6)
+        assert stream.passed == 6
+        assert sum(len(b) for b in db.batches) == 6
+        assert scraper.active == 0
@@ -12,6 +12,7 @@ calls are made. Tests verify:
   - get_all_leads() / get_unexported_leads() call select correctly
   - mark_exported() is a no-op
   - start_session() returns a non-empty string
+  - end_session() stores the metrics summary on the scraper_jobs row
 """
 
 import os
@@ -262,6 +263,19 @@ class TestStartSession:
         assert "_" in session_id  # e.g. 20260303_123456
 
 
+class TestEndSession:
+    def test_stores_metrics_on_job(self, handler, mock_client):
+        summary = {"counters": {"leads_total{stage=passed}": 3}, "timers": {}}
+        handler.end_session({"total": 3, "job_id": "job-1", "metrics": summary})
+        mock_client.table.assert_called_with("scraper_jobs")
+        mock_client.table.return_value.update.assert_called_once_with({"metrics": summary})
+        mock_client.table.return_value.update.return_value.eq.assert_called_once_with("id", "job-1")
+
+    def test_no_job_id_no_update(self, handler, mock_client):
+        handler.end_session({"total": 3, "metrics": {"counters": {}, "timers": {}}})
+        mock_client.table.return_value.update.assert_not_called()
+
+
 # ── Context manager ───────────────────────────────────────────────────────────
 
 class TestContextManager:
@@ -0,0 +1,172 @@
+"""
+Integration tests for XHRGoogleMapsScraper's streamed Phase A → Phase B.
+
+httpx.MockTransport stands in for Google: search pages return synthetic
+APP_INITIALIZATION_STATE place records, profile pages return a fixed
+profile.  No network access.
+
+Tests cover:
+  - Profile fetches start before the last search term has been fetched
+  - max_results_per_niche caps the URLs handed to Phase B
+  - URLs repeated across search terms are fetched once
+  - href-scraped and record-decoded search pages give the same URL for a place
+  - A 429 on a profile fetch shrinks the session's adaptive limit
+  - Every request sent takes a google.com token from the rate limiter
+  - With the response cache on, a re-run sends no requests
+  - A --record run replays offline with the same leads
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("selenium")   # xhr_scraper → google_maps → selenium
+
+import httpx
+from scrapers import xhr_scraper
+from scrapers.xhr_scraper import XHRGoogleMapsScraper
+
+from unit.test_app_state import _page, _place
+from unit.test_html_extract import PROFILE
+
+
+def _config(**scraping) -> dict:
+    base = {
+        "xhr_concurrency":        5,
+        "xhr_search_concurrency": 2,
+        "max_results_per_niche":  100,
+    }
+    base.update(scraping)
+    return {"scraping": base}
+
+
+class _Log(list):
+    throttle = 0   # answer this many profile requests with 429 first
+
+
+@pytest.fixture
+def google(monkeypatch):
+    """Route the scraper's AsyncClient through a MockTransport; log requests."""
+    log = _Log()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        await asyncio.sleep(0.01)
+        if "/maps/search/" in url:
+            log.append("search")
+            term   = url.rsplit("/", 1)[1]
+            places = [_place(f"Biz {i}", f"0x{i}:0x{len(term) % 3}") for i in range(4)]
+            return httpx.Response(200, html=_page(*places))
+        if log.count("429") < log.throttle:
+            log.append("429")
+            return httpx.Response(429)
+        log.append("profile")
+        return httpx.Response(200, html=PROFILE)
+
+    real_client = httpx.AsyncClient
+
+    def client(**kwargs):
+        kwargs.pop("http2", None)
+        kwargs.setdefault("transport", httpx.MockTransport(handler))   # --replay brings its own
+        return real_client(**kwargs)
+
+    monkeypatch.setattr(xhr_scraper.httpx, "AsyncClient", client)
+    monkeypatch.setattr(xhr_scraper.random, "uniform", lambda a, b: 0.05)
+    return log
+
+
+def test_profiles_start_before_search_finishes(google):
+    scraper = XHRGoogleMapsScraper(_config(xhr_search_concurrency=1), rate_limiter=None)
+    scraper.scrape_niche("home services", {"city": "Dallas", "state": "TX"})
+    last_search   = len(google) - 1 - google[::-1].index("search")
+    first_profile = google.index("profile")
+    assert first_profile < last_search
+
+
+def test_max_results_caps_phase_b(google):
+    scraper = XHRGoogleMapsScraper(_config(max_results_per_niche=3), rate_limiter=None)
+    leads   = scraper.scrape_niche("home services", {"city": "Dallas", "state": "TX"})
+    assert google.count("profile") == 3
+    assert len(leads) == 3
+
+
+def test_duplicate_urls_fetched_once(google):
+    scraper = XHRGoogleMapsScraper(_config(), rate_limiter=None)
+    scraper.scrape_niche("home services", {"city": "Dallas", "state": "TX"})
+    # data ids repeat across terms (len(term) % 3 has only three values)
+    assert google.count("profile") <= 12
+
+
+def test_href_and_record_urls_match():
+    scraper = XHRGoogleMapsScraper(_config(), rate_limiter=None)
+    records = scraper._extract_urls_from_html(_page(_place("Biz 1", "0x1:0x2")), set())
+    hrefs   = '<a href="/maps/place/Biz+1/data=!4m7!3m6!1s0x1:0x2!8m2!3d32.7!4d-96.8">Biz 1</a>'
+    assert scraper._extract_urls_from_html(hrefs, set()) == records
+    assert scraper._extract_urls_from_html(hrefs, set(records)) == []
+
+
+def test_429_shrinks_adaptive_limit(google):
+    google.throttle = 2
+    config  = _config(adaptive_start=4, adaptive_min=2, max_results_per_niche=4)
+    scraper = XHRGoogleMapsScraper(config, rate_limiter=None)
+
+    async def main():
+        await scraper.open_session()
+        limiter = scraper._session["limiter"]
+        try:
+            leads = await xhr_scraper.collect(
+                scraper.scrape_niche_iter("plumbers", {"city": "Dallas", "state": "TX"})
+            )
+            return leads, dict(limiter.stats)
+        finally:
+            await scraper.close_session()
+
+    leads, stats = asyncio.run(main())
+    assert len(leads) == 4            # throttled profiles were retried
+    assert stats["blocked"] == 2
+    assert stats["decreases"] == 1    # same wave → halved once
+    assert stats["limit"] < 4         # 4 → 2, then healthy windows add one each
+
+
+def test_every_request_takes_a_token(google):
+    hosts = []
+
+    class Tokens:
+        async def acquire(self, host):
+            hosts.append(host)
+
+    scraper = XHRGoogleMapsScraper(_config(max_results_per_niche=6), rate_limiter=Tokens())
+    scraper.scrape_niche("plumbers", {"city": "Dallas", "state": "TX"})
+    assert len(hosts) == len(google) > 0
+    assert set(hosts) == {"google.com"}
+
+
+def test_cached_rerun_sends_no_requests(google, tmp_path):
+    config = _config(max_results_per_niche=6)
+    config["cache"] = {"enabled": True, "path": str(tmp_path / "cache.db")}
+    location = {"city": "Dallas", "state": "TX"}
+
+    first = XHRGoogleMapsScraper(config, rate_limiter=None).scrape_niche("plumbers", location)
+    n_requests = len(google)
+    again = XHRGoogleMapsScraper(config, rate_limiter=None).scrape_niche("plumbers", location)
+
+    assert n_requests > 0
+    assert len(google) == n_requests
+    assert sorted(l["name"] for l in again) == sorted(l["name"] for l in first)
+
+
+def test_record_then_replay_offline(google, tmp_path):
+    location = {"city": "Dallas", "state": "TX"}
+    record   = _config(max_results_per_niche=6)
+    record["fixtures"] = {"mode": "record", "dir": str(tmp_path)}
+    live = XHRGoogleMapsScraper(record, rate_limiter=None).scrape_niche("plumbers", location)
+    n_requests = len(google)
+
+    replay = _config(max_results_per_niche=6)
+    replay["fixtures"] = {"mode": "replay", "dir": str(tmp_path)}
+    scraper = XHRGoogleMapsScraper(replay, rate_limiter=None)
+    offline = scraper.scrape_niche("plumbers", location)
+
+    assert len(google) == n_requests      # nothing reached the mock network
+    assert sorted(l["name"] for l in offline) == sorted(l["name"] for l in live)
+    assert scraper.fixtures.stats["misses"] == 0
@@ -0,0 +1,158 @@
+"""
+Unit tests for utils/adaptive_limiter.py
+
+Tests cover:
+  - Never more requests in flight than the current limit
+  - Additive increase after each healthy window, capped at the ceiling
+  - Slow or error-heavy windows hold the limit
+  - A block halves the limit once per epoch, never below adaptive_min
+  - Cancelled waiters neither leak nor count
+  - adaptive_concurrency: false pins the limit at the ceiling
+  - The current limit is published as the adaptive_limit gauge
+"""
+
+import asyncio
+
+import pytest
+
+from utils.adaptive_limiter import AdaptiveLimiter
+from utils.metrics import metrics
+
+
+def _limiter(ceiling=50, **scraping):
+    cfg = {"adaptive_start": 4, "adaptive_min": 2, "adaptive_latency_target": 1.0}
+    cfg.update(scraping)
+    return AdaptiveLimiter({"scraping": cfg}, ceiling, "test")
+
+
+async def _request(limiter, outcome="ok", delay=0.0, log=None):
+    async with limiter.slot() as ticket:
+        if log is not None:
+            log.append(limiter.in_flight)
+        await asyncio.sleep(delay)
+        if outcome != "ok":
+            ticket["outcome"] = outcome
+
+
+def _run(limiter, n, **kw):
+    async def main():
+        await asyncio.gather(*(_request(limiter, **kw) for _ in range(n)))
+    asyncio.run(main())
+
+
+# ── Slots ─────────────────────────────────────────────────────────────────────
+
+def test_in_flight_never_exceeds_limit():
+    limiter = _limiter(adaptive_concurrency=False, ceiling=3)
+    log: list[int] = []
+    _run(limiter, 20, delay=0.001, log=log)
+    assert max(log) == 3
+    assert limiter.stats["peak"] == 3
+    assert limiter.in_flight == 0
+
+
+def test_cancelled_waiter_does_not_leak():
+    limiter = _limiter(ceiling=1, adaptive_concurrency=False)
+
+    async def main():
+        first  = asyncio.create_task(_request(limiter, delay=0.05))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(_request(limiter))
+        await asyncio.sleep(0.01)
+        second.cancel()
+        await asyncio.gather(first, second, return_exceptions=True)
+        await _request(limiter)
+
+    asyncio.run(main())
+    assert limiter.in_flight == 0
+    assert limiter.stats["ok"] == 2
+
+
+def test_exception_counts_as_error():
+    limiter = _limiter()
+
+    async def main():
+        with pytest.raises(RuntimeError):
+            async with limiter.slot():
+                raise RuntimeError("boom")
+
+    asyncio.run(main())
+    assert limiter.stats["errors"] == 1
+    assert limiter.in_flight == 0
+
+
+# ── AIMD ──────────────────────────────────────────────────────────────────────
+
+class TestIncrease:
+    def test_healthy_windows_grow_by_one(self):
+        limiter = _limiter()
+        _run(limiter, 4)            # one full window at limit 4
+        assert limiter.limit == 5
+        _run(limiter, 5)
+        assert limiter.limit == 6
+        assert limiter.stats["increases"] == 2
+
+    def test_capped_at_ceiling(self):
+        limiter = _limiter(ceiling=5)
+        _run(limiter, 200)
+        assert limiter.limit == 5
+
+    def test_slow_window_holds(self):
+        limiter = _limiter(adaptive_latency_target=0.001)
+        _run(limiter, 8, delay=0.01)
+        assert limiter.limit == 4
+
+    def test_errors_hold(self):
+        limiter = _limiter()
+        _run(limiter, 3)
+        _run(limiter, 1, outcome="error")
+        assert limiter.limit == 4
+
+
+class TestDecrease:
+    def test_block_halves_once_per_epoch(self):
+        limiter = _limiter(adaptive_start=16)
+        # 8 requests of the same wave are all blocked → one decrease
+        _run(limiter, 8, outcome="blocked")
+        assert limiter.limit == 8
+        assert limiter.stats["blocked"] == 8
+        assert limiter.stats["decreases"] == 1
+
+    def test_next_wave_can_halve_again(self):
+        limiter = _limiter(adaptive_start=16)
+        _run(limiter, 1, outcome="blocked")
+        _run(limiter, 1, outcome="blocked")
+        assert limiter.limit == 4
+
+    def test_never_below_min(self):
+        limiter = _limiter(adaptive_start=3, adaptive_min=2)
+        for _ in range(5):
+            _run(limiter, 1, outcome="blocked")
+        assert limiter.limit == 2
+
+    def test_report_block_from_stale_epoch_ignored(self):
+        limiter = _limiter(adaptive_start=16)
+        epoch   = limiter.epoch
+        limiter.report_block(epoch)
+        limiter.report_block(epoch)
+        assert limiter.limit == 8
+
+
+def test_disabled_pins_ceiling():
+    limiter = _limiter(ceiling=12, adaptive_concurrency=False)
+    assert limiter.limit == 12
+    _run(limiter, 4, outcome="blocked")
+    _run(limiter, 50)
+    assert limiter.limit == 12
+    assert "limit 12" in limiter.summary()
+
+
+def test_limit_published_as_gauge():
+    metrics.reset()
+    limiter = _limiter(adaptive_start=16)
+    assert metrics.gauge("adaptive_limit", limiter="test") == 16
+    _run(limiter, 1, outcome="blocked")
+    assert metrics.gauge("adaptive_limit", limiter="test") == 8
+    _run(limiter, 8)
+    assert metrics.gauge("adaptive_limit", limiter="test") == 9 == limiter.stats["limit"]
+    metrics.reset()
@@ -0,0 +1,159 @@
+"""
+Unit tests for scrapers/app_state.py
+
+Tests cover:
+  - locate_app_state() — blob located by raw_decode, trailing JS ignored
+  - Place records read from fixed positions inside ")]}'"-guarded payloads
+  - Field association: each phone stays with its own business
+  - Duplicate data ids collapse; missing fields default cleanly
+  - canonical_place_url() maps scraped hrefs onto the record URL
+  - parse_place_payload() decodes guarded XHR bodies and the tbm=map envelope
+  - MapsRPCScraper._parse_app_state() builds leads from records
+  - The saved debug_response.html search page decodes without error
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+from scrapers.app_state import (
+    PlaceRecord,
+    canonical_place_url,
+    locate_app_state,
+    parse_place_payload,
+    parse_place_records,
+)
+from scrapers.maps_rpc import MapsRPCScraper
+
+FIXTURE = Path(__file__).parent.parent.parent.parent / "leadparser" / "debug_response.html"
+
+
+def _place(name, data_id, phone=None, rating=None, reviews=None, place_id=None):
+    rec = [None] * 179
+    rec[4]   = [None] * 7 + [rating, reviews]
+    rec[7]   = ["https://example.com/" + name.split()[0].lower(), "example.com"]
+    rec[9]   = [None, None, 51.05, -114.07]
+    rec[10]  = data_id
+    rec[11]  = name
+    rec[13]  = ["Plumber", "Contractor"]
+    rec[39]  = "123 Main St, Calgary, AB T2P 1J9"
+    rec[78]  = place_id
+    rec[178] = [[phone, [[phone], 1]]] if phone else None
+    return rec
+
+
+def _page(*places, trailing=";window.APP_FLAGS=[1,0];</script>"):
+    payload = ["plumbers near 51.04,-114.07", None, [[None, p] for p in places]]
+    state   = [[1.0, 2.0], None, None, [None, ")]}'\n" + json.dumps(payload)]]
+    return (
+        "<html><head><script>window.APP_INITIALIZATION_STATE="
+        + json.dumps(state) + trailing + "</head><body></body></html>"
+    )
+
+
+ACE  = _place("Ace Plumbing", "0x1:0xa", phone="(403) 555-0101", rating=4.7, reviews=212, place_id="ChIJace")
+BOLT = _place("Bolt Drains", "0x2:0xb", rating=3.9, reviews=8)
+CRUX = _place("Crux Heating", "0x3:0xc", phone="(403) 555-0303")
+
+
+# ── Blob location ─────────────────────────────────────────────────────────────
+
+class TestLocate:
+    def test_missing_marker(self):
+        assert locate_app_state("<html></html>") is None
+
+    def test_stops_at_end_of_array(self):
+        state = locate_app_state(_page(ACE))
+        assert isinstance(state, list)
+        assert len(state) == 4
+
+    def test_brackets_inside_strings_do_not_confuse_depth(self):
+        html = 'APP_INITIALIZATION_STATE=["a];b", ["]"]];var x=[1];'
+        assert locate_app_state(html) == ["a];b", ["]"]]
+
+    def test_invalid_literal_returns_none(self):
+        assert locate_app_state("APP_INITIALIZATION_STATE=[1, undefined];") is None
+
+
+# ── Place records ─────────────────────────────────────────────────────────────
+
+class TestPlaceRecords:
+    def test_fields_read_from_positions(self):
+        (rec,) = parse_place_records(_page(ACE))
+        assert rec.name == "Ace Plumbing"
+        assert rec.data_id == "0x1:0xa"
+        assert rec.place_id == "ChIJace"
+        assert rec.phone == "(403) 555-0101"
+        assert rec.rating == "4.7"
+        assert rec.review_count == 212
+        assert (rec.lat, rec.lng) == (51.05, -114.07)
+        assert rec.website == "https://example.com/ace"
+        assert rec.address == "123 Main St, Calgary, AB T2P 1J9"
+        assert rec.categories == ["Plumber", "Contractor"]
+
+    def test_phones_stay_with_their_business(self):
+        recs = parse_place_records(_page(ACE, BOLT, CRUX))
+        assert [(r.name, r.phone) for r in recs] == [
+            ("Ace Plumbing", "(403) 555-0101"),
+            ("Bolt Drains", ""),
+            ("Crux Heating", "(403) 555-0303"),
+        ]
+
+    def test_duplicate_data_ids_collapse(self):
+        assert len(parse_place_records(_page(ACE, ACE))) == 1
+
+    def test_sparse_record_defaults(self):
+        rec = [None] * 12
+        rec[10], rec[11] = "0x9:0x9", "Tiny Co"
+        (out,) = parse_place_records(_page(rec))
+        assert out == PlaceRecord(name="Tiny Co", data_id="0x9:0x9")
+
+    def test_url_carries_data_id(self):
+        (rec,) = parse_place_records(_page(ACE))
+        assert rec.url == "https://www.google.com/maps/place/Ace+Plumbing/data=!4m2!3m1!1s0x1:0xa"
+
+    def test_href_maps_onto_record_url(self):
+        (rec,) = parse_place_records(_page(ACE))
+        for href in (
+            "/maps/place/Ace+Plumbing/data=!4m7!3m6!1s0x1:0xa!8m2!3d51.05!4d-114.07",
+            "https://www.google.com/maps/place/Ace%20Plumbing/data=!4m2!3m1!1s0x1:0xa?hl=en",
+        ):
+            assert canonical_place_url(href) == rec.url
+        assert canonical_place_url("/maps/place/Tiny+Co") == PlaceRecord(name="Tiny Co").url
+
+    @pytest.mark.skipif(not FIXTURE.exists(), reason="debug_response.html not present")
+    def test_saved_fixture_decodes(self):
+        html = FIXTURE.read_text(encoding="utf-8")
+        assert locate_app_state(html) is not None
+        assert parse_place_records(html) == []
+
+
+# ── MapsRPCScraper integration ────────────────────────────────────────────────
+
+class TestPayload:
+    def test_guarded_xhr_body(self):
+        body = ")]}'\n" + json.dumps([None, [[None, ACE]]])
+        assert [r.name for r in parse_place_payload(body)] == ["Ace Plumbing"]
+
+    def test_tbm_map_envelope(self):
+        inner = ")]}'\n" + json.dumps([[None, BOLT], [None, CRUX]])
+        body  = json.dumps({"c": 0, "d": inner}) + '/*""*/'
+        assert [r.name for r in parse_place_payload(body)] == ["Bolt Drains", "Crux Heating"]
+
+    def test_html_page(self):
+        assert [r.name for r in parse_place_payload(_page(ACE))] == ["Ace Plumbing"]
+
+    def test_garbage(self):
+        assert parse_place_payload("{not json") == []
+        assert parse_place_payload("") == []
+
+
+class TestMapsRPCParse:
+    def test_leads_from_records(self):
+        scraper = MapsRPCScraper({"scraping": {}}, rate_limiter=None)
+        leads = scraper._parse_app_state(_page(ACE, BOLT))
+        assert [l["name"] for l in leads] == ["Ace Plumbing", "Bolt Drains"]
+        assert leads[0]["phone"] == "(403) 555-0101"
+        assert leads[0]["review_count"] == 212
+        assert leads[0]["place_id"] == "ChIJace"
+        assert leads[1]["phone"] == ""
@@ -0,0 +1,248 @@
+"""
+Unit tests for scrapers/browser_pool.py
+
+Playwright is replaced by in-memory fakes; no Chromium is launched.
+
+Tests cover:
+  - start() launches once and pre-warms contexts
+  - Released contexts are reused (fingerprint kept), pages closed
+  - Recycle policy: unhealthy, max page loads, max age, idle cap
+  - A disconnected browser is relaunched and stale contexts dropped
+  - Proxied and direct contexts live in separate buckets
+"""
+
+import asyncio
+
+import pytest
+from scrapers import browser_pool
+from scrapers.browser_pool import BrowserPool, make_fingerprint
+
+
+class FakePage:
+    def __init__(self, ctx):
+        self.ctx = ctx
+
+    async def close(self):
+        self.ctx.pages.remove(self)
+
+
+class FakeContext:
+    def __init__(self, kwargs):
+        self.kwargs = kwargs
+        self.pages  = []
+        self.closed = False
+
+    async def new_page(self):
+        if self.closed:
+            raise RuntimeError("context closed")
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts  = []
+        self.connected = True
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **kwargs):
+        ctx = FakeContext(kwargs)
+        self.contexts.append(ctx)
+        return ctx
+
+    async def close(self):
+        self.connected = False
+
+
+class FakePlaywright:
+    async def stop(self):
+        pass
+
+
+class FakeProxyManager:
+    def get_proxy(self):
+        return {"http": "http://10.0.0.1:8080"}
+
+
+@pytest.fixture
+def make_pool(sample_config, monkeypatch):
+    browsers = []
+
+    async def launch(self):
+        browsers.append(FakeBrowser())
+        return FakePlaywright(), browsers[-1]
+
+    monkeypatch.setattr(BrowserPool, "_launch_browser", launch)
+
+    def make(proxy_manager=None, **scraping):
+        sample_config.setdefault("scraping", {}).update(scraping)
+        pool = BrowserPool(sample_config, proxy_manager)
+        pool.browsers = browsers
+        return pool
+    return make
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+# ── Fingerprint ───────────────────────────────────────────────────────────────
+
+def test_fingerprint_is_new_context_kwargs():
+    fp = make_fingerprint()
+    assert fp["user_agent"] in browser_pool.USER_AGENTS
+    assert fp["timezone_id"] != "America/Seattle"
+    assert 1280 <= fp["viewport"]["width"] <= 1920
+
+
+# ── Leasing ───────────────────────────────────────────────────────────────────
+
+class TestLeasing:
+    def test_start_launches_once_and_prewarms(self, make_pool):
+        async def main():
+            pool = make_pool(pool_contexts=3)
+            await pool.start()
+            await pool.start()
+            return pool
+        pool = _run(main())
+        assert pool.stats["launches"] == 1
+        assert len(pool.browsers[0].contexts) == 3
+
+    def test_released_context_is_reused(self, make_pool):
+        async def main():
+            pool = make_pool(pool_contexts=1)
+            await pool.start()
+            async with pool.context() as first:
+                await pool.new_page(first)
+            async with pool.context() as second:
+                pass
+            return pool, first, second
+        pool, first, second = _run(main())
+        assert second is first
+        assert first["ctx"].pages == []          # pages closed on release
+        assert pool.stats["reused"] == 2
+        assert len(pool.browsers[0].contexts) == 1
+
+    def test_concurrent_leases_get_distinct_contexts(self, make_pool):
+        async def main():
+            pool = make_pool(pool_contexts=1)
+            await pool.start()
+            a = await pool.acquire()
+            b = await pool.acquire()
+            return a, b
+        a, b = _run(main())
+        assert a["ctx"] is not b["ctx"]
+        assert a["fingerprint"] is not b["fingerprint"]
+
+    def test_proxied_and_direct_kept_apart(self, make_pool):
+        async def main():
+            pool = make_pool(FakeProxyManager(), pool_contexts=1)
+            await pool.start()
+            proxied = await pool.acquire()
+            direct  = await pool.acquire(use_proxy=False)
+            return proxied, direct
+        proxied, direct = _run(main())
+        assert proxied["ctx"].kwargs["proxy"] == {"server": "http://10.0.0.1:8080"}
+        assert "proxy" not in direct["ctx"].kwargs
+
+
+# ── Recycle policy ────────────────────────────────────────────────────────────
+
+class TestRecycle:
+    def test_unhealthy_context_closed(self, make_pool):
+        async def main():
+            pool = make_pool(pool_contexts=1)
+            await pool.start()
+            async with pool.context() as lease:
+                lease["healthy"] = False
+            return pool, lease
+        pool, lease = _run(main())
+        assert lease["ctx"].closed
+        assert pool.stats["recycled"] == 1
+
+    def test_max_pages(self, make_pool):
+        async def main():
+            pool = make_pool(pool_contexts=1, context_max_pages=2)
+            await pool.start()
+            lease = await pool.acquire()
+            lease["pages"] += 1
+            assert not pool.expired(lease)
+            lease["pages"] += 1
+            assert pool.expired(lease)
+            await pool.release(lease)
+            return lease
+        assert _run(main())["ctx"].closed
+
+    def test_max_age_checked_on_acquire(self, make_pool, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr(browser_pool.time, "monotonic", lambda: clock[0])
+
+        async def main():
+            pool = make_pool(pool_contexts=1, context_max_age=60)
+            await pool.start()
+            warm = pool._idle[False][0]
+            clock[0] += 61
+            fresh = await pool.acquire()
+            return warm, fresh
+        warm, fresh = _run(main())
+        assert warm["ctx"].closed
+        assert fresh is not warm
+
+    def test_idle_cap(self, make_pool):
+        async def main():
+            pool = make_pool(pool_contexts=1)
+            await pool.start()
+            a = await pool.acquire()
+            b = await pool.acquire()
+            await pool.release(a)
+            await pool.release(b)
+            return pool, a, b
+        pool, a, b = _run(main())
+        assert len(pool._idle[False]) == 1
+        assert not a["ctx"].closed and b["ctx"].closed
+
+
+# ── Health checks ─────────────────────────────────────────────────────────────
+
+class TestHealth:
+    def test_relaunch_on_disconnect(self, make_pool):
+        async def main():
+            pool = make_pool(pool_contexts=1)
+            await pool.start()
+            held = await pool.acquire()
+            pool.browsers[0].connected = False
+            lease = await pool.acquire()
+            await pool.release(held)   # from the dead browser → retired
+            return pool, held, lease
+        pool, held, lease = _run(main())
+        assert pool.stats["launches"] == 2
+        assert lease["ctx"] in pool.browsers[1].contexts
+        assert held["ctx"].closed
+        assert pool._idle[False] == []
+
+    def test_dead_context_marked_unhealthy(self, make_pool):
+        async def main():
+            pool = make_pool(pool_contexts=1)
+            await pool.start()
+            lease = await pool.acquire()
+            lease["ctx"].closed = True
+            with pytest.raises(RuntimeError):
+                await pool.new_page(lease)
+            return lease
+        assert _run(main())["healthy"] is False
+
+    def test_close_disposes_idle_contexts(self, make_pool):
+        async def main():
+            pool = make_pool(pool_contexts=2)
+            await pool.start()
+            await pool.close()
+            return pool
+        pool = _run(main())
+        assert all(c.closed for c in pool.browsers[0].contexts)
+        assert not pool.browsers[0].connected
@@ -0,0 +1,90 @@
+"""
+Unit tests for the trigger-maintained dashboard stats (lead_stats)
+
+Tests cover:
+  - Insert / update / delete triggers keep lead_stats equal to a recount
+  - Updates to columns the stats ignore do not bump the version
+  - dashboard_stats() falls back to one aggregate query on old files
+  - /api/stats sends an ETag and answers 304 until the data changes
+"""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+import api_server
+from exporters.sqlite_handler import _STATS_AGGREGATE, dashboard_stats
+
+DAY = "2026-01-15"
+
+
+@pytest.fixture
+def lead(make_lead):
+    """Leads added on DAY, spread over every score tier."""
+    return lambda i, **overrides: make_lead(i, **{"date_added": DAY, "lead_score": i % 25, **overrides})
+
+
+def _recount(conn, day=DAY) -> dict:
+    total, hot, warm = conn.execute(_STATS_AGGREGATE).fetchone()
+    added = conn.execute("SELECT COUNT(*) FROM leads WHERE date_added = ?", (day,)).fetchone()[0]
+    return {"total": total, "hot": hot, "warm": warm, "new_this_session": added}
+
+
+def _stats(conn, day=DAY) -> dict:
+    stats = dashboard_stats(conn, day)
+    stats.pop("version")
+    return stats
+
+
+def test_triggers_match_recount(db, lead):
+    db.bulk_insert([lead(i) for i in range(60)] + [lead(i, website="acme.com") for i in range(60, 70)])
+    db.insert_lead(lead(70, phone=""))
+    assert _stats(db._conn) == _recount(db._conn)
+    assert _stats(db._conn)["total"] == 60
+
+    with db._conn:
+        db._conn.execute("UPDATE leads SET lead_score = 20, date_added = '2026-01-16' WHERE id <= 10")
+        db._conn.execute("UPDATE leads SET website = 'x.com' WHERE id BETWEEN 11 AND 15")
+        db._conn.execute("DELETE FROM leads WHERE id > 50")
+    assert _stats(db._conn) == _recount(db._conn)
+    assert _stats(db._conn, "2026-01-16") == _recount(db._conn, "2026-01-16")
+
+
+def test_version_ignores_unrelated_updates(db, lead):
+    db.bulk_insert([lead(i) for i in range(5)])
+    before = dashboard_stats(db._conn, DAY)["version"]
+    db.mark_exported([1, 2, 3])
+    assert dashboard_stats(db._conn, DAY)["version"] == before
+    db.insert_lead(lead(9))
+    assert dashboard_stats(db._conn, DAY)["version"] == before + 1
+
+
+def test_fallback_without_lead_stats(tmp_path):
+    conn = sqlite3.connect(tmp_path / "old.db")
+    conn.execute("CREATE TABLE leads (website TEXT, phone TEXT, lead_score INTEGER, date_added TEXT)")
+    conn.executemany("INSERT INTO leads VALUES (?, ?, ?, ?)", [
+        ("", "214-555-0100", 19, DAY), (None, "214-555-0101", 13, DAY),
+        ("acme.com", "214-555-0102", 20, DAY), ("", "", 20, "2026-01-01"),
+    ])
+    assert dashboard_stats(conn, DAY) == {
+        "total": 2, "hot": 1, "warm": 1, "new_this_session": 3, "version": None,
+    }
+
+
+def test_stats_etag(db, lead, monkeypatch):
+    monkeypatch.setattr(api_server, "DB_PATH", Path(db.db_path))
+    client = api_server.app.test_client()
+    db.bulk_insert([lead(i) for i in range(5)])
+
+    first = client.get("/api/stats")
+    etag  = first.headers["ETag"]
+    assert first.status_code == 200 and first.json["total"] == 5
+    assert "no-cache" in first.headers["Cache-Control"]
+
+    again = client.get("/api/stats", headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.data == b""
+
+    db.insert_lead(lead(6))
+    changed = client.get("/api/stats", headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["ETag"] != etag
@@ -0,0 +1,109 @@
+"""
+Unit tests for scrapers/dom_extract.py
+
+Tests cover:
+  - normalize_profile() applies the stepwise extractors' cleanup rules
+  - Phone / rating / review / website fallbacks pick the first usable value
+  - _extract_business() reads a profile with one page.evaluate
+  - _extract_business() falls back to the stepwise extractors on failure
+"""
+
+import asyncio
+
+from scrapers.dom_extract import PROFILE_JS, normalize_profile
+from scrapers.playwright_scraper import PlaywrightGoogleMapsScraper
+
+RAW = {
+    "name":        "  Joe's Plumbing ",
+    "phones":      ["+1214", " +12145550123 "],
+    "address":     "123 Main St, Dallas, TX 75201",
+    "hours_label": "Open ⋅ Closes 6 PM; Show open hours for the week",
+    "hours_text":  "",
+    "ratings":     ["", "4.6"],
+    "reviews":     ["Write a review", "1,280 reviews"],
+    "websites":    ["", "https://www.google.com/url?q=x&url=https%3A%2F%2Fjoes.com&sa=U"],
+    "category":    "Plumber",
+}
+
+
+# ── normalize_profile ─────────────────────────────────────────────────────────
+
+class TestNormalize:
+    def test_fields(self):
+        assert normalize_profile(RAW) == {
+            "name":         "Joe's Plumbing",
+            "phone":        "+12145550123",
+            "address":      "123 Main St, Dallas, TX 75201",
+            "hours":        "Open ⋅ Closes 6 PM",
+            "review_count": 1280,
+            "rating":       "4.6",
+            "website":      "https://joes.com",
+            "category":     "Plumber",
+        }
+
+    def test_short_hours_label_uses_text_fallback(self):
+        out = normalize_profile({**RAW, "hours_label": "hours", "hours_text": " 9–5 "})
+        assert out["hours"] == "9–5"
+
+    def test_direct_website_kept(self):
+        out = normalize_profile({**RAW, "websites": ["https://joes.com/"]})
+        assert out["website"] == "https://joes.com/"
+
+    def test_empty(self):
+        out = normalize_profile({})
+        assert out["name"] == "" and out["phone"] == ""
+        assert out["review_count"] == 0 and out["rating"] == ""
+
+
+# ── _extract_business ─────────────────────────────────────────────────────────
+
+class FakePage:
+    def __init__(self, raw=None, fail=False):
+        self.raw   = raw
+        self.fail  = fail
+        self.calls = []
+
+    async def goto(self, url, **kw):
+        self.calls.append("goto")
+
+    async def wait_for_selector(self, sel, **kw):
+        self.calls.append("wait")
+
+    async def evaluate(self, script):
+        self.calls.append("evaluate")
+        if self.fail:
+            raise RuntimeError("Execution context was destroyed")
+        assert script is PROFILE_JS
+        return self.raw
+
+
+def _extract(sample_config, page):
+    sample_config.setdefault("scraping", {})
+    scraper = PlaywrightGoogleMapsScraper(sample_config, rate_limiter=None)
+    return asyncio.run(scraper._extract_business(page, "https://maps/x", "plumbers"))
+
+
+def test_single_round_trip(sample_config):
+    page = FakePage(RAW)
+    lead = _extract(sample_config, page)
+    assert page.calls == ["goto", "wait", "evaluate"]
+    assert lead["name"] == "Joe's Plumbing"
+    assert lead["phone"] == "+12145550123"
+    assert lead["gmb_link"] == "https://maps/x"
+
+
+def test_no_phone_skipped(sample_config):
+    lead = _extract(sample_config, FakePage({**RAW, "phones": []}))
+    assert lead is None
+
+
+def test_stepwise_fallback(sample_config, monkeypatch):
+    async def stepwise(self, page):
+        page.calls.append("stepwise")
+        return normalize_profile(RAW)
+
+    monkeypatch.setattr(PlaywrightGoogleMapsScraper, "_extract_fields_stepwise", stepwise)
+    page = FakePage(fail=True)
+    lead = _extract(sample_config, page)
+    assert page.calls[-1] == "stepwise"
+    assert lead["review_count"] == 1280
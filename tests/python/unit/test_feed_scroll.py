@@ -0,0 +1,76 @@
+"""
+Unit tests for scrapers/feed_scroll.py
+
+A fake page replays scripted SCROLL_JS results; the JS itself needs Chromium.
+
+Tests cover:
+  - The first step only collects, later steps scroll
+  - Stops at end-of-list, at max_collect, and after three empty steps
+  - Excluded / repeated hrefs are skipped
+  - A missing feed ends the scroll with nothing collected
+"""
+
+import asyncio
+
+from scrapers.feed_scroll import SCROLL_JS, collect_feed
+
+
+class FakePage:
+    def __init__(self, *steps):
+        self.steps = list(steps)
+        self.args  = []
+
+    async def evaluate(self, script, arg):
+        assert script is SCROLL_JS
+        self.args.append(arg)
+        if self.steps:
+            return self.steps.pop(0)
+        return {"hrefs": [], "end": False}
+
+
+def _step(*ids, end=False):
+    return {"hrefs": [f"https://maps/maps/place/{i}" for i in ids], "end": end}
+
+
+def _collect(page, max_collect=100, exclude=(), **kw):
+    return asyncio.run(collect_feed(page, max_collect, set(exclude), **kw))
+
+
+def test_first_step_collects_without_scrolling():
+    page = FakePage(_step(1, 2), _step(3), _step(end=True))
+    urls, end = _collect(page, quiet_ms=100, max_wait_ms=900)
+    assert len(urls) == 3 and end
+    assert [a["scroll"] for a in page.args] == [False, True, True]
+    assert page.args[1]["quietMs"] == 100 and page.args[1]["maxWaitMs"] == 900
+
+
+def test_stops_at_max_collect():
+    page = FakePage(_step(1, 2, 3), _step(4, 5, 6))
+    urls, end = _collect(page, max_collect=4)
+    assert urls == [f"https://maps/maps/place/{i}" for i in (1, 2, 3, 4)]
+    assert not end and len(page.args) == 2
+
+
+def test_three_empty_steps_give_up():
+    page = FakePage(_step(1))
+    urls, _ = _collect(page, max_steps=20)
+    assert len(urls) == 1
+    assert len(page.args) == 4
+
+
+def test_max_steps_bounds_scrolls():
+    page = FakePage(*[_step(i) for i in range(50)])
+    urls, _ = _collect(page, max_steps=5)
+    assert len(page.args) == 6 and len(urls) == 6
+
+
+def test_excluded_and_repeated_hrefs_skipped():
+    page = FakePage(_step(1, 2), _step(2, 3, end=True))
+    urls, _ = _collect(page, exclude={"https://maps/maps/place/1"})
+    assert urls == ["https://maps/maps/place/2", "https://maps/maps/place/3"]
+
+
+def test_missing_feed():
+    page = FakePage({"hrefs": [], "end": False, "missing": True})
+    assert _collect(page) == ([], False)
+    assert len(page.args) == 1
@@ -0,0 +1,176 @@
+"""
+Unit tests for scrapers/html_extract.py
+
+Tests cover:
+  - Script / style blocks split out with case-insensitive close tags
+  - Phone strategy order (tel: link → data-item-id → aria-label → bare scan)
+  - Name from og:title (either attribute order), <title>, <h1>
+  - Rating / review count from quoted strings, aria-labels and compact form
+  - Address, hours, website and category anchors
+  - parse_business_html() gate: None without phone or name
+  - parse_business_bytes() (process-pool entry point) decodes then parses
+  - The saved debug_response.html search page parses without error
+"""
+
+from pathlib import Path
+
+import pytest
+from scrapers.html_extract import (
+    extract_fields,
+    parse_business_bytes,
+    parse_business_html,
+)
+
+FIXTURE = Path(__file__).parent.parent.parent.parent / "leadparser" / "debug_response.html"
+
+
+def _page(*body: str, head: str = "") -> str:
+    return (
+        "<!DOCTYPE html><html><head>" + head + "</head><body>"
+        + "".join(body)
+        + "</body></html>"
+    )
+
+
+PROFILE = _page(
+    '<h1 class="DUwDvf">Joe\'s Plumbing</h1>',
+    '<span aria-label="4.6 stars"></span>',
+    '<button aria-label="128 reviews"></button>',
+    '<button data-item-id="address" class="x" aria-label="Address: 123 Main St, Dallas, TX 75201">',
+    '<a data-item-id="authority" href="https://joesplumbing.com">site</a>',
+    '<button data-item-id="phone:tel:+12145550123" aria-label="Phone: (214) 555-0123">',
+    '<div aria-label="Open ⋅ Closes 6 PM; Show open hours for the week"></div>',
+    '<script>{"category": "Plumber"}</script>',
+    head='<meta property="og:title" content="Joe\'s Plumbing · Google Maps">',
+)
+
+
+# ── Regions ───────────────────────────────────────────────────────────────────
+
+class TestRegions:
+    def test_uppercase_script_closes(self):
+        html = _page('<SCRIPT>var x = 1;</SCRIPT>', '<h1 class="x">After Script</h1>')
+        assert extract_fields(html)["name"] == "After Script"
+
+    def test_mixed_case_close_with_space(self):
+        html = _page('<script>var x = 1;</Script >', '<STYLE>h1 {}</style >',
+                     '<h1 class="x">After Style</h1>')
+        assert extract_fields(html)["name"] == "After Style"
+
+
+# ── Phone ─────────────────────────────────────────────────────────────────────
+
+class TestPhone:
+    def test_tel_link_wins(self):
+        html = _page('<a href="tel:(214)%20555-0199">call</a>', PROFILE)
+        assert extract_fields(html)["phone"] == "(214) 555-0199"
+
+    def test_data_item_id(self):
+        assert extract_fields(PROFILE)["phone"] == "+12145550123"
+
+    def test_aria_label(self):
+        html = _page('<button aria-label="Phone: (214) 555-0123">')
+        assert extract_fields(html)["phone"] == "(214) 555-0123"
+
+    def test_bare_pattern_fallback(self):
+        html = _page("<div>Call us at 214-555-0123 today</div>")
+        assert extract_fields(html)["phone"] == "214-555-0123"
+
+    def test_no_phone(self):
+        assert extract_fields(_page("<div>nothing here</div>"))["phone"] == ""
+
+
+# ── Name ──────────────────────────────────────────────────────────────────────
+
+class TestName:
+    def test_og_title_suffix_stripped(self):
+        assert extract_fields(PROFILE)["name"] == "Joe's Plumbing"
+
+    def test_og_title_content_first(self):
+        html = _page(head='<meta content="Ace Roofing - Google Maps" property="og:title">')
+        assert extract_fields(html)["name"] == "Ace Roofing"
+
+    def test_generic_title_falls_through_to_h1(self):
+        html = _page("<h1>Real Name</h1>", head="<title>  Google Maps  </title>")
+        assert extract_fields(html)["name"] == "Real Name"
+
+    def test_title_tag(self):
+        html = _page(head="<title>Best Pizza · Google Maps</title>")
+        assert extract_fields(html)["name"] == "Best Pizza"
+
+
+# ── Rating / reviews ──────────────────────────────────────────────────────────
+
+class TestRatingReviews:
+    def test_aria_labels(self):
+        f = extract_fields(PROFILE)
+        assert f["rating"] == "4.6"
+        assert f["review_count"] == 128
+
+    def test_quoted_json_strings(self):
+        html = _page('<script>["4.2 stars","1,204 reviews"]</script>')
+        f = extract_fields(html)
+        assert f["rating"] == "4.2"
+        assert f["review_count"] == 1204
+
+    def test_compact_fallback(self):
+        f = extract_fields(_page("<span>4.9(57)</span>"))
+        assert f["rating"] == "4.9"
+        assert f["review_count"] == 57
+
+
+# ── Other fields ──────────────────────────────────────────────────────────────
+
+class TestOtherFields:
+    def test_address(self):
+        assert extract_fields(PROFILE)["address"] == "123 Main St, Dallas, TX 75201"
+
+    def test_street_address_fallback(self):
+        html = _page('<script>{"streetAddress": "9 Elm Rd"}</script>')
+        assert extract_fields(html)["address"] == "9 Elm Rd"
+
+    def test_website(self):
+        assert extract_fields(PROFILE)["website"] == "https://joesplumbing.com"
+
+    def test_google_og_url_ignored(self):
+        html = _page(head='<meta property="og:url" content="https://www.google.com/maps/x">')
+        assert extract_fields(html)["website"] == ""
+
+    def test_hours(self):
+        assert extract_fields(PROFILE)["hours"] == "Open ⋅ Closes 6 PM"
+
+    def test_category(self):
+        assert extract_fields(PROFILE)["category"] == "Plumber"
+
+
+# ── parse_business_html ───────────────────────────────────────────────────────
+
+class TestParseBusinessHtml:
+    def test_returns_lead(self):
+        lead = parse_business_html(PROFILE, "https://maps.google.com/?cid=1", "plumbers")
+        assert lead["name"] == "Joe's Plumbing"
+        assert lead["niche"] == "plumbers"
+        assert lead["gmb_link"] == "https://maps.google.com/?cid=1"
+        assert lead["source"] == "Google Maps (XHR)"
+
+    def test_none_without_phone(self):
+        html = _page("<h1>No Phone Co</h1>")
+        assert parse_business_html(html, "u", "n") is None
+
+    def test_none_without_name(self):
+        html = _page('<a href="tel:2145550123">x</a>')
+        assert parse_business_html(html, "u", "n") is None
+
+    def test_bytes_entry_point_matches_str(self):
+        body = PROFILE.encode("utf-8")
+        assert parse_business_bytes(body, "utf-8", "u", "n") == parse_business_html(PROFILE, "u", "n")
+
+    def test_bytes_entry_point_tolerates_bad_bytes(self):
+        body = PROFILE.encode("utf-8") + b"\xff\xfe"
+        assert parse_business_bytes(body, "utf-8", "u", "n")["name"] == "Joe's Plumbing"
+
+    @pytest.mark.skipif(not FIXTURE.exists(), reason="debug_response.html not present")
+    def test_saved_fixture_parses(self):
+        html = FIXTURE.read_text(encoding="utf-8")
+        fields = extract_fields(html)
+        assert isinstance(fields["name"], str)
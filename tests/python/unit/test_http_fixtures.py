@@ -0,0 +1,151 @@
+"""
+Unit tests for utils/http_fixtures.py record / replay
+
+Tests cover:
+  - httpx: the record hook saves responses; ReplayTransport serves them back
+  - requests: the session hook records; ReplayAdapter replays
+  - Replay misses answer 404 and are counted
+  - Replay latency delays each response
+  - Playwright: HAR path per context when recording, routes when replaying
+  - Mode off → every hook is a no-op
+"""
+
+import asyncio
+import time
+
+import httpx
+import requests
+from requests.adapters import BaseAdapter
+
+from utils.http_fixtures import HttpFixtures
+
+URL = "https://www.google.com/maps/search/plumbers+in+Dallas"
+
+
+def _fixtures(tmp_path, mode, **extra):
+    return HttpFixtures({"fixtures": {"mode": mode, "dir": str(tmp_path), **extra}})
+
+
+# ── httpx ─────────────────────────────────────────────────────────────────────
+
+def _live_client(fixtures):
+    def handler(request):
+        if request.url.path == "/old":
+            return httpx.Response(301, headers={"location": URL})
+        return httpx.Response(200, html="<html>results</html>")
+    return httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), follow_redirects=True,
+        **fixtures.httpx_kwargs(),
+    )
+
+
+def test_httpx_record_then_replay(tmp_path):
+    async def record():
+        async with _live_client(_fixtures(tmp_path, "record")) as client:
+            await client.get(URL + "?authuser=0")
+            await client.get("https://www.google.com/old")
+
+    asyncio.run(record())
+    replay = _fixtures(tmp_path, "replay")
+
+    async def main():
+        async with httpx.AsyncClient(follow_redirects=True, **replay.httpx_kwargs()) as client:
+            return await client.get(URL), await client.get("https://www.google.com/old"), \
+                await client.get("https://www.google.com/never")
+
+    hit, redirected, miss = asyncio.run(main())
+    assert hit.status_code == 200 and hit.text == "<html>results</html>"
+    assert hit.headers["content-type"].startswith("text/html")
+    assert redirected.status_code == 200 and str(redirected.url) == URL
+    assert miss.status_code == 404
+    assert replay.stats == {"recorded": 0, "replayed": 3, "misses": 1}
+
+
+def test_replay_latency(tmp_path):
+    _fixtures(tmp_path, "record").save("GET", URL, 200, {}, b"x")
+    replay = _fixtures(tmp_path, "replay", latency_ms=50)
+
+    async def main():
+        async with httpx.AsyncClient(**replay.httpx_kwargs()) as client:
+            start = time.monotonic()
+            await asyncio.gather(*(client.get(URL) for _ in range(5)))
+            return time.monotonic() - start
+
+    elapsed = asyncio.run(main())
+    assert 0.05 <= elapsed < 0.2      # concurrent: latency overlaps
+
+
+# ── requests ──────────────────────────────────────────────────────────────────
+
+class _LiveAdapter(BaseAdapter):
+    def send(self, request, **kwargs):
+        resp = requests.Response()
+        resp.status_code = 200
+        resp.headers     = requests.structures.CaseInsensitiveDict(
+            {"content-type": "text/html; charset=utf-8"}
+        )
+        resp._content = "<p>(214) 555-0100 — Acme</p>".encode()
+        resp.url      = request.url
+        resp.request  = request
+        return resp
+
+    def close(self):
+        pass
+
+
+def test_requests_record_then_replay(tmp_path):
+    url      = "https://www.yellowpages.com/search?search_terms=acme"
+    recorder = _fixtures(tmp_path, "record")
+    session  = requests.Session()
+    session.mount("https://", _LiveAdapter())
+    recorder.install_session(session)
+    session.get(url, timeout=12)
+    assert recorder.stats["recorded"] == 1
+
+    replay  = _fixtures(tmp_path, "replay")
+    offline = requests.Session()
+    replay.install_session(offline)
+    resp = offline.get(url, timeout=12)
+    assert resp.status_code == 200
+    assert resp.text == "<p>(214) 555-0100 — Acme</p>"
+    assert offline.get(url + "x").status_code == 404
+
+
+# ── Playwright ────────────────────────────────────────────────────────────────
+
+class FakeContext:
+    def __init__(self):
+        self.routes = []
+
+    async def route(self, pattern, handler):
+        self.routes.append(("route", pattern))
+
+    async def route_from_har(self, har, not_found):
+        self.routes.append(("har", har.rsplit("/", 1)[-1], not_found))
+
+
+def test_playwright_har(tmp_path):
+    recorder = _fixtures(tmp_path, "record")
+    first, second = recorder.context_kwargs(), recorder.context_kwargs()
+    assert first["record_har_path"] != second["record_har_path"]
+    assert first["record_har_path"].startswith(str(tmp_path / "har"))
+
+    for kwargs in (first, second):
+        open(kwargs["record_har_path"], "wb").close()
+    ctx = FakeContext()
+    asyncio.run(_fixtures(tmp_path, "replay").install_context(ctx))
+    assert ctx.routes[0] == ("route", "**/*")          # abort whatever no archive has
+    assert [r[0] for r in ctx.routes[1:]] == ["har", "har"]
+    assert all(r[2] == "fallback" for r in ctx.routes[1:])
+
+
+def test_off_is_noop(tmp_path):
+    fixtures = HttpFixtures({})
+    assert not fixtures.enabled
+    assert fixtures.httpx_kwargs() == {} and fixtures.context_kwargs() == {}
+    session = requests.Session()
+    fixtures.install_session(session)
+    assert session.hooks["response"] == []
+    ctx = FakeContext()
+    asyncio.run(fixtures.install_context(ctx))
+    assert ctx.routes == []
@@ -0,0 +1,125 @@
+"""
+Unit tests for /api/leads keyset pagination (exporters/sqlite_handler.LeadPage)
+
+Tests cover:
+  - Paging with cursors returns every qualified lead once, in dashboard order
+  - Filters: score tier / range, niche, status, search text (LIKE escaped)
+  - fields= projection and argument validation
+  - /api/leads streams {"leads", "next_cursor"} and rejects bad args with 400
+  - Without cursor / limit, /api/leads keeps its original bare-array shape
+  - dashboard.py re-parses the CSV only when it changes
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+import api_server
+import dashboard
+from exporters.sqlite_handler import LEAD_COLUMNS, LEAD_LIST_FIELDS, LeadPage
+
+
+def _spread(i: int) -> dict:
+    """Alternate niches, three dates and four score tiers so every filter splits."""
+    return {
+        "niche": "plumbers" if i % 2 else "roofers",
+        "date_added": f"2026-01-{10 + i % 3}", "lead_score": i % 4 * 6,
+    }
+
+
+@pytest.fixture
+def db(db, make_lead):
+    db.bulk_insert([make_lead(i, **_spread(i)) for i in range(50)]
+                   + [make_lead(50, website="acme.com", **_spread(50))])
+    return db
+
+
+def _page(conn, **args) -> dict:
+    return json.loads("".join(LeadPage(args).iter_json(conn)))
+
+
+def _all_pages(conn, limit="100", **args) -> list[dict]:
+    leads, cursor = [], None
+    args["limit"] = limit
+    while True:
+        page   = _page(conn, **args, **({"cursor": cursor} if cursor else {}))
+        leads += page["leads"]
+        cursor = page["next_cursor"]
+        if not cursor:
+            return leads
+
+
+def test_pages_cover_everything_in_order(db):
+    expected = [row[0] for row in db._conn.execute(
+        "SELECT id FROM leads WHERE website = '' "
+        "ORDER BY lead_score DESC, date_added DESC, id DESC")]
+    leads = _all_pages(db._conn, limit="7")
+    assert [l["id"] for l in leads] == expected and len(expected) == 50
+
+
+def test_filters(db):
+    hot = _all_pages(db._conn, filter="hot")
+    assert hot and all(l["lead_score"] >= 18 for l in hot)
+    mid = _all_pages(db._conn, min_score="6", max_score="12")
+    assert {l["lead_score"] for l in mid} == {6, 12}
+    assert {l["niche"] for l in _all_pages(db._conn, niche="roofers")} == {"roofers"}
+    assert len(_all_pages(db._conn, status="new")) == 50
+    assert _all_pages(db._conn, status="called") == []
+    assert {l["name"] for l in _all_pages(db._conn, q="Biz 4")} == {"Biz 4", *(f"Biz {i}" for i in range(40, 50))}
+    assert _all_pages(db._conn, q="100%") == []             # % is literal, not a wildcard
+
+
+def test_projection_and_validation(db):
+    page = _page(db._conn, fields="name,phone", limit="2")
+    assert [set(l) for l in page["leads"]] == [{"name", "phone"}] * 2
+    assert set(_page(db._conn, limit="1")["leads"][0]) == set(LEAD_LIST_FIELDS)
+    for bad in ({"fields": "name,password"}, {"limit": "0"}, {"limit": "x"},
+                {"filter": "lukewarm"}, {"cursor": "not-a-cursor"}):
+        with pytest.raises(ValueError):
+            LeadPage(bad)
+
+
+def test_endpoint_streams_pages(db, monkeypatch):
+    monkeypatch.setattr(api_server, "DB_PATH", Path(db.db_path))
+    client = api_server.app.test_client()
+
+    first = client.get("/api/leads?limit=30&fields=id,name")
+    assert first.status_code == 200 and first.mimetype == "application/json"
+    body = first.get_json()
+    assert len(body["leads"]) == 30 and body["next_cursor"]
+    rest = client.get(f"/api/leads?limit=30&cursor={body['next_cursor']}").get_json()
+    assert len(rest["leads"]) == 20 and rest["next_cursor"] is None
+    assert client.get("/api/leads?limit=5000").status_code == 400
+
+
+def test_unpaged_keeps_bare_array(db, monkeypatch):
+    monkeypatch.setattr(api_server, "DB_PATH", Path(db.db_path))
+    client = api_server.app.test_client()
+
+    leads = client.get("/api/leads").get_json()
+    assert isinstance(leads, list) and len(leads) == 50     # every lead, no page cap
+    db._conn.row_factory = __import__("sqlite3").Row
+    star = [dict(r) for r in db._conn.execute(
+        "SELECT * FROM leads WHERE website = '' "
+        "ORDER BY lead_score DESC, date_added DESC, id DESC")]
+    assert leads == star                                     # same rows and columns as SELECT *
+    assert tuple(leads[0]) == LEAD_COLUMNS
+
+    hot = client.get("/api/leads?filter=hot").get_json()
+    assert isinstance(hot, list) and all(l["lead_score"] >= 18 for l in hot)
+
+    monkeypatch.setattr(api_server, "DB_PATH", Path(db.db_path).with_name("missing.db"))
+    assert client.get("/api/leads").get_json() == []
+
+
+def test_dashboard_csv_cache(tmp_path, monkeypatch):
+    csv_path = tmp_path / "leads_latest.csv"
+    csv_path.write_text("Business Name,Lead Score,Website (if available)\nAcme,9,\n")
+    monkeypatch.setattr(dashboard, "_csv_path", str(csv_path))
+    monkeypatch.setattr(dashboard, "_cache", {"key": None, "leads": []})
+
+    first = dashboard.load_leads()
+    assert dashboard.load_leads() is first                  # unchanged file: no re-parse
+    csv_path.write_text("Business Name,Lead Score,Website (if available)\nAcme,9,\nBolt,12,\n")
+    assert [l["Business Name"] for l in dashboard.load_leads()] == ["Bolt", "Acme"]
@@ -0,0 +1,147 @@
+"""
+Unit tests for utils/metrics.py and the run-metrics plumbing
+
+Tests cover:
+  - Counters and histograms keyed by name + labels (label order irrelevant)
+  - Gauges keep the last value set and appear in summary() / Prometheus text
+  - timer() observes wall time; summary() quantiles from the buckets
+  - Prometheus text output: TYPE lines, cumulative buckets, +Inf, sum/count
+  - write_prometheus() creates the file atomically
+  - LeadStream counts leads per stage and times build_lead / filters
+  - SQLiteHandler stores the summary in sessions.metrics, adding the
+    column to databases created before it existed
+"""
+
+import json
+import sqlite3
+import time
+
+import pytest
+
+from exporters.sqlite_handler import SQLiteHandler
+from main import LeadStream
+from utils.address_parser import AddressParser
+from utils.lead_scorer import LeadScorer
+from utils.metrics import Metrics, metrics
+from utils.phone_validator import PhoneValidator
+from utils.pitch_engine import PitchEngine
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+# ── Registry ──────────────────────────────────────────────────────────────────
+
+def test_counters_by_labels():
+    m = Metrics()
+    m.inc("requests_total", scraper="xhr", result="ok")
+    m.inc("requests_total", 2, result="ok", scraper="xhr")
+    m.inc("requests_total", scraper="xhr", result="blocked")
+    assert m.counter("requests_total", scraper="xhr", result="ok") == 3
+    assert m.counter("requests_total", scraper="xhr", result="blocked") == 1
+    assert m.counter("requests_total", scraper="maps_rpc", result="ok") == 0
+
+
+def test_timer_and_summary():
+    m = Metrics()
+    with m.timer("phase_seconds", phase="scrape"):
+        time.sleep(0.02)
+    for value in (0.002, 0.003, 0.004, 0.2):
+        m.observe("parse_seconds", value)
+
+    phase = m.histogram("phase_seconds", phase="scrape")
+    assert phase["count"] == 1 and 0.02 <= phase["sum"] < 0.5
+
+    summary = m.summary()
+    parse   = summary["timers"]["parse_seconds"]
+    assert parse["count"] == 4 and parse["max"] == 0.2
+    assert parse["p50"] == 0.005        # bucket bound holding the median
+    assert parse["p95"] == 0.2          # capped at the observed max
+    assert "phase_seconds{phase=scrape}" in summary["timers"]
+    json.dumps(summary)                 # stored as JSON in the session record
+
+
+def test_gauge_last_value_wins():
+    m = Metrics()
+    m.set("adaptive_limit", 10, limiter="xhr")
+    m.set("adaptive_limit", 5, limiter="xhr")
+    assert m.gauge("adaptive_limit", limiter="xhr") == 5
+    assert m.gauge("adaptive_limit", limiter="maps_rpc") is None
+    assert m.summary()["gauges"] == {"adaptive_limit{limiter=xhr}": 5}
+
+    text = m.to_prometheus()
+    assert "# TYPE leadparser_adaptive_limit gauge" in text
+    assert 'leadparser_adaptive_limit{limiter="xhr"} 5' in text
+
+
+def test_prometheus_text(tmp_path):
+    m = Metrics()
+    m.inc("leads_total", 5, stage="passed")
+    m.observe("fetch_seconds", 0.03, kind="profile")
+    m.observe("fetch_seconds", 7.0, kind="profile")
+    text = m.to_prometheus()
+
+    assert "# TYPE leadparser_leads_total counter" in text
+    assert 'leadparser_leads_total{stage="passed"} 5' in text
+    assert "# TYPE leadparser_fetch_seconds histogram" in text
+    assert 'leadparser_fetch_seconds_bucket{kind="profile",le="0.025"} 0' in text
+    assert 'leadparser_fetch_seconds_bucket{kind="profile",le="0.05"} 1' in text
+    assert 'leadparser_fetch_seconds_bucket{kind="profile",le="+Inf"} 2' in text
+    assert 'leadparser_fetch_seconds_sum{kind="profile"} 7.03' in text
+    assert 'leadparser_fetch_seconds_count{kind="profile"} 2' in text
+
+    path = tmp_path / "out" / "run.prom"
+    m.write_prometheus(str(path))
+    assert path.read_text() == text
+    assert list(path.parent.iterdir()) == [path]     # no temp file left behind
+
+
+# ── Pipeline ──────────────────────────────────────────────────────────────────
+
+def test_lead_stream_stages(sample_config, sample_raw_lead):
+    sample_config["filters"]["min_reviews"] = 50
+    stream = LeadStream(
+        sample_config, None, 10, LeadScorer(sample_config), PitchEngine(sample_config),
+        PhoneValidator(), AddressParser(),
+    )
+    location = {"city": "Dallas", "state": "TX"}
+    many     = dict(sample_raw_lead, review_count=80, gmb_link="https://maps.google.com/?cid=2")
+    no_phone = dict(sample_raw_lead, phone="", gmb_link="https://maps.google.com/?cid=3")
+    for raw in (sample_raw_lead, sample_raw_lead, many, no_phone):
+        stream.add(raw, "plumbers", location)
+
+    stage = lambda s: metrics.counter("leads_total", stage=s)
+    assert (stage("raw"), stage("duplicate"), stage("no_phone")) == (3, 1, 1)
+    assert (stage("passed"), stage("filtered")) == (1, 1)
+    assert metrics.histogram("build_lead_seconds")["count"] == 3
+    assert metrics.histogram("filter_seconds")["count"] == 2
+
+
+# ── Session record ────────────────────────────────────────────────────────────
+
+def test_sqlite_session_metrics(tmp_path, sample_config, sample_raw_lead):
+    path = tmp_path / "leads.db"
+    old  = sqlite3.connect(path)        # sessions table from before the column
+    old.execute(
+        "CREATE TABLE sessions (id INTEGER PRIMARY KEY AUTOINCREMENT, started_at TEXT NOT NULL, "
+        "finished_at TEXT, niches_searched TEXT, total_scraped INTEGER DEFAULT 0, "
+        "new_leads INTEGER DEFAULT 0, duplicates INTEGER DEFAULT 0, errors INTEGER DEFAULT 0, "
+        "config_snapshot TEXT)"
+    )
+    old.close()
+
+    with SQLiteHandler({"database": {"path": str(path)}}) as db:
+        db.start_session(["plumbers"], sample_config)
+        lead = dict(sample_raw_lead, zip_code="75201", date_added="2026-01-01")
+        db.bulk_insert([lead, lead])
+        db.end_session({"total": 1, "new": 1, "metrics": metrics.summary()})
+
+    row = sqlite3.connect(path).execute("SELECT metrics FROM sessions").fetchone()
+    stored = json.loads(row[0])
+    assert stored["counters"]["exporter_rows_total{exporter=sqlite,result=new}"] == 1
+    assert stored["counters"]["exporter_rows_total{exporter=sqlite,result=duplicate}"] == 1
+    assert stored["timers"]["exporter_seconds{exporter=sqlite,op=bulk_insert}"]["count"] == 1
@@ -0,0 +1,115 @@
+"""
+Unit tests for Playwright Phase A network capture (scrapers/playwright_scraper.py)
+
+Tests cover:
+  - _capture_places() decodes matching Maps responses into place records
+  - Non-Maps / failed responses are ignored; a copy with a phone wins
+  - _split_captured() yields complete records as leads, sends the rest to
+    Phase B, matches DOM hrefs by data id and respects max_results
+"""
+
+import asyncio
+import json
+
+from scrapers import playwright_scraper as ps
+from unit.test_app_state import _page, _place
+
+ACE  = _place("Ace Plumbing", "0x1:0xa", phone="(403) 555-0101", place_id="ChIJace")
+BOLT = _place("Bolt Drains", "0x2:0xb")
+CRUX = _place("Crux Heating", "0x3:0xc", phone="(403) 555-0303")
+
+
+class FakeResponse:
+    def __init__(self, url, body, status=200):
+        self.url    = url
+        self.body   = body
+        self.status = status
+
+    async def text(self):
+        return self.body
+
+
+class FakePage:
+    def __init__(self):
+        self.handlers = []
+
+    def on(self, event, handler):
+        assert event == "response"
+        self.handlers.append(handler)
+
+
+def _capture(*responses):
+    async def main():
+        page, captured, pending = FakePage(), {}, set()
+        ps._capture_places(page, captured, pending)
+        for resp in responses:
+            for handler in page.handlers:
+                handler(resp)
+        await asyncio.gather(*pending)
+        return captured
+    return asyncio.run(main())
+
+
+def _xhr(*places):
+    inner = ")]}'\n" + json.dumps([[None, p] for p in places])
+    return json.dumps({"c": 0, "d": inner}) + '/*""*/'
+
+
+# ── _capture_places ───────────────────────────────────────────────────────────
+
+class TestCapture:
+    def test_search_page_and_scroll_xhr(self):
+        captured = _capture(
+            FakeResponse("https://www.google.com/maps/search/plumbers", _page(ACE)),
+            FakeResponse("https://www.google.com/search?tbm=map&q=plumbers", _xhr(BOLT)),
+        )
+        assert sorted(captured) == ["0x1:0xa", "0x2:0xb"]
+        assert captured["0x1:0xa"].phone == "(403) 555-0101"
+
+    def test_ignores_other_and_failed_responses(self):
+        captured = _capture(
+            FakeResponse("https://www.google.com/maps/vt?pb=tile", _xhr(ACE)),
+            FakeResponse("https://www.google.com/search?tbm=map", _xhr(BOLT), status=429),
+        )
+        assert captured == {}
+
+    def test_record_with_phone_wins(self):
+        bare = _place("Ace Plumbing", "0x1:0xa")
+        captured = _capture(
+            FakeResponse("https://www.google.com/search?tbm=map", _xhr(bare)),
+            FakeResponse("https://www.google.com/maps/preview/place?q=x", ")]}'\n" + json.dumps([ACE])),
+        )
+        assert captured["0x1:0xa"].phone
+
+    def test_disabled(self):
+        page = FakePage()
+        ps._capture_places(page, None, set())
+        assert page.handlers == []
+
+
+# ── _split_captured ───────────────────────────────────────────────────────────
+
+class TestSplit:
+    def _captured(self):
+        return _capture(FakeResponse(
+            "https://www.google.com/search?tbm=map", _xhr(ACE, BOLT, CRUX)
+        ))
+
+    def test_complete_records_skip_phase_b(self):
+        href = "https://www.google.com/maps/place/Ace+Plumbing/data=!4m7!3m6!1s0x1:0xa!8m2"
+        ready, todo = ps._split_captured([href], self._captured(), 10, "plumbers")
+        assert [l["name"] for l in ready] == ["Ace Plumbing", "Crux Heating"]
+        assert ready[0]["gmb_link"] == href
+        assert ready[0]["niche"] == "plumbers"
+        # BOLT has no phone → opened in Phase B via its canonical URL
+        assert len(todo) == 1 and "/maps/place/" in todo[0]
+
+    def test_unmatched_href_goes_to_phase_b(self):
+        href = "https://www.google.com/maps/place/Other/data=!1s0x9:0x9"
+        ready, todo = ps._split_captured([href], {}, 10, "plumbers")
+        assert ready == [] and todo == [href]
+
+    def test_max_results_caps_extra_records(self):
+        href = "https://www.google.com/maps/place/X/data=!1s0x9:0x9"
+        ready, todo = ps._split_captured([href], self._captured(), 2, "plumbers")
+        assert len(ready) + len(todo) == 2
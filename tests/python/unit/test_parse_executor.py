@@ -0,0 +1,64 @@
+"""
+Unit tests for XHRGoogleMapsScraper's opt-in parse executor (scrapers/xhr_scraper.py)
+
+Tests cover:
+  - "thread" and "process" modes return the same lead as inline parsing
+  - A BrokenProcessPool shuts the pool down and falls back to inline
+"""
+
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+pytest.importorskip("selenium")   # xhr_scraper → google_maps → selenium
+
+from scrapers.xhr_scraper import XHRGoogleMapsScraper
+from utils.response_cache import CachedResponse
+
+from unit.test_html_extract import PROFILE
+
+URL = "https://www.google.com/maps/place/Joe's+Plumbing"
+
+
+def _scraper(mode: str) -> XHRGoogleMapsScraper:
+    config = {"scraping": {"parse_executor": mode, "parse_workers": 2}}
+    return XHRGoogleMapsScraper(config, rate_limiter=None)
+
+
+def _parse(scraper: XHRGoogleMapsScraper):
+    resp = CachedResponse(URL, PROFILE.encode("utf-8"), "utf-8")
+    return asyncio.run(scraper._parse_response(resp, URL, "plumbers"))
+
+
+@pytest.mark.parametrize("mode", ["thread", "process"])
+def test_executor_matches_inline(mode):
+    expected = _parse(_scraper("inline"))
+    assert expected is not None
+
+    with _scraper(mode) as scraper:
+        assert _parse(scraper) == expected
+        assert scraper._parse_pool is not None
+    assert scraper._parse_pool is None   # close() shut it down
+
+
+class BrokenPool:
+    def __init__(self):
+        self.shutdowns = []
+
+    def submit(self, fn, *args):
+        raise BrokenProcessPool("worker died")
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shutdowns.append((wait, cancel_futures))
+
+
+def test_broken_pool_falls_back_inline():
+    scraper = _scraper("process")
+    pool    = scraper._parse_pool = BrokenPool()
+
+    lead = _parse(scraper)
+    assert lead == _parse(_scraper("inline"))
+    assert pool.shutdowns == [(False, True)]
+    assert scraper._parse_pool is None
+    assert scraper._parse_mode == "inline"
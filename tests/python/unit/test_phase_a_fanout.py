@@ -0,0 +1,150 @@
+"""
+Unit tests for the parallel Playwright Phase A (scrapers/playwright_scraper.py)
+
+A fake pool/page stands in for Playwright; _scroll_and_collect is patched
+to return canned hrefs for the page's current search term.
+
+Tests cover:
+  - Search terms are spread over phase_a_workers contexts
+  - URLs found by several terms are kept once
+  - Workers still scrolling are cancelled once max_results is reached
+  - Repeated proxy failures switch a worker to a direct context
+"""
+
+import asyncio
+from urllib.parse import unquote_plus
+
+import pytest
+
+from scrapers import playwright_scraper as ps
+from scrapers.playwright_scraper import PlaywrightGoogleMapsScraper
+
+TERMS = ["plumbers", "drain cleaning", "water heater repair", "leak detection", "sewer repair"]
+
+
+class FakePage:
+    def __init__(self, lease, fail_proxied):
+        self.lease        = lease
+        self.fail_proxied = fail_proxied
+        self.term         = None
+
+    async def route(self, pattern, handler):
+        pass
+
+    def on(self, event, handler):
+        pass
+
+    async def goto(self, url, **kw):
+        if self.lease["proxied"] and self.fail_proxied:
+            raise RuntimeError("net::ERR_CONNECTION_RESET")
+        query     = unquote_plus(url.rsplit("/", 1)[-1])
+        self.term = query.split(" in ")[0]
+
+    async def close(self):
+        pass
+
+
+class FakePool:
+    def __init__(self, fail_proxied=False):
+        self.fail_proxied = fail_proxied
+        self.acquired     = []
+        self.released     = []
+
+    async def acquire(self, use_proxy=True):
+        lease = {"pages": 0, "healthy": True, "proxied": use_proxy}
+        self.acquired.append(lease)
+        return lease
+
+    async def release(self, lease):
+        self.released.append(lease)
+
+    async def new_page(self, lease):
+        return FakePage(lease, self.fail_proxied)
+
+
+class NoWait:
+    async def acquire(self, host):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def _expansions(monkeypatch):
+    monkeypatch.setitem(ps.NICHE_EXPANSIONS, "plumbers", TERMS[1:])
+
+    async def no_stealth(page):
+        pass
+    monkeypatch.setattr(ps, "_apply_stealth", no_stealth)
+
+
+def _scraper(sample_config, hrefs, delay=0.01, **scraping):
+    sample_config.setdefault("scraping", {}).update({"phase_a_workers": 3, **scraping})
+    scraper = PlaywrightGoogleMapsScraper(sample_config, NoWait())
+    state   = {"active": 0, "peak": 0, "scrolled": [], "finished": []}
+
+    async def scroll(page, remaining, exclude):
+        state["active"] += 1
+        state["peak"]    = max(state["peak"], state["active"])
+        state["scrolled"].append(page.term)
+        try:
+            await asyncio.sleep(delay(page.term) if callable(delay) else delay)
+        finally:
+            state["active"] -= 1
+        state["finished"].append(page.term)
+        return [h for h in hrefs.get(page.term, []) if h not in exclude][:remaining]
+
+    scraper._scroll_and_collect = scroll
+    return scraper, state
+
+
+def _collect(scraper, pool, max_results=100):
+    location = {"city": "Dallas", "state": "TX"}
+    return asyncio.run(scraper._collect_all_urls(pool, "plumbers", location, max_results, {}))
+
+
+def test_terms_spread_over_workers(sample_config):
+    hrefs = {t: [f"{t}/{i}" for i in range(2)] for t in TERMS}
+    scraper, state = _scraper(sample_config, hrefs)
+    pool = FakePool()
+    urls = _collect(scraper, pool)
+    assert sorted(urls) == sorted(h for t in TERMS for h in hrefs[t])
+    assert state["peak"] == 3
+    assert len(pool.acquired) == 3 and len(pool.released) == 3
+
+
+def test_one_worker_is_sequential(sample_config):
+    scraper, state = _scraper(sample_config, {}, phase_a_workers=1)
+    _collect(scraper, FakePool())
+    assert state["peak"] == 1
+    assert state["scrolled"] == TERMS
+
+
+def test_shared_seen_set(sample_config):
+    shared = ["a", "b"]
+    hrefs  = {t: shared + [t] for t in TERMS}
+    scraper, _ = _scraper(sample_config, hrefs)
+    urls = _collect(scraper, FakePool())
+    assert sorted(urls) == sorted(shared + TERMS)
+
+
+def test_cancels_once_full(sample_config):
+    hrefs = {t: [f"{t}/{i}" for i in range(5)] for t in TERMS}
+    # The first term fills the target fast; the others are still scrolling
+    scraper, state = _scraper(
+        sample_config, hrefs, delay=lambda term: 0.01 if term == "plumbers" else 5
+    )
+    pool = FakePool()
+    urls = _collect(scraper, pool, max_results=5)
+    assert urls == hrefs["plumbers"]
+    assert state["finished"] == ["plumbers"]
+    assert len(pool.released) == len(pool.acquired)
+
+
+def test_proxy_failures_fall_back_to_direct(sample_config):
+    hrefs = {t: [t] for t in TERMS}
+    scraper, _ = _scraper(sample_config, hrefs, phase_a_workers=1)
+    pool = FakePool(fail_proxied=True)
+    urls = _collect(scraper, pool)
+    # Three resets on the proxied context, then every term on a direct one
+    assert [l["proxied"] for l in pool.acquired] == [True, False]
+    assert not pool.acquired[0]["healthy"]
+    assert sorted(urls) == sorted(TERMS[2:])  # the first two terms were lost
@@ -0,0 +1,201 @@
+"""
+Unit tests for the Playwright Phase B work queue (scrapers/playwright_scraper.py)
+
+A fake pool/page stands in for Playwright; _extract_business is patched.
+
+Tests cover:
+  - Every URL is extracted exactly once across workers
+  - A stuck page times out and is re-queued for another worker
+  - A failed navigation is re-queued under the same retry budget
+  - URLs out of retries are dropped, not retried forever
+  - A /sorry/ block retires the context and re-queues the URL
+  - The worker target shrinks on blocks / slow pages and grows back
+"""
+
+import asyncio
+
+from scrapers import playwright_scraper as ps
+from scrapers.playwright_scraper import PlaywrightGoogleMapsScraper
+
+
+class FakePage:
+    def __init__(self):
+        self.url = "about:blank"
+
+    async def route(self, pattern, handler):
+        pass
+
+    async def close(self):
+        pass
+
+    async def add_init_script(self, script=None, path=None):
+        pass
+
+
+class FakePool:
+    def __init__(self):
+        self.leases   = 0
+        self.retired  = 0
+
+    async def acquire(self, use_proxy=True):
+        self.leases += 1
+        return {"pages": 0, "healthy": True}
+
+    async def release(self, lease):
+        self.retired += not lease["healthy"]
+
+    async def new_page(self, lease):
+        return FakePage()
+
+    def expired(self, lease):
+        return not lease["healthy"]
+
+
+class NoWait:
+    async def acquire(self, host):
+        pass
+
+
+def _scraper(sample_config, **scraping):
+    sample_config.setdefault("scraping", {}).update({"workers": 3, **scraping})
+    return PlaywrightGoogleMapsScraper(sample_config, NoWait())
+
+
+def _run_phase_b(scraper, urls, extract=None):
+    if extract is not None:
+        scraper._extract_business = extract
+    sched = ps._new_schedule(urls, scraper._n_workers, scraper.config)
+    pool  = FakePool()
+
+    async def main():
+        out = asyncio.Queue()
+        workers = [
+            scraper._phase_b_worker(
+                wid, pool, sched, "plumbers", None, {"done": 0, "total": len(urls)},
+                out, asyncio.Semaphore(sched["max"]),
+            )
+            for wid in range(sched["max"])
+        ]
+        return await ps.collect(ps.merge_workers(out, workers))
+
+    return asyncio.run(main()), sched, pool
+
+
+# ── Work queue ────────────────────────────────────────────────────────────────
+
+def test_each_url_extracted_once(sample_config):
+    calls = []
+
+    async def extract(page, url, niche):
+        calls.append(url)
+        await asyncio.sleep(0)
+        return {"gmb_link": url}
+
+    urls = [f"u{i}" for i in range(10)]
+    leads, sched, _ = _run_phase_b(_scraper(sample_config), urls, extract)
+    assert sorted(l["gmb_link"] for l in leads) == sorted(urls)
+    assert sorted(calls) == sorted(urls)
+    assert sched["pending"] == 0
+
+
+def test_stuck_page_requeued(sample_config):
+    seen = []
+
+    async def extract(page, url, niche):
+        seen.append(url)
+        if url == "slow" and seen.count("slow") == 1:
+            await asyncio.sleep(10)
+        return {"gmb_link": url}
+
+    scraper = _scraper(sample_config, profile_timeout=0.05)
+    leads, sched, _ = _run_phase_b(scraper, ["slow", "a", "b"], extract)
+    assert sorted(l["gmb_link"] for l in leads) == ["a", "b", "slow"]
+    assert sched["retried"] == 1
+
+
+def test_goto_failure_requeued(sample_config, monkeypatch):
+    gotos = []
+
+    class FlakyPage(FakePage):
+        async def goto(self, url, **kw):
+            gotos.append(url)
+            if gotos.count(url) == 1 and url == "flaky":
+                raise RuntimeError("net::ERR_CONNECTION_RESET")
+            self.url = url
+
+        async def wait_for_selector(self, sel, **kw):
+            pass
+
+        async def evaluate(self, script):
+            return {"name": self.url, "phones": ["+12145550123"]}
+
+    async def new_page(self, lease):
+        return FlakyPage()
+
+    monkeypatch.setattr(FakePool, "new_page", new_page)
+    leads, sched, _ = _run_phase_b(_scraper(sample_config), ["flaky", "ok"])
+    assert sorted(l["gmb_link"] for l in leads) == ["flaky", "ok"]
+    assert gotos.count("flaky") == 2
+    assert sched["retried"] == 1
+    assert sched["dropped"] == 0
+
+
+def test_out_of_retries_dropped(sample_config):
+    async def extract(page, url, niche):
+        if url == "bad":
+            raise RuntimeError("boom")
+        return {"gmb_link": url}
+
+    scraper = _scraper(sample_config, profile_retries=2)
+    leads, sched, _ = _run_phase_b(scraper, ["bad", "ok"], extract)
+    assert [l["gmb_link"] for l in leads] == ["ok"]
+    assert sched["retried"] == 2
+    assert sched["dropped"] == 1
+
+
+def test_block_retires_context_and_requeues(sample_config):
+    blocked = {"done": False}
+
+    async def extract(page, url, niche):
+        if url == "x" and not blocked["done"]:
+            blocked["done"] = True
+            page.url = "https://www.google.com/sorry/index?continue=..."
+        return {"gmb_link": url}
+
+    leads, sched, pool = _run_phase_b(_scraper(sample_config), ["x", "y"], extract)
+    assert sorted(l["gmb_link"] for l in leads) == ["x", "y"]
+    assert sched["blocked"] == 1
+    assert pool.retired == 1
+
+
+# ── Adaptive worker target ────────────────────────────────────────────────────
+
+class TestAdapt:
+    def _sched(self, sample_config, workers=4):
+        sample_config.setdefault("scraping", {})
+        return ps._new_schedule([f"u{i}" for i in range(50)], workers, sample_config)
+
+    def test_blocks_shed_workers(self, sample_config):
+        sched = self._sched(sample_config)
+        for i in range(ps._ADAPT_WINDOW // 2):
+            ps._adapt(sched, 1.0, blocked=i % 2 == 0)
+        assert sched["target"] == 3
+
+    def test_slow_pages_shed_workers(self, sample_config):
+        sched = self._sched(sample_config)
+        for _ in range(ps._ADAPT_WINDOW // 2):
+            ps._adapt(sched, sched["slow_secs"] + 5, blocked=False)
+        assert sched["target"] == 3
+
+    def test_clean_window_grows_back_to_max(self, sample_config):
+        sched = self._sched(sample_config)
+        sched["target"] = 2
+        for _ in range(ps._ADAPT_WINDOW * 3):
+            ps._adapt(sched, 1.0, blocked=False)
+        assert sched["target"] == sched["max"] == 4
+
+    def test_never_below_one(self, sample_config):
+        sched = self._sched(sample_config, workers=1)
+        for _ in range(ps._ADAPT_WINDOW * 2):
+            ps._adapt(sched, 1.0, blocked=True)
+        assert sched["target"] == 1
@@ -0,0 +1,115 @@
+"""
+Unit tests for utils/rate_limiter.py token buckets
+
+Tests cover:
+  - A bucket serves its burst immediately, then paces at its rate
+  - Hosts map to buckets by domain suffix; unknown hosts share "default"
+  - The global bucket caps all hosts together
+  - acquire() waits on the event loop — other coroutines keep running
+  - The sync shim (acquire_sync / RateLimiter.wait(host=...)) uses time.sleep
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from utils import rate_limiter as rl
+from utils.rate_limiter import AsyncRateLimiter, RateLimiter, TokenBucket
+
+
+def _config(**limits):
+    return {"scraping": {"delay_min": 0, "delay_max": 0, "rate_limits": limits}}
+
+
+# ── TokenBucket ───────────────────────────────────────────────────────────────
+
+def test_bucket_burst_then_rate():
+    bucket = TokenBucket(rate=10, burst=3)
+    delays = [bucket.reserve() for _ in range(5)]
+    assert delays[:3] == [0.0, 0.0, 0.0]
+    assert delays[3] == pytest.approx(0.1, abs=0.01)
+    assert delays[4] == pytest.approx(0.2, abs=0.01)
+
+
+def test_bucket_refills():
+    bucket = TokenBucket(rate=100, burst=1)
+    bucket.reserve()
+    time.sleep(0.02)
+    assert bucket.reserve() == 0.0
+
+
+# ── Host buckets ──────────────────────────────────────────────────────────────
+
+class TestHosts:
+    def test_suffix_match(self):
+        limiter = AsyncRateLimiter(_config())
+        assert limiter.bucket_for("www.google.com") == "google.com"
+        assert limiter.bucket_for("https://maps.google.com/maps/place/x") == "google.com"
+        assert limiter.bucket_for("m.yelp.com") == "yelp.com"
+        assert limiter.bucket_for("notgoogle.com") == "default"
+        assert limiter.bucket_for("https://www.411.com/business/x") == "default"
+
+    def test_config_adds_and_overrides(self):
+        limiter = AsyncRateLimiter(_config(**{
+            "bbb.org":    {"rate": 0.2, "burst": 1},
+            "google.com": {"rate": 9.0, "burst": 3},
+        }))
+        assert limiter.bucket_for("www.bbb.org") == "bbb.org"
+        assert limiter.buckets["google.com"].rate == 9.0
+        assert "yelp.com" in limiter.buckets   # defaults kept
+
+    def test_global_caps_all_hosts(self):
+        limiter = AsyncRateLimiter(_config(
+            **{"global": {"rate": 10, "burst": 2}, "default": {"rate": 1000, "burst": 100}}
+        ))
+        delays = [limiter.reserve(h) for h in ("a.com", "b.com", "c.com")]
+        assert delays[:2] == [0.0, 0.0]
+        assert delays[2] > 0
+
+
+# ── Async vs sync ─────────────────────────────────────────────────────────────
+
+def test_acquire_does_not_block_loop():
+    limiter = AsyncRateLimiter(_config(
+        **{"global": {"rate": 100, "burst": 1}, "google.com": {"rate": 100, "burst": 1}}
+    ))
+    ticks = {"n": 0}
+
+    async def ticker():
+        while True:
+            ticks["n"] += 1
+            await asyncio.sleep(0.001)
+
+    async def worker():
+        for _ in range(5):
+            await limiter.acquire("google.com")
+
+    async def main():
+        t = asyncio.create_task(ticker())
+        start = time.monotonic()
+        await asyncio.gather(*(worker() for _ in range(4)))
+        elapsed = time.monotonic() - start
+        t.cancel()
+        return elapsed
+
+    elapsed = asyncio.run(main())
+    # 20 requests at 100/s with a burst of 1 → ~0.19s, paced not serialised
+    assert 0.15 <= elapsed < 0.6
+    assert ticks["n"] > 20
+
+
+def test_sync_shim_sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr(rl.time, "sleep", slept.append)
+    limiter = RateLimiter(_config(**{"yelp.com": {"rate": 2, "burst": 1}}))
+    limiter.wait(host="yelp.com")
+    limiter.wait(host="www.yelp.com")
+    # delay_min/max = 0 → the random pause sleeps 0; the bucket adds ~0.5s
+    assert max(slept) == pytest.approx(0.5, abs=0.05)
+
+
+def test_rate_limiter_acquire_delegates():
+    limiter = RateLimiter(_config())
+    asyncio.run(limiter.acquire("google.com"))
+    assert limiter.hosts.stats["acquired"] == 1
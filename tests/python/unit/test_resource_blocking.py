@@ -0,0 +1,107 @@
+"""
+Unit tests for scrapers/resource_blocking.py
+
+Tests cover:
+  - Per-phase resource-type allowlists
+  - URL block patterns (tiles, photos, telemetry) and allow overrides
+  - install() aborts / falls back on routes and records blocked counts + bytes
+  - block_resources: false installs nothing
+"""
+
+import asyncio
+
+from scrapers import resource_blocking as rb
+
+
+class FakeRequest:
+    def __init__(self, url, resource_type):
+        self.url           = url
+        self.resource_type = resource_type
+
+
+class FakeRoute:
+    def __init__(self, url, resource_type):
+        self.request = FakeRequest(url, resource_type)
+        self.action  = None
+
+    async def abort(self):
+        self.action = "abort"
+
+    async def fallback(self):
+        self.action = "fallback"
+
+
+class FakePage:
+    def __init__(self):
+        self.handler = None
+
+    async def route(self, pattern, handler):
+        self.handler = handler
+
+
+def _rules(sample_config, **scraping):
+    sample_config.setdefault("scraping", {}).update(scraping)
+    return rb.load_rules(sample_config)
+
+
+def _drive(rules, phase, requests):
+    page, stats = FakePage(), rb.new_stats()
+
+    async def main():
+        await rb.install(page, phase, rules, stats)
+        routes = [FakeRoute(url, rtype) for url, rtype in requests]
+        for route in routes:
+            await page.handler(route)
+        return routes
+
+    return asyncio.run(main()), stats, page
+
+
+# ── should_block ──────────────────────────────────────────────────────────────
+
+class TestShouldBlock:
+    def test_type_allowlist_per_phase(self, sample_config):
+        rules = _rules(sample_config)
+        url   = "https://www.google.com/maps/_/css"
+        assert not rb.should_block(rules, "search", "stylesheet", url)
+        assert rb.should_block(rules, "profile", "stylesheet", url)
+        assert rb.should_block(rules, "search", "image", "https://www.google.com/x.png")
+        assert rb.should_block(rules, "profile", "font", "https://fonts.gstatic.com/a.woff2")
+
+    def test_tiles_and_telemetry_blocked_even_as_xhr(self, sample_config):
+        rules = _rules(sample_config)
+        assert rb.should_block(rules, "search", "xhr", "https://www.google.com/maps/vt?pb=!1m5")
+        assert rb.should_block(rules, "profile", "fetch", "https://www.google.com/gen_204?atyp=i")
+        assert rb.should_block(rules, "profile", "script", "https://www.googletagmanager.com/gtm.js")
+        assert not rb.should_block(rules, "profile", "xhr", "https://www.google.com/maps/preview/place?q=x")
+
+    def test_allow_pattern_wins(self, sample_config):
+        rules = _rules(sample_config, allow_url_patterns=[r"/maps/vt\?keep"])
+        assert not rb.should_block(rules, "search", "image", "https://www.google.com/maps/vt?keep=1")
+
+    def test_extra_block_pattern(self, sample_config):
+        rules = _rules(sample_config, block_url_patterns=[r"/maps/preview/reviews"])
+        assert rb.should_block(rules, "profile", "xhr", "https://www.google.com/maps/preview/reviews?x")
+
+
+# ── install ───────────────────────────────────────────────────────────────────
+
+class TestInstall:
+    def test_routes_and_counts(self, sample_config):
+        routes, stats, _ = _drive(_rules(sample_config), "profile", [
+            ("https://www.google.com/maps/place/x", "document"),
+            ("https://lh5.googleusercontent.com/p/photo", "image"),
+            ("https://fonts.gstatic.com/s/roboto.woff2", "font"),
+            ("https://www.google.com/maps/vt?pb=tile", "image"),
+        ])
+        assert [r.action for r in routes] == ["fallback", "abort", "abort", "abort"]
+        assert stats["blocked"] == 3 and stats["allowed"] == 1
+        assert stats["by_type"] == {"image": 2, "font": 1}
+        assert stats["est_bytes_saved"] == 2 * rb._EST_BYTES["image"] + rb._EST_BYTES["font"]
+        assert "3/4 requests blocked" in rb.summary(stats)
+
+    def test_disabled_installs_nothing(self, sample_config):
+        rules = _rules(sample_config, block_resources=False)
+        page  = FakePage()
+        asyncio.run(rb.install(page, "profile", rules, rb.new_stats()))
+        assert page.handler is None
@@ -0,0 +1,140 @@
+"""
+Unit tests for utils/response_cache.py on-disk response cache
+
+Tests cover:
+  - URL normalization (host case, fragment, tracking params, query order)
+  - URL classes pick the TTL
+  - put/get round-trip with compression; expired entries miss
+  - A TTL of 0 never stores that class
+  - LRU eviction keeps the file under max_mb
+  - fetch() skips the rate-limit wait and the network on a hit
+  - A disabled cache is a no-op
+"""
+
+import asyncio
+import os
+import time
+
+from utils import response_cache as rc
+from utils.response_cache import ResponseCache, normalize_url, open_cache, url_class
+
+PLACE  = "https://www.google.com/maps/place/Acme+Plumbing/data=!4m2!3m1!1s0x1:0x2"
+SEARCH = "https://www.google.com/maps/search/plumbers+in+Dallas"
+
+
+def _config(tmp_path, **cache):
+    return {"cache": {"enabled": True, "path": str(tmp_path / "cache.db"), **cache}}
+
+
+# ── Keys and classes ──────────────────────────────────────────────────────────
+
+def test_normalize_url():
+    a = normalize_url("https://WWW.Google.com/maps/place/X?hl=en&authuser=0&utm_source=x#frag")
+    b = normalize_url("https://www.google.com/maps/place/X?hl=en")
+    assert a == b
+    assert normalize_url("https://a.com/s?b=2&a=1") == normalize_url("https://a.com/s?a=1&b=2")
+    assert normalize_url("https://a.com/s?q=1") != normalize_url("https://a.com/s?q=2")
+
+
+def test_url_class():
+    assert url_class(PLACE) == "profile"
+    assert url_class(SEARCH) == "search"
+    assert url_class("https://www.yelp.com/search?find_desc=x") == "lookup"
+    assert url_class("https://www.411.com/business/x/") == "lookup"
+    assert url_class("https://html.duckduckgo.com/html/?q=x") == "default"
+
+
+# ── Storage ───────────────────────────────────────────────────────────────────
+
+def test_round_trip(tmp_path):
+    cache = ResponseCache(_config(tmp_path))
+    body  = "<html>Acme — (214) 555-0100</html>".encode("utf-8") * 200
+    assert cache.get(PLACE) is None
+    cache.put(PLACE, body, "utf-8")
+
+    hit = cache.get(PLACE + "?authuser=0")
+    assert hit.content == body and hit.status_code == 200
+    assert "Acme —" in hit.text
+    assert cache.stats == {"hits": 1, "misses": 1, "stores": 1, "evicted": 0, "expired": 0}
+    assert cache._bytes < len(body) / 10     # compressed
+
+    # Survives reopening
+    cache.close()
+    assert ResponseCache(_config(tmp_path)).get(PLACE).content == body
+
+
+def test_ttl_per_class(tmp_path, monkeypatch):
+    cache = ResponseCache(_config(tmp_path, ttl_hours={"search": 1, "lookup": 0}))
+    cache.put(PLACE, b"profile")
+    cache.put(SEARCH, b"search")
+    cache.put("https://www.yelp.com/biz/acme", b"yelp")
+    assert cache.stats["stores"] == 2        # lookup TTL 0 → not stored
+
+    later = time.time() + 2 * 3600
+    monkeypatch.setattr(rc.time, "time", lambda: later)
+    assert cache.get(SEARCH) is None         # 1 h TTL
+    assert cache.get(PLACE).content == b"profile"   # 168 h default
+
+
+def test_lru_eviction(tmp_path):
+    cache = ResponseCache(_config(tmp_path, max_mb=0.01))   # ~10 KB
+    pages = [f"{PLACE}{i}" for i in range(6)]
+    for i, url in enumerate(pages):
+        cache.put(url, os.urandom(3000))     # incompressible
+        if i == 1:
+            cache.get(pages[0])              # pages[0] becomes recently used
+    assert cache._bytes <= cache.max_bytes
+    assert cache.stats["evicted"] > 0
+    assert cache.get(pages[1]) is None       # least recently used went first
+    assert cache.get(pages[-1]) is not None
+
+
+# ── Callers ───────────────────────────────────────────────────────────────────
+
+class FakeSession:
+    def __init__(self):
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append(url)
+
+        class Resp:
+            status_code = 200
+            content     = b"<html>listing</html>"
+            encoding    = "utf-8"
+        return Resp()
+
+
+def test_fetch_skips_wait_on_hit(tmp_path):
+    cache   = ResponseCache(_config(tmp_path))
+    session = FakeSession()
+    waits   = []
+    url     = "https://www.yellowpages.com/search?search_terms=acme"
+
+    first  = cache.fetch(session, url, wait=lambda: waits.append(1), timeout=12)
+    second = cache.fetch(session, url, wait=lambda: waits.append(1), timeout=12)
+    assert session.calls == [url] and waits == [1]
+    assert second.text == "<html>listing</html>" and first.status_code == 200
+
+
+def test_async_round_trip(tmp_path):
+    cache = ResponseCache(_config(tmp_path))
+
+    async def main():
+        await cache.aput(SEARCH, b"page")
+        return await cache.aget(SEARCH)
+
+    assert asyncio.run(main()).content == b"page"
+
+
+def test_disabled_is_noop(tmp_path):
+    cache = open_cache({"cache": {"enabled": False, "path": str(tmp_path / "c.db")}})
+    cache.put(PLACE, b"x")
+    assert cache.get(PLACE) is None
+    assert not (tmp_path / "c.db").exists()
+    assert not open_cache({}).enabled
+
+
+def test_open_cache_shares_instance(tmp_path):
+    config = _config(tmp_path)
+    assert open_cache(config) is open_cache(config)
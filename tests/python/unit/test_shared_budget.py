@@ -0,0 +1,237 @@
+"""
+Unit tests for utils/shared_budget.py cross-process request budget
+
+Tests cover:
+  - TOKEN round-trip over the Unix socket and the TCP fallback
+  - The sync client shares the server's buckets with the async one
+  - SLOT caps requests in flight across clients; a closed client frees its slot
+  - A client reuses one connection for all of its TOKEN / SLOT requests
+  - A slot granted to a cancelled request is handed back
+  - Clients fail open (local limits) when the server is gone
+  - AsyncRateLimiter / AdaptiveLimiter pick the server up from LEADPARSER_BUDGET
+  - Two subprocesses draw from one google.com bucket
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+import pytest
+
+from utils import shared_budget as sb
+from utils.adaptive_limiter import AdaptiveLimiter
+from utils.rate_limiter import AsyncRateLimiter
+from utils.shared_budget import BudgetClient, BudgetServer
+
+LEADPARSER = Path(__file__).resolve().parents[3] / "leadparser"
+
+
+def _config(concurrency=50, **limits):
+    return {"scraping": {"shared_concurrency": concurrency, "rate_limits": limits}}
+
+
+@pytest.fixture
+def server(tmp_path):
+    started = []
+
+    def start(config=None, use_unix=True):
+        srv = BudgetServer(config or _config(), path=str(tmp_path / "b.sock"), use_unix=use_unix)
+        srv.start()
+        started.append(srv)
+        return srv
+
+    yield start
+    for srv in started:
+        srv.stop()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_client(monkeypatch):
+    monkeypatch.delenv(sb.ENV_VAR, raising=False)
+    monkeypatch.setattr(sb, "_client", None)
+    yield
+    if sb._client is not None:
+        sb._client.close()
+
+
+@pytest.fixture
+def client():
+    opened = []
+
+    def connect(address):
+        opened.append(BudgetClient(address))
+        return opened[-1]
+
+    yield connect
+    for c in opened:
+        c.close()
+
+
+# ── Tokens ────────────────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("use_unix", [True, False])
+def test_token_round_trip(server, client, use_unix):
+    srv = server(_config(**{"google.com": {"rate": 1, "burst": 2}}), use_unix=use_unix)
+    assert srv.address.startswith("unix:" if use_unix else "tcp:127.0.0.1:")
+    budget = client(srv.address)
+
+    async def main():
+        return [await budget.token("www.google.com") for _ in range(3)]
+
+    delays = asyncio.run(main())
+    # Burst of two, then the third token has to wait for a refill
+    assert delays[0] == 0.0
+    assert delays[0] <= delays[1] < delays[2] <= 1.0
+    assert srv.stats["tokens"] == 3
+
+
+def test_sync_and_async_share_buckets(server, client):
+    srv    = server(_config(**{"yelp.com": {"rate": 1, "burst": 1}}))
+    budget = client(srv.address)
+    assert budget.token_sync("yelp.com") == 0.0
+    assert asyncio.run(budget.token("m.yelp.com")) > 0.5
+
+
+# ── Slots ─────────────────────────────────────────────────────────────────────
+
+def test_slots_cap_in_flight_across_clients(server, client):
+    srv     = server(_config(concurrency=3))
+    clients = [client(srv.address) for _ in range(4)]
+    state   = {"active": 0, "peak": 0}
+
+    async def request(client):
+        async with client.slot() as held:
+            assert held
+            state["active"] += 1
+            state["peak"]    = max(state["peak"], state["active"])
+            await asyncio.sleep(0.05)
+            state["active"] -= 1
+
+    async def main():
+        await asyncio.gather(*(request(c) for c in clients for _ in range(3)))
+
+    asyncio.run(main())
+    assert state["peak"] == 3
+    assert srv.stats["slots"] == 12 and srv.stats["peak"] == 3
+    deadline = time.monotonic() + 1
+    while srv.stats["in_flight"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert srv.stats["in_flight"] == 0
+
+
+def test_one_connection_per_client(server, client):
+    srv    = server(_config(concurrency=1))
+    budget = client(srv.address)
+
+    async def main():
+        for _ in range(3):
+            async with budget.slot() as held:   # concurrency 1: each RELEASE frees it
+                assert held
+                await budget.token("google.com")
+
+    asyncio.run(main())
+    budget.token_sync("google.com")
+    budget.token_sync("google.com")
+    assert srv.stats["slots"] == 3 and srv.stats["tokens"] == 5
+    assert srv.stats["connections"] == 2          # one async + one sync socket
+
+
+def test_cancelled_slot_request_is_handed_back(server, client):
+    srv          = server(_config(concurrency=1))
+    first, other = client(srv.address), client(srv.address)
+
+    async def main():
+        async with first.slot():
+            waiter = asyncio.create_task(other.slot().__aenter__())
+            await asyncio.sleep(0.05)
+            waiter.cancel()
+        # The slot granted to the cancelled request is released by the client
+        async with asyncio.timeout(2):
+            async with first.slot() as held:
+                return held
+
+    assert asyncio.run(main()) is True
+    assert srv.stats["slots"] == 3
+
+
+# ── Failing open ──────────────────────────────────────────────────────────────
+
+def test_client_fails_open(server, client):
+    srv     = server()
+    address = srv.address
+    srv.stop()
+    budget = client(address)
+
+    async def main():
+        async with budget.slot() as held:
+            return held, await budget.token("google.com")
+
+    assert asyncio.run(main()) == (False, None)
+    assert not budget.available
+    assert budget.token_sync("google.com") is None
+
+
+def test_rate_limiter_falls_back_to_local(monkeypatch, tmp_path):
+    monkeypatch.setenv(sb.ENV_VAR, f"unix:{tmp_path / 'missing.sock'}")
+    limiter = AsyncRateLimiter(_config())
+    assert limiter.remote is not None
+    asyncio.run(limiter.acquire("google.com"))
+    assert limiter.stats["acquired"] == 1
+
+
+# ── Limiters wired to the server ──────────────────────────────────────────────
+
+def test_limiters_use_server(server, monkeypatch):
+    srv = server(_config(concurrency=2, **{"google.com": {"rate": 1, "burst": 1}}))
+    monkeypatch.setenv(sb.ENV_VAR, srv.address)
+
+    rates  = [AsyncRateLimiter(_config(**{"google.com": {"rate": 1000, "burst": 100}}))
+              for _ in range(2)]
+    delays = [rates[0].remote.token_sync("google.com"), rates[1].remote.token_sync("google.com")]
+    assert delays[0] == 0.0 and delays[1] > 0.5   # server bucket, not the local 1000/s
+
+    limiter = AdaptiveLimiter(
+        {"scraping": {"adaptive_concurrency": False}}, ceiling=10, name="test"
+    )
+
+    async def main():
+        async def one():
+            async with limiter.slot():
+                await asyncio.sleep(0.03)
+        await asyncio.gather(*(one() for _ in range(6)))
+
+    asyncio.run(main())
+    assert limiter.stats["peak"] == 6      # local limit 10 …
+    assert srv.stats["peak"] == 2          # … but two at once on the server
+
+
+def test_subprocesses_share_rate(server):
+    srv = server(_config(**{
+        "google.com": {"rate": 5,   "burst": 1},
+        "global":     {"rate": 100, "burst": 100},
+    }))
+    script = textwrap.dedent(f"""
+        import sys, time
+        sys.path.insert(0, {str(LEADPARSER)!r})
+        from utils.rate_limiter import AsyncRateLimiter
+        limiter = AsyncRateLimiter({{"scraping": {{}}}})
+        for _ in range(3):
+            limiter.acquire_sync("google.com")
+        print(limiter.stats["wait_seconds"])
+    """)
+    env   = {**os.environ, sb.ENV_VAR: srv.address}
+    start = time.monotonic()
+    procs = [
+        subprocess.Popen([sys.executable, "-c", script], env=env, stdout=subprocess.PIPE, text=True)
+        for _ in range(2)
+    ]
+    outs = [p.communicate(timeout=30)[0] for p in procs]
+    assert all(p.returncode == 0 for p in procs)
+    assert srv.stats["tokens"] == 6
+    # Six google.com tokens at 5/s from one bucket → the last waits ~1s
+    assert time.monotonic() - start >= 0.9
+    assert sum(float(o) for o in outs) > 1.0
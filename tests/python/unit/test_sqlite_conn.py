@@ -0,0 +1,80 @@
+"""
+Unit tests for utils/sqlite_conn.py connection profile and read pool
+
+Tests cover:
+  - connect() applies WAL and the PRAGMA profile
+  - Read-only connections reject writes
+  - ReadPool reuses idle connections and caps how many it keeps
+  - A connection that raised inside the block is closed, not pooled
+  - read_pool() returns one pool per database file
+"""
+
+import sqlite3
+
+import pytest
+
+from utils.sqlite_conn import PRAGMAS, ReadPool, connect, read_pool
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "leads.db"
+    conn = connect(path)
+    conn.execute("CREATE TABLE leads (id INTEGER PRIMARY KEY, name TEXT)")
+    conn.execute("INSERT INTO leads (name) VALUES ('Acme Plumbing')")
+    conn.commit()
+    conn.close()
+    return path
+
+
+def _pragma(conn, name):
+    return conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+
+def test_writer_profile(db_path):
+    conn = connect(db_path)
+    assert _pragma(conn, "journal_mode") == "wal"
+    assert _pragma(conn, "synchronous") == 1          # NORMAL
+    assert _pragma(conn, "temp_store") == 2           # MEMORY
+    assert _pragma(conn, "cache_size") == PRAGMAS["cache_size"]
+    assert _pragma(conn, "busy_timeout") == PRAGMAS["busy_timeout"]
+    assert isinstance(conn.execute("SELECT * FROM leads").fetchone(), sqlite3.Row)
+    conn.close()
+
+
+def test_readonly_rejects_writes(db_path):
+    conn = connect(db_path, readonly=True)
+    assert conn.execute("SELECT name FROM leads").fetchone()["name"] == "Acme Plumbing"
+    with pytest.raises(sqlite3.OperationalError):
+        conn.execute("INSERT INTO leads (name) VALUES ('x')")
+    conn.close()
+
+
+def test_pool_reuses_and_caps(db_path):
+    pool = ReadPool(db_path, size=1)
+    with pool.connection() as first:
+        pass
+    with pool.connection() as again:
+        assert again is first
+    assert pool.stats == {"opened": 1, "reused": 1}
+
+    with pool.connection() as a, pool.connection() as b:
+        assert a is not b
+    assert pool._idle.qsize() == 1                    # second one closed, not kept
+    pool.close()
+    assert pool._idle.qsize() == 0
+
+
+def test_pool_drops_connection_on_error(db_path):
+    pool = ReadPool(db_path)
+    with pytest.raises(sqlite3.OperationalError):
+        with pool.connection() as conn:
+            conn.execute("SELECT * FROM missing_table")
+    with pool.connection() as fresh:
+        assert fresh is not conn
+    assert pool.stats == {"opened": 2, "reused": 0}
+
+
+def test_read_pool_per_path(db_path, tmp_path):
+    assert read_pool(db_path) is read_pool(str(db_path))
+    assert read_pool(db_path) is not read_pool(tmp_path / "other.db")
@@ -0,0 +1,86 @@
+"""
+Unit tests for exporters/sqlite_handler.py bulk insert and migrations
+
+Tests cover:
+  - bulk_insert() counts new vs duplicate leads (across calls and within one)
+  - commit_every splits a large import into several transactions
+  - A failing row (NOT NULL violation) costs only itself
+  - insert_lead() still reports (inserted, dedup_key)
+  - Migrations bring an old (user_version 0) file up to date, once
+  - Dashboard query shapes use the partial / date_added indexes
+"""
+
+import sqlite3
+
+from exporters.sqlite_handler import _MIGRATIONS, QUALIFIED_WHERE, SQLiteHandler
+
+
+def _count(db) -> int:
+    return db._conn.execute("SELECT COUNT(*) FROM leads").fetchone()[0]
+
+
+def test_new_and_duplicates(db, make_lead):
+    first = db.bulk_insert([make_lead(i) for i in range(5)])
+    assert first == {"new": 5, "duplicates": 0, "errors": 0}
+
+    # 3 already stored, 1 repeated inside the batch, 2 new
+    again = db.bulk_insert([make_lead(3), make_lead(4), make_lead(5), make_lead(5), make_lead(6), make_lead(0)])
+    assert again == {"new": 2, "duplicates": 4, "errors": 0}
+    assert _count(db) == 7
+
+
+def test_commit_every(db, make_lead, monkeypatch):
+    groups = []
+    real   = db._insert_rows
+    monkeypatch.setattr(db, "_insert_rows", lambda rows, stats: (groups.append(len(rows)), real(rows, stats)))
+    stats = db.bulk_insert([make_lead(i) for i in range(25)], commit_every=10)
+    assert groups == [10, 10, 5]
+    assert stats["new"] == 25 and not db._conn.in_transaction
+
+
+def test_bad_row_only_costs_itself(db, make_lead):
+    leads = [make_lead(1), make_lead(2, niche=None), make_lead(3), make_lead(1)]
+    assert db.bulk_insert(leads) == {"new": 2, "duplicates": 1, "errors": 1}
+    assert _count(db) == 2
+
+
+def test_insert_lead(db, make_lead):
+    inserted, key = db.insert_lead(make_lead(1))
+    assert inserted and len(key) == 32
+    assert db.insert_lead(make_lead(1)) == (False, key)
+    raw = db._conn.execute("SELECT raw_json FROM leads").fetchone()[0]
+    assert '"Biz 1"' in raw
+
+
+# ── Migrations and query plans ────────────────────────────────────────────────
+
+def test_migrates_old_file(tmp_path):
+    path = tmp_path / "leads.db"
+    old  = sqlite3.connect(path)
+    old.execute("CREATE TABLE sessions (id INTEGER PRIMARY KEY, started_at TEXT NOT NULL)")
+    old.close()
+
+    handler = SQLiteHandler({"database": {"path": str(path)}})
+    handler.open()
+    assert handler.schema_version == len(_MIGRATIONS)
+    columns = {row[1] for row in handler._conn.execute("PRAGMA table_info(sessions)")}
+    assert "metrics" in columns
+    handler.close()
+
+    handler.open()          # already current: nothing re-runs
+    assert handler.schema_version == len(_MIGRATIONS)
+    handler.close()
+
+
+def test_dashboard_queries_use_indexes(db):
+    assert db.check_query_plans() == {"lead_list": True, "qualified_count": True, "new_today": True}
+    plan = db.query_plan(f"SELECT COUNT(*) FROM leads WHERE {QUALIFIED_WHERE}")
+    assert plan == ["SCAN leads USING COVERING INDEX idx_leads_qualified"]
+
+
+def test_missing_index_is_reported(db, caplog):
+    db._conn.execute("DROP INDEX idx_leads_date_added")
+    db.close()
+    db.open()               # the check runs on open
+    assert "does not use idx_leads_date_added" in caplog.text
+    assert db.check_query_plans()["new_today"] is False
@@ -0,0 +1,95 @@
+"""
+Unit tests for scrapers/streaming.py
+
+Tests cover:
+  - merge_workers() yields items as workers produce them
+  - Closing the stream early cancels the remaining workers
+  - A worker exception is re-raised to the consumer
+  - iter_scraper() prefers scrape_niche_iter(), falls back to scrape_niche()
+"""
+
+import asyncio
+from contextlib import aclosing
+
+import pytest
+from scrapers.streaming import collect, iter_scraper, merge_workers
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+# ── merge_workers ─────────────────────────────────────────────────────────────
+
+class TestMergeWorkers:
+    def test_yields_everything(self):
+        async def main():
+            out = asyncio.Queue()
+
+            async def worker(base):
+                for i in range(3):
+                    await asyncio.sleep(0)
+                    out.put_nowait(base + i)
+
+            return await collect(merge_workers(out, [worker(0), worker(10)]))
+
+        assert sorted(_run(main())) == [0, 1, 2, 10, 11, 12]
+
+    def test_no_workers(self):
+        assert _run(collect(merge_workers(asyncio.Queue(), []))) == []
+
+    def test_early_close_cancels_workers(self):
+        cancelled = []
+
+        async def main():
+            out = asyncio.Queue()
+
+            async def worker():
+                try:
+                    for i in range(100):
+                        out.put_nowait(i)
+                        await asyncio.sleep(0.01)
+                except asyncio.CancelledError:
+                    cancelled.append(True)
+                    raise
+
+            async with aclosing(merge_workers(out, [worker()])) as items:
+                async for item in items:
+                    if item == 2:
+                        break
+
+        _run(main())
+        assert cancelled == [True]
+
+    def test_worker_exception_propagates(self):
+        async def main():
+            out = asyncio.Queue()
+
+            async def bad():
+                out.put_nowait("first")
+                raise RuntimeError("boom")
+
+            return await collect(merge_workers(out, [bad()]))
+
+        with pytest.raises(RuntimeError, match="boom"):
+            _run(main())
+
+
+# ── iter_scraper ──────────────────────────────────────────────────────────────
+
+class TestIterScraper:
+    def test_uses_async_iterator(self):
+        class Async:
+            async def scrape_niche_iter(self, niche, location, on_progress=None):
+                for i in range(2):
+                    yield {"name": f"{niche}-{i}"}
+
+        leads = _run(collect(iter_scraper(Async(), "plumbers", {})))
+        assert leads == [{"name": "plumbers-0"}, {"name": "plumbers-1"}]
+
+    def test_falls_back_to_sync_scrape_niche(self):
+        class Legacy:
+            def scrape_niche(self, niche, location, on_progress=None):
+                return [{"name": niche}]
+
+        assert _run(collect(iter_scraper(Legacy(), "roofers", {}))) == [{"name": "roofers"}]